@@ -1,12 +1,20 @@
-from typing import Dict, Any, TypedDict, Annotated
-from langgraph.graph import StateGraph, END
-from langchain_core.messages import HumanMessage, AIMessage, BaseMessage
-from langgraph.graph.message import add_messages
+from typing import Dict, Any, AsyncIterator, Optional
+import uuid
+import weakref
+from langgraph.graph import StateGraph, START, END
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.runnables import RunnableLambda
 
-from core.models.conversation_models import ConversationState
+from core.models.conversation_models import ConversationState, turn_bounds
+from core.models.message_log import MessageLog
+from agents.state import GraphState
 from agents.nodes.conversation_nodes import (
     initialize_conversation_node,
     process_user_response_node,
+    aprocess_user_response_node,
     clarification_node,
     next_question_node,
     finalize_conversation_node,
@@ -14,29 +22,18 @@ from agents.nodes.conversation_nodes import (
 )
 
 
-class GraphState(TypedDict):
-    """Estado compatible con LangGraph"""
-    messages: Annotated[list[BaseMessage], add_messages]
-    pending_questions: list[str]
-    user_responses: dict[str, str]
-    current_question: str
-    current_question_index: int
-    needs_clarification: bool
-    clarification_reason: str
-    conversation_complete: bool
-    metadata: dict[str, Any]
-
-
 def graph_to_conversation_state(graph_state: GraphState) -> ConversationState:
     """Convierte GraphState a ConversationState"""
     state = ConversationState()
-    state.messages = graph_state.get("messages", [])
+    state.messages = MessageLog(graph_state.get("messages", []))
+    state.turn_starts = graph_state.get("turn_starts", [])
     state.pending_questions = graph_state.get("pending_questions", [])
+    state.question_validators = graph_state.get("question_validators", {})
     state.user_responses = graph_state.get("user_responses", {})
-    state.current_question = graph_state.get("current_question")
+    state.current_question = graph_state.get("current_question") or None
     state.current_question_index = graph_state.get("current_question_index", 0)
     state.needs_clarification = graph_state.get("needs_clarification", False)
-    state.clarification_reason = graph_state.get("clarification_reason")
+    state.clarification_reason = graph_state.get("clarification_reason") or None
     state.conversation_complete = graph_state.get("conversation_complete", False)
     state.metadata = graph_state.get("metadata", {})
     return state
@@ -45,160 +42,359 @@ def graph_to_conversation_state(graph_state: GraphState) -> ConversationState:
 def conversation_to_graph_state(conv_state: ConversationState) -> GraphState:
     """Convierte ConversationState a GraphState"""
     return GraphState(
-        messages=conv_state.messages,
+        messages=conv_state.messages.to_messages(),
+        turn_starts=conv_state.turn_starts,
         pending_questions=conv_state.pending_questions,
+        question_validators=conv_state.question_validators,
         user_responses=conv_state.user_responses,
         current_question=conv_state.current_question or "",
         current_question_index=conv_state.current_question_index,
         needs_clarification=conv_state.needs_clarification,
         clarification_reason=conv_state.clarification_reason or "",
+        response_processed=True,
         conversation_complete=conv_state.conversation_complete,
         metadata=conv_state.metadata
     )
 
 
+# Rutas de `decision_node` hacia los nodos del grafo
+ROUTES = {
+    "initialize": "initialize",
+    "process_response": "process_response",
+    "clarify": "clarify",
+    "next_question": "next_question",
+    "finalize": "finalize",
+    "wait_for_user": END
+}
+
+
+def build_conversation_graph() -> StateGraph:
+    """
+    Construye el grafo de la entrevista con `decision_node` como router.
+
+    Cada turno entra por START y recorre como máximo evaluar → aclarar o
+    avanzar → finalizar, hasta quedar esperando al usuario.
+
+    Returns:
+        StateGraph sin compilar
+    """
+    builder = StateGraph(GraphState)
+    builder.add_node("initialize", initialize_conversation_node)
+    builder.add_node(
+        "process_response",
+        RunnableLambda(process_user_response_node, afunc=aprocess_user_response_node)
+    )
+    builder.add_node("clarify", clarification_node)
+    builder.add_node("next_question", next_question_node)
+    builder.add_node("finalize", finalize_conversation_node)
+
+    builder.add_conditional_edges(START, decision_node, ROUTES)
+    builder.add_edge("initialize", END)
+    builder.add_conditional_edges("process_response", decision_node, ROUTES)
+    builder.add_edge("clarify", END)
+    builder.add_conditional_edges("next_question", decision_node, ROUTES)
+    builder.add_edge("finalize", END)
+    return builder
+
+
+# Serializador de checkpoints que admite los validadores de las preguntas;
+# conviene pasarlo también a los checkpointers persistentes (p. ej. SQLite)
+CHECKPOINT_SERDE = JsonPlusSerializer(
+    allowed_msgpack_modules=[("core.models.question_models", "ValidatorSpec")]
+)
+
+# Grafo compilado una sola vez al importar el módulo. El checkpointer por
+# defecto guarda el estado de cada conversación en memoria, por thread_id;
+# cada agente libera su thread al terminar la entrevista o al descartarse
+DEFAULT_CHECKPOINTER = InMemorySaver(serde=CHECKPOINT_SERDE)
+CONVERSATION_GRAPH = build_conversation_graph().compile(checkpointer=DEFAULT_CHECKPOINTER)
+
+
 class AdaptieraRRHHAgent:
     """
-    Agente conversacional de RRHH usando un ConversationState interno
-    con procesamiento directo de nodos.
-    
+    Agente conversacional de RRHH que ejecuta el grafo de LangGraph.
+
     Este agente maneja entrevistas automatizadas, recopila respuestas,
-    decide cuándo repreguntar y envía resúmenes por correo.
+    decide cuándo repreguntar y envía resúmenes por correo. Cada turno es
+    una sola ejecución del grafo compilado; el estado de la conversación
+    vive en el checkpointer bajo el `thread_id` del agente, así que cada
+    turno solo envía el mensaje nuevo del usuario.
+
+    Con el checkpointer en memoria del proceso, el thread se borra al
+    terminar la entrevista (el estado final queda en `values`) o cuando el
+    agente se descarta. Para retomar conversaciones desde otro agente hay que
+    pasar un checkpointer propio, que solo se libera con `release()`.
     """
-    
-    def __init__(self):
-        self.state = ConversationState()
-        self.initialized = False
-    
+
+    def __init__(self, checkpointer: Optional[BaseCheckpointSaver] = None, thread_id: Optional[str] = None):
+        """
+        Inicializa el agente.
+
+        Args:
+            checkpointer: Checkpointer de LangGraph (None usa el checkpointer en memoria del proceso)
+            thread_id: Conversación del checkpointer a retomar (None inicia una nueva)
+        """
+        if checkpointer is None:
+            self.graph = CONVERSATION_GRAPH
+        else:
+            # Reutiliza el grafo compilado con otro checkpointer, sin recompilar
+            self.graph = CONVERSATION_GRAPH.copy(update={"checkpointer": checkpointer})
+        self._release_thread: Optional[weakref.finalize] = None
+        self._set_thread(thread_id or uuid.uuid4().hex)
+        self.values: GraphState = {}
+        if thread_id is not None:
+            # Retomar una conversación guardada en el checkpointer
+            self.values = self.graph.get_state(self.config).values
+        self.initialized = bool(self.values)
+
+    def _set_thread(self, thread_id: str) -> None:
+        """
+        Cambia el thread de la conversación. Con el checkpointer en memoria
+        del proceso, el thread se borra si el agente se descarta sin liberarlo.
+        """
+        if self._release_thread is not None:
+            self._release_thread.detach()
+            self._release_thread = None
+        self.thread_id = thread_id
+        if self.graph is CONVERSATION_GRAPH:
+            self._release_thread = weakref.finalize(self, DEFAULT_CHECKPOINTER.delete_thread, thread_id)
+            self._release_thread.atexit = False
+
+    def release(self) -> None:
+        """Borra la conversación del checkpointer (el estado sigue disponible en `values`)."""
+        if self._release_thread is not None:
+            # Ejecuta el borrado una sola vez
+            self._release_thread()
+            return
+        checkpointer = self.graph.checkpointer
+        if isinstance(checkpointer, BaseCheckpointSaver):
+            checkpointer.delete_thread(self.thread_id)
+
+    def _release_if_complete(self) -> None:
+        """Libera el thread en memoria de una entrevista terminada."""
+        if self.graph is CONVERSATION_GRAPH and self.is_conversation_complete():
+            self.release()
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Configuración de ejecución del grafo para esta conversación."""
+        return {"configurable": {"thread_id": self.thread_id}}
+
+    @property
+    def state(self) -> ConversationState:
+        """Estado de la conversación como ConversationState (se construye al pedirlo)."""
+        return graph_to_conversation_state(self.values)
+
+    def get_latest_reply(self) -> Optional[str]:
+        """
+        Obtiene la respuesta del agente en el último turno.
+
+        Usa el índice de turnos del estado, así que no recorre el historial
+        ni depende de comparar el texto del usuario.
+
+        Returns:
+            Mensajes del agente del último turno o None si no respondió
+        """
+        turn_starts = self.values.get("turn_starts") or []
+        if not turn_starts:
+            return None
+        messages = self.values.get("messages", [])
+        start, end = turn_bounds(turn_starts, len(messages), -1)
+        replies = [
+            message.content.strip()
+            for message in messages[start:end]
+            if isinstance(message, AIMessage)
+        ]
+        return "\n".join(replies) if replies else None
+
     def start_conversation(self) -> str:
         """
         Inicia una nueva conversación.
-        
+
         Returns:
             Mensaje inicial del agente
         """
         try:
             print("🚀 Iniciando conversación...")
-            
-            # Inicializar estado
-            self.state = initialize_conversation_node(self.state)
+
+            self.values = self.graph.invoke({}, self.config)
             self.initialized = True
-            
-            # Retornar el último mensaje del agente
-            if self.state.messages:
-                ai_messages = [msg for msg in self.state.messages if isinstance(msg, AIMessage)]
-                if ai_messages:
-                    return ai_messages[-1].content
-            
+
+            # Retornar el mensaje inicial del agente
+            greeting = self.get_latest_reply()
+            if greeting is not None:
+                return greeting
+
         except Exception as e:
             print(f"Error al iniciar conversación: {e}")
             return "Lo siento, hubo un error al iniciar la conversación. ¿Puedes intentar de nuevo?"
-        
+
         return "¡Hola! Soy el asistente de RRHH. ¿Cómo puedo ayudarte?"
-    
+
+    def _turn_input(self, user_input: str) -> Dict[str, Any]:
+        """
+        Construye la entrada de un turno: el mensaje nuevo del usuario y el
+        comienzo del turno en el índice de turnos.
+        """
+        return {
+            "messages": [HumanMessage(content=user_input)],
+            "turn_starts": [len(self.values.get("messages", []))],
+            "response_processed": False
+        }
+
     def process_user_input(self, user_input: str) -> str:
         """
         Procesa la entrada del usuario y retorna la respuesta del agente.
-        
+
         Args:
             user_input: Mensaje del usuario
-            
+
         Returns:
             Respuesta del agente
         """
         # Si no está inicializado, inicializar primero
         if not self.initialized:
-            initial_response = self.start_conversation()
-            # Después procesar el input
-            
+            self.start_conversation()
+
+        if self.is_conversation_complete():
+            return self.get_latest_reply() or ""
+
         try:
-            # Agregar mensaje del usuario
-            user_message = HumanMessage(content=user_input)
-            self.state.messages.append(user_message)
-            
-            # Procesar según el estado actual
-            while True:
-                decision = decision_node(self.state)
-                print(f"Decisión tomada: {decision}")
-                
-                if decision == "process_response":
-                    self.state = process_user_response_node(self.state)
-                elif decision == "clarify":
-                    self.state = clarification_node(self.state)
-                    break  # Esperamos respuesta del usuario
-                elif decision == "next_question":
-                    self.state = next_question_node(self.state)
-                    break  # Esperamos respuesta del usuario o terminamos
-                elif decision == "finalize":
-                    self.state = finalize_conversation_node(self.state)
-                    break  # Conversación terminada
-                elif decision == "wait_for_user":
-                    break  # Esperamos respuesta del usuario
-                else:
-                    print(f"⚠️ Decisión desconocida: {decision}")
-                    break
-            
-            # Retornar el último mensaje del agente
-            if self.state.messages:
-                # Buscar el último mensaje del agente después del input del usuario
-                user_message_found = False
-                for i in range(len(self.state.messages) - 1, -1, -1):
-                    msg = self.state.messages[i]
-                    if isinstance(msg, HumanMessage) and msg.content == user_input:
-                        user_message_found = True
-                        continue
-                    if user_message_found and isinstance(msg, AIMessage):
-                        return msg.content
-                
-                # Fallback: último mensaje del agente
-                ai_messages = [msg for msg in self.state.messages if isinstance(msg, AIMessage)]
-                if ai_messages:
-                    return ai_messages[-1].content
-            
+            self.values = self.graph.invoke(
+                self._turn_input(user_input), self.config, durability="exit"
+            )
+            self._release_if_complete()
+            reply = self.get_latest_reply()
+            if reply is not None:
+                return reply
+            return "Lo siento, no pude procesar tu respuesta. ¿Puedes intentar de nuevo?"
+
         except Exception as e:
             print(f"Error al procesar input del usuario: {e}")
             import traceback
             traceback.print_exc()
             return "Lo siento, hubo un problema procesando tu respuesta. ¿Puedes intentar de nuevo?"
-        
+
+    async def astream_user_input(self, user_input: str) -> AsyncIterator[str]:
+        """
+        Procesa la entrada del usuario con `astream` y transmite cada mensaje
+        del agente a medida que los nodos lo generan.
+
+        Args:
+            user_input: Mensaje del usuario
+
+        Yields:
+            Mensajes del agente producidos en el turno
+        """
+        if not self.initialized:
+            self.values = await self.graph.ainvoke({}, self.config)
+            self.initialized = True
+
+        if self.is_conversation_complete():
+            return
+
+        async for update in self.graph.astream(
+            self._turn_input(user_input), self.config, stream_mode="updates", durability="exit"
+        ):
+            for node_update in update.values():
+                for message in (node_update or {}).get("messages", []):
+                    if isinstance(message, AIMessage):
+                        yield message.content
+
+        self.values = (await self.graph.aget_state(self.config)).values
+        self._release_if_complete()
+
+    async def aprocess_user_input(self, user_input: str) -> str:
+        """
+        Procesa la entrada del usuario de forma asíncrona.
+
+        Args:
+            user_input: Mensaje del usuario
+
+        Returns:
+            Respuesta del agente
+        """
+        if self.initialized and self.is_conversation_complete():
+            return self.get_latest_reply() or ""
+
+        replies = [reply.strip() async for reply in self.astream_user_input(user_input)]
+        if replies:
+            return "\n".join(replies)
         return "Lo siento, no pude procesar tu respuesta. ¿Puedes intentar de nuevo?"
-    
+
     def is_conversation_complete(self) -> bool:
         """
         Verifica si la conversación ha terminado.
-        
+
         Returns:
             True si la conversación está completa
         """
-        return self.state.conversation_complete
-    
+        return bool(self.values.get("conversation_complete", False))
+
     def get_conversation_summary(self) -> Dict[str, Any]:
         """
         Obtiene un resumen de la conversación.
-        
+
         Returns:
             Diccionario con el resumen de la conversación
         """
         return {
-            "responses": self.state.user_responses,
-            "questions_asked": len(self.state.user_responses),
-            "total_questions": len(self.state.pending_questions),
-            "complete": self.state.conversation_complete,
-            "messages_count": len(self.state.messages)
+            "responses": self.values.get("user_responses", {}),
+            "questions_asked": len(self.values.get("user_responses", {})),
+            "total_questions": len(self.values.get("pending_questions", [])),
+            "complete": self.is_conversation_complete(),
+            "messages_count": len(self.values.get("messages", []))
         }
+
+    def snapshot(self) -> bytes:
+        """
+        Serializa la entrevista en curso para guardarla o moverla de proceso.
+        
+        Returns:
+            Estado de la conversación en formato binario (ver ConversationState.to_bytes)
+        """
+        return self.state.to_bytes()
+    
+    def restore(self, data: bytes) -> "AdaptieraRRHHAgent":
+        """
+        Retoma una entrevista a partir de un snapshot, en un thread nuevo del
+        checkpointer. El thread anterior solo se borra con el checkpointer en
+        memoria del proceso; en uno propio se conserva.
+        
+        Args:
+            data: Bytes producidos por `snapshot()`
+        
+        Returns:
+            El mismo agente, para encadenar llamadas
+        """
+        values = conversation_to_graph_state(ConversationState.from_bytes(data))
+        if self.graph is CONVERSATION_GRAPH:
+            self.release()
+        self._set_thread(uuid.uuid4().hex)
+        # Se registra como salida de un nodo que termina el turno, así el grafo
+        # queda esperando el próximo mensaje del usuario
+        self.graph.update_state(self.config, values, as_node="initialize")
+        self.values = self.graph.get_state(self.config).values
+        self.initialized = bool(self.values.get("messages"))
+        return self
     
     def reset_conversation(self):
-        """Reinicia la conversación"""
-        self.state = ConversationState()
+        """Reinicia la conversación en un thread nuevo y libera el anterior"""
+        self.release()
+        self._set_thread(uuid.uuid4().hex)
+        self.values = {}
         self.initialized = False
 
 
 # Función de conveniencia para crear una instancia del agente
-def create_rrhh_agent() -> AdaptieraRRHHAgent:
+def create_rrhh_agent(checkpointer: Optional[BaseCheckpointSaver] = None) -> AdaptieraRRHHAgent:
     """
     Crea una nueva instancia del agente de RRHH.
-    
+
+    Args:
+        checkpointer: Checkpointer de LangGraph (None usa el checkpointer en memoria del proceso)
+
     Returns:
         Instancia del agente configurada
     """
-    return AdaptieraRRHHAgent() 
\ No newline at end of file
+    return AdaptieraRRHHAgent(checkpointer)
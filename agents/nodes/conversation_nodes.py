@@ -1,247 +1,197 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from langchain_core.messages import HumanMessage, AIMessage
-from langchain_groq import ChatGroq
-import os
-<<<<<<< HEAD
-from core.models.conversation_models import ConversationState
-from agents.tools.file_search_tool import search_questions_file_direct, save_user_responses_direct
+from agents.state import GraphState
+from agents.tools.file_search_tool import search_question_specs_direct, save_user_responses_direct
 from agents.tools.email_tool import simulate_email_send_direct
+from agents.tools.response_evaluator import get_response_evaluator
 from utils.env_utils import load_env_variables
-=======
-from dotenv import load_dotenv
-from core.models.conversation_models import ConversationState
-
-# Importar funciones directas sin decoradores @tool
-import json
-import datetime
-
-def search_questions_file_direct(file_path: str = "data/questions.json") -> list[str]:
-    """Busca y carga las preguntas desde un archivo local (versión directa sin @tool)."""
-    try:
-        if not os.path.exists(file_path):
-            default_questions = [
-                "¿Cuál es tu nombre completo?",
-                "¿Cuál es tu experiencia laboral previa?",
-                "¿Qué habilidades técnicas posees?",
-                "¿Por qué estás interesado en esta posición?",
-                "¿Cuáles son tus expectativas salariales?"
-            ]
-            
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump({"questions": default_questions}, f, ensure_ascii=False, indent=2)
-            
-            return default_questions
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            
-        if isinstance(data, dict) and "questions" in data:
-            return data["questions"]
-        elif isinstance(data, list):
-            return data
-        else:
-            raise ValueError("Formato de archivo no válido")
-            
-    except Exception as e:
-        print(f"Error al cargar preguntas: {e}")
-        return [
-            "¿Cuál es tu nombre completo?",
-            "¿Cuál es tu experiencia laboral previa?",
-            "¿Qué habilidades técnicas posees?"
-        ]
-
-def save_user_responses_direct(responses: Dict[str, str], file_path: str = "data/user_responses.json") -> bool:
-    """Guarda las respuestas del usuario en un archivo local (versión directa sin @tool)."""
-    try:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        
-        responses["timestamp"] = datetime.datetime.now().isoformat()
-        
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(responses, f, ensure_ascii=False, indent=2)
-            
-        return True
-        
-    except Exception as e:
-        print(f"Error al guardar respuestas: {e}")
-        return False
-
-def simulate_email_send_direct(user_responses: Dict[str, str]) -> bool:
-    """Simula el envío de correo (versión directa sin @tool)."""
-    try:
-        print("📧 Simulando envío de correo...")
-        print(f"Resumen enviado para {len(user_responses)} respuestas")
-        return True
-    except Exception as e:
-        print(f"Error al enviar correo: {e}")
-        return False
->>>>>>> 89555764e321d68bb834290eb9d0decbd30f198e
 
 # Cargar variables de entorno
 load_env_variables()
 
+# Los nodos reciben el GraphState y devuelven solo los campos que cambian;
+# LangGraph agrega los mensajes nuevos al historial con `add_messages`.
 
-def initialize_conversation_node(state: ConversationState) -> ConversationState:
+
+def initialize_conversation_node(state: GraphState) -> Dict[str, Any]:
     """
     Nodo inicial que carga las preguntas y prepara la conversación.
     """
     print("🚀 Inicializando conversación...")
-    
+
     # Cargar preguntas desde archivo
-    questions = search_questions_file_direct("data/questions.json")
-    state.pending_questions = questions
-    state.current_question_index = 0
-    
+    question_specs = search_question_specs_direct("data/questions.json")
+    questions = [spec.text for spec in question_specs]
+    update: Dict[str, Any] = {
+        "pending_questions": questions,
+        "question_validators": {spec.text: spec.validator for spec in question_specs},
+        "user_responses": {},
+        "current_question_index": 0,
+        "needs_clarification": False,
+        "clarification_reason": "",
+        "response_processed": False,
+        "conversation_complete": False
+    }
+
     if questions:
-        state.current_question = questions[0]
-        
+        update["current_question"] = questions[0]
+
         # Mensaje de bienvenida combinado con la primera pregunta
-        welcome_and_question_message = AIMessage(content=f"""¡Hola! Soy el asistente de RRHH de Adaptiera. 
+        update["turn_starts"] = [len(state.get("messages") or [])]
+        update["messages"] = [AIMessage(content=f"""¡Hola! Soy el asistente de RRHH de Adaptiera. 
 Voy a realizarte algunas preguntas para conocerte mejor.
 Responde con la mayor sinceridad posible.
 
 Empecemos:
 
-{state.current_question}""")
-        state.messages.append(welcome_and_question_message)
-    
-    return state
+{questions[0]}""")]
 
+    return update
 
-def process_user_response_node(state: ConversationState) -> ConversationState:
+
+def _last_user_response(state: GraphState) -> Optional[str]:
     """
-    Nodo que procesa la respuesta del usuario y decide si es satisfactoria.
+    Obtiene la última respuesta del usuario, si es el último mensaje.
     """
-    print("🤔 Procesando respuesta del usuario...")
-    
-    # Obtener la última respuesta del usuario
-    last_message = state.messages[-1] if state.messages else None
-    
+    messages = state.get("messages") or []
+    last_message = messages[-1] if messages else None
     if not isinstance(last_message, HumanMessage):
         print("⚠️ No se encontró respuesta del usuario")
-        return state
-    
-    user_response = last_message.content
-    current_question = state.current_question
-    
-    # Configurar el LLM (Groq)
-    groq_api_key = os.getenv("GROQ_API_KEY")
-    if not groq_api_key:
-        print("⚠️ GROQ_API_KEY no configurada, usando lógica simple")
-        # Lógica simple sin LLM (más permisiva)
-        is_satisfactory = len(user_response.strip()) > 3
-        clarification_reason = "Por favor, proporciona una respuesta más detallada" if not is_satisfactory else None
-    else:
-        # Usar Groq para evaluar la respuesta (modelo actualizado)
-        llm = ChatGroq(api_key=groq_api_key, model="llama-3.3-70b-versatile")
-        
-        evaluation_prompt = f"""
-        Evalúa si la siguiente respuesta es satisfactoria para la pregunta planteada:
-        
-        Pregunta: {current_question}
-        Respuesta: {user_response}
-        
-        Responde SOLO con:
-        - "SATISFACTORIA" si la respuesta proporciona información básica relevante a la pregunta
-        - "NECESITA_CLARIFICACION: [razón]" si la respuesta está completamente vacía, es irrelevante o muy confusa
-        
-        Sé PERMISIVO en tu evaluación. Acepta respuestas que tengan al menos alguna relación con la pregunta, 
-        incluso si son breves o no muy detalladas. Solo solicita clarificación si la respuesta realmente 
-        no tiene sentido o está completamente fuera de tema.
-        """
-        
-        try:
-            evaluation = llm.invoke(evaluation_prompt).content.strip()
-            
-            if evaluation.startswith("SATISFACTORIA"):
-                is_satisfactory = True
-                clarification_reason = None
-            else:
-                is_satisfactory = False
-                clarification_reason = evaluation.replace("NECESITA_CLARIFICACION:", "").strip()
-        except Exception as e:
-            print(f"Error al evaluar con Groq: {e}")
-            # Fallback a lógica simple (más permisiva)
-            is_satisfactory = len(user_response.strip()) > 3
-            clarification_reason = "Por favor, proporciona una respuesta más detallada" if not is_satisfactory else None
-    
-    # Actualizar estado
+        return None
+    return last_message.content
+
+
+def _evaluation_update(
+    state: GraphState,
+    user_response: str,
+    is_satisfactory: bool,
+    clarification_reason: str
+) -> Dict[str, Any]:
+    """
+    Construye la actualización del estado a partir de la evaluación.
+    """
+    current_question = state.get("current_question")
+
     if is_satisfactory:
         # Guardar respuesta satisfactoria
-        state.user_responses[current_question] = user_response
-        save_user_responses_direct(state.user_responses, "data/user_responses.json")
-        state.needs_clarification = False
-        state.clarification_reason = None
+        user_responses = {**state.get("user_responses", {}), current_question: user_response}
+        save_user_responses_direct(dict(user_responses), "data/user_responses.json")
         print(f"✅ Respuesta aceptada para: {current_question}")
-    else:
-        state.needs_clarification = True
-        state.clarification_reason = clarification_reason
-        print(f"❓ Necesita clarificación: {clarification_reason}")
-    
-    return state
+        return {
+            "user_responses": user_responses,
+            "needs_clarification": False,
+            "clarification_reason": "",
+            "response_processed": True
+        }
+
+    print(f"❓ Necesita clarificación: {clarification_reason}")
+    return {
+        "needs_clarification": True,
+        "clarification_reason": clarification_reason,
+        "response_processed": True
+    }
+
+
+def process_user_response_node(state: GraphState) -> Dict[str, Any]:
+    """
+    Nodo que procesa la respuesta del usuario y decide si es satisfactoria.
+    """
+    print("🤔 Procesando respuesta del usuario...")
+
+    user_response = _last_user_response(state)
+    if user_response is None:
+        return {"response_processed": True}
+
+    current_question = state.get("current_question")
+
+    # Evaluar con el evaluador compartido (validador + caché + Groq + lógica simple)
+    is_satisfactory, clarification_reason = get_response_evaluator().evaluate(
+        current_question, user_response, state.get("question_validators", {}).get(current_question)
+    )
+    return _evaluation_update(state, user_response, is_satisfactory, clarification_reason)
+
+
+async def aprocess_user_response_node(state: GraphState) -> Dict[str, Any]:
+    """
+    Variante asíncrona de `process_user_response_node` para `ainvoke`/`astream`.
+    """
+    print("🤔 Procesando respuesta del usuario...")
 
+    user_response = _last_user_response(state)
+    if user_response is None:
+        return {"response_processed": True}
 
-def clarification_node(state: ConversationState) -> ConversationState:
+    current_question = state.get("current_question")
+
+    is_satisfactory, clarification_reason = await get_response_evaluator().aevaluate(
+        current_question, user_response, state.get("question_validators", {}).get(current_question)
+    )
+    return _evaluation_update(state, user_response, is_satisfactory, clarification_reason)
+
+
+def clarification_node(state: GraphState) -> Dict[str, Any]:
     """
     Nodo que solicita aclaración cuando la respuesta no es satisfactoria.
     """
     print("🔄 Solicitando aclaración...")
-    
+
     clarification_message = AIMessage(content=f"""
 Me gustaría que puedas ampliar tu respuesta anterior.
-{state.clarification_reason}
+{state.get("clarification_reason")}
 
-Por favor, proporciona más detalles sobre: {state.current_question}
+Por favor, proporciona más detalles sobre: {state.get("current_question")}
 """)
-    
-    state.messages.append(clarification_message)
-    return state
 
+    return {"messages": [clarification_message]}
 
-def next_question_node(state: ConversationState) -> ConversationState:
+
+def next_question_node(state: GraphState) -> Dict[str, Any]:
     """
     Nodo que avanza a la siguiente pregunta.
     """
     print("➡️ Avanzando a la siguiente pregunta...")
-    
-    state.current_question_index += 1
-    
-    if state.current_question_index < len(state.pending_questions):
+
+    current_question_index = state.get("current_question_index", 0) + 1
+    pending_questions = state.get("pending_questions", [])
+
+    if current_question_index < len(pending_questions):
         # Hay más preguntas
-        state.current_question = state.pending_questions[state.current_question_index]
-        
+        current_question = pending_questions[current_question_index]
+
         next_question_message = AIMessage(content=f"""
 Perfecto, gracias por tu respuesta.
 
 Siguiente pregunta:
-{state.current_question}
+{current_question}
 """)
-        state.messages.append(next_question_message)
-    else:
-        # No hay más preguntas, marcar como completa
-        state.conversation_complete = True
-        state.current_question = None
-        
-        completion_message = AIMessage(content="""
+        return {
+            "current_question_index": current_question_index,
+            "current_question": current_question,
+            "messages": [next_question_message]
+        }
+
+    # No hay más preguntas, marcar como completa
+    completion_message = AIMessage(content="""
 ¡Excelente! Hemos terminado con todas las preguntas.
 Ahora voy a procesar tu información y enviar un resumen.
 """)
-        state.messages.append(completion_message)
-    
-    return state
+    return {
+        "current_question_index": current_question_index,
+        "current_question": "",
+        "conversation_complete": True,
+        "messages": [completion_message]
+    }
 
 
-def finalize_conversation_node(state: ConversationState) -> ConversationState:
+def finalize_conversation_node(state: GraphState) -> Dict[str, Any]:
     """
     Nodo final que guarda las respuestas y envía el correo.
     """
     print("🏁 Finalizando conversación...")
-    
+
     # Enviar correo (simulado por ahora)
-    email_success = simulate_email_send_direct(state.user_responses)
-    
+    email_success = simulate_email_send_direct(state.get("user_responses", {}))
+
     if email_success:
         final_message = AIMessage(content="""
 ¡Muchas gracias por tu tiempo! 
@@ -259,90 +209,52 @@ Gracias por completar la entrevista.
 Hubo algunos problemas técnicos al procesar tu información, 
 pero nuestro equipo se pondrá en contacto contigo pronto.
 """)
-    
-    state.messages.append(final_message)
-    return state
 
+    return {"messages": [final_message]}
 
-def decision_node(state: ConversationState) -> str:
+
+def decision_node(state: GraphState) -> str:
     """
     Función de decisión que determina el siguiente paso en el flujo.
-    Esta función NO modifica el estado, solo retorna la decisión.
+    Esta función NO modifica el estado, solo retorna la decisión; el grafo
+    la usa como router condicional a la entrada de cada turno y después de
+    procesar una respuesta o avanzar de pregunta.
     """
     print("🎯 Tomando decisión sobre el siguiente paso...")
-    print(f"   Estado actual: conversation_complete={state.conversation_complete}, needs_clarification={state.needs_clarification}")
-    print(f"   Pregunta actual: {state.current_question}")
-    print(f"   Índice: {state.current_question_index}, Total preguntas: {len(state.pending_questions)}")
-<<<<<<< HEAD
-=======
-    print(f"   Último mensaje: {type(state.messages[-1]).__name__ if state.messages else 'Ninguno'}")
->>>>>>> 89555764e321d68bb834290eb9d0decbd30f198e
-    
+
+    messages = state.get("messages") or []
+    last_message = messages[-1] if messages else None
+
     # 1. Si ya está completa, finalizar
-    if state.conversation_complete:
+    if state.get("conversation_complete"):
         print("   ➡️ Decisión: finalize")
         return "finalize"
-    
-    # 2. Si no hay pregunta actual (inicial), procesar primera respuesta
-    if not state.current_question:
+
+    # 2. Si todavía no hay conversación, inicializarla
+    if not messages:
+        print("   ➡️ Decisión: initialize")
+        return "initialize"
+
+    # 3. Si no hay pregunta actual, no hay nada que evaluar
+    if not state.get("current_question"):
         print("   ➡️ Decisión: wait_for_user")
         return "wait_for_user"
-    
-    # 3. Si necesita clarificación, solicitar más información
-    if state.needs_clarification:
-        print("   ➡️ Decisión: clarify")
-        return "clarify"
-    
-    # 4. Si la respuesta fue satisfactoria, seguir con siguiente pregunta
-    last_message = state.messages[-1] if state.messages else None
+
     if isinstance(last_message, HumanMessage):
-        # Hay una respuesta nueva del usuario, procesarla
-        print("   ➡️ Decisión: process_response")
-        return "process_response"
-    
-<<<<<<< HEAD
-    # 5. Si acabamos de procesar una respuesta satisfactoria, ir a siguiente pregunta
-    if (state.current_question_index < len(state.pending_questions) and 
-        not state.needs_clarification):
+        # 4. Hay una respuesta nueva del usuario, procesarla
+        if not state.get("response_processed"):
+            print("   ➡️ Decisión: process_response")
+            return "process_response"
+
+        # 5. Si necesita clarificación, solicitar más información
+        if state.get("needs_clarification"):
+            print("   ➡️ Decisión: clarify")
+            return "clarify"
+
+        # 6. La respuesta fue satisfactoria: seguir con la siguiente pregunta
         print("   ➡️ Decisión: next_question")
         return "next_question"
-    
-    # 6. Por defecto, esperar respuesta del usuario
+
+    # 7. Por defecto, esperar respuesta del usuario
     print("   ➡️ Decisión: wait_for_user")
     return "wait_for_user"
-=======
-    # Si acabamos de procesar una respuesta satisfactoria, avanzar a la siguiente pregunta
-    # Esto se detecta cuando: no necesita aclaración Y tenemos una pregunta actual Y hay respuestas guardadas
-    if (not state.needs_clarification and 
-        state.current_question and 
-        state.current_question in state.user_responses and
-        state.messages and 
-        isinstance(state.messages[-1], AIMessage)):
-        print("   → Respuesta procesada exitosamente, avanzando a siguiente pregunta...")
-        return "next_question"
-    
-    # Si no hay pregunta actual pero no está completa, ir a la siguiente
-    if not state.current_question and not state.conversation_complete:
-        print("   → No hay pregunta actual, avanzando a siguiente pregunta...")
-        return "next_question"
-    
-    # Si tenemos una pregunta actual pero es la inicial (sin respuestas del usuario aún)
-    if (state.current_question and 
-        len(state.user_responses) == 0 and 
-        state.messages and 
-        isinstance(state.messages[-1], AIMessage)):
-        print("   → Estado inicial con pregunta lista, esperando respuesta del usuario...")
-        return "wait_for_user"
-    
-    # Por defecto, esperar respuesta del usuario
-    print("   → Esperando respuesta del usuario...")
-    return "wait_for_user"
-
-
-def dummy_decision_node(state: ConversationState) -> ConversationState:
-    """
-    Nodo dummy que no hace nada, solo para mantener la estructura del grafo.
-    La lógica real está en la función decision_node que se usa para routing.
-    """
-    return state 
->>>>>>> 89555764e321d68bb834290eb9d0decbd30f198e
@@ -0,0 +1,274 @@
+"""
+Diario de turnos por sesión para retomar entrevistas interrumpidas.
+
+Al terminar cada turno el agente agrega un registro con lo que cambió: los
+mensajes nuevos, el comienzo del turno en el índice de turnos y los campos
+de estado (respuestas aceptadas, pregunta actual, aclaración pendiente). Si
+el servidor se reinicia o la pestaña se recarga, el mismo token vuelve a
+abrir el diario y `replay()` reconstruye el ConversationState aplicando los
+registros en orden, sin llamar al LLM: los veredictos ya están en el diario.
+
+Formato del archivo: cabecera fija (firma + versión) y registros msgpack
+con prefijo de longitud y CRC32. Un registro a medio escribir (corte de luz,
+proceso terminado) se detecta por la longitud o el CRC y se descarta junto
+con lo que le sigue; el turno interrumpido simplemente no cuenta.
+"""
+import os
+import struct
+import threading
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import ormsgpack
+
+from core.models.conversation_models import VALIDATOR_FIELDS, ConversationState
+from core.models.question_models import ValidatorSpec
+from core.rrhh_config import SESSION_JOURNAL_CONFIG
+
+JOURNAL_MAGIC = b"ADJL"
+JOURNAL_VERSION = 1
+JOURNAL_HEADER = struct.Struct("<4sH")
+RECORD_HEADER = struct.Struct("<II")
+
+# Campos de ConversationState que cada registro guarda completos (son chicos)
+STATE_FIELDS = (
+    "user_responses",
+    "current_question",
+    "current_question_index",
+    "needs_clarification",
+    "clarification_reason",
+    "conversation_complete",
+    "metadata"
+)
+
+
+def build_record(state: ConversationState, message_cursor: int, turn_cursor: int) -> Dict[str, Any]:
+    """
+    Arma el registro de un turno: lo agregado al estado desde los cursores.
+
+    Las preguntas y sus validadores se incluyen solo en el primer registro,
+    cuando se cargan al iniciar la conversación.
+
+    Args:
+        state (ConversationState): Estado después del turno
+        message_cursor (int): Mensajes ya registrados en el diario
+        turn_cursor (int): Turnos ya registrados en el diario
+
+    Returns:
+        Dict[str, Any]: Registro listo para `SessionJournal.append`
+    """
+    record: Dict[str, Any] = {
+        "messages": [list(message) for message in state.messages.iter_text(message_cursor)],
+        "turn_starts": state.turn_starts[turn_cursor:],
+        "state": {field: getattr(state, field) for field in STATE_FIELDS}
+    }
+    if message_cursor == 0:
+        record["pending_questions"] = state.pending_questions
+        record["question_validators"] = {
+            question: [getattr(validator, field) for field in VALIDATOR_FIELDS]
+            for question, validator in state.question_validators.items()
+        }
+    return record
+
+
+def apply_record(state: ConversationState, record: Dict[str, Any]) -> None:
+    """
+    Aplica un registro del diario sobre un estado.
+
+    Args:
+        state (ConversationState): Estado a actualizar
+        record (Dict[str, Any]): Registro producido por `build_record`
+    """
+    if "pending_questions" in record:
+        state.pending_questions = record["pending_questions"]
+        state.question_validators = {
+            question: ValidatorSpec(**dict(zip(VALIDATOR_FIELDS, values)))
+            for question, values in record["question_validators"].items()
+        }
+    state.messages.extend(record["messages"])
+    state.turn_starts.extend(record["turn_starts"])
+    for field, value in record["state"].items():
+        setattr(state, field, value)
+
+
+class SessionJournal:
+    """
+    Diario de solo agregado de una sesión, en un archivo propio.
+    """
+
+    def __init__(self, path: str, fsync: bool = True):
+        """
+        Inicializa el diario (el archivo se crea con el primer registro).
+
+        Args:
+            path (str): Ruta del archivo del diario
+            fsync (bool): Forzar cada registro a disco antes de continuar
+        """
+        self.path = path
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        # Bytes válidos del archivo (None hasta leerlo por primera vez)
+        self._length: Optional[int] = None
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """
+        Agrega un registro al final del diario.
+
+        Args:
+            record (Dict[str, Any]): Registro a guardar
+        """
+        payload = ormsgpack.packb(record)
+        frame = RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        with self._lock:
+            try:
+                if self._length is None:
+                    self._length = self._scan()[1]
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.path, "ab") as journal:
+                    if self._length == 0:
+                        journal.truncate(0)
+                        header = JOURNAL_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION)
+                        journal.write(header)
+                        self._length = len(header)
+                    elif journal.tell() != self._length:
+                        # Descartar un registro incompleto antes de seguir escribiendo
+                        journal.truncate(self._length)
+                    journal.write(frame)
+                    journal.flush()
+                    if self.fsync:
+                        os.fsync(journal.fileno())
+                self._length += len(frame)
+            except OSError as e:
+                self._length = None
+                print(f"⚠️ Error al escribir el diario de la sesión: {e}")
+
+    def _scan(self) -> Tuple[List[Dict[str, Any]], int]:
+        """Lee los registros válidos y la longitud del archivo hasta el último de ellos."""
+        try:
+            with open(self.path, "rb") as journal:
+                data = journal.read()
+        except FileNotFoundError:
+            return [], 0
+
+        if len(data) < JOURNAL_HEADER.size:
+            return [], 0
+        magic, version = JOURNAL_HEADER.unpack_from(data)
+        if magic != JOURNAL_MAGIC or version != JOURNAL_VERSION:
+            print(f"⚠️ Diario de sesión con formato no soportado: {self.path}")
+            return [], 0
+
+        records = []
+        offset = JOURNAL_HEADER.size
+        while offset + RECORD_HEADER.size <= len(data):
+            length, checksum = RECORD_HEADER.unpack_from(data, offset)
+            start = offset + RECORD_HEADER.size
+            payload = data[start:start + length]
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                break
+            records.append(ormsgpack.unpackb(payload))
+            offset = start + length
+        return records, offset
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Recorre los registros completos del diario, en orden.
+
+        Yields:
+            Dict[str, Any]: Registros de cada turno
+        """
+        with self._lock:
+            records, self._length = self._scan()
+        yield from records
+
+    def replay(self) -> Optional[ConversationState]:
+        """
+        Reconstruye el estado de la conversación aplicando el diario.
+
+        Returns:
+            Optional[ConversationState]: Estado al final del último turno completo, o None si está vacío
+        """
+        state = None
+        for record in self.records():
+            if state is None:
+                state = ConversationState()
+            apply_record(state, record)
+        return state
+
+    def rewrite(self, state: ConversationState) -> None:
+        """
+        Reemplaza el diario por un único registro con el estado completo.
+
+        Args:
+            state (ConversationState): Estado a dejar como punto de partida
+        """
+        if not len(state.messages):
+            self.clear()
+            return
+        payload = ormsgpack.packb(build_record(state, 0, 0))
+        data = (
+            JOURNAL_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION)
+            + RECORD_HEADER.pack(len(payload), zlib.crc32(payload))
+            + payload
+        )
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(tmp_path, "wb") as journal:
+                    journal.write(data)
+                    journal.flush()
+                    os.fsync(journal.fileno())
+                # Reemplazo atómico: un corte a mitad de camino deja el diario anterior
+                os.replace(tmp_path, self.path)
+                self._length = len(data)
+            except OSError as e:
+                self._length = None
+                print(f"⚠️ Error al reescribir el diario de la sesión: {e}")
+
+    def clear(self) -> None:
+        """Borra el diario (por ejemplo, al reiniciar la entrevista)."""
+        with self._lock:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            self._length = 0
+
+
+def get_session_journal(key: str) -> Optional[SessionJournal]:
+    """
+    Obtiene el diario de una sesión según SESSION_JOURNAL_CONFIG.
+
+    Args:
+        key (str): Clave de la sesión (ver `session_key`)
+
+    Returns:
+        Optional[SessionJournal]: Diario de la sesión o None si está desactivado
+    """
+    if not SESSION_JOURNAL_CONFIG["enabled"]:
+        return None
+    return SessionJournal(
+        os.path.join(SESSION_JOURNAL_CONFIG["directory"], f"{key}.journal"),
+        fsync=SESSION_JOURNAL_CONFIG["fsync"]
+    )
+
+
+def delete_session_journal(key: str) -> None:
+    """
+    Borra el diario de una sesión que salió del almacén (terminada, descartada o vencida).
+
+    Args:
+        key (str): Clave de la sesión (ver `session_key`)
+    """
+    if not SESSION_JOURNAL_CONFIG["enabled"]:
+        return
+    try:
+        os.remove(os.path.join(SESSION_JOURNAL_CONFIG["directory"], f"{key}.journal"))
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"⚠️ Error al borrar el diario de la sesión {key}: {e}")
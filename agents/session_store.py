@@ -0,0 +1,564 @@
+"""
+Almacén de sesiones de entrevista indexado por candidato.
+
+Cada pestaña del navegador ya no guarda su agente para siempre: la vista
+retira el agente del almacén al comenzar una ejecución (`checkout`) y lo
+devuelve al terminar (`checkin`). Hay dos implementaciones:
+
+- `MemorySessionStore`: LRU en memoria con TTL de inactividad. Los agentes
+  inactivos o que exceden el tamaño máximo se vuelcan (snapshot binario) al
+  almacén en disco en lugar de descartarse, y se restauran al volver.
+- `SQLiteSessionStore`: guarda solo el snapshot en SQLite; cada `checkout`
+  reconstruye el agente y cada `checkin` lo persiste.
+
+Los agentes solo necesitan `snapshot()` y `restore(data)`.
+"""
+import hashlib
+import hmac
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from agents.session_journal import delete_session_journal
+from core.rrhh_config import SESSION_STORE_CONFIG
+
+AgentFactory = Callable[[], Any]
+
+
+def _session_secret() -> bytes:
+    """
+    Secreto del servidor para firmar las claves de sesión.
+
+    Raises:
+        ValueError: Si no están configuradas ni SESSION_KEY_SECRET ni FERNET_KEY
+    """
+    secret = os.getenv("SESSION_KEY_SECRET") or os.getenv("FERNET_KEY")
+    if not secret:
+        raise ValueError("SESSION_KEY_SECRET (o FERNET_KEY) no configurada en variables de entorno")
+    return secret.encode("utf-8")
+
+
+def session_key(datos_usuario: Dict[str, Any]) -> str:
+    """
+    Calcula la clave de sesión de un candidato a partir de su token desencriptado.
+
+    La clave es un HMAC de los datos con el secreto del servidor
+    (SESSION_KEY_SECRET o, si no está, FERNET_KEY): no guarda datos
+    personales y, como la API la usa como id de sesión, no se puede calcular
+    conociendo solo el nombre, el teléfono y la oferta del candidato.
+
+    Args:
+        datos_usuario (Dict[str, Any]): Datos del token desencriptado
+
+    Returns:
+        str: Clave hexadecimal de 32 caracteres
+
+    Raises:
+        ValueError: Si no hay secreto configurado
+    """
+    canonical = json.dumps(datos_usuario, sort_keys=True, ensure_ascii=False, default=str)
+    return hmac.new(_session_secret(), canonical.encode("utf-8"), hashlib.sha256).hexdigest()[:32]
+
+
+class SessionLease:
+    """Agente retirado del almacén durante una ejecución; se puede reemplazar."""
+
+    __slots__ = ("key", "agent")
+
+    def __init__(self, key: str, agent: Any):
+        self.key = key
+        self.agent = agent
+
+
+class SessionStore(ABC):
+    """
+    Interfaz común de los almacenes de sesiones.
+    """
+
+    @abstractmethod
+    def checkout(self, key: str, factory: AgentFactory) -> Any:
+        """
+        Retira el agente de una sesión, creándolo con `factory` si no existe.
+
+        Args:
+            key (str): Clave de la sesión
+            factory (AgentFactory): Crea un agente nuevo (también se usa antes de restaurar un snapshot)
+
+        Returns:
+            Any: Agente de la sesión
+        """
+
+    @abstractmethod
+    def checkin(self, key: str, agent: Any) -> None:
+        """
+        Devuelve el agente de una sesión al almacén.
+
+        Args:
+            key (str): Clave de la sesión
+            agent (Any): Agente (puede ser otro distinto del retirado, p. ej. al reiniciar)
+        """
+
+    @abstractmethod
+    def discard(self, key: str) -> None:
+        """Elimina una sesión del almacén."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, float]:
+        """Contadores de uso del almacén."""
+
+    def close(self) -> None:
+        """Libera los recursos del almacén."""
+
+    @contextmanager
+    def session(self, key: str, factory: AgentFactory) -> Iterator[SessionLease]:
+        """
+        Retira el agente de una sesión y lo devuelve al salir, aunque haya errores.
+
+        Args:
+            key (str): Clave de la sesión
+            factory (AgentFactory): Crea un agente nuevo si la sesión no existe
+
+        Yields:
+            SessionLease: Agente retirado; asignar `lease.agent` reemplaza el de la sesión
+        """
+        lease = SessionLease(key, self.checkout(key, factory))
+        try:
+            yield lease
+        finally:
+            self.checkin(key, lease.agent)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Almacén de sesiones persistente: un snapshot binario por sesión en SQLite.
+
+    Las sesiones sin actividad durante `ttl_seconds` se borran al abrir el
+    almacén y periódicamente al escribir.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        ttl_seconds: float = 30 * 24 * 3600,
+        on_remove: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Abre (o crea) la base de sesiones.
+
+        Args:
+            db_path (str): Ruta del archivo SQLite
+            ttl_seconds (float): Tiempo sin actividad tras el que se borra una sesión
+            on_remove (Optional[Callable[[str], None]]): Se llama con la clave de cada
+                sesión descartada o vencida (por ejemplo, para borrar su diario)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.on_remove = on_remove
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._stats = {"loads": 0, "misses": 0, "saves": 0, "expired": 0}
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Varios procesos pueden compartir la base (WAL); esperar si otro está escribiendo
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sessions (
+                key TEXT PRIMARY KEY,
+                snapshot BLOB NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_sessions_updated_at ON sessions (updated_at)"
+        )
+        self._purge_expired(time.time())
+        self._conn.commit()
+
+    def load(self, key: str) -> Optional[bytes]:
+        """
+        Lee el snapshot vigente de una sesión.
+
+        Args:
+            key (str): Clave de la sesión
+
+        Returns:
+            Optional[bytes]: Snapshot del agente o None si no existe o venció
+        """
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT snapshot, updated_at FROM sessions WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"⚠️ Error al leer la sesión {key}: {e}")
+                return None
+            if row is None or row[1] + self.ttl_seconds <= time.time():
+                self._stats["misses"] += 1
+                return None
+            self._stats["loads"] += 1
+            return bytes(row[0])
+
+    def save(self, key: str, snapshot: bytes) -> None:
+        """
+        Guarda (o reemplaza) el snapshot de una sesión.
+
+        Args:
+            key (str): Clave de la sesión
+            snapshot (bytes): Snapshot del agente
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sessions (key, snapshot, updated_at) VALUES (?, ?, ?)",
+                    (key, snapshot, now)
+                )
+                self._writes += 1
+                if self._writes % 100 == 0:
+                    self._purge_expired(now)
+                self._conn.commit()
+                self._stats["saves"] += 1
+            except sqlite3.Error as e:
+                print(f"⚠️ Error al guardar la sesión {key}: {e}")
+
+    def _purge_expired(self, now: float) -> None:
+        """Borra las sesiones sin actividad durante más de `ttl_seconds`."""
+        cutoff = now - self.ttl_seconds
+        expired = []
+        if self.on_remove is not None:
+            expired = [key for (key,) in self._conn.execute(
+                "SELECT key FROM sessions WHERE updated_at <= ?", (cutoff,)
+            )]
+        self._stats["expired"] += self._conn.execute(
+            "DELETE FROM sessions WHERE updated_at <= ?", (cutoff,)
+        ).rowcount
+        for key in expired:
+            self.on_remove(key)
+
+    def checkout(self, key: str, factory: AgentFactory) -> Any:
+        """Crea el agente con `factory` y lo restaura desde el snapshot guardado, si hay."""
+        snapshot = self.load(key)
+        agent = factory()
+        if snapshot is not None:
+            agent.restore(snapshot)
+        return agent
+
+    def checkin(self, key: str, agent: Any) -> None:
+        """Guarda el snapshot del agente."""
+        self.save(key, agent.snapshot())
+
+    def discard(self, key: str) -> None:
+        """Borra el snapshot de la sesión."""
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE key = ?", (key,))
+            self._conn.commit()
+        if self.on_remove is not None:
+            self.on_remove(key)
+
+    def __len__(self) -> int:
+        """Cantidad de sesiones guardadas (incluye las vencidas aún no borradas)."""
+        with self._lock:
+            (total,) = self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()
+        return total
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Obtiene los contadores del almacén.
+
+        Returns:
+            Dict[str, float]: Lecturas, sesiones no encontradas, escrituras y vencidas
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self) -> None:
+        """Cierra la conexión a la base."""
+        with self._lock:
+            self._conn.close()
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Almacén de sesiones en memoria con LRU y TTL de inactividad.
+
+    Una sesión se retira de a una ejecución por vez: el agente no es
+    thread-safe, así que una segunda pestaña del mismo candidato espera a que
+    la primera lo devuelva. Los agentes retirados no cuentan para la
+    expulsión: solo los devueltos quedan en el LRU, ordenados por último uso.
+    Al expulsar una sesión su snapshot se vuelca en `spill` (si está
+    configurado), fuera del lock del almacén, y el agente se libera.
+    `on_remove` se llama cuando la sesión deja la memoria: al descartarla, al
+    expulsarla sin `spill` o una vez escrito su snapshot.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 500,
+        idle_ttl_seconds: float = 900.0,
+        spill: Optional[SQLiteSessionStore] = None,
+        clock: Callable[[], float] = time.monotonic,
+        checkout_timeout_seconds: float = 60.0,
+        evict_interval_seconds: Optional[float] = None,
+        on_remove: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Inicializa el almacén.
+
+        Args:
+            max_sessions (int): Máximo de agentes inactivos en memoria
+            idle_ttl_seconds (float): Inactividad tras la que un agente se expulsa
+            spill (Optional[SQLiteSessionStore]): Almacén en disco para los expulsados; None los descarta
+            clock (Callable[[], float]): Reloj monotónico (inyectable en pruebas)
+            checkout_timeout_seconds (float): Espera máxima por una sesión retirada por otra ejecución
+            evict_interval_seconds (Optional[float]): Cada cuánto expulsar las sesiones
+                inactivas en segundo plano (None solo las expulsa al usar el almacén)
+            on_remove (Optional[Callable[[str], None]]): Se llama con la clave de cada
+                sesión que deja la memoria (por ejemplo, para borrar su diario)
+        """
+        self.max_sessions = max_sessions
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.spill = spill
+        self.checkout_timeout_seconds = checkout_timeout_seconds
+        self.on_remove = on_remove
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._spill_lock = threading.Lock()
+        self._idle: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        # Sesiones retiradas; None mientras se restaura el agente desde disco
+        self._checked_out: Dict[str, Optional[Any]] = {}
+        # Expulsadas cuyo snapshot todavía no se escribió: (agente, snapshot)
+        self._spilling: Dict[str, Tuple[Any, bytes]] = {}
+        self._stats = {"hits": 0, "restored": 0, "created": 0, "evicted": 0, "spilled": 0, "waits": 0}
+        self._stopping = threading.Event()
+        self._evictor: Optional[threading.Thread] = None
+        if evict_interval_seconds:
+            self._evictor = threading.Thread(
+                target=self._evict_periodically, args=(evict_interval_seconds,), daemon=True
+            )
+            self._evictor.start()
+
+    def checkout(self, key: str, factory: AgentFactory) -> Any:
+        """
+        Retira el agente de la sesión: de memoria, del disco o creándolo.
+
+        Si otra ejecución tiene la sesión retirada, espera a que la devuelva.
+
+        Raises:
+            TimeoutError: Si la sesión sigue retirada pasados `checkout_timeout_seconds`
+        """
+        deadline = time.monotonic() + self.checkout_timeout_seconds
+        with self._lock:
+            if key in self._checked_out:
+                self._stats["waits"] += 1
+            while key in self._checked_out:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"La sesión {key} está en uso por otra ejecución")
+                self._released.wait(remaining)
+            evicted = self._evict(self._clock())
+            idle = self._idle.pop(key, None)
+            pending = self._spilling.pop(key, None)
+            agent = idle[1] if idle is not None else (pending[0] if pending is not None else None)
+            # Reservar la sesión mientras se restaura fuera del lock
+            self._checked_out[key] = agent
+            if agent is not None:
+                self._stats["hits"] += 1
+        self._spill_evicted(evicted)
+        if agent is not None:
+            return agent
+
+        try:
+            # Fuera del lock: leer de disco y construir el agente puede tardar
+            snapshot = self.spill.load(key) if self.spill is not None else None
+            agent = factory()
+            if snapshot is not None:
+                agent.restore(snapshot)
+        except BaseException:
+            with self._lock:
+                self._checked_out.pop(key, None)
+                self._released.notify_all()
+            raise
+
+        with self._lock:
+            self._checked_out[key] = agent
+            self._stats["restored" if snapshot is not None else "created"] += 1
+        return agent
+
+    def checkin(self, key: str, agent: Any) -> None:
+        """Devuelve el agente al LRU, libera la sesión y expulsa las que correspondan."""
+        with self._lock:
+            self._checked_out.pop(key, None)
+            self._idle[key] = (self._clock(), agent)
+            self._idle.move_to_end(key)
+            evicted = self._evict(self._clock())
+            self._released.notify_all()
+        self._spill_evicted(evicted)
+
+    def discard(self, key: str) -> None:
+        """Elimina la sesión de memoria y del almacén en disco."""
+        with self._lock:
+            self._idle.pop(key, None)
+            self._spilling.pop(key, None)
+            if key in self._checked_out:
+                del self._checked_out[key]
+                self._released.notify_all()
+            if self.on_remove is not None:
+                self.on_remove(key)
+        if self.spill is not None:
+            self.spill.discard(key)
+
+    def evict_idle(self) -> int:
+        """
+        Expulsa las sesiones inactivas vencidas sin esperar al próximo uso.
+
+        Returns:
+            int: Cantidad de sesiones expulsadas
+        """
+        with self._lock:
+            evicted = self._evict(self._clock())
+        self._spill_evicted(evicted)
+        return len(evicted)
+
+    def _evict_periodically(self, interval: float) -> None:
+        """Expulsa las sesiones vencidas cada `interval` segundos hasta cerrar el almacén."""
+        while not self._stopping.wait(interval):
+            try:
+                self.evict_idle()
+            except Exception as e:
+                print(f"⚠️ Error al expulsar sesiones inactivas: {e}")
+
+    def _evict(self, now: float) -> List[str]:
+        """
+        Expulsa desde el frente del LRU las sesiones vencidas y las que exceden
+        el máximo (con el lock tomado). Los snapshots se toman acá, con el agente
+        inactivo, y se escriben después con `_spill_evicted`.
+
+        Returns:
+            List[str]: Claves expulsadas
+        """
+        evicted = []
+        while self._idle:
+            key, (last_used, agent) = next(iter(self._idle.items()))
+            if len(self._idle) <= self.max_sessions and now - last_used < self.idle_ttl_seconds:
+                break
+            del self._idle[key]
+            evicted.append(key)
+            if self.spill is not None:
+                self._spilling[key] = (agent, agent.snapshot())
+            elif self.on_remove is not None:
+                self.on_remove(key)
+        self._stats["evicted"] += len(evicted)
+        return evicted
+
+    def _spill_evicted(self, keys: List[str]) -> None:
+        """
+        Escribe en disco, fuera del lock del almacén, los snapshots de las
+        sesiones expulsadas. Las que se retiraron mientras tanto se omiten:
+        el agente en memoria es la versión vigente.
+        """
+        if self.spill is None:
+            return
+        for key in keys:
+            # Las escrituras de una misma sesión no se adelantan entre sí
+            with self._spill_lock:
+                with self._lock:
+                    pending = self._spilling.get(key)
+                if pending is None:
+                    continue
+                self.spill.save(key, pending[1])
+                with self._lock:
+                    if self._spilling.get(key) is pending:
+                        del self._spilling[key]
+                        # Con el snapshot en disco el diario sobra; bajo el lock,
+                        # para no borrar el de un agente que se retiró de nuevo
+                        if self.on_remove is not None:
+                            self.on_remove(key)
+                    self._stats["spilled"] += 1
+
+    def __len__(self) -> int:
+        """Cantidad de sesiones en memoria (inactivas y retiradas)."""
+        with self._lock:
+            return len(self._idle) + len(self._checked_out) + len(self._spilling)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Obtiene los contadores del almacén.
+
+        Returns:
+            Dict[str, float]: Aciertos, restauradas, creadas, expulsadas, volcadas,
+            esperas por sesiones en uso y sesiones inactivas y activas
+        """
+        with self._lock:
+            stats: Dict[str, float] = dict(self._stats)
+            stats["idle_sessions"] = len(self._idle)
+            stats["active_sessions"] = len(self._checked_out)
+        return stats
+
+    def close(self) -> None:
+        """Vuelca todas las sesiones en memoria al almacén en disco y lo cierra."""
+        self._stopping.set()
+        if self._evictor is not None:
+            self._evictor.join()
+            self._evictor = None
+        with self._spill_lock, self._lock:
+            sessions = [(key, agent.snapshot()) for key, (_, agent) in self._idle.items()]
+            sessions += [
+                (key, agent.snapshot()) for key, agent in self._checked_out.items() if agent is not None
+            ]
+            sessions += [(key, snapshot) for key, (_, snapshot) in self._spilling.items()]
+            self._idle.clear()
+            self._checked_out.clear()
+            self._spilling.clear()
+            self._released.notify_all()
+        if self.spill is not None:
+            for key, snapshot in sessions:
+                self.spill.save(key, snapshot)
+            self.spill.close()
+
+
+_store: Optional[SessionStore] = None
+_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """
+    Obtiene el almacén de sesiones compartido por todo el proceso.
+
+    Returns:
+        SessionStore: Instancia única configurada según SESSION_STORE_CONFIG
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                sqlite_backend = SESSION_STORE_CONFIG["backend"] == "sqlite"
+                disk = SQLiteSessionStore(
+                    SESSION_STORE_CONFIG["db_path"],
+                    ttl_seconds=SESSION_STORE_CONFIG["disk_ttl_seconds"],
+                    # Con el LRU en memoria los diarios se borran al volcar la sesión
+                    on_remove=delete_session_journal if sqlite_backend else None
+                )
+                if sqlite_backend:
+                    _store = disk
+                else:
+                    _store = MemorySessionStore(
+                        max_sessions=SESSION_STORE_CONFIG["max_sessions"],
+                        idle_ttl_seconds=SESSION_STORE_CONFIG["idle_ttl_seconds"],
+                        spill=disk,
+                        checkout_timeout_seconds=SESSION_STORE_CONFIG["checkout_timeout_seconds"],
+                        evict_interval_seconds=SESSION_STORE_CONFIG["evict_interval_seconds"],
+                        on_remove=delete_session_journal
+                    )
+    return _store
@@ -1,20 +1,32 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional, Sequence
 from langchain_core.messages import HumanMessage, AIMessage
-from langchain_groq import ChatGroq
-import os
+import asyncio
+from concurrent.futures import Future
 import json
 from pathlib import Path
 from dotenv import load_dotenv
 import datetime
+import time
 
 from core.models.conversation_models import ConversationState
-from agents.tools.file_search_tool import search_questions_file_direct, save_user_responses_direct
+from core.models.message_log import TranscriptView
+from core.models.question_models import QuestionSpec, ValidatorSpec
+from agents.session_journal import SessionJournal, build_record
+from agents.tools.file_search_tool import save_user_responses_direct
+from agents.tools.question_bank import get_question_bank
 from agents.tools.email_tool import simulate_email_send_direct
+from agents.tools.answer_extractor import get_answer_extractor
+from agents.tools.response_evaluator import get_response_evaluator
+from agents.tools.speculative_evaluator import SpeculativeEvaluator
+from core.rrhh_config import SPECULATIVE_EVALUATION_CONFIG
 from utils.env_utils import load_env_variables
 
 # Cargar variables de entorno al importar el módulo
 load_env_variables()
 
+CLARIFICATION_HEADER = """Me gustaría que puedas ampliar tu respuesta anterior.
+"""
+
 
 class SimpleRRHHAgent:
     """
@@ -23,18 +35,57 @@ class SimpleRRHHAgent:
     Este agente maneja entrevistas automatizadas de manera secuencial,
     recopila respuestas, decide cuándo repreguntar y envía resúmenes por correo.
     Puede cargar preguntas específicas según el ID de vacante.
+    
+    Cada operación tiene una variante asíncrona (`astart_conversation`,
+    `aprocess_user_input`) que evalúa con `ainvoke` y ejecuta la persistencia
+    y las notificaciones fuera del event loop; las variantes sincrónicas
+    comparten con ellas toda la lógica de la conversación. `stream_user_input`
+    transmite la respuesta en fragmentos para la interfaz.
+    
+    Si un mensaje responde también preguntas posteriores, el extractor de
+    respuestas las registra (en paralelo con la evaluación) y la entrevista
+    las salta.
+    
+    Con un diario de sesión, cada turno terminado se agrega al diario y un
+    agente nuevo con el mismo diario retoma la entrevista en la pregunta
+    pendiente, sin volver a evaluar las respuestas.
     """
     
-    def __init__(self, id_job_offer: str = None):
+    def __init__(
+        self,
+        id_job_offer: str = None,
+        speculative: Optional[bool] = None,
+        journal: Optional[SessionJournal] = None
+    ):
         """
         Inicializa el agente de RRHH.
         
         Args:
             id_job_offer: ID de la oferta de trabajo para cargar preguntas específicas
+            speculative: Evaluar borradores en segundo plano (None usa SPECULATIVE_EVALUATION_CONFIG)
+            journal: Diario de la sesión; si ya tiene turnos, la entrevista se retoma desde él
         """
         self.state = ConversationState()
         self.initialized = False
         self.id_job_offer = id_job_offer
+        self.journal = journal
+        # Mensajes y turnos del estado que ya están en el diario
+        self._journal_cursor = (0, 0)
+        self.evaluator = get_response_evaluator()
+        self.extractor = get_answer_extractor()
+        # Inicio del turno en curso, para acotar la espera de la extracción
+        self._turn_started = time.monotonic()
+        
+        if speculative is None:
+            speculative = SPECULATIVE_EVALUATION_CONFIG["enabled"]
+        self.speculator: Optional[SpeculativeEvaluator] = None
+        if speculative:
+            self.speculator = SpeculativeEvaluator(
+                self.evaluator,
+                debounce_seconds=SPECULATIVE_EVALUATION_CONFIG["debounce_seconds"],
+                similarity_threshold=SPECULATIVE_EVALUATION_CONFIG["similarity_threshold"],
+                max_wait_seconds=SPECULATIVE_EVALUATION_CONFIG["max_wait_seconds"]
+            )
         
         # Guardar información de la vacante en metadatos
         if id_job_offer:
@@ -42,6 +93,27 @@ class SimpleRRHHAgent:
             print(f"🎯 Agente inicializado para oferta de trabajo: {id_job_offer}")
         else:
             print("🎯 Agente inicializado con preguntas generales")
+        
+        if journal is not None:
+            self._replay_journal()
+    
+    def _replay_journal(self) -> None:
+        """Reconstruye el estado a partir del diario de la sesión, sin llamar al LLM"""
+        state = self.journal.replay()
+        if state is None or not len(state.messages):
+            return
+        self.state = state
+        self.initialized = True
+        self.id_job_offer = state.metadata.get("id_job_offer", self.id_job_offer)
+        self._journal_cursor = (len(state.messages), len(state.turn_starts))
+        print(f"📒 Entrevista retomada desde el diario: {len(state.user_responses)} respuestas registradas")
+    
+    def _journal_turn(self) -> None:
+        """Agrega al diario lo que cambió en el turno que acaba de terminar"""
+        if self.journal is None:
+            return
+        self.journal.append(build_record(self.state, *self._journal_cursor))
+        self._journal_cursor = (len(self.state.messages), len(self.state.turn_starts))
     
     def start_conversation(self) -> str:
         """
@@ -52,13 +124,40 @@ class SimpleRRHHAgent:
         """
         print("🚀 Inicializando conversación...")
         
-        # Cargar preguntas desde archivo específico o por defecto
-        questions = search_questions_file_direct("data/questions.json", self.id_job_offer)
-        self.state.pending_questions = questions
+        # Preguntas del archivo específico o por defecto, desde el banco compartido
+        questions = get_question_bank().get("data/questions.json", self.id_job_offer)
+        return self._begin_conversation(questions)
+    
+    async def astart_conversation(self) -> str:
+        """
+        Inicia una nueva conversación sin bloquear el event loop.
+        
+        Returns:
+            Mensaje inicial del agente
+        """
+        print("🚀 Inicializando conversación...")
+        
+        questions = await asyncio.to_thread(
+            get_question_bank().get, "data/questions.json", self.id_job_offer
+        )
+        return self._begin_conversation(questions)
+    
+    def _begin_conversation(self, questions: Sequence[QuestionSpec]) -> str:
+        """
+        Prepara el estado con las preguntas cargadas y genera el saludo.
+        
+        Args:
+            questions: Preguntas de la entrevista junto con sus validadores
+        
+        Returns:
+            Mensaje inicial del agente
+        """
+        self.state.pending_questions = [question.text for question in questions]
+        self.state.question_validators = {question.text: question.validator for question in questions}
         self.state.current_question_index = 0
         
         if questions:
-            self.state.current_question = questions[0]
+            self.state.current_question = self.state.pending_questions[0]
             
             # Mensaje de bienvenida personalizado según la vacante
             welcome_content = """¡Hola! Soy el asistente de RRHH de Adaptiera. 
@@ -71,6 +170,7 @@ Responde con la mayor sinceridad posible."""
             welcome_content += "\n\nEmpecemos:"
             
             welcome_message = AIMessage(content=welcome_content)
+            self.state.begin_turn()
             self.state.messages.append(welcome_message)
             
             # Primera pregunta
@@ -78,6 +178,7 @@ Responde con la mayor sinceridad posible."""
             self.state.messages.append(question_message)
             
             self.initialized = True
+            self._journal_turn()
             return f"{welcome_message.content}\n\n{self.state.current_question}"
         
         return "¡Hola! Soy el asistente de RRHH. ¿Cómo puedo ayudarte?"
@@ -88,153 +189,387 @@ Responde con la mayor sinceridad posible."""
         
         Args:
             user_input: Mensaje del usuario
-            
+        
         Returns:
             Respuesta del agente
         """
         if not self.initialized:
             return self.start_conversation()
         
-        # Agregar mensaje del usuario al estado
+        self._record_user_message(user_input)
+        extraction = self._start_extraction(user_input)
+        
+        # Evaluar la respuesta
+        is_satisfactory, clarification_reason = self._evaluate_response(user_input)
+        
+        if not is_satisfactory:
+            self._discard_extraction(extraction)
+            return self._request_clarification(clarification_reason)
+        
+        self._accept_response(user_input)
+        if extraction is not None:
+            self._accept_extracted_answers(
+                self.extractor.collect(extraction, self._extraction_timeout())
+            )
+        save_user_responses_direct(dict(self.state.user_responses), self._response_file())
+        
+        # Avanzar a la siguiente pregunta
+        next_message = self._advance_question()
+        if next_message is not None:
+            return next_message
+        
+        email_success = simulate_email_send_direct(self.state.user_responses)
+        return self._finalize_conversation(email_success)
+    
+    async def aprocess_user_input(self, user_input: str) -> str:
+        """
+        Procesa la entrada del usuario de forma asíncrona.
+        
+        La evaluación usa `ainvoke` y el guardado de respuestas y el envío
+        del resumen se ejecutan en hilos auxiliares.
+        
+        Args:
+            user_input: Mensaje del usuario
+        
+        Returns:
+            Respuesta del agente
+        """
+        if not self.initialized:
+            return await self.astart_conversation()
+        
+        self._record_user_message(user_input)
+        extraction = self._astart_extraction(user_input)
+        
+        is_satisfactory, clarification_reason = await self._aevaluate_response(user_input)
+        
+        if not is_satisfactory:
+            self._discard_extraction(extraction)
+            return self._request_clarification(clarification_reason)
+        
+        self._accept_response(user_input)
+        if extraction is not None:
+            self._accept_extracted_answers(
+                await self.extractor.acollect(extraction, self._extraction_timeout())
+            )
+        await asyncio.to_thread(
+            save_user_responses_direct,
+            dict(self.state.user_responses),
+            self._response_file()
+        )
+        
+        next_message = self._advance_question()
+        if next_message is not None:
+            return next_message
+        
+        email_success = await asyncio.to_thread(
+            simulate_email_send_direct, dict(self.state.user_responses)
+        )
+        return self._finalize_conversation(email_success)
+    
+    def stream_user_input(self, user_input: str) -> Iterator[str]:
+        """
+        Procesa la entrada del usuario y transmite la respuesta del agente en fragmentos.
+        
+        La razón de una aclaración se transmite a medida que Groq la genera,
+        de modo que la interfaz puede mostrar el primer fragmento sin esperar
+        el turno completo. Los fragmentos concatenados equivalen a la
+        respuesta de `process_user_input`.
+        
+        Args:
+            user_input: Mensaje del usuario
+        
+        Yields:
+            Fragmentos de la respuesta del agente
+        """
+        if not self.initialized:
+            yield self.start_conversation()
+            return
+        
+        self._record_user_message(user_input)
+        extraction = self._start_extraction(user_input)
+        
+        speculative = self._resolve_speculation(user_input)
+        if speculative is not None:
+            is_satisfactory, reason = speculative
+            reason_chunks = iter([reason] if reason else [])
+        else:
+            is_satisfactory, reason_chunks = self.evaluator.stream_evaluate(
+                self.state.current_question, user_input, self._current_validator()
+            )
+        
+        if not is_satisfactory:
+            self._discard_extraction(extraction)
+            yield CLARIFICATION_HEADER
+            clarification_reason = ""
+            for chunk in reason_chunks:
+                clarification_reason += chunk
+                yield chunk
+            self._request_clarification(clarification_reason)
+            yield self._clarification_footer()
+            return
+        
+        self._accept_response(user_input)
+        if extraction is not None:
+            self._accept_extracted_answers(
+                self.extractor.collect(extraction, self._extraction_timeout())
+            )
+        save_user_responses_direct(dict(self.state.user_responses), self._response_file())
+        
+        next_message = self._advance_question()
+        if next_message is not None:
+            yield next_message
+            return
+        
+        email_success = simulate_email_send_direct(self.state.user_responses)
+        yield self._finalize_conversation(email_success)
+    
+    def _record_user_message(self, user_input: str) -> None:
+        """
+        Agrega el mensaje del usuario al historial.
+        
+        Args:
+            user_input: Mensaje del usuario
+        """
         user_message = HumanMessage(content=user_input)
+        self._turn_started = time.monotonic()
+        self.state.begin_turn()
         self.state.messages.append(user_message)
         
         print(f"🤔 Procesando respuesta del usuario: {user_input[:50]}...")
+    
+    def _accept_response(self, user_input: str) -> None:
+        """
+        Guarda una respuesta satisfactoria para la pregunta actual.
         
-        # Evaluar la respuesta
-        is_satisfactory, clarification_reason = self._evaluate_response(user_input)
+        Args:
+            user_input: Respuesta aceptada
+        """
+        self.state.user_responses[self.state.current_question] = user_input
+        self.state.needs_clarification = False
+        self.state.clarification_reason = None
+        print(f"✅ Respuesta aceptada para: {self.state.current_question}")
+    
+    def _remaining_questions(self) -> List[str]:
+        """
+        Obtiene las preguntas posteriores a la actual que aún no tienen respuesta.
+        """
+        return [
+            question
+            for question in self.state.pending_questions[self.state.current_question_index + 1:]
+            if question not in self.state.user_responses
+        ]
+    
+    def _start_extraction(self, user_input: str) -> Optional[Future]:
+        """
+        Lanza en segundo plano la extracción de respuestas a preguntas posteriores.
         
-        if is_satisfactory:
-            # Guardar respuesta satisfactoria
-            self.state.user_responses[self.state.current_question] = user_input
-            
-            # Crear nombre de archivo basado en id_job_offer
-            if self.id_job_offer:
-                response_file = f"data/user_responses_{self.id_job_offer}.json"
-            else:
-                response_file = "data/user_responses.json"
-            
-            save_user_responses_direct(self.state.user_responses, response_file)
-            self.state.needs_clarification = False
-            self.state.clarification_reason = None
-            print(f"✅ Respuesta aceptada para: {self.state.current_question}")
-            
-            # Avanzar a la siguiente pregunta
-            return self._next_question()
-        else:
-            # Solicitar aclaración
-            self.state.needs_clarification = True
-            self.state.clarification_reason = clarification_reason
-            print(f"❓ Necesita clarificación: {clarification_reason}")
-            
-            clarification_message = AIMessage(content=f"""Me gustaría que puedas ampliar tu respuesta anterior.
-{clarification_reason}
-
-Por favor, proporciona más detalles sobre: {self.state.current_question}""")
-            
-            self.state.messages.append(clarification_message)
-            return clarification_message.content
+        Returns:
+            Future con las respuestas extraídas, o None si no corresponde extraer
+        """
+        if self.extractor is None:
+            return None
+        return self.extractor.submit(
+            self.state.current_question,
+            user_input,
+            self._remaining_questions(),
+            self.state.question_validators,
+            self.evaluator.breaker
+        )
     
-    def _evaluate_response(self, user_response: str) -> tuple[bool, str]:
+    def _astart_extraction(self, user_input: str) -> Optional["asyncio.Task[Dict[str, str]]"]:
         """
-        Evalúa si la respuesta del usuario es satisfactoria.
+        Lanza la extracción como tarea del event loop, en paralelo con la evaluación.
+        
+        Returns:
+            Tarea con las respuestas extraídas, o None si no corresponde extraer
+        """
+        if self.extractor is None:
+            return None
+        pending = self._remaining_questions()
+        if not self.extractor.should_extract(user_input, pending):
+            return None
+        return asyncio.create_task(self.extractor.aextract(
+            self.state.current_question, user_input, pending, self.state.question_validators,
+            self.evaluator.breaker
+        ))
+    
+    def _extraction_timeout(self) -> Optional[float]:
         """
-        current_question = self.state.current_question
+        Tiempo que le queda al turno para esperar la extracción (None sin límite).
         
-        # Asegurar que las variables de entorno estén cargadas
-        load_env_variables()
+        Usa el presupuesto de latencia del evaluador: la extracción no puede
+        demorar el turno más que la evaluación con Groq.
+        """
+        budget = self.evaluator.turn_budget_seconds
+        if budget is None:
+            return None
+        return max(0.0, budget - (time.monotonic() - self._turn_started))
+    
+    def _discard_extraction(self, extraction: Any) -> None:
+        """
+        Descarta la extracción en curso de una respuesta que no fue aceptada.
+        """
+        if self.extractor is not None:
+            self.extractor.discard(extraction)
+    
+    def _accept_extracted_answers(self, answers: Dict[str, str]) -> None:
+        """
+        Registra las respuestas a preguntas posteriores contenidas en el mensaje.
         
-        # Configurar el LLM (Groq)
-        groq_api_key = os.getenv("GROQ_API_KEY")
-        if not groq_api_key:
-            print("⚠️ GROQ_API_KEY no configurada, usando lógica simple")
-            # Lógica simple sin LLM (más permisiva)
-            is_satisfactory = len(user_response.strip()) > 3
-            clarification_reason = "Por favor, proporciona una respuesta más detallada." if not is_satisfactory else ""
-            return is_satisfactory, clarification_reason
+        Las respuestas se mantienen en el orden del banco de preguntas.
         
-        print(f"✅ GROQ_API_KEY encontrada, usando evaluación inteligente")
+        Args:
+            answers: Fragmento de la respuesta por pregunta cubierta
+        """
+        if not answers:
+            return
+        for question, answer in answers.items():
+            print(f"✅ Respuesta extraída para: {question}")
+        responses = {**self.state.user_responses, **answers}
+        self.state.user_responses = {
+            question: responses[question]
+            for question in self.state.pending_questions
+            if question in responses
+        }
+        self.state.metadata.setdefault("extracted_questions", []).extend(answers)
+    
+    def _response_file(self) -> str:
+        """
+        Obtiene la ruta del archivo de respuestas según la oferta de trabajo.
         
-        try:
-            # Usar Groq para evaluar la respuesta
-            llm = ChatGroq(api_key=groq_api_key, model="llama-3.3-70b-versatile")
-            
-            evaluation_prompt = f"""
-            Evalúa si la siguiente respuesta es satisfactoria para la pregunta planteada:
-            
-            Pregunta: {current_question}
-            Respuesta: {user_response}
-            
-            Responde SOLO con:
-            - "SATISFACTORIA" si la respuesta proporciona información básica relevante a la pregunta
-            - "NECESITA_CLARIFICACION: [razón específica]" si la respuesta está completamente vacía, es irrelevante o muy confusa
-            
-            Sé PERMISIVO en tu evaluación. Acepta respuestas que tengan al menos alguna relación con la pregunta, 
-            incluso si son breves o no muy detalladas. Solo solicita clarificación si la respuesta realmente 
-            no tiene sentido o está completamente fuera de tema.
-            """
-            
-            # ✅ SOLUCIÓN DEFINITIVA: Manejo seguro de la respuesta
-            response = llm.invoke(evaluation_prompt)
-            
-            # Extraer contenido de forma segura - ESTO SOLUCIONA EL ERROR
-            if hasattr(response, 'content') and response.content:
-                evaluation = response.content.strip()
-            elif isinstance(response, str):
-                evaluation = response.strip()
-            else:
-                # Convertir a string de forma segura
-                evaluation = str(response).strip()
-            
-            print(f"🔍 Evaluación recibida: {evaluation}")
-            
-            if evaluation.startswith("SATISFACTORIA"):
-                return True, ""
-            elif evaluation.startswith("NECESITA_CLARIFICACION"):
-                reason = evaluation.replace("NECESITA_CLARIFICACION:", "").strip()
-                return False, reason
-            else:
-                # Si la respuesta no tiene el formato esperado, ser permisivo
-                print(f"⚠️ Formato inesperado: {evaluation}")
-                return True, ""
-                
-        except Exception as e:
-            print(f"Error al evaluar con Groq: {e}")
-            print(f"Tipo de error: {type(e)}")
-            # Fallback a lógica simple (más permisiva)
-            is_satisfactory = len(user_response.strip()) > 3
-            clarification_reason = "Por favor, proporciona una respuesta más detallada." if not is_satisfactory else ""
-            return is_satisfactory, clarification_reason
-    
-    def _next_question(self) -> str:
-        """
-        Avanza a la siguiente pregunta o finaliza la conversación.
+        Returns:
+            Ruta del archivo de respuestas
+        """
+        if self.id_job_offer:
+            return f"data/user_responses_{self.id_job_offer}.json"
+        return "data/user_responses.json"
+    
+    def _request_clarification(self, clarification_reason: str) -> str:
+        """
+        Marca la pregunta actual como pendiente de aclaración.
+        
+        Args:
+            clarification_reason: Motivo de la aclaración
+        
+        Returns:
+            Mensaje de aclaración para el usuario
+        """
+        self.state.needs_clarification = True
+        self.state.clarification_reason = clarification_reason
+        print(f"❓ Necesita clarificación: {clarification_reason}")
+        
+        clarification_message = AIMessage(
+            content=CLARIFICATION_HEADER + clarification_reason + self._clarification_footer()
+        )
+        
+        self.state.messages.append(clarification_message)
+        self._journal_turn()
+        return clarification_message.content
+    
+    def _clarification_footer(self) -> str:
+        """
+        Obtiene el cierre del mensaje de aclaración para la pregunta actual.
+        """
+        return f"""
+
+Por favor, proporciona más detalles sobre: {self.state.current_question}"""
+    
+    def submit_draft(self, draft: str) -> None:
+        """
+        Registra un borrador de la respuesta en curso para evaluarlo en segundo plano.
+        
+        No hace nada si el modo especulativo está desactivado.
+        
+        Args:
+            draft: Texto que el candidato lleva escrito
+        """
+        if self.speculator is None or self.state.current_question is None or not draft.strip():
+            return
+        self.speculator.submit_draft(self.state.current_question, draft, self._current_validator())
+    
+    def _resolve_speculation(self, user_response: str) -> Optional[tuple[bool, str]]:
+        """
+        Reutiliza el veredicto de un borrador equivalente ya evaluado, si lo hay.
+        """
+        if self.speculator is None:
+            return None
+        return self.speculator.resolve(self.state.current_question, user_response)
+    
+    def _evaluate_response(self, user_response: str) -> tuple[bool, str]:
+        """
+        Evalúa si la respuesta del usuario es satisfactoria.
+        """
+        speculative = self._resolve_speculation(user_response)
+        if speculative is not None:
+            return speculative
+        return self.evaluator.evaluate(
+            self.state.current_question, user_response, self._current_validator()
+        )
+    
+    async def _aevaluate_response(self, user_response: str) -> tuple[bool, str]:
+        """
+        Evalúa de forma asíncrona si la respuesta del usuario es satisfactoria.
+        """
+        if self.speculator is not None:
+            # resolve() puede esperar a la evaluación del borrador en curso
+            speculative = await asyncio.to_thread(self._resolve_speculation, user_response)
+            if speculative is not None:
+                return speculative
+        return await self.evaluator.aevaluate(
+            self.state.current_question, user_response, self._current_validator()
+        )
+    
+    def _current_validator(self) -> Optional[ValidatorSpec]:
+        """
+        Obtiene el validador declarado para la pregunta actual.
+        """
+        return self.state.question_validators.get(self.state.current_question)
+    
+    def _advance_question(self) -> Optional[str]:
+        """
+        Avanza a la siguiente pregunta si quedan preguntas pendientes.
         
         Returns:
-            Mensaje con la siguiente pregunta o finalización
+            Mensaje con la siguiente pregunta, o None si no quedan preguntas
         """
         print("➡️ Avanzando a la siguiente pregunta...")
         
         self.state.current_question_index += 1
         
+        # Saltar las preguntas que ya quedaron respondidas en mensajes anteriores
+        skipped = 0
+        while (
+            self.state.current_question_index < len(self.state.pending_questions)
+            and self.state.pending_questions[self.state.current_question_index] in self.state.user_responses
+        ):
+            self.state.current_question_index += 1
+            skipped += 1
+        
         if self.state.current_question_index < len(self.state.pending_questions):
             # Hay más preguntas
             self.state.current_question = self.state.pending_questions[self.state.current_question_index]
             
-            next_question_message = AIMessage(content=f"""Perfecto, gracias por tu respuesta.
+            acknowledgement = "Perfecto, gracias por tu respuesta."
+            if skipped:
+                acknowledgement += " Ya tomé nota de lo que me contaste sobre otras preguntas."
+            
+            next_question_message = AIMessage(content=f"""{acknowledgement}
 
 Siguiente pregunta:
 {self.state.current_question}""")
             
             self.state.messages.append(next_question_message)
+            self._journal_turn()
             return next_question_message.content
-        else:
-            # No hay más preguntas, finalizar conversación
-            return self._finalize_conversation()
+        
+        return None
     
-    def _finalize_conversation(self) -> str:
+    def _finalize_conversation(self, email_success: bool) -> str:
         """
-        Finaliza la conversación guardando respuestas y enviando correo.
+        Finaliza la conversación con el resultado del envío del correo.
+        
+        Args:
+            email_success: Si el resumen se envió correctamente
         
         Returns:
             Mensaje de finalización
@@ -244,9 +579,6 @@ Siguiente pregunta:
         self.state.conversation_complete = True
         self.state.current_question = None
         
-        # Enviar correo
-        email_success = simulate_email_send_direct(self.state.user_responses)
-        
         if email_success:
             final_message = AIMessage(content="""¡Muchas gracias por tu tiempo! 
 
@@ -262,6 +594,10 @@ Hubo algunos problemas técnicos al procesar tu información,
 pero nuestro equipo se pondrá en contacto contigo pronto.""")
         
         self.state.messages.append(final_message)
+        if self.journal is not None:
+            # Terminada la entrevista no hay nada que retomar: el diario se borra
+            self.journal.clear()
+            self.journal = None
         return final_message.content
     
     def is_conversation_complete(self) -> bool:
@@ -285,24 +621,99 @@ pero nuestro equipo se pondrá en contacto contigo pronto.""")
             "questions_asked": len(self.state.user_responses),
             "total_questions": len(self.state.pending_questions),
             "complete": self.state.conversation_complete,
-            "messages_count": len(self.state.messages)
+            "messages_count": len(self.state.messages),
+            "extracted_count": len(self.state.metadata.get("extracted_questions", []))
         }
     
+    def get_transcript(self) -> TranscriptView:
+        """
+        Obtiene una vista de solo lectura del historial de la conversación.
+        
+        La interfaz la recorre directamente en lugar de guardar su propia
+        copia de los mensajes.
+        
+        Returns:
+            Vista del historial con tuplas (rol, texto); los roles son human y ai
+        """
+        return TranscriptView(self.state.messages)
+    
+    def get_latest_reply(self) -> Optional[str]:
+        """
+        Obtiene la respuesta del agente en el último turno, sin recorrer el historial.
+        
+        Returns:
+            Respuesta del último turno o None si todavía no hay
+        """
+        return self.state.latest_reply()
+    
+    def get_speculation_stats(self) -> Dict[str, Any]:
+        """
+        Obtiene las métricas de la evaluación especulativa de borradores.
+        
+        Returns:
+            Diccionario con aciertos y llamadas desperdiciadas (vacío si está desactivada)
+        """
+        return self.speculator.stats() if self.speculator is not None else {}
+    
+    def snapshot(self) -> bytes:
+        """
+        Serializa la entrevista en curso para guardarla o moverla de proceso.
+        
+        Returns:
+            Estado de la conversación en formato binario (ver ConversationState.to_bytes)
+        """
+        return self.state.to_bytes()
+    
+    def restore(self, data: bytes) -> "SimpleRRHHAgent":
+        """
+        Retoma una entrevista a partir de un snapshot.
+        
+        Args:
+            data: Bytes producidos por `snapshot()`
+        
+        Returns:
+            El mismo agente, para encadenar llamadas
+        """
+        state = ConversationState.from_bytes(data)
+        journaled_turns = len(self.state.turn_starts) if self.journal is not None else 0
+        if len(state.turn_starts) < journaled_turns:
+            # El diario ya llegó más lejos que el snapshot; se conserva lo retomado
+            return self
+        self.state = state
+        self.initialized = len(self.state.messages) > 0
+        self.id_job_offer = self.state.metadata.get("id_job_offer", self.id_job_offer)
+        if self.speculator is not None:
+            self.speculator.discard()
+        if self.journal is not None:
+            if len(state.turn_starts) > journaled_turns:
+                # El snapshot tiene turnos que el diario no: el diario parte de él
+                self.journal.rewrite(self.state)
+            self._journal_cursor = (len(self.state.messages), len(self.state.turn_starts))
+        return self
+    
     def reset_conversation(self):
-        """Reinicia la conversación"""
+        """Reinicia la conversación y borra su diario"""
         self.state = ConversationState()
+        if self.id_job_offer:
+            self.state.metadata["id_job_offer"] = self.id_job_offer
         self.initialized = False
+        if self.journal is not None:
+            self.journal.clear()
+            self._journal_cursor = (0, 0)
+        if self.speculator is not None:
+            self.speculator.discard()
 
 
 # Función de conveniencia para crear una instancia del agente
-def create_simple_rrhh_agent(id_job_offer: str = None) -> SimpleRRHHAgent:
+def create_simple_rrhh_agent(id_job_offer: str = None, journal: Optional[SessionJournal] = None) -> SimpleRRHHAgent:
     """
     Crea una nueva instancia del agente de RRHH simplificado.
     
     Args:
         id_job_offer: ID de la oferta de trabajo para cargar preguntas específicas
+        journal: Diario de la sesión para registrar los turnos y retomar la entrevista
     
     Returns:
         Instancia del agente configurada
     """
-    return SimpleRRHHAgent(id_job_offer) 
\ No newline at end of file
+    return SimpleRRHHAgent(id_job_offer, journal=journal)
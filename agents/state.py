@@ -0,0 +1,24 @@
+import operator
+from typing import Any, TypedDict, Annotated
+from langchain_core.messages import BaseMessage
+from langgraph.graph.message import add_messages
+
+from core.models.question_models import ValidatorSpec
+
+
+class GraphState(TypedDict, total=False):
+    """Estado compatible con LangGraph"""
+    messages: Annotated[list[BaseMessage], add_messages]
+    # Índice en `messages` del primer mensaje de cada turno (el turno 0 es el saludo)
+    turn_starts: Annotated[list[int], operator.add]
+    pending_questions: list[str]
+    question_validators: dict[str, ValidatorSpec]
+    user_responses: dict[str, str]
+    current_question: str
+    current_question_index: int
+    needs_clarification: bool
+    clarification_reason: str
+    # La última respuesta del usuario ya fue evaluada en este turno
+    response_processed: bool
+    conversation_complete: bool
+    metadata: dict[str, Any]
@@ -0,0 +1,186 @@
+"""
+Pre-clasificador local de respuestas que evita llamadas al LLM.
+
+Puntúa cada respuesta con rasgos baratos (longitud, solapamiento léxico con
+la pregunta, proporción de palabras vacías, entropía y chequeos de idioma) y
+solo deja pasar al LLM la banda intermedia en la que no hay suficiente
+certeza.
+"""
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, NamedTuple, Optional
+
+from utils.string_utils import normalize_text
+
+SATISFACTORIA = "SATISFACTORIA"
+NECESITA_CLARIFICACION = "NECESITA_CLARIFICACION"
+
+UNREADABLE_REASON = (
+    "No pudimos entender tu respuesta. "
+    "Por favor, responde a la pregunta con tus propias palabras."
+)
+EMPTY_REASON = "La respuesta está vacía. Por favor, responde a la pregunta."
+
+STOP_WORDS = frozenset("""
+a al algo algun alguna alguno algunos ante antes aqui asi aun bien cada como
+con contra cual cuales cuando de del desde donde dos el ella ellas ellos en
+entre era es esa ese eso esta estas este esto estos fue ha hay la las le les
+lo los mas me mi mis mucho muy nada ni no nos o otra otro para pero poco por
+porque que quien se sea ser si sin sobre solo su sus tambien te tengo ti tiene
+todo tu tus un una uno unos y ya yo
+""".split())
+
+VOWELS = frozenset("aeiou")
+CONSONANT_RUN = re.compile(r"[b-df-hj-np-tv-z]{5,}")
+
+
+class Classification(NamedTuple):
+    """
+    Resultado del pre-clasificador.
+
+    `verdict` es None cuando la respuesta se escala al LLM; en ese caso
+    `confidence` es la puntuación de satisfacción estimada.
+    """
+
+    verdict: Optional[str]
+    confidence: float
+    reason: str
+
+
+def _char_entropy(text: str) -> float:
+    """Entropía de Shannon (bits) de los caracteres de un texto."""
+    counts = Counter(text)
+    total = len(text)
+    return -sum(c / total * math.log2(c / total) for c in counts.values())
+
+
+def _is_gibberish_token(token: str) -> bool:
+    """Indica si una palabra parece tecleo al azar."""
+    letters = [c for c in token if c.isalpha()]
+    if len(letters) < 5:
+        return False
+    vowel_ratio = sum(c in VOWELS for c in letters) / len(letters)
+    return (
+        vowel_ratio < 0.15
+        or CONSONANT_RUN.search(token) is not None
+        or len(set(letters)) <= 2
+    )
+
+
+class AnswerClassifier:
+    """
+    Clasificador local de respuestas con umbrales configurables.
+
+    Las respuestas con puntuación >= accept_threshold se aceptan sin LLM,
+    las vacías, ilegibles o con puntuación <= reject_threshold se rechazan,
+    y el resto se escala al LLM.
+    """
+
+    def __init__(self, accept_threshold: float = 0.85, reject_threshold: float = 0.1):
+        """
+        Inicializa el clasificador.
+
+        Args:
+            accept_threshold (float): Puntuación mínima para aceptar localmente
+            reject_threshold (float): Puntuación máxima para rechazar localmente
+        """
+        self.accept_threshold = accept_threshold
+        self.reject_threshold = reject_threshold
+        self._lock = threading.Lock()
+        self._stats = {"accepted": 0, "rejected": 0, "escalated": 0}
+
+    def score(self, question: str, answer: str) -> float:
+        """
+        Calcula la probabilidad estimada de que la respuesta sea satisfactoria.
+
+        Args:
+            question (str): Pregunta planteada al candidato
+            answer (str): Respuesta del candidato
+
+        Returns:
+            float: Puntuación entre 0 y 1
+        """
+        tokens = normalize_text(answer).split()
+        if not tokens:
+            return 0.0
+
+        content = [t for t in tokens if t not in STOP_WORDS]
+        question_content = {
+            t for t in normalize_text(question).split() if t not in STOP_WORDS
+        }
+
+        length_score = min(len(content) / 6, 1.0)
+        overlap = (
+            len(question_content.intersection(content)) / len(question_content)
+            if question_content else 0.0
+        )
+        overlap_score = min(overlap * 2, 1.0)
+        stop_ratio = 1 - len(content) / len(tokens)
+
+        letters = [c for c in "".join(tokens) if c.isalpha()]
+        alpha_ratio = len(letters) / len("".join(tokens))
+        vowel_ratio = sum(c in VOWELS for c in letters) / len(letters) if letters else 0.0
+        language_score = 1.0 if alpha_ratio >= 0.7 and 0.3 <= vowel_ratio <= 0.65 else 0.0
+
+        return (
+            0.45 * length_score
+            + 0.25 * overlap_score
+            + 0.15 * (1 - stop_ratio)
+            + 0.15 * language_score
+        )
+
+    def classify(self, question: str, answer: str) -> Classification:
+        """
+        Clasifica una respuesta o la deriva al LLM si hay dudas.
+
+        Args:
+            question (str): Pregunta planteada al candidato
+            answer (str): Respuesta del candidato
+
+        Returns:
+            Classification: Veredicto (None si se escala al LLM), confianza y razón
+        """
+        normalized = normalize_text(answer)
+        if not normalized:
+            return self._record(Classification(NECESITA_CLARIFICACION, 1.0, EMPTY_REASON))
+
+        tokens = normalized.split()
+        compact = normalized.replace(" ", "")
+        gibberish_ratio = sum(_is_gibberish_token(t) for t in tokens) / len(tokens)
+        if gibberish_ratio >= 0.5 or (len(compact) >= 6 and _char_entropy(compact) < 1.5):
+            return self._record(Classification(NECESITA_CLARIFICACION, 0.9, UNREADABLE_REASON))
+
+        score = self.score(question, answer)
+        if score >= self.accept_threshold:
+            return self._record(Classification(SATISFACTORIA, score, ""))
+        if score <= self.reject_threshold:
+            return self._record(Classification(NECESITA_CLARIFICACION, 1 - score, UNREADABLE_REASON))
+        return self._record(Classification(None, score, ""))
+
+    def _record(self, result: Classification) -> Classification:
+        """Actualiza los contadores con el resultado de una clasificación."""
+        if result.verdict == SATISFACTORIA:
+            key = "accepted"
+        elif result.verdict == NECESITA_CLARIFICACION:
+            key = "rejected"
+        else:
+            key = "escalated"
+        with self._lock:
+            self._stats[key] += 1
+        return result
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Obtiene los contadores del clasificador.
+
+        Returns:
+            Dict[str, float]: Aceptadas, rechazadas, escaladas y llamadas al LLM ahorradas
+        """
+        with self._lock:
+            stats: Dict[str, float] = dict(self._stats)
+        stats["llm_calls_saved"] = stats["accepted"] + stats["rejected"]
+        total = stats["llm_calls_saved"] + stats["escalated"]
+        stats["saved_ratio"] = stats["llm_calls_saved"] / total if total else 0.0
+        return stats
@@ -0,0 +1,443 @@
+"""
+Extracción de respuestas múltiples a partir de un solo mensaje del candidato.
+
+Los candidatos suelen responder varias preguntas a la vez ("Soy Ana López,
+trabajé cinco años en logística y manejo SQL"). El extractor pide a Groq, en
+una única llamada estructurada, qué preguntas pendientes quedan cubiertas por
+el mensaje y con qué fragmento, de modo que el agente puede registrarlas y
+saltarlas. Las respuestas extraídas pasan por el validador declarado para su
+pregunta; las que no lo superan se preguntan normalmente.
+
+La extracción se lanza en paralelo con la evaluación de la respuesta actual,
+así que no suma un viaje a Groq al turno: el agente la espera solo lo que le
+queda del presupuesto del turno y comparte el circuit breaker del evaluador.
+Si no hay API key, el mensaje es corto, el circuito está abierto, la llamada
+falla o no llega a tiempo, no se extrae nada y la entrevista sigue pregunta a
+pregunta.
+"""
+import asyncio
+import json
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional
+
+from agents.tools.model_cascade import response_text
+from agents.tools.question_validators import validate_answer
+from agents.tools.response_evaluator import get_groq_api_key
+from core.models.question_models import ValidatorSpec
+from core.rrhh_config import ANSWER_EXTRACTION_CONFIG
+from services.circuit_breaker import CircuitBreaker
+from services.llm_client import obtener_cliente_llm
+from services.llm_gateway import Admision, LLMGateway, PRIORIDAD_ENTREVISTA, obtener_gateway_llm
+
+JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def build_extraction_prompt(question: str, user_response: str, pending: List[str]) -> str:
+    """
+    Construye el prompt de extracción para las preguntas pendientes.
+
+    Args:
+        question: Pregunta que el candidato está respondiendo
+        user_response: Respuesta del candidato
+        pending: Preguntas que todavía no se hicieron
+
+    Returns:
+        Prompt para el LLM
+    """
+    numbered = "\n".join(f"{index}. {text}" for index, text in enumerate(pending, start=1))
+    return f"""
+            Un candidato respondió la siguiente pregunta de una entrevista:
+
+            Pregunta: {question}
+            Respuesta: {user_response}
+
+            Preguntas que todavía no se le hicieron:
+            {numbered}
+
+            Indica cuáles de esas preguntas ya quedan respondidas EXPLÍCITAMENTE en la respuesta.
+            Responde SOLO con un objeto JSON cuyas claves son los números de las preguntas
+            respondidas y cuyos valores son el fragmento de la respuesta que las responde,
+            por ejemplo {{"1": "trabajé cinco años en logística"}}.
+            No incluyas preguntas que solo se mencionan de forma vaga o que habría que suponer.
+            Si ninguna queda respondida, responde {{}}.
+            """
+
+
+def parse_extraction(text: str, pending: List[str]) -> Optional[Dict[str, str]]:
+    """
+    Interpreta la salida del LLM y la asocia a las preguntas pendientes.
+
+    Args:
+        text: Salida del LLM
+        pending: Preguntas pendientes en el orden en que se numeraron
+
+    Returns:
+        Respuestas por pregunta, o None si la salida está mal formada
+    """
+    match = JSON_OBJECT.search(text)
+    if match is None:
+        return None
+    try:
+        data = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(data, dict):
+        return None
+
+    answers: Dict[str, str] = {}
+    for key, value in data.items():
+        try:
+            index = int(str(key).strip().rstrip(".")) - 1
+        except ValueError:
+            continue
+        if 0 <= index < len(pending) and isinstance(value, str) and value.strip():
+            answers[pending[index]] = value.strip()
+    return answers
+
+
+class AnswerExtractor:
+    """
+    Mapea un mensaje del candidato a las preguntas pendientes que responde.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        min_words: int = 12,
+        max_questions: int = 10,
+        gateway: Optional[LLMGateway] = None
+    ):
+        """
+        Inicializa el extractor.
+
+        Args:
+            model (str): Modelo de Groq usado para la extracción
+            min_words (int): Palabras mínimas del mensaje para intentar extraer
+            max_questions (int): Máximo de preguntas pendientes incluidas en el prompt
+            gateway (Optional[LLMGateway]): Gateway de llamadas (por defecto el del proceso)
+        """
+        self.model = model
+        self.min_words = min_words
+        self.max_questions = max_questions
+        self.gateway = gateway or obtener_gateway_llm()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "calls": 0,
+            "skipped": 0,
+            "filled": 0,
+            "rejected_by_validator": 0,
+            "malformed": 0,
+            "errors": 0,
+            "circuit_open": 0,
+            "timed_out": 0,
+            "discarded": 0
+        }
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        """Incrementa un contador de forma thread-safe."""
+        with self._lock:
+            self._stats[key] += amount
+
+    def should_extract(self, user_response: str, pending: List[str]) -> bool:
+        """
+        Indica si vale la pena pedir la extracción para este mensaje.
+
+        Args:
+            user_response: Respuesta del candidato
+            pending: Preguntas pendientes
+
+        Returns:
+            bool: True si hay preguntas pendientes y el mensaje es suficientemente largo
+        """
+        if pending and len(user_response.split()) >= self.min_words:
+            return True
+        self._count("skipped")
+        return False
+
+    def _filter(
+        self,
+        answers: Dict[str, str],
+        validators: Dict[str, ValidatorSpec]
+    ) -> Dict[str, str]:
+        """Descarta las respuestas extraídas que su validador rechaza."""
+        accepted = {}
+        for question, answer in answers.items():
+            verdict = validate_answer(validators.get(question), answer)
+            if verdict is not None and not verdict[0]:
+                self._count("rejected_by_validator")
+                continue
+            accepted[question] = answer
+        self._count("filled", len(accepted))
+        return accepted
+
+    def _handle_output(
+        self,
+        response: Any,
+        pending: List[str],
+        validators: Dict[str, ValidatorSpec]
+    ) -> Dict[str, str]:
+        """Interpreta y valida la salida del LLM."""
+        answers = parse_extraction(response_text(response), pending)
+        if answers is None:
+            self._count("malformed")
+            print("⚠️ Extracción con formato inesperado, se ignora")
+            return {}
+        return self._filter(answers, validators)
+
+    def extract(
+        self,
+        question: str,
+        user_response: str,
+        pending: List[str],
+        validators: Dict[str, ValidatorSpec],
+        breaker: Optional[CircuitBreaker] = None
+    ) -> Dict[str, str]:
+        """
+        Extrae las respuestas a preguntas pendientes contenidas en el mensaje.
+
+        Args:
+            question: Pregunta que el candidato está respondiendo
+            user_response: Respuesta del candidato
+            pending: Preguntas pendientes (sin la actual)
+            validators: Validadores declarados por pregunta
+            breaker: Circuit breaker de Groq a consultar e informar (None sin breaker)
+
+        Returns:
+            Dict[str, str]: Respuesta extraída por pregunta (vacío si no hay ninguna)
+        """
+        pending = pending[:self.max_questions]
+        if not self.should_extract(user_response, pending):
+            return {}
+        return self._call(question, user_response, pending, validators, breaker)
+
+    def _prepare(self, breaker: Optional[CircuitBreaker]) -> Optional[str]:
+        """API key de Groq si se puede llamar: hay key y el circuito lo permite."""
+        groq_api_key = get_groq_api_key()
+        if not groq_api_key:
+            self._count("skipped")
+            return None
+        if breaker is not None and not breaker.allow_request():
+            self._count("circuit_open")
+            return None
+        self._count("calls")
+        return groq_api_key
+
+    def _failed(
+        self,
+        error: BaseException,
+        breaker: Optional[CircuitBreaker],
+        admission: Admision
+    ) -> Dict[str, str]:
+        """Informa el error al breaker (si la llamada llegó a Groq) y no extrae nada."""
+        if breaker is not None:
+            if admission.admitida:
+                breaker.record_failure()
+            else:
+                breaker.release_probe()
+        self._count("errors")
+        print(f"⚠️ Error en la extracción de respuestas: {error}")
+        return {}
+
+    def _call(
+        self,
+        question: str,
+        user_response: str,
+        pending: List[str],
+        validators: Dict[str, ValidatorSpec],
+        breaker: Optional[CircuitBreaker] = None
+    ) -> Dict[str, str]:
+        """Llama a Groq para un mensaje que ya pasó el filtro de longitud."""
+        groq_api_key = self._prepare(breaker)
+        if groq_api_key is None:
+            return {}
+
+        admission = Admision()
+        try:
+            llm = obtener_cliente_llm(groq_api_key, self.model)
+            response = self.gateway.invoke(
+                llm,
+                build_extraction_prompt(question, user_response, pending),
+                self.model,
+                PRIORIDAD_ENTREVISTA,
+                admission
+            )
+        except Exception as e:
+            return self._failed(e, breaker, admission)
+        if breaker is not None:
+            breaker.record_success(admission.duracion())
+        return self._handle_output(response, pending, validators)
+
+    async def aextract(
+        self,
+        question: str,
+        user_response: str,
+        pending: List[str],
+        validators: Dict[str, ValidatorSpec],
+        breaker: Optional[CircuitBreaker] = None
+    ) -> Dict[str, str]:
+        """
+        Variante asíncrona de `extract`.
+
+        Args:
+            question: Pregunta que el candidato está respondiendo
+            user_response: Respuesta del candidato
+            pending: Preguntas pendientes (sin la actual)
+            validators: Validadores declarados por pregunta
+            breaker: Circuit breaker de Groq a consultar e informar (None sin breaker)
+
+        Returns:
+            Dict[str, str]: Respuesta extraída por pregunta (vacío si no hay ninguna)
+        """
+        pending = pending[:self.max_questions]
+        if not self.should_extract(user_response, pending):
+            return {}
+        groq_api_key = self._prepare(breaker)
+        if groq_api_key is None:
+            return {}
+
+        admission = Admision()
+        try:
+            llm = obtener_cliente_llm(groq_api_key, self.model)
+            response = await self.gateway.ainvoke(
+                llm,
+                build_extraction_prompt(question, user_response, pending),
+                self.model,
+                PRIORIDAD_ENTREVISTA,
+                admission
+            )
+        except asyncio.CancelledError:
+            # Descartada o sin tiempo: el resultado de Groq ya no se sabrá
+            if breaker is not None:
+                breaker.release_probe()
+            raise
+        except Exception as e:
+            return self._failed(e, breaker, admission)
+        if breaker is not None:
+            breaker.record_success(admission.duracion())
+        return self._handle_output(response, pending, validators)
+
+    def submit(
+        self,
+        question: str,
+        user_response: str,
+        pending: List[str],
+        validators: Dict[str, ValidatorSpec],
+        breaker: Optional[CircuitBreaker] = None
+    ) -> Optional["Future[Dict[str, str]]"]:
+        """
+        Lanza la extracción en segundo plano, para solaparla con la evaluación.
+
+        Args:
+            question: Pregunta que el candidato está respondiendo
+            user_response: Respuesta del candidato
+            pending: Preguntas pendientes (sin la actual)
+            validators: Validadores declarados por pregunta
+            breaker: Circuit breaker de Groq a consultar e informar (None sin breaker)
+
+        Returns:
+            Future con las respuestas extraídas, o None si el mensaje no lo amerita
+        """
+        pending = pending[:self.max_questions]
+        if not self.should_extract(user_response, pending):
+            return None
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=4, thread_name_prefix="extraccion-groq"
+                    )
+        return self._executor.submit(self._call, question, user_response, pending, validators, breaker)
+
+    def collect(self, extraction: "Future[Dict[str, str]]", timeout: Optional[float]) -> Dict[str, str]:
+        """
+        Espera el resultado de una extracción lanzada con `submit`.
+
+        Args:
+            extraction: Future devuelto por `submit`
+            timeout: Segundos máximos de espera (None sin límite)
+
+        Returns:
+            Dict[str, str]: Respuestas extraídas, o vacío si no llegaron a tiempo
+        """
+        try:
+            return extraction.result(timeout=timeout)
+        except FutureTimeoutError:
+            # La llamada sigue en su hilo e informa al breaker cuando termine
+            extraction.cancel()
+            self._count("timed_out")
+            print("⏱️ La extracción de respuestas no llegó dentro del presupuesto del turno, se ignora")
+            return {}
+
+    async def acollect(
+        self,
+        extraction: "asyncio.Task[Dict[str, str]]",
+        timeout: Optional[float]
+    ) -> Dict[str, str]:
+        """
+        Variante asíncrona de `collect` para la tarea de `aextract`.
+
+        Args:
+            extraction: Tarea con la extracción
+            timeout: Segundos máximos de espera (None sin límite)
+
+        Returns:
+            Dict[str, str]: Respuestas extraídas, o vacío si no llegaron a tiempo
+        """
+        try:
+            return await asyncio.wait_for(extraction, timeout=timeout)
+        except asyncio.TimeoutError:
+            self._count("timed_out")
+            print("⏱️ La extracción de respuestas no llegó dentro del presupuesto del turno, se ignora")
+            return {}
+
+    def discard(self, extraction: Any) -> None:
+        """
+        Descarta una extracción en curso porque la respuesta actual no fue aceptada.
+
+        Args:
+            extraction: Future o tarea devuelta al lanzar la extracción
+        """
+        if extraction is not None:
+            extraction.cancel()
+            self._count("discarded")
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Obtiene los contadores de la extracción.
+
+        Returns:
+            Dict[str, int]: Llamadas, mensajes sin extracción, preguntas completadas,
+            respuestas rechazadas por validador, salidas mal formadas, errores,
+            llamadas evitadas por el circuito abierto, extracciones que no llegaron
+            a tiempo y extracciones descartadas
+        """
+        with self._lock:
+            return dict(self._stats)
+
+
+_extractor: Optional[AnswerExtractor] = None
+_extractor_lock = threading.Lock()
+
+
+def get_answer_extractor() -> Optional[AnswerExtractor]:
+    """
+    Obtiene el extractor compartido por todo el proceso.
+
+    Returns:
+        Instancia única configurada según ANSWER_EXTRACTION_CONFIG, o None si está desactivado
+    """
+    global _extractor
+    if not ANSWER_EXTRACTION_CONFIG["enabled"]:
+        return None
+    if _extractor is None:
+        with _extractor_lock:
+            if _extractor is None:
+                _extractor = AnswerExtractor(
+                    model=ANSWER_EXTRACTION_CONFIG["model"],
+                    min_words=ANSWER_EXTRACTION_CONFIG["min_words"],
+                    max_questions=ANSWER_EXTRACTION_CONFIG["max_questions"]
+                )
+    return _extractor
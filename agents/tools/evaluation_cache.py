@@ -0,0 +1,273 @@
+"""
+Caché de evaluaciones de respuestas indexada por pregunta y respuesta normalizada.
+
+Combina un LRU en memoria con un nivel persistente en SQLite. Ambos niveles
+respetan un TTL y un tamaño máximo; las entradas más antiguas se expulsan
+primero.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from utils.string_utils import normalize_text
+
+Evaluation = Tuple[bool, str]
+
+
+def question_id(question: str) -> str:
+    """
+    Calcula un identificador estable para el texto de una pregunta.
+
+    Args:
+        question (str): Texto de la pregunta
+
+    Returns:
+        str: Identificador hexadecimal de 16 caracteres
+    """
+    normalized = normalize_text(question or "")
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def cache_key(question: str, answer: str) -> str:
+    """
+    Construye la clave de caché para una pregunta y una respuesta.
+
+    Args:
+        question (str): Texto de la pregunta
+        answer (str): Respuesta del candidato
+
+    Returns:
+        str: Clave compuesta por el id de la pregunta y la respuesta normalizada
+    """
+    return f"{question_id(question)}:{normalize_text(answer)}"
+
+
+class EvaluationCache:
+    """
+    Caché de dos niveles (memoria LRU + SQLite) para evaluaciones del LLM.
+
+    Es segura para usarse desde varios hilos y lleva contadores de aciertos
+    y fallos para poder ajustar su tamaño y TTL.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        memory_max_entries: int = 2048,
+        disk_max_entries: int = 100000,
+        ttl_seconds: float = 7 * 24 * 3600
+    ):
+        """
+        Inicializa la caché.
+
+        Args:
+            db_path (Optional[str]): Ruta del archivo SQLite; None desactiva el nivel en disco
+            memory_max_entries (int): Máximo de entradas en memoria
+            disk_max_entries (int): Máximo de entradas en disco
+            ttl_seconds (float): Tiempo de vida de cada entrada en segundos
+        """
+        self.memory_max_entries = memory_max_entries
+        self.disk_max_entries = disk_max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._memory: "OrderedDict[str, Tuple[float, bool, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0
+        }
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_writes = 0
+
+        if db_path:
+            self._open_disk_tier(db_path)
+
+    def _open_disk_tier(self, db_path: str) -> None:
+        """
+        Abre (o crea) la base SQLite del nivel persistente.
+
+        Args:
+            db_path (str): Ruta del archivo SQLite
+        """
+        try:
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS evaluations (
+                    key TEXT PRIMARY KEY,
+                    satisfactory INTEGER NOT NULL,
+                    reason TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_evaluations_last_access "
+                "ON evaluations (last_access)"
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ No se pudo abrir la caché de evaluaciones en disco: {e}")
+            self._conn = None
+
+    def get(self, question: str, answer: str) -> Optional[Evaluation]:
+        """
+        Busca la evaluación de una respuesta en memoria y luego en disco.
+
+        Args:
+            question (str): Texto de la pregunta
+            answer (str): Respuesta del candidato
+
+        Returns:
+            Optional[Evaluation]: Tupla (es satisfactoria, razón) o None si no está
+        """
+        key = cache_key(question, answer)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, satisfactory, reason = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return satisfactory, reason
+                del self._memory[key]
+
+            result = self._get_from_disk(key, now)
+            if result is None:
+                self._stats["misses"] += 1
+                return None
+
+            created_at, satisfactory, reason = result
+            self._stats["disk_hits"] += 1
+            self._store_in_memory(key, created_at + self.ttl_seconds, satisfactory, reason)
+            return satisfactory, reason
+
+    def set(self, question: str, answer: str, evaluation: Evaluation) -> None:
+        """
+        Guarda la evaluación de una respuesta en ambos niveles.
+
+        Args:
+            question (str): Texto de la pregunta
+            answer (str): Respuesta del candidato
+            evaluation (Evaluation): Tupla (es satisfactoria, razón)
+        """
+        key = cache_key(question, answer)
+        satisfactory, reason = evaluation
+        now = time.time()
+
+        with self._lock:
+            self._stats["stores"] += 1
+            self._store_in_memory(key, now + self.ttl_seconds, satisfactory, reason or "")
+            self._store_on_disk(key, satisfactory, reason or "", now)
+
+    def _store_in_memory(self, key: str, expires_at: float, satisfactory: bool, reason: str) -> None:
+        """Inserta una entrada en el LRU en memoria expulsando la más antigua si hace falta."""
+        self._memory[key] = (expires_at, satisfactory, reason)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_max_entries:
+            self._memory.popitem(last=False)
+            self._stats["memory_evictions"] += 1
+
+    def _get_from_disk(self, key: str, now: float) -> Optional[Tuple[float, bool, str]]:
+        """Lee una entrada vigente del nivel en disco y actualiza su último acceso."""
+        if self._conn is None:
+            return None
+        try:
+            row = self._conn.execute(
+                "SELECT created_at, satisfactory, reason FROM evaluations WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            created_at, satisfactory, reason = row
+            if created_at + self.ttl_seconds <= now:
+                self._conn.execute("DELETE FROM evaluations WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE evaluations SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            return created_at, bool(satisfactory), reason
+        except sqlite3.Error as e:
+            print(f"⚠️ Error al leer la caché de evaluaciones: {e}")
+            return None
+
+    def _store_on_disk(self, key: str, satisfactory: bool, reason: str, now: float) -> None:
+        """Escribe una entrada en disco y aplica la expulsión periódicamente."""
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO evaluations "
+                "(key, satisfactory, reason, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, int(satisfactory), reason, now, now)
+            )
+            self._disk_writes += 1
+            if self._disk_writes % 100 == 0:
+                self._evict_disk(now)
+            self._conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Error al escribir la caché de evaluaciones: {e}")
+
+    def _evict_disk(self, now: float) -> None:
+        """Borra las entradas vencidas y las menos usadas que exceden el tamaño máximo."""
+        expired = self._conn.execute(
+            "DELETE FROM evaluations WHERE created_at <= ?", (now - self.ttl_seconds,)
+        ).rowcount
+        (total,) = self._conn.execute("SELECT COUNT(*) FROM evaluations").fetchone()
+        excess = total - self.disk_max_entries
+        overflow = 0
+        if excess > 0:
+            overflow = self._conn.execute(
+                "DELETE FROM evaluations WHERE key IN "
+                "(SELECT key FROM evaluations ORDER BY last_access LIMIT ?)",
+                (excess,)
+            ).rowcount
+        self._stats["disk_evictions"] += expired + overflow
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Obtiene los contadores de uso de la caché.
+
+        Returns:
+            Dict[str, float]: Aciertos, fallos, expulsiones, tamaño y tasa de acierto
+        """
+        with self._lock:
+            stats: Dict[str, float] = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        stats["hit_rate"] = hits / lookups if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        """Vacía ambos niveles de la caché."""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM evaluations")
+                self._conn.commit()
+
+    def close(self) -> None:
+        """Cierra la conexión con el nivel en disco."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -1,9 +1,12 @@
 import os
 import json
-from typing import List, Dict, Any
+from typing import List, Dict
 from langchain_core.tools import tool
 import datetime
 
+from core.models.question_models import QuestionSpec
+from agents.tools.question_bank import get_question_bank
+
 
 @tool
 def search_questions_file(file_path: str = "data/questions.json", id_job_offer: str = None) -> List[str]:
@@ -17,54 +20,27 @@ def search_questions_file(file_path: str = "data/questions.json", id_job_offer:
     Returns:
         Lista de preguntas a realizar al usuario
     """
-    try:
-        # Si se proporciona id_job_offer, buscar archivo específico
-        if id_job_offer:
-            # Construir ruta específica para la oferta de trabajo
-            base_dir = os.path.dirname(file_path) if file_path else "data"
-            specific_file = os.path.join(base_dir, f"questions_{id_job_offer}.json")
-            
-            print(f"🔍 Buscando preguntas para oferta de trabajo: {id_job_offer}")
-            print(f"📁 Archivo esperado: {specific_file}")
-            
-            # Intentar cargar archivo específico de la oferta de trabajo
-            if os.path.exists(specific_file):
-                print(f"✅ Encontrado archivo específico: {specific_file}")
-                with open(specific_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    
-                if isinstance(data, dict) and "questions" in data:
-                    print(f"📋 Cargadas {len(data['questions'])} preguntas para oferta de trabajo {id_job_offer}")
-                    return data["questions"]
-                elif isinstance(data, list):
-                    print(f"📋 Cargadas {len(data)} preguntas para oferta de trabajo {id_job_offer}")
-                    return data
-            else:
-                print(f"⚠️ No se encontró archivo específico para oferta de trabajo {id_job_offer}")
-                print(f"🔄 Intentando cargar archivo por defecto...")
-        
-        # Cargar archivo por defecto si no hay id_job_offer o no existe el específico
-        default_file = file_path if file_path else "data/questions.json"
-        
-        # Verificar si el archivo por defecto existe
-        if not os.path.exists(default_file):
-            print(f"❌ No se encontró archivo de preguntas: {default_file}")
-            raise FileNotFoundError(f"Archivo de preguntas no encontrado: {default_file}")
+    return [question.text for question in search_question_specs_direct(file_path, id_job_offer)]
+
+
+def search_question_specs_direct(file_path: str = "data/questions.json", id_job_offer: str = None) -> List[QuestionSpec]:
+    """
+    Carga las preguntas junto con sus validadores según el id_job_offer.
+    
+    Usa el archivo `questions_{id_job_offer}.json` del mismo directorio que
+    file_path o, si no existe, file_path. Las preguntas salen del banco en
+    memoria (ver agents/tools/question_bank.py), que solo relee el archivo
+    cuando cambia.
+    
+    Args:
+        file_path: Ruta base del archivo de preguntas
+        id_job_offer: ID de la oferta de trabajo para seleccionar el archivo específico
         
-        # Cargar preguntas del archivo por defecto
-        print(f"📂 Cargando archivo por defecto: {default_file}")
-        with open(default_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            
-        if isinstance(data, dict) and "questions" in data:
-            print(f"📋 Cargadas {len(data['questions'])} preguntas del archivo por defecto")
-            return data["questions"]
-        elif isinstance(data, list):
-            print(f"📋 Cargadas {len(data)} preguntas del archivo por defecto")
-            return data
-        else:
-            raise ValueError("Formato de archivo no válido")
-            
+    Returns:
+        Lista de preguntas con su validador
+    """
+    try:
+        return list(get_question_bank().get(file_path, id_job_offer))
     except Exception as e:
         print(f"❌ Error al cargar preguntas: {e}")
         raise e
@@ -0,0 +1,348 @@
+"""
+Cascada de modelos de Groq para evaluar respuestas.
+
+La evaluación se pide primero al modelo más rápido de la lista; solo si su
+salida está mal formada, declara poca confianza o (según la configuración)
+rechaza la respuesta, se vuelve a preguntar al siguiente modelo. El último
+modelo de la cascada decide siempre, con la interpretación permisiva de
+`parse_evaluation`. Con un solo modelo, la cascada equivale a una llamada
+directa. Todas las llamadas pasan por el gateway LLM del proceso.
+"""
+import re
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from agents.tools.evaluation_cache import Evaluation
+from services.llm_client import obtener_cliente_llm
+from services.llm_gateway import Admision, LLMGateway, PRIORIDAD_ENTREVISTA, obtener_gateway_llm
+
+CONFIDENCE_INSTRUCTION = """
+            Añade en una segunda línea "CONFIANZA: [número entre 0 y 1]" indicando
+            qué tan seguro estás de tu evaluación.
+            """
+
+CONFIDENCE = re.compile(r"CONFIANZA\s*:\s*([0-9]+(?:[.,][0-9]+)?)", re.IGNORECASE)
+
+ESCALATION_REASONS = ("malformed", "low_confidence", "rejection", "error")
+
+
+def response_text(response: Any) -> str:
+    """
+    Extrae el texto de la respuesta del LLM de forma segura.
+
+    Args:
+        response: Respuesta devuelta por el LLM
+
+    Returns:
+        Texto de la respuesta sin espacios al inicio ni al final
+    """
+    if hasattr(response, 'content') and response.content:
+        return response.content.strip()
+    if isinstance(response, str):
+        return response.strip()
+    return str(response).strip()
+
+
+def parse_evaluation(response: Any) -> Evaluation:
+    """
+    Interpreta la respuesta del LLM de forma segura.
+
+    Args:
+        response: Respuesta devuelta por el LLM
+
+    Returns:
+        Tupla (es satisfactoria, razón de la aclaración)
+    """
+    evaluation = response_text(response)
+
+    print(f"🔍 Evaluación recibida: {evaluation}")
+
+    if evaluation.startswith("SATISFACTORIA"):
+        return True, ""
+    elif evaluation.startswith("NECESITA_CLARIFICACION"):
+        reason = evaluation.replace("NECESITA_CLARIFICACION:", "").strip()
+        return False, reason
+    else:
+        # Si la respuesta no tiene el formato esperado, ser permisivo
+        print(f"⚠️ Formato inesperado: {evaluation}")
+        return True, ""
+
+
+def format_evaluation(evaluation: Evaluation) -> str:
+    """
+    Convierte una evaluación al formato de texto que devuelve el LLM.
+
+    Args:
+        evaluation: Tupla (es satisfactoria, razón de la aclaración)
+
+    Returns:
+        "SATISFACTORIA" o "NECESITA_CLARIFICACION: [razón]"
+    """
+    is_satisfactory, reason = evaluation
+    if is_satisfactory:
+        return "SATISFACTORIA"
+    return f"NECESITA_CLARIFICACION: {reason}"
+
+
+def parse_tier_output(text: str) -> Optional[Tuple[Evaluation, Optional[float]]]:
+    """
+    Interpreta la salida de un modelo intermedio de la cascada.
+
+    Args:
+        text: Texto devuelto por el modelo
+
+    Returns:
+        Tupla (evaluación, confianza) o None si la salida está mal formada.
+        La confianza es None cuando el modelo no la declaró.
+    """
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    if not lines:
+        return None
+
+    verdict = lines[0]
+    if verdict.startswith("SATISFACTORIA"):
+        evaluation: Evaluation = (True, "")
+    elif verdict.startswith("NECESITA_CLARIFICACION"):
+        evaluation = (False, verdict.replace("NECESITA_CLARIFICACION:", "").strip())
+    else:
+        return None
+
+    match = CONFIDENCE.search(text)
+    if match is None:
+        return evaluation, None
+    confidence = float(match.group(1).replace(",", "."))
+    # Algunos modelos responden en porcentaje
+    if confidence > 1:
+        confidence /= 100
+    return evaluation, confidence
+
+
+class ModelCascade:
+    """
+    Ejecuta la evaluación sobre una lista de modelos ordenada de más rápido a
+    más capaz y cuenta, por modelo, las llamadas y los escalados.
+    """
+
+    def __init__(
+        self,
+        models: List[str],
+        min_confidence: float = 0.8,
+        escalate_on_rejection: bool = True,
+        gateway: Optional[LLMGateway] = None
+    ):
+        """
+        Inicializa la cascada.
+
+        Args:
+            models (List[str]): Modelos en orden de escalado
+            min_confidence (float): Confianza mínima para aceptar la salida de un modelo intermedio
+            escalate_on_rejection (bool): Si los rechazos de un modelo intermedio se confirman con el siguiente
+            gateway (Optional[LLMGateway]): Gateway de llamadas (por defecto el del proceso)
+        """
+        if not models:
+            raise ValueError("La cascada necesita al menos un modelo")
+        self.models = list(models)
+        self.min_confidence = min_confidence
+        self.escalate_on_rejection = escalate_on_rejection
+        self.gateway = gateway or obtener_gateway_llm()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {
+            model: {"calls": 0, "answered": 0, "escalated": 0, **{r: 0 for r in ESCALATION_REASONS}}
+            for model in self.models
+        }
+
+    def build_prompt(self, prompt: str, final: bool) -> str:
+        """
+        Adapta el prompt de evaluación al nivel de la cascada.
+
+        Los modelos intermedios deben declarar su confianza; el último modelo
+        recibe el prompt original.
+
+        Args:
+            prompt (str): Prompt de evaluación
+            final (bool): Si el prompt va al último modelo de la cascada
+
+        Returns:
+            str: Prompt a enviar
+        """
+        if final:
+            return prompt
+        return prompt + CONFIDENCE_INSTRUCTION
+
+    def _escalation_reason(self, text: str) -> Tuple[Optional[Evaluation], Optional[str]]:
+        """
+        Decide si la salida de un modelo intermedio se acepta o se escala.
+
+        Returns:
+            Tupla (evaluación aceptada o None, motivo del escalado o None)
+        """
+        parsed = parse_tier_output(text)
+        if parsed is None:
+            return None, "malformed"
+        evaluation, confidence = parsed
+        if confidence is None or confidence < self.min_confidence:
+            return None, "low_confidence"
+        if not evaluation[0] and self.escalate_on_rejection:
+            return None, "rejection"
+        return evaluation, None
+
+    def _record(self, model: str, key: str) -> None:
+        """Actualiza los contadores de un modelo."""
+        with self._lock:
+            counters = self._stats[model]
+            counters[key] += 1
+            if key in ESCALATION_REASONS:
+                counters["escalated"] += 1
+
+    def invoke(
+        self,
+        prompt: str,
+        api_key: str,
+        priority: int = PRIORIDAD_ENTREVISTA,
+        admission: Optional[Admision] = None
+    ) -> Evaluation:
+        """
+        Evalúa el prompt recorriendo la cascada.
+
+        Args:
+            prompt (str): Prompt de evaluación
+            api_key (str): API key de Groq
+            priority (int): Prioridad de las llamadas en el gateway
+            admission (Optional[Admision]): Registra el primer turno concedido por el gateway
+
+        Returns:
+            Tupla (es satisfactoria, razón de la aclaración)
+
+        Raises:
+            Exception: El error del último modelo si también falla
+        """
+        for index, model in enumerate(self.models):
+            final = index == len(self.models) - 1
+            self._record(model, "calls")
+            try:
+                llm = obtener_cliente_llm(api_key, model)
+                response = self.gateway.invoke(llm, self.build_prompt(prompt, final), model, priority, admission)
+            except Exception as e:
+                if final:
+                    raise
+                print(f"⚠️ Error con el modelo {model}, escalando: {e}")
+                self._record(model, "error")
+                continue
+            result = self._accept(model, response, final)
+            if result is not None:
+                return result
+        raise RuntimeError("La cascada terminó sin veredicto")  # pragma: no cover
+
+    async def ainvoke(
+        self,
+        prompt: str,
+        api_key: str,
+        priority: int = PRIORIDAD_ENTREVISTA,
+        admission: Optional[Admision] = None
+    ) -> Evaluation:
+        """
+        Evalúa el prompt recorriendo la cascada de forma asíncrona.
+
+        Args:
+            prompt (str): Prompt de evaluación
+            api_key (str): API key de Groq
+            priority (int): Prioridad de las llamadas en el gateway
+            admission (Optional[Admision]): Registra el primer turno concedido por el gateway
+
+        Returns:
+            Tupla (es satisfactoria, razón de la aclaración)
+
+        Raises:
+            Exception: El error del último modelo si también falla
+        """
+        for index, model in enumerate(self.models):
+            final = index == len(self.models) - 1
+            self._record(model, "calls")
+            try:
+                llm = obtener_cliente_llm(api_key, model)
+                response = await self.gateway.ainvoke(
+                    llm, self.build_prompt(prompt, final), model, priority, admission
+                )
+            except Exception as e:
+                if final:
+                    raise
+                print(f"⚠️ Error con el modelo {model}, escalando: {e}")
+                self._record(model, "error")
+                continue
+            result = self._accept(model, response, final)
+            if result is not None:
+                return result
+        raise RuntimeError("La cascada terminó sin veredicto")  # pragma: no cover
+
+    def stream(
+        self,
+        prompt: str,
+        api_key: str,
+        priority: int = PRIORIDAD_ENTREVISTA,
+        admission: Optional[Admision] = None
+    ) -> Iterator[str]:
+        """
+        Evalúa el prompt recorriendo la cascada y devuelve el texto en fragmentos.
+
+        Los modelos intermedios responden completos (su salida hay que
+        validarla antes de aceptarla); solo el último modelo se transmite en
+        streaming a medida que genera la respuesta.
+
+        Args:
+            prompt (str): Prompt de evaluación
+            api_key (str): API key de Groq
+            priority (int): Prioridad de las llamadas en el gateway
+            admission (Optional[Admision]): Registra el primer turno concedido por el gateway
+
+        Yields:
+            str: Fragmentos de la respuesta en el formato del prompt de evaluación
+
+        Raises:
+            Exception: El error del último modelo si también falla
+        """
+        for index, model in enumerate(self.models):
+            final = index == len(self.models) - 1
+            self._record(model, "calls")
+            llm = obtener_cliente_llm(api_key, model)
+            if final:
+                yield from self.gateway.stream(llm, self.build_prompt(prompt, final), model, priority, admission)
+                self._record(model, "answered")
+                return
+            try:
+                response = self.gateway.invoke(llm, self.build_prompt(prompt, final), model, priority, admission)
+            except Exception as e:
+                print(f"⚠️ Error con el modelo {model}, escalando: {e}")
+                self._record(model, "error")
+                continue
+            result = self._accept(model, response, final)
+            if result is not None:
+                yield format_evaluation(result)
+                return
+
+    def _accept(self, model: str, response: Any, final: bool) -> Optional[Evaluation]:
+        """
+        Acepta la salida de un modelo o registra su escalado.
+
+        Returns:
+            La evaluación aceptada o None si hay que escalar
+        """
+        if final:
+            self._record(model, "answered")
+            return parse_evaluation(response)
+        evaluation, reason = self._escalation_reason(response_text(response))
+        if reason is not None:
+            print(f"↗️ Escalando evaluación desde {model}: {reason}")
+            self._record(model, reason)
+            return None
+        self._record(model, "answered")
+        return evaluation
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Obtiene los contadores por modelo.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Llamadas, respuestas aceptadas y escalados por motivo
+        """
+        with self._lock:
+            return {model: dict(counters) for model, counters in self._stats.items()}
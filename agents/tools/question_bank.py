@@ -0,0 +1,315 @@
+"""
+Banco de preguntas en memoria, compartido por todo el proceso.
+
+Cada oferta de trabajo se resuelve a su archivo `questions_{id}.json` (o al
+archivo por defecto si no existe) y las preguntas se guardan como tuplas
+inmutables de QuestionSpec: todas las sesiones comparten los mismos objetos.
+En cada consulta solo se hace `os.stat` del archivo; se vuelve a cargar
+únicamente cuando cambian su fecha de modificación o su tamaño. Si hay un
+índice compilado (ver question_index.py) y la firma del archivo coincide con
+la indexada, las preguntas salen del índice sin parsear el JSON.
+
+Con un observador de archivos activo sobre el directorio (ver
+question_watcher.py) ni siquiera se hace `os.stat`: el observador recarga y
+valida los archivos que cambian y reemplaza la entrada de forma atómica. Las
+sesiones en curso conservan la tupla que ya tenían.
+
+Los ids de oferta llegan del cliente, así que la caché tiene un máximo de
+entradas y descarta las menos usadas.
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from pydantic import ValidationError
+
+from core.models.question_models import QuestionSpec
+from core.rrhh_config import QUESTION_BANK_CONFIG
+
+if TYPE_CHECKING:
+    from agents.tools.question_index import QuestionIndex
+
+QuestionSet = Tuple[QuestionSpec, ...]
+
+DEFAULT_QUESTIONS_FILE = "data/questions.json"
+
+
+class _Entry(NamedTuple):
+    """Preguntas cargadas para una oferta junto con la firma del archivo de origen."""
+    path: str
+    signature: Tuple[int, int]
+    questions: QuestionSet
+
+
+def _signature(stat: os.stat_result) -> Tuple[int, int]:
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def parse_question_specs(data: Any) -> List[QuestionSpec]:
+    """
+    Convierte el contenido de un archivo de preguntas en preguntas con validador.
+    
+    Acepta el formato antiguo (lista de textos) y el nuevo, en el que cada
+    pregunta puede ser un objeto {"text": ..., "validator": ...}.
+    
+    Args:
+        data: Contenido JSON del archivo de preguntas
+        
+    Returns:
+        Lista de preguntas con su validador
+        
+    Raises:
+        ValueError: Si el formato del archivo no es válido
+    """
+    if isinstance(data, dict) and "questions" in data:
+        raw_questions = data["questions"]
+    elif isinstance(data, list):
+        raw_questions = data
+    else:
+        raise ValueError("Formato de archivo no válido")
+    
+    try:
+        return [QuestionSpec.from_raw(raw) for raw in raw_questions]
+    except ValidationError as e:
+        raise ValueError(f"Pregunta con formato no válido: {e}") from e
+
+
+def load_question_file(path: str) -> QuestionSet:
+    """
+    Lee y valida un archivo de preguntas.
+
+    Args:
+        path (str): Ruta del archivo JSON
+
+    Returns:
+        QuestionSet: Preguntas con su validador
+
+    Raises:
+        ValueError: Si el formato del archivo no es válido
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return tuple(parse_question_specs(json.load(f)))
+
+
+class QuestionBank:
+    """
+    Caché de preguntas por oferta de trabajo con invalidación por mtime y tamaño.
+
+    Es segura para usarse desde varios hilos, guarda como máximo
+    `max_entries` ofertas (LRU) y lleva contadores de aciertos y recargas.
+    """
+
+    def __init__(self, index: Optional["QuestionIndex"] = None, max_entries: int = 256):
+        """
+        Inicializa el banco vacío (las preguntas se cargan a demanda).
+
+        Args:
+            index (Optional[QuestionIndex]): Índice compilado del directorio de preguntas
+            max_entries (int): Máximo de ofertas en caché
+        """
+        self.index = index
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, Optional[str]], _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+        self.index_loads = 0
+        self.reloads = 0
+        self.evictions = 0
+        # Directorios con un observador de archivos activo
+        self._watched: Set[str] = set()
+
+    @staticmethod
+    def _candidates(file_path: str, id_job_offer: Optional[str]) -> Tuple[str, ...]:
+        """Archivos a probar en orden: el de la oferta y luego el por defecto."""
+        default_file = os.path.abspath(file_path or DEFAULT_QUESTIONS_FILE)
+        if not id_job_offer:
+            return (default_file,)
+        specific_file = os.path.join(os.path.dirname(default_file), f"questions_{id_job_offer}.json")
+        return (specific_file, default_file)
+
+    def get(self, file_path: str = DEFAULT_QUESTIONS_FILE, id_job_offer: Optional[str] = None) -> QuestionSet:
+        """
+        Obtiene las preguntas de una oferta de trabajo.
+
+        Args:
+            file_path (str): Archivo de preguntas por defecto; los de cada oferta
+                se buscan en su mismo directorio
+            id_job_offer (Optional[str]): ID de la oferta de trabajo
+
+        Returns:
+            QuestionSet: Preguntas compartidas (no se deben modificar)
+
+        Raises:
+            FileNotFoundError: Si no existe ni el archivo de la oferta ni el por defecto
+            ValueError: Si el archivo tiene un formato no válido
+        """
+        id_job_offer = str(id_job_offer) if id_job_offer else None
+        candidates = self._candidates(file_path, id_job_offer)
+        key = (candidates[-1], id_job_offer)
+        if os.path.dirname(candidates[-1]) in self._watched:
+            # El observador mantiene la entrada al día: no hace falta mirar el disco
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._hit(key)
+                    return entry.questions
+        return self._lookup(key, *self._locate(candidates))
+
+    @staticmethod
+    def _locate(candidates: Tuple[str, ...]) -> Tuple[str, Tuple[int, int]]:
+        """Primer archivo existente entre los candidatos, con su firma."""
+        for path in candidates:
+            try:
+                return path, _signature(os.stat(path))
+            except FileNotFoundError:
+                continue
+
+        print(f"❌ No se encontró archivo de preguntas: {candidates[-1]}")
+        raise FileNotFoundError(f"Archivo de preguntas no encontrado: {candidates[-1]}")
+
+    def _lookup(
+        self, key: Tuple[str, Optional[str]], path: str, signature: Tuple[int, int], reload: bool = False
+    ) -> QuestionSet:
+        """Devuelve la entrada en caché si sigue vigente o recarga el archivo."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.path == path and entry.signature == signature:
+                self._hit(key)
+                return entry.questions
+            questions = self._from_index(key, path, signature)
+            if questions is not None:
+                self._store(key, _Entry(path, signature, questions), reload)
+                self.index_loads += 1
+                return questions
+            questions = load_question_file(path)
+            self._store(key, _Entry(path, signature, questions), reload)
+            self.loads += 1
+
+        id_job_offer = key[1]
+        if id_job_offer and path == key[0]:
+            print(f"⚠️ No se encontró archivo específico para oferta de trabajo {id_job_offer}; se usa {path}")
+        print(f"📋 Cargadas {len(questions)} preguntas desde {path}")
+        return questions
+
+    def _hit(self, key: Tuple[str, Optional[str]]) -> None:
+        """Cuenta un acierto y marca la oferta como usada recién (con el lock tomado)."""
+        self.hits += 1
+        self._entries.move_to_end(key)
+
+    def _store(self, key: Tuple[str, Optional[str]], entry: _Entry, reload: bool = False) -> None:
+        """Guarda una entrada y descarta las menos usadas si se supera el máximo (con el lock tomado)."""
+        if reload:
+            self.reloads += 1
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _from_index(self, key: Tuple[str, Optional[str]], path: str, signature: Tuple[int, int]) -> Optional[QuestionSet]:
+        """Preguntas del índice si el archivo no cambió desde que se compiló."""
+        if self.index is None or os.path.dirname(path) != self.index.directory:
+            return None
+        entry = self.index.get(key[1] if path != key[0] else "")
+        if entry is None or entry.source != os.path.basename(path) or entry.signature != signature:
+            return None
+        return entry.specs
+
+    def watch(self, directory: str) -> None:
+        """
+        Indica que un observador avisa los cambios de un directorio vía `refresh`.
+
+        Args:
+            directory (str): Directorio de los archivos de preguntas
+        """
+        self._watched.add(os.path.abspath(directory))
+
+    def unwatch(self, directory: str) -> None:
+        """Vuelve a comprobar los archivos del directorio en cada consulta."""
+        self._watched.discard(os.path.abspath(directory))
+
+    def refresh(self, path: str) -> int:
+        """
+        Recarga las ofertas afectadas por un archivo que cambió, se creó o se borró.
+
+        Si el archivo nuevo no es válido se mantiene la versión anterior: las
+        sesiones nuevas no reciben un banco de preguntas roto.
+
+        Args:
+            path (str): Archivo de preguntas modificado
+
+        Returns:
+            int: Ofertas cuyas preguntas cambiaron
+        """
+        path = os.path.abspath(path)
+        changed = 0
+        with self._lock:
+            entries = list(self._entries.items())
+        for key, entry in entries:
+            candidates = self._candidates(*key)
+            if path != entry.path and path not in candidates:
+                continue
+            try:
+                questions = self._lookup(key, *self._locate(candidates), reload=True)
+            except FileNotFoundError:
+                with self._lock:
+                    self._entries.pop(key, None)
+                    self.reloads += 1
+                changed += 1
+                continue
+            except (OSError, ValueError) as e:
+                print(f"❌ Archivo de preguntas no válido, se mantiene la versión anterior: {path}: {e}")
+                continue
+            if questions is not entry.questions:
+                changed += 1
+        return changed
+
+    def invalidate(self) -> None:
+        """Descarta todas las preguntas en caché."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Contadores del banco.
+
+        Returns:
+            Dict[str, int]: Ofertas en caché, aciertos, cargas desde el JSON y desde
+            el índice, recargas por cambios avisados por el observador y ofertas
+            descartadas por el máximo de entradas
+        """
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "loads": self.loads,
+            "index_loads": self.index_loads,
+            "reloads": self.reloads,
+            "evictions": self.evictions
+        }
+
+
+_question_bank: Optional[QuestionBank] = None
+_question_bank_lock = threading.Lock()
+
+
+def get_question_bank() -> QuestionBank:
+    """
+    Obtiene el banco de preguntas compartido por todo el proceso.
+
+    Returns:
+        QuestionBank: Instancia única, con el índice compilado si existe
+    """
+    global _question_bank
+    if _question_bank is None:
+        with _question_bank_lock:
+            if _question_bank is None:
+                # Importación diferida: question_index depende de este módulo
+                from agents.tools.question_index import get_question_index
+
+                _question_bank = QuestionBank(
+                    get_question_index(), max_entries=QUESTION_BANK_CONFIG["max_entries"]
+                )
+    return _question_bank
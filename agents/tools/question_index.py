@@ -0,0 +1,272 @@
+"""
+Índice compilado del banco de preguntas de todas las ofertas de trabajo.
+
+`python -m agents.tools.question_index` recorre `data/questions.json` y
+`data/questions_{id}.json`, valida cada archivo y los compila en un único
+artefacto (`data/questions.idx`). Al abrirlo se lee solo la tabla de
+offsets, y la búsqueda por id de oferta es un acceso a diccionario más la
+decodificación de ese bloque, sin abrir ni parsear archivos JSON.
+
+Cada pregunta lleva un id estable (el mismo `question_id` que usa la caché de
+evaluaciones) y un hash de su contenido (texto + validador); cada oferta
+lleva además el hash del conjunto, para detectar cambios entre versiones del
+banco.
+
+Formato del archivo: cabecera fija (firma, versión, offset y largo de la
+tabla), los bloques msgpack de cada oferta uno detrás de otro y al final la
+tabla msgpack {id de oferta: [offset, largo, archivo, mtime_ns, tamaño, hash]}.
+El archivo por defecto se guarda con el id de oferta "".
+"""
+import argparse
+import hashlib
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import ormsgpack
+
+from agents.tools.evaluation_cache import question_id
+from agents.tools.question_bank import QuestionSet, load_question_file
+from core.models.conversation_models import VALIDATOR_FIELDS
+from core.models.question_models import QuestionSpec, ValidatorSpec
+from core.rrhh_config import QUESTION_INDEX_CONFIG
+
+INDEX_MAGIC = b"ADQI"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct("<4sHQI")
+
+# Archivos de preguntas: questions.json (por defecto) y questions_{id}.json
+QUESTION_FILE_PATTERN = re.compile(r"questions(?:_(.+))?\.json")
+
+
+def content_hash(spec: QuestionSpec) -> str:
+    """
+    Calcula el hash del contenido de una pregunta (texto y validador).
+
+    Args:
+        spec (QuestionSpec): Pregunta
+
+    Returns:
+        str: Hash hexadecimal de 16 caracteres
+    """
+    payload = ormsgpack.packb([spec.text, [getattr(spec.validator, field) for field in VALIDATOR_FIELDS]])
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+class IndexedQuestion(NamedTuple):
+    """Pregunta del índice con su id estable y el hash de su contenido."""
+    question_id: str
+    content_hash: str
+    spec: QuestionSpec
+
+
+class IndexEntry(NamedTuple):
+    """Preguntas de una oferta en el índice junto con los datos de su archivo de origen."""
+    source: str
+    signature: Tuple[int, int]
+    set_hash: str
+    questions: Tuple[IndexedQuestion, ...]
+
+    @property
+    def specs(self) -> QuestionSet:
+        """Preguntas en el formato del banco de preguntas."""
+        return tuple(question.spec for question in self.questions)
+
+
+def build_question_index(data_dir: str = "data", output_path: Optional[str] = None) -> Dict[str, int]:
+    """
+    Compila todos los archivos de preguntas de un directorio en un índice.
+
+    Los archivos con formato no válido se informan y se omiten: el banco de
+    preguntas los sigue leyendo desde disco (y reporta el error) si se piden.
+
+    Args:
+        data_dir (str): Directorio con questions.json y questions_{id}.json
+        output_path (Optional[str]): Ruta del índice (por defecto, questions.idx en data_dir)
+
+    Returns:
+        Dict[str, int]: Ofertas indexadas, preguntas y archivos omitidos
+    """
+    output_path = output_path or os.path.join(data_dir, "questions.idx")
+    table: Dict[str, list] = {}
+    blocks: List[bytes] = []
+    offset = INDEX_HEADER.size
+    questions_count = skipped = 0
+
+    for name in sorted(os.listdir(data_dir)):
+        match = QUESTION_FILE_PATTERN.fullmatch(name)
+        if match is None:
+            continue
+        path = os.path.join(data_dir, name)
+        stat = os.stat(path)
+        try:
+            specs = load_question_file(path)
+        except ValueError as e:
+            print(f"⚠️ Se omite {path}: {e}")
+            skipped += 1
+            continue
+
+        records = []
+        hashes = []
+        for spec in specs:
+            digest = content_hash(spec)
+            hashes.append(digest)
+            records.append([
+                question_id(spec.text),
+                digest,
+                spec.text,
+                [getattr(spec.validator, field) for field in VALIDATOR_FIELDS]
+            ])
+        block = ormsgpack.packb(records)
+        set_hash = hashlib.sha256("".join(hashes).encode("ascii")).hexdigest()[:16]
+        table[match.group(1) or ""] = [offset, len(block), name, stat.st_mtime_ns, stat.st_size, set_hash]
+        blocks.append(block)
+        offset += len(block)
+        questions_count += len(specs)
+
+    table_bytes = ormsgpack.packb(table)
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, offset, len(table_bytes)))
+        for block in blocks:
+            f.write(block)
+        f.write(table_bytes)
+        f.flush()
+        os.fsync(f.fileno())
+    # Reemplazo atómico: quien tenga abierto el índice anterior sigue leyéndolo
+    os.replace(tmp_path, output_path)
+    return {"offers": len(table), "questions": questions_count, "skipped": skipped}
+
+
+class QuestionIndex:
+    """
+    Índice compilado abierto en modo solo lectura (mmap).
+
+    Es seguro para usarse desde varios hilos: el archivo no cambia mientras
+    está abierto (las recompilaciones lo reemplazan con otro archivo).
+    """
+
+    def __init__(self, path: str):
+        """
+        Abre el índice y carga su tabla de offsets.
+
+        Args:
+            path (str): Ruta del índice
+
+        Raises:
+            ValueError: Si el archivo no es un índice válido
+        """
+        self.path = os.path.abspath(path)
+        self.directory = os.path.dirname(self.path)
+        with open(self.path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._data) < INDEX_HEADER.size:
+            raise ValueError(f"Índice de preguntas truncado: {path}")
+        magic, version, table_offset, table_length = INDEX_HEADER.unpack_from(self._data)
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"El archivo no es un índice de preguntas: {path}")
+        if version != INDEX_VERSION:
+            raise ValueError(f"Versión de índice no soportada: {version}")
+        if table_offset + table_length > len(self._data):
+            raise ValueError(f"Índice de preguntas truncado: {path}")
+        self._table: Dict[str, list] = ormsgpack.unpackb(self._data[table_offset:table_offset + table_length])
+        # Los validadores se repiten mucho entre ofertas: se construyen una vez
+        self._validators: Dict[tuple, ValidatorSpec] = {}
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __contains__(self, id_job_offer: str) -> bool:
+        return id_job_offer in self._table
+
+    def offers(self) -> List[str]:
+        """Ids de las ofertas indexadas ("" es el archivo por defecto)."""
+        return list(self._table)
+
+    def get(self, id_job_offer: str) -> Optional[IndexEntry]:
+        """
+        Obtiene las preguntas de una oferta.
+
+        Args:
+            id_job_offer (str): ID de la oferta ("" para el archivo por defecto)
+
+        Returns:
+            Optional[IndexEntry]: Preguntas de la oferta, o None si no está indexada
+        """
+        row = self._table.get(id_job_offer)
+        if row is None:
+            return None
+        offset, length, source, mtime_ns, size, set_hash = row
+        questions = tuple(
+            IndexedQuestion(
+                qid, digest, QuestionSpec.model_construct(text=text, validator=self._validator(validator))
+            )
+            for qid, digest, text, validator in ormsgpack.unpackb(self._data[offset:offset + length])
+        )
+        return IndexEntry(source, (mtime_ns, size), set_hash, questions)
+
+    def _validator(self, values: List[Any]) -> ValidatorSpec:
+        """Validador compartido para los valores indexados (ya validados al compilar)."""
+        key = tuple(values)
+        validator = self._validators.get(key)
+        if validator is None:
+            validator = self._validators.setdefault(
+                key, ValidatorSpec.model_construct(**dict(zip(VALIDATOR_FIELDS, values)))
+            )
+        return validator
+
+    def close(self) -> None:
+        """Libera el mapeo del archivo."""
+        self._data.close()
+
+
+_question_index: Optional[QuestionIndex] = None
+_question_index_loaded = False
+_question_index_lock = threading.Lock()
+
+
+def get_question_index() -> Optional[QuestionIndex]:
+    """
+    Abre (una sola vez por proceso) el índice configurado en QUESTION_INDEX_CONFIG.
+
+    Returns:
+        Optional[QuestionIndex]: Índice abierto, o None si está desactivado,
+        no se compiló o no se puede leer
+    """
+    global _question_index, _question_index_loaded
+    if not _question_index_loaded:
+        with _question_index_lock:
+            if not _question_index_loaded:
+                path = QUESTION_INDEX_CONFIG["path"]
+                if QUESTION_INDEX_CONFIG["enabled"] and os.path.exists(path):
+                    try:
+                        _question_index = QuestionIndex(path)
+                        print(f"🗂️ Índice de preguntas abierto: {len(_question_index)} ofertas")
+                    except (OSError, ValueError) as e:
+                        print(f"⚠️ No se pudo abrir el índice de preguntas: {e}")
+                _question_index_loaded = True
+    return _question_index
+
+
+def main() -> None:
+    """Compila el índice desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Compila los archivos de preguntas en un índice")
+    parser.add_argument("--data-dir", default=os.path.dirname(QUESTION_INDEX_CONFIG["path"]) or ".")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    result = build_question_index(args.data_dir, args.output)
+    elapsed = time.perf_counter() - started
+    print(
+        f"✅ Índice compilado: {result['offers']} ofertas, {result['questions']} preguntas, "
+        f"{result['skipped']} archivos omitidos ({elapsed:.2f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
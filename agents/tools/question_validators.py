@@ -0,0 +1,170 @@
+"""
+Validadores baratos por pregunta declarados en el banco de preguntas.
+
+Cada validador devuelve un veredicto (es satisfactoria, razón) cuando puede
+decidir por sí mismo, o None cuando la respuesta debe evaluarse con el LLM.
+"""
+import re
+import threading
+from typing import Dict, List, Optional
+
+from agents.tools.evaluation_cache import Evaluation
+from core.models.question_models import ValidatorSpec
+from utils.string_utils import normalize_text
+
+NAME_WORD = re.compile(r"^[^\W\d_]+(?:['’\-][^\W\d_]+)*$")
+NAME_PREFIX = re.compile(r"^(?:me llamo|mi nombre (?:completo )?es|soy)\s+", re.IGNORECASE)
+NUMBER = re.compile(r"(\d+(?:[.,]\d+)*)\s*(k|mill(?:ón|on|ones)|mil|m)?\b", re.IGNORECASE)
+DECIMAL_PART = re.compile(r"[.,](\d{1,2})$")
+MULTIPLIERS = {"k": 1e3, "mil": 1e3, "m": 1e6, "millon": 1e6, "millones": 1e6}
+
+YES_WORDS = frozenset([
+    "si", "sip", "claro", "obvio", "afirmativo", "correcto", "yes", "dale", "ok"
+])
+NO_WORDS = frozenset(["no", "nop", "nunca", "negativo", "ninguna", "ninguno", "nada"])
+
+DEFAULT_REASONS = {
+    "name": "Por favor, indica tu nombre y apellido.",
+    "numeric_range": "El valor indicado no parece estar en un rango válido. ¿Podrías confirmarlo?",
+    "regex": "La respuesta no tiene el formato esperado. ¿Podrías revisarla?",
+    "yes_no": "Por favor, responde con un sí o un no."
+}
+
+
+def _parse_numbers(answer: str) -> List[float]:
+    """
+    Extrae los valores numéricos de una respuesta ("1.500.000", "$1,500.50", "50k", "1 millón").
+
+    El separador decimal es el último punto o coma seguido de uno o dos
+    dígitos; los demás separadores se toman como separadores de miles.
+
+    Args:
+        answer: Respuesta del candidato
+
+    Returns:
+        Lista de números encontrados
+    """
+    values = []
+    for digits, suffix in NUMBER.findall(answer):
+        decimal = DECIMAL_PART.search(digits)
+        if decimal:
+            digits = re.sub(r"[.,]", "", digits[:decimal.start()]) + "." + decimal.group(1)
+        else:
+            digits = re.sub(r"[.,]", "", digits)
+        try:
+            value = float(digits)
+        except ValueError:
+            continue
+        if suffix:
+            value *= MULTIPLIERS[suffix.lower().replace("ó", "o")]
+        values.append(value)
+    return values
+
+
+def _validate_name(answer: str) -> Optional[bool]:
+    """
+    Valida un nombre completo.
+
+    Devuelve None (decide el LLM) para frases largas, respuestas con dígitos,
+    que pueden responder varias preguntas a la vez ("Juan Pérez, 5 años"), y
+    nombres con partículas de una letra ("María José de la O").
+    """
+    words = NAME_PREFIX.sub("", answer.rstrip(".")).replace(",", " ").split()
+    if len(words) > 6 or any(char.isdigit() for char in answer):
+        return None
+    if len(words) < 2 or not all(NAME_WORD.match(word) for word in words):
+        return False
+    if any(len(word) < 2 for word in words):
+        return None
+    return True
+
+
+def _validate_numeric_range(spec: ValidatorSpec, answer: str) -> Optional[bool]:
+    """Valida que algún número de la respuesta esté en el rango; None si no hay números."""
+    values = _parse_numbers(answer)
+    if not values:
+        return None
+    low = spec.min if spec.min is not None else float("-inf")
+    high = spec.max if spec.max is not None else float("inf")
+    return any(low <= value <= high for value in values)
+
+
+def _validate_yes_no(answer: str) -> bool:
+    """Indica si la respuesta contiene un sí o un no explícito."""
+    words = set(normalize_text(answer).split())
+    return bool(words & YES_WORDS or words & NO_WORDS)
+
+
+def validate_answer(spec: Optional[ValidatorSpec], answer: str) -> Optional[Evaluation]:
+    """
+    Aplica el validador declarado para la pregunta.
+
+    Args:
+        spec: Validador de la pregunta (None equivale a texto libre)
+        answer: Respuesta del candidato
+
+    Returns:
+        Tupla (es satisfactoria, razón) o None si hay que evaluar con el LLM
+    """
+    if spec is None or spec.type == "free_text":
+        return None
+
+    answer = answer.strip()
+    if spec.type == "name":
+        is_valid: Optional[bool] = _validate_name(answer)
+    elif spec.type == "numeric_range":
+        is_valid = _validate_numeric_range(spec, answer)
+    elif spec.type == "regex":
+        is_valid = bool(spec.pattern) and re.search(spec.pattern, answer) is not None
+    elif spec.type == "yes_no":
+        is_valid = _validate_yes_no(answer)
+    else:
+        return None
+
+    if is_valid is None:
+        return None
+    if is_valid:
+        return True, ""
+    return False, spec.message or DEFAULT_REASONS[spec.type]
+
+
+class QuestionValidatorStage:
+    """
+    Etapa del evaluador que aplica los validadores y cuenta sus resultados.
+    """
+
+    def __init__(self):
+        """Inicializa los contadores por tipo de validador."""
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def evaluate(self, spec: Optional[ValidatorSpec], answer: str) -> Optional[Evaluation]:
+        """
+        Valida una respuesta y registra si se resolvió sin LLM.
+
+        Args:
+            spec: Validador de la pregunta
+            answer: Respuesta del candidato
+
+        Returns:
+            Tupla (es satisfactoria, razón) o None si hay que evaluar con el LLM
+        """
+        result = validate_answer(spec, answer)
+        validator_type = spec.type if spec is not None else "free_text"
+        outcome = "escalated" if result is None else ("accepted" if result[0] else "rejected")
+        with self._lock:
+            counters = self._stats.setdefault(
+                validator_type, {"accepted": 0, "rejected": 0, "escalated": 0}
+            )
+            counters[outcome] += 1
+        return result
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Obtiene los contadores por tipo de validador.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Aceptadas, rechazadas y escaladas por tipo
+        """
+        with self._lock:
+            return {key: dict(value) for key, value in self._stats.items()}
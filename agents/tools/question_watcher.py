@@ -0,0 +1,176 @@
+"""
+Observador de los archivos de preguntas para recargarlos sin reiniciar la app.
+
+Los reclutadores editan `data/questions_*.json` durante una campaña. El
+observador avisa al banco de preguntas cada archivo que cambia, se crea o se
+borra, y el banco lo valida y reemplaza la entrada de forma atómica (ver
+`QuestionBank.refresh`). Mientras está activo, el banco deja de consultar el
+disco en cada inicio de entrevista.
+
+Usa inotify (a través de watchdog, que se instala con Streamlit) y, si no
+está disponible, un hilo que revisa el directorio cada
+`QUESTION_WATCH_CONFIG["poll_interval_seconds"]`.
+"""
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from agents.tools.question_bank import DEFAULT_QUESTIONS_FILE, QuestionBank, get_question_bank
+from agents.tools.question_index import QUESTION_FILE_PATTERN
+from core.rrhh_config import QUESTION_WATCH_CONFIG
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+
+class _EventHandler(FileSystemEventHandler):
+    """Traduce los eventos de watchdog a llamadas del observador."""
+
+    def __init__(self, watcher: "QuestionFileWatcher"):
+        self.watcher = watcher
+
+    def on_any_event(self, event) -> None:
+        if event.is_directory or event.event_type in ("opened", "closed_no_write"):
+            return
+        self.watcher.notify(event.src_path)
+        # Los editores suelen guardar en un temporal y renombrarlo
+        if getattr(event, "dest_path", ""):
+            self.watcher.notify(event.dest_path)
+
+
+class QuestionFileWatcher:
+    """
+    Observa un directorio de archivos de preguntas y avisa los cambios al banco.
+    """
+
+    def __init__(
+        self,
+        bank: QuestionBank,
+        directory: str = "data",
+        poll_interval: float = QUESTION_WATCH_CONFIG["poll_interval_seconds"],
+        use_inotify: bool = QUESTION_WATCH_CONFIG["use_inotify"]
+    ):
+        """
+        Inicializa el observador (empieza a observar con `start()`).
+
+        Args:
+            bank (QuestionBank): Banco de preguntas a mantener al día
+            directory (str): Directorio de los archivos de preguntas
+            poll_interval (float): Segundos entre revisiones en modo sondeo
+            use_inotify (bool): Usar inotify (watchdog) si está disponible
+        """
+        self.bank = bank
+        self.directory = os.path.abspath(directory)
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify and Observer is not None
+        self._observer = None
+        self._poller: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    @property
+    def backend(self) -> str:
+        """Mecanismo en uso: "inotify" o "polling"."""
+        return "inotify" if self.use_inotify else "polling"
+
+    def notify(self, path: str) -> None:
+        """
+        Avisa al banco que un archivo cambió (se ignoran los que no son de preguntas).
+
+        Args:
+            path (str): Archivo modificado, creado o borrado
+        """
+        if os.path.dirname(os.path.abspath(path)) != self.directory:
+            return
+        if QUESTION_FILE_PATTERN.fullmatch(os.path.basename(path)) is None:
+            return
+        if self.bank.refresh(path):
+            print(f"🔄 Preguntas recargadas desde {path}")
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """Firma (mtime_ns, tamaño) de cada archivo de preguntas del directorio."""
+        files = {}
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return files
+        for entry in entries:
+            if QUESTION_FILE_PATTERN.fullmatch(entry.name) is None:
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def _poll(self, previous: Dict[str, Tuple[int, int]]) -> None:
+        """Revisa el directorio periódicamente y avisa los archivos que cambiaron."""
+        while not self._stopping.wait(self.poll_interval):
+            current = self._snapshot()
+            for path in previous.keys() | current.keys():
+                if previous.get(path) != current.get(path):
+                    self.notify(path)
+            previous = current
+
+    def start(self) -> None:
+        """Empieza a observar el directorio y marca sus archivos como observados en el banco."""
+        if self.use_inotify:
+            observer = Observer()
+            observer.daemon = True
+            observer.schedule(_EventHandler(self), self.directory, recursive=False)
+            observer.start()
+            self._observer = observer
+        else:
+            # La primera foto se toma antes de volver, para no perder cambios inmediatos
+            self._poller = threading.Thread(target=self._poll, args=(self._snapshot(),), daemon=True)
+            self._poller.start()
+        # Recién ahora el banco deja de comprobar el disco; lo cargado antes de
+        # observar se descarta para no servir una versión que ya cambió
+        self.bank.watch(self.directory)
+        self.bank.invalidate()
+        print(f"👀 Observando archivos de preguntas en {self.directory} ({self.backend})")
+
+    def stop(self) -> None:
+        """Deja de observar; el banco vuelve a comprobar los archivos en cada consulta."""
+        self.bank.unwatch(self.directory)
+        self._stopping.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self._poller is not None:
+            self._poller.join()
+            self._poller = None
+
+
+_watcher: Optional[QuestionFileWatcher] = None
+_watcher_lock = threading.Lock()
+
+
+def start_question_watcher() -> Optional[QuestionFileWatcher]:
+    """
+    Arranca (una sola vez por proceso) el observador del banco de preguntas compartido.
+
+    Returns:
+        Optional[QuestionFileWatcher]: Observador activo, o None si está
+        desactivado en QUESTION_WATCH_CONFIG o no se pudo iniciar
+    """
+    global _watcher
+    if _watcher is None and QUESTION_WATCH_CONFIG["enabled"]:
+        with _watcher_lock:
+            if _watcher is None:
+                watcher = QuestionFileWatcher(
+                    get_question_bank(), os.path.dirname(DEFAULT_QUESTIONS_FILE)
+                )
+                try:
+                    watcher.start()
+                except OSError as e:
+                    print(f"⚠️ No se pudo observar los archivos de preguntas: {e}")
+                    watcher.stop()
+                    return None
+                _watcher = watcher
+    return _watcher
@@ -0,0 +1,652 @@
+"""
+Evaluación de respuestas de candidatos compartida por ambos agentes.
+
+El evaluador aplica primero el validador declarado para la pregunta,
+resuelve localmente las respuestas evidentes con el pre-clasificador,
+consulta después la caché de evaluaciones y solo llama al LLM de Groq
+cuando ninguna de esas etapas tiene un veredicto. Las llamadas a Groq
+recorren una cascada de modelos, del más rápido al más capaz, con un
+presupuesto de latencia por turno y un circuit breaker: si Groq tarda o
+falla repetidamente, el turno se resuelve con la lógica local.
+"""
+import asyncio
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+from agents.tools.answer_classifier import AnswerClassifier, SATISFACTORIA
+from agents.tools.evaluation_cache import Evaluation, EvaluationCache
+from agents.tools.model_cascade import ModelCascade, parse_evaluation
+from agents.tools.question_validators import QuestionValidatorStage
+from core.models.question_models import ValidatorSpec
+from core.rrhh_config import (
+    ANSWER_CLASSIFIER_CONFIG,
+    EVALUATION_CACHE_CONFIG,
+    EVALUATION_LATENCY_CONFIG,
+    LLM_CONFIG,
+    LLM_GATEWAY_CONFIG,
+    MODEL_CASCADE_CONFIG
+)
+from services.circuit_breaker import CircuitBreaker
+from services.llm_gateway import PRIORIDAD_ENTREVISTA, Admision
+from utils.env_utils import load_env_variables
+
+
+def build_evaluation_prompt(question: str, user_response: str) -> str:
+    """
+    Construye el prompt de evaluación para una pregunta y su respuesta.
+
+    Args:
+        question: Pregunta planteada al candidato
+        user_response: Respuesta del candidato
+
+    Returns:
+        Prompt para el LLM
+    """
+    return f"""
+            Evalúa si la siguiente respuesta es satisfactoria para la pregunta planteada:
+
+            Pregunta: {question}
+            Respuesta: {user_response}
+
+            Responde SOLO con:
+            - "SATISFACTORIA" si la respuesta proporciona información básica relevante a la pregunta
+            - "NECESITA_CLARIFICACION: [razón específica]" si la respuesta está completamente vacía, es irrelevante o muy confusa
+
+            Sé PERMISIVO en tu evaluación. Acepta respuestas que tengan al menos alguna relación con la pregunta,
+            incluso si son breves o no muy detalladas. Solo solicita clarificación si la respuesta realmente
+            no tiene sentido o está completamente fuera de tema.
+            """
+
+
+def simple_evaluation(user_response: str) -> Evaluation:
+    """
+    Evaluación local sin LLM (más permisiva).
+
+    Args:
+        user_response: Respuesta del candidato
+
+    Returns:
+        Tupla (es satisfactoria, razón de la aclaración)
+    """
+    is_satisfactory = len(user_response.strip()) > 3
+    clarification_reason = "Por favor, proporciona una respuesta más detallada." if not is_satisfactory else ""
+    return is_satisfactory, clarification_reason
+
+
+def get_groq_api_key() -> Optional[str]:
+    """
+    Obtiene la API key de Groq asegurando que el .env esté cargado.
+
+    Returns:
+        API key de Groq o None si no está configurada
+    """
+    load_env_variables()
+    return os.getenv("GROQ_API_KEY")
+
+
+SATISFACTORY_MARKER = "SATISFACTORIA"
+CLARIFICATION_MARKER = "NECESITA_CLARIFICACION"
+
+# Marca de fin del streaming en la cola de fragmentos
+_END_OF_STREAM = object()
+
+
+def stream_verdict(text: str) -> Optional[bool]:
+    """
+    Decide el veredicto a partir del comienzo de la respuesta del LLM.
+
+    Args:
+        text: Texto recibido hasta el momento
+
+    Returns:
+        True o False, o None si todavía no hay texto suficiente para decidir
+    """
+    head = text.lstrip()
+    if head.startswith(SATISFACTORY_MARKER):
+        return True
+    if head.startswith(CLARIFICATION_MARKER):
+        return False
+    if not head or SATISFACTORY_MARKER.startswith(head) or CLARIFICATION_MARKER.startswith(head):
+        return None
+    # Formato inesperado: ser permisivo, igual que parse_evaluation
+    return True
+
+
+def _as_stream(evaluation: Evaluation) -> Tuple[bool, Iterator[str]]:
+    """Adapta una evaluación completa al formato de stream_evaluate."""
+    is_satisfactory, reason = evaluation
+    return is_satisfactory, iter([reason] if reason else [])
+
+
+def _stream_reason(text: str, chunks: "queue.Queue[Any]", ended: bool) -> Iterator[str]:
+    """
+    Transmite la razón de la aclaración: lo ya recibido tras el marcador y
+    los fragmentos que sigan llegando.
+    """
+    buffer = text.lstrip()[len(CLARIFICATION_MARKER):]
+    emitted = False
+    # Espacios finales retenidos hasta saber si sigue más texto (la razón va sin strip)
+    trailing = ""
+    while True:
+        if not emitted:
+            buffer = buffer.lstrip(": \n\t")
+        content = trailing + buffer
+        stripped = content.rstrip()
+        trailing = content[len(stripped):]
+        if stripped:
+            emitted = True
+            yield stripped
+        if ended:
+            return
+        try:
+            item = chunks.get(timeout=LLM_CONFIG["timeout_seconds"])
+        except queue.Empty:
+            return
+        if item is _END_OF_STREAM or isinstance(item, Exception):
+            return
+        buffer = item
+
+
+class ResponseEvaluator:
+    """
+    Decide si la respuesta de un candidato es satisfactoria.
+
+    Orden de evaluación: validador de la pregunta, pre-clasificador local,
+    caché de evaluaciones, cascada de modelos de Groq y, si no hay API key,
+    el circuito está abierto, se agota el presupuesto del turno o el LLM
+    falla, la lógica simple local.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[EvaluationCache] = None,
+        classifier: Optional[AnswerClassifier] = None,
+        cascade: Optional[ModelCascade] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        turn_budget_seconds: Optional[float] = None
+    ):
+        """
+        Inicializa el evaluador.
+
+        Args:
+            cache: Caché de evaluaciones (None la desactiva)
+            classifier: Pre-clasificador local (None lo desactiva)
+            cascade: Cascada de modelos (None usa solo el modelo de LLM_CONFIG)
+            breaker: Circuit breaker de Groq (None crea uno con valores por defecto)
+            turn_budget_seconds: Tiempo máximo de evaluación por turno (None sin límite)
+        """
+        self.cache = cache
+        self.classifier = classifier
+        self.cascade = cascade or ModelCascade([LLM_CONFIG["model"]])
+        self.breaker = breaker or CircuitBreaker()
+        self.turn_budget_seconds = turn_budget_seconds or None
+        self.validators = QuestionValidatorStage()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._late_tasks: Set[asyncio.Future] = set()
+        self._lock = threading.Lock()
+        self._fallbacks = {"no_api_key": 0, "circuit_open": 0, "budget_exceeded": 0, "error": 0}
+
+    def _fallback(self, cause: str, user_response: str) -> Evaluation:
+        """
+        Resuelve el turno con la lógica local y cuenta el motivo.
+
+        Args:
+            cause: Motivo del fallback (no_api_key, circuit_open, budget_exceeded o error)
+            user_response: Respuesta del candidato
+
+        Returns:
+            Tupla (es satisfactoria, razón de la aclaración)
+        """
+        with self._lock:
+            self._fallbacks[cause] += 1
+        return simple_evaluation(user_response)
+
+    def _remaining_budget(self, started: float) -> Optional[float]:
+        """Tiempo que le queda al turno para esperar a Groq (None sin límite)."""
+        if self.turn_budget_seconds is None:
+            return None
+        return self.turn_budget_seconds - (time.monotonic() - started)
+
+    def _store_late_result(
+        self,
+        question: str,
+        user_response: str,
+        future: Any,
+        admission: Optional[Admision] = None
+    ) -> None:
+        """
+        Guarda en la caché la evaluación de Groq que llegó después del presupuesto,
+        para que un reintento del candidato no vuelva a esperar. Si la llamada
+        seguía en la cola del gateway al agotarse el presupuesto (`admission`),
+        su resultado se informa recién ahora al circuit breaker.
+        """
+        if admission is not None:
+            self._record_call(admission, None if future.cancelled() else future.exception())
+        if future.cancelled() or future.exception() is not None:
+            return
+        if self.cache is not None:
+            self.cache.set(question, user_response, future.result())
+
+    def _record_call(self, admission: Admision, error: Optional[BaseException]) -> None:
+        """
+        Informa al circuit breaker cómo terminó una llamada a Groq, medida desde
+        que el gateway le concedió turno: la espera en cola no es culpa de Groq.
+        """
+        if error is None:
+            self.breaker.record_success(admission.duracion())
+        elif admission.admitida:
+            self.breaker.record_failure()
+        else:
+            self.breaker.release_probe()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Obtiene el pool de hilos que permite cortar la espera sincrónica."""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=LLM_GATEWAY_CONFIG["max_concurrency"] * 2,
+                        thread_name_prefix="evaluacion-groq"
+                    )
+        return self._executor
+
+    def _classify_locally(
+        self,
+        question: str,
+        user_response: str,
+        validator: Optional[ValidatorSpec]
+    ) -> Optional[Evaluation]:
+        """
+        Intenta resolver la evaluación sin LLM.
+
+        Args:
+            question: Pregunta planteada al candidato
+            user_response: Respuesta del candidato
+            validator: Validador declarado para la pregunta
+
+        Returns:
+            Tupla (es satisfactoria, razón) o None si hay que escalar al LLM
+        """
+        validated = self.validators.evaluate(validator, user_response)
+        if validated is not None:
+            print(f"⚡ Evaluación por validador '{validator.type}': {validated[0]}")
+            return validated
+        if self.classifier is None:
+            return None
+        result = self.classifier.classify(question, user_response)
+        if result.verdict is None:
+            return None
+        print(f"⚡ Evaluación local: {result.verdict} (confianza {result.confidence:.2f})")
+        return result.verdict == SATISFACTORIA, result.reason
+
+    def _resolve_before_llm(
+        self,
+        question: str,
+        user_response: str,
+        validator: Optional[ValidatorSpec],
+        started: float
+    ) -> Tuple[Optional[Evaluation], Optional[str]]:
+        """
+        Ejecuta las etapas previas a Groq: validador, pre-clasificador, caché,
+        API key, presupuesto y circuit breaker.
+
+        Returns:
+            Tupla (evaluación si alguna etapa decidió, API key de Groq si hay que llamarlo)
+        """
+        local = self._classify_locally(question, user_response, validator)
+        if local is not None:
+            return local, None
+        return self._resolve_before_groq(question, user_response, started)
+
+    def _resolve_before_groq(
+        self,
+        question: str,
+        user_response: str,
+        started: float
+    ) -> Tuple[Optional[Evaluation], Optional[str]]:
+        """
+        Etapas de `_resolve_before_llm` que pueden tocar el disco: caché, API
+        key (carga el .env), presupuesto y circuit breaker.
+
+        Returns:
+            Tupla (evaluación si alguna etapa decidió, API key de Groq si hay que llamarlo)
+        """
+        if self.cache is not None:
+            cached = self.cache.get(question, user_response)
+            if cached is not None:
+                print("⚡ Evaluación obtenida de la caché")
+                return cached, None
+
+        groq_api_key = get_groq_api_key()
+        if not groq_api_key:
+            print("⚠️ GROQ_API_KEY no configurada, usando lógica simple")
+            return self._fallback("no_api_key", user_response), None
+
+        budget = self._remaining_budget(started)
+        if budget is not None and budget <= 0:
+            return self._fallback("budget_exceeded", user_response), None
+        if not self.breaker.allow_request():
+            print("⚠️ Circuito de Groq abierto, usando lógica simple")
+            return self._fallback("circuit_open", user_response), None
+
+        print(f"✅ GROQ_API_KEY encontrada, usando evaluación inteligente")
+        return None, groq_api_key
+
+    def _budget_exceeded(self, user_response: str, queued: bool) -> Evaluation:
+        """
+        Resuelve localmente un turno que agotó su presupuesto esperando a Groq.
+
+        Si la llamada todavía esperaba turno en el gateway no cuenta como fallo
+        de Groq; quien llama informa su resultado al breaker cuando termine.
+        """
+        if queued:
+            print(f"⏱️ La llamada a Groq sigue en la cola tras el presupuesto del turno ({self.turn_budget_seconds}s), usando lógica simple")
+        else:
+            print(f"⏱️ Groq superó el presupuesto del turno ({self.turn_budget_seconds}s), usando lógica simple")
+            self.breaker.record_failure()
+        return self._fallback("budget_exceeded", user_response)
+
+    def _groq_failed(self, error: Exception, user_response: str, admission: Admision) -> Evaluation:
+        """Registra un error de Groq y resuelve el turno con la lógica simple (más permisiva)."""
+        print(f"Error al evaluar con Groq ({type(error).__name__}): {error}")
+        self._record_call(admission, error)
+        return self._fallback("error", user_response)
+
+    def evaluate(
+        self,
+        question: str,
+        user_response: str,
+        validator: Optional[ValidatorSpec] = None,
+        priority: int = PRIORIDAD_ENTREVISTA
+    ) -> Evaluation:
+        """
+        Evalúa si la respuesta del usuario es satisfactoria.
+
+        Args:
+            question: Pregunta planteada al candidato
+            user_response: Respuesta del candidato
+            validator: Validador declarado para la pregunta
+            priority: Prioridad en el gateway LLM (PRIORIDAD_LOTE para re-evaluaciones)
+
+        Returns:
+            Tupla (es satisfactoria, razón de la aclaración)
+        """
+        started = time.monotonic()
+        resolved, groq_api_key = self._resolve_before_llm(question, user_response, validator, started)
+        if resolved is not None:
+            return resolved
+        budget = self._remaining_budget(started)
+
+        prompt = build_evaluation_prompt(question, user_response)
+        admission = Admision()
+        try:
+            # Recorrer la cascada de modelos con los clientes Groq compartidos
+            if budget is None:
+                evaluation = self.cascade.invoke(prompt, groq_api_key, priority, admission)
+            else:
+                future: Future = self._get_executor().submit(
+                    self.cascade.invoke, prompt, groq_api_key, priority, admission
+                )
+                try:
+                    evaluation = future.result(timeout=budget)
+                except FutureTimeoutError:
+                    if future.done():
+                        # El timeout vino de la propia llamada, no del presupuesto
+                        raise
+                    queued = not admission.admitida
+                    future.add_done_callback(
+                        lambda done: self._store_late_result(
+                            question, user_response, done, admission if queued else None
+                        )
+                    )
+                    return self._budget_exceeded(user_response, queued)
+        except Exception as e:
+            return self._groq_failed(e, user_response, admission)
+        self._record_call(admission, None)
+
+        if self.cache is not None:
+            self.cache.set(question, user_response, evaluation)
+        return evaluation
+
+    def stream_evaluate(
+        self,
+        question: str,
+        user_response: str,
+        validator: Optional[ValidatorSpec] = None,
+        priority: int = PRIORIDAD_ENTREVISTA
+    ) -> Tuple[bool, Iterator[str]]:
+        """
+        Evalúa la respuesta transmitiendo la razón de la aclaración a medida
+        que Groq la genera.
+
+        El veredicto se decide con los primeros fragmentos de la respuesta; el
+        presupuesto del turno se aplica hasta ese momento. La evaluación
+        completa se guarda en la caché cuando termina el streaming.
+
+        Args:
+            question: Pregunta planteada al candidato
+            user_response: Respuesta del candidato
+            validator: Validador declarado para la pregunta
+            priority: Prioridad en el gateway LLM
+
+        Returns:
+            Tupla (es satisfactoria, iterador con los fragmentos de la razón)
+        """
+        started = time.monotonic()
+        resolved, groq_api_key = self._resolve_before_llm(question, user_response, validator, started)
+        if resolved is not None:
+            return _as_stream(resolved)
+
+        chunks: "queue.Queue[Any]" = queue.Queue()
+        admission = Admision()
+        producer = self._get_executor().submit(
+            self._produce_stream,
+            question,
+            user_response,
+            build_evaluation_prompt(question, user_response),
+            groq_api_key,
+            priority,
+            chunks,
+            admission
+        )
+
+        text = ""
+        verdict: Optional[bool] = None
+        ended = False
+        try:
+            while verdict is None:
+                budget = self._remaining_budget(started)
+                item = chunks.get(timeout=None if budget is None else max(budget, 0.0))
+                if item is _END_OF_STREAM:
+                    # Respuesta vacía o incompleta: ser permisivo, igual que parse_evaluation
+                    ended = True
+                    verdict = stream_verdict(text) is not False
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    text += item
+                    verdict = stream_verdict(text)
+        except queue.Empty:
+            queued = not admission.admitida
+            if queued:
+                producer.add_done_callback(lambda done: self._record_call(admission, done.result()))
+            return _as_stream(self._budget_exceeded(user_response, queued))
+        except Exception as e:
+            return _as_stream(self._groq_failed(e, user_response, admission))
+        self._record_call(admission, None)
+
+        if verdict:
+            return True, iter(())
+        return False, _stream_reason(text, chunks, ended)
+
+    def _produce_stream(
+        self,
+        question: str,
+        user_response: str,
+        prompt: str,
+        groq_api_key: str,
+        priority: int,
+        chunks: "queue.Queue[Any]",
+        admission: Admision
+    ) -> Optional[Exception]:
+        """
+        Consume el streaming de la cascada en un hilo auxiliar, publica los
+        fragmentos en la cola y guarda la evaluación completa en la caché.
+
+        Returns:
+            El error de la cascada, o None si el streaming terminó bien
+        """
+        text = ""
+        try:
+            for chunk in self.cascade.stream(prompt, groq_api_key, priority, admission):
+                text += chunk
+                chunks.put(chunk)
+        except Exception as e:
+            chunks.put(e)
+            return e
+        chunks.put(_END_OF_STREAM)
+        if self.cache is not None:
+            self.cache.set(question, user_response, parse_evaluation(text))
+        return None
+
+    async def aevaluate(
+        self,
+        question: str,
+        user_response: str,
+        validator: Optional[ValidatorSpec] = None,
+        priority: int = PRIORIDAD_ENTREVISTA
+    ) -> Evaluation:
+        """
+        Evalúa de forma asíncrona si la respuesta del usuario es satisfactoria.
+
+        Args:
+            question: Pregunta planteada al candidato
+            user_response: Respuesta del candidato
+            validator: Validador declarado para la pregunta
+            priority: Prioridad en el gateway LLM (PRIORIDAD_LOTE para re-evaluaciones)
+
+        Returns:
+            Tupla (es satisfactoria, razón de la aclaración)
+        """
+        started = time.monotonic()
+        # El validador y el pre-clasificador son baratos: solo la caché y el
+        # .env justifican salir del event loop
+        local = self._classify_locally(question, user_response, validator)
+        if local is not None:
+            return local
+        resolved, groq_api_key = await asyncio.to_thread(
+            self._resolve_before_groq, question, user_response, started
+        )
+        if resolved is not None:
+            return resolved
+        budget = self._remaining_budget(started)
+
+        prompt = build_evaluation_prompt(question, user_response)
+        admission = Admision()
+        task = asyncio.ensure_future(self.cascade.ainvoke(prompt, groq_api_key, priority, admission))
+        try:
+            try:
+                # shield: si se agota el presupuesto, la llamada sigue para llenar la caché
+                evaluation = await asyncio.wait_for(asyncio.shield(task), timeout=budget)
+            except asyncio.TimeoutError:
+                if task.done():
+                    # El timeout vino de la propia llamada, no del presupuesto
+                    raise
+                queued = not admission.admitida
+                self._late_tasks.add(task)
+                task.add_done_callback(self._late_tasks.discard)
+                task.add_done_callback(
+                    lambda done: self._store_late_result(
+                        question, user_response, done, admission if queued else None
+                    )
+                )
+                return self._budget_exceeded(user_response, queued)
+        except Exception as e:
+            return self._groq_failed(e, user_response, admission)
+        self._record_call(admission, None)
+
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.set, question, user_response, evaluation)
+        return evaluation
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Obtiene las métricas de las etapas del evaluador.
+
+        Returns:
+            Diccionario con las métricas por etapa
+        """
+        return {
+            "validators": self.validators.stats(),
+            "classifier": self.classifier.stats() if self.classifier is not None else {},
+            "cache": self.cache.stats() if self.cache is not None else {},
+            "cascade": self.cascade.stats(),
+            "gateway": self.cascade.gateway.stats(),
+            "circuit_breaker": self.breaker.stats(),
+            "fallbacks": self.fallback_stats()
+        }
+
+    def fallback_stats(self) -> Dict[str, int]:
+        """
+        Obtiene cuántos turnos se resolvieron con la lógica local y por qué.
+
+        Returns:
+            Dict[str, int]: Fallbacks por motivo
+        """
+        with self._lock:
+            return dict(self._fallbacks)
+
+
+_evaluator: Optional[ResponseEvaluator] = None
+_evaluator_lock = threading.Lock()
+
+
+def get_response_evaluator() -> ResponseEvaluator:
+    """
+    Obtiene el evaluador compartido por todo el proceso.
+
+    Returns:
+        Instancia única de ResponseEvaluator configurada según EVALUATION_CACHE_CONFIG,
+        ANSWER_CLASSIFIER_CONFIG, MODEL_CASCADE_CONFIG y EVALUATION_LATENCY_CONFIG
+    """
+    global _evaluator
+    if _evaluator is None:
+        with _evaluator_lock:
+            if _evaluator is None:
+                cache = None
+                if EVALUATION_CACHE_CONFIG["enabled"]:
+                    cache = EvaluationCache(
+                        db_path=EVALUATION_CACHE_CONFIG["db_path"],
+                        memory_max_entries=EVALUATION_CACHE_CONFIG["memory_max_entries"],
+                        disk_max_entries=EVALUATION_CACHE_CONFIG["disk_max_entries"],
+                        ttl_seconds=EVALUATION_CACHE_CONFIG["ttl_seconds"]
+                    )
+                classifier = None
+                if ANSWER_CLASSIFIER_CONFIG["enabled"]:
+                    classifier = AnswerClassifier(
+                        accept_threshold=ANSWER_CLASSIFIER_CONFIG["accept_threshold"],
+                        reject_threshold=ANSWER_CLASSIFIER_CONFIG["reject_threshold"]
+                    )
+                cascade = ModelCascade(
+                    models=MODEL_CASCADE_CONFIG["models"],
+                    min_confidence=MODEL_CASCADE_CONFIG["min_confidence"],
+                    escalate_on_rejection=MODEL_CASCADE_CONFIG["escalate_on_rejection"]
+                )
+                breaker = CircuitBreaker(
+                    failure_threshold=EVALUATION_LATENCY_CONFIG["failure_threshold"],
+                    slow_call_seconds=EVALUATION_LATENCY_CONFIG["slow_call_seconds"],
+                    open_seconds=EVALUATION_LATENCY_CONFIG["open_seconds"]
+                )
+                _evaluator = ResponseEvaluator(
+                    cache,
+                    classifier,
+                    cascade,
+                    breaker=breaker,
+                    turn_budget_seconds=EVALUATION_LATENCY_CONFIG["turn_budget_seconds"]
+                )
+    return _evaluator
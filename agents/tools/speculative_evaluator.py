@@ -0,0 +1,211 @@
+"""
+Evaluación especulativa de borradores mientras el candidato escribe.
+
+Los borradores se reciben con debounce: solo se evalúa el último borrador
+tras `debounce_seconds` sin cambios. La evaluación pasa por el evaluador
+compartido, de modo que el veredicto de Groq queda en la caché de
+evaluaciones. Al enviar la respuesta, si el texto final coincide (o casi
+coincide) con un borrador evaluado, se reutiliza ese veredicto y la llamada
+a Groq sale del camino crítico.
+
+Solo se reutilizan veredictos de Groq guardados en la caché; los fallbacks
+locales (sin API key, circuito abierto, presupuesto agotado) nunca se
+reutilizan.
+"""
+import difflib
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional
+
+from agents.tools.evaluation_cache import Evaluation
+from agents.tools.question_validators import validate_answer
+from core.models.question_models import ValidatorSpec
+from services.llm_gateway import PRIORIDAD_ESPECULATIVA
+from utils.string_utils import normalize_text
+
+
+class _Speculation:
+    """Borrador evaluado (o en evaluación) para una pregunta."""
+
+    __slots__ = ("draft", "normalized", "done", "used")
+
+    def __init__(self, draft: str):
+        self.draft = draft
+        self.normalized = normalize_text(draft)
+        self.done: Future = Future()
+        self.used = False
+
+
+class SpeculativeEvaluator:
+    """
+    Evalúa borradores en segundo plano para una sesión de entrevista.
+    """
+
+    def __init__(
+        self,
+        evaluator,
+        debounce_seconds: float = 0.8,
+        similarity_threshold: float = 0.9,
+        max_wait_seconds: float = 1.5,
+        min_draft_chars: int = 4
+    ):
+        """
+        Inicializa el evaluador especulativo.
+
+        Args:
+            evaluator: ResponseEvaluator compartido (con caché de evaluaciones)
+            debounce_seconds (float): Tiempo sin cambios antes de evaluar un borrador
+            similarity_threshold (float): Similitud mínima para reutilizar un veredicto
+            max_wait_seconds (float): Espera máxima por una especulación en curso al enviar
+            min_draft_chars (int): Longitud mínima del borrador para especular
+        """
+        self.evaluator = evaluator
+        self.debounce_seconds = debounce_seconds
+        self.similarity_threshold = similarity_threshold
+        self.max_wait_seconds = max_wait_seconds
+        self.min_draft_chars = min_draft_chars
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._speculations: Dict[str, List[_Speculation]] = {}
+        self._stats = {
+            "drafts": 0,
+            "debounced": 0,
+            "skipped": 0,
+            "speculative_calls": 0,
+            "exact_hits": 0,
+            "near_hits": 0,
+            "misses": 0,
+            "wasted_calls": 0
+        }
+
+    def submit_draft(self, question: str, draft: str, validator: Optional[ValidatorSpec] = None) -> None:
+        """
+        Registra un borrador; se evaluará si no llega otro antes del debounce.
+
+        Args:
+            question: Pregunta que el candidato está respondiendo
+            draft: Texto del borrador
+            validator: Validador declarado para la pregunta
+        """
+        with self._lock:
+            self._stats["drafts"] += 1
+            if self._timer is not None:
+                self._timer.cancel()
+                self._stats["debounced"] += 1
+            self._timer = threading.Timer(
+                self.debounce_seconds, self._speculate, args=(question, draft, validator)
+            )
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _speculate(self, question: str, draft: str, validator: Optional[ValidatorSpec]) -> None:
+        """Evalúa un borrador en el hilo del temporizador."""
+        with self._lock:
+            self._timer = None
+            known = self._speculations.setdefault(question, [])
+            normalized = normalize_text(draft)
+            # Los borradores cortos, repetidos o que resuelve el validador no necesitan a Groq
+            if (
+                len(normalized) < self.min_draft_chars
+                or any(s.normalized == normalized for s in known)
+                or validate_answer(validator, draft) is not None
+            ):
+                self._stats["skipped"] += 1
+                return
+            speculation = _Speculation(draft)
+            known.append(speculation)
+            self._stats["speculative_calls"] += 1
+
+        try:
+            self.evaluator.evaluate(question, draft, validator, priority=PRIORIDAD_ESPECULATIVA)
+        except Exception as e:
+            print(f"⚠️ Error en la evaluación especulativa: {e}")
+        finally:
+            speculation.done.set_result(None)
+
+    def _similarity(self, normalized: str, speculation: _Speculation) -> float:
+        """Similitud entre el texto final y un borrador (ambos normalizados)."""
+        if normalized == speculation.normalized:
+            return 1.0
+        return difflib.SequenceMatcher(None, normalized, speculation.normalized).ratio()
+
+    def resolve(self, question: str, final_text: str) -> Optional[Evaluation]:
+        """
+        Busca un veredicto especulativo reutilizable para la respuesta enviada.
+
+        Si el borrador equivalente aún se está evaluando, espera como máximo
+        `max_wait_seconds`. Las especulaciones de la pregunta que no se usen
+        se cuentan como llamadas desperdiciadas.
+
+        Args:
+            question: Pregunta respondida
+            final_text: Texto enviado por el candidato
+
+        Returns:
+            Evaluación reutilizada o None si hay que evaluar normalmente
+        """
+        normalized = normalize_text(final_text)
+        with self._lock:
+            if self._timer is not None:
+                # El borrador pendiente ya no se evaluará: la respuesta llegó antes
+                self._timer.cancel()
+                self._timer = None
+            candidates = sorted(
+                ((self._similarity(normalized, s), s) for s in self._speculations.pop(question, [])),
+                key=lambda item: item[0],
+                reverse=True
+            )
+
+        result: Optional[Evaluation] = None
+        used: Optional[_Speculation] = None
+        for similarity, speculation in candidates:
+            if similarity < self.similarity_threshold:
+                break
+            try:
+                speculation.done.result(timeout=self.max_wait_seconds)
+            except FutureTimeoutError:
+                continue
+            cached = self.evaluator.cache.get(question, speculation.draft) if self.evaluator.cache else None
+            if cached is not None:
+                result, used = cached, speculation
+                used.used = True
+                break
+
+        with self._lock:
+            if used is None:
+                self._stats["misses"] += 1
+            elif used.normalized == normalized:
+                self._stats["exact_hits"] += 1
+            else:
+                self._stats["near_hits"] += 1
+            self._stats["wasted_calls"] += sum(1 for _, s in candidates if not s.used)
+
+        if result is not None:
+            print(f"⚡ Evaluación especulativa reutilizada ({'exacta' if used.normalized == normalized else 'aproximada'})")
+        return result
+
+    def discard(self) -> None:
+        """Descarta los borradores pendientes (p. ej. al reiniciar la entrevista)."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._stats["wasted_calls"] += sum(
+                1 for speculations in self._speculations.values() for s in speculations if not s.used
+            )
+            self._speculations.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Obtiene los contadores de especulación.
+
+        Returns:
+            Dict[str, float]: Borradores, evaluaciones especulativas, aciertos,
+            llamadas desperdiciadas y proporción de envíos resueltos por especulación
+        """
+        with self._lock:
+            stats: Dict[str, float] = dict(self._stats)
+        submits = stats["exact_hits"] + stats["near_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["exact_hits"] + stats["near_hits"]) / submits if submits else 0.0
+        return stats
@@ -0,0 +1,221 @@
+"""
+API HTTP (ASGI) de entrevistas, sin Streamlit.
+
+Expone el mismo SimpleRRHHAgent que la vista del chatbot, con el almacén de
+sesiones y el diario de cada sesión detrás, para frontends livianos o un
+balanceador delante:
+
+- `POST /interviews`: inicia (o retoma, con el mismo token) una entrevista;
+  acepta `token`, `job_offer` y opcionalmente `session_id`
+- `POST /interviews/{session_id}/answer`: responde la pregunta actual
+- `POST /interviews/{session_id}/stream`: igual, transmitiendo la respuesta en fragmentos
+- `GET /interviews/{session_id}/summary`: resumen de la entrevista
+- `GET /interviews/{session_id}/transcript?cursor=N`: mensajes desde un cursor
+- `GET /health`: el proceso está vivo
+- `GET /ready`: 200 cuando terminó el calentamiento (app/warmup.py), 503 antes
+
+Se ejecuta con `python run.py --mode api` (uvicorn). Está hecha sobre
+Starlette, que ya se instala como dependencia de Streamlit.
+"""
+import asyncio
+import re
+import uuid
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from starlette.applications import Starlette
+from starlette.concurrency import iterate_in_threadpool
+from starlette.exceptions import HTTPException
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from agents.session_journal import get_session_journal
+from agents.session_store import SessionLease, SessionStore, get_session_store, session_key
+from agents.simple_agent import create_simple_rrhh_agent
+from app.warmup import is_ready, run_warmup
+from core.security import desencriptar_datos_usuario
+
+# Formato de los ids de sesión (uuid4 o session_key: 32 caracteres hexadecimales)
+SESSION_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+
+def create_app(store: Optional[SessionStore] = None) -> Starlette:
+    """
+    Crea la aplicación ASGI de entrevistas.
+
+    Args:
+        store: Almacén de sesiones (None usa el compartido del proceso)
+
+    Returns:
+        Aplicación Starlette lista para uvicorn
+    """
+    # Un lock por sesión: dos pedidos del mismo candidato no avanzan la entrevista a la vez
+    locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    def session_store() -> SessionStore:
+        return store if store is not None else get_session_store()
+
+    def agent_factory(key: str, id_job_offer: Optional[str] = None):
+        return lambda: create_simple_rrhh_agent(id_job_offer, journal=get_session_journal(key))
+
+    @asynccontextmanager
+    async def checkout(key: str, id_job_offer: Optional[str] = None) -> AsyncIterator[SessionLease]:
+        """Retira el agente de la sesión mientras dura el pedido."""
+        lock = locks.get(key)
+        if lock is None:
+            lock = locks[key] = asyncio.Lock()
+        async with lock:
+            agent = await asyncio.to_thread(
+                session_store().checkout, key, agent_factory(key, id_job_offer)
+            )
+            lease = SessionLease(key, agent)
+            try:
+                yield lease
+            finally:
+                if lease.agent.initialized:
+                    await asyncio.to_thread(session_store().checkin, key, lease.agent)
+                else:
+                    # No dejar sesiones vacías por pedidos con ids desconocidos
+                    await asyncio.to_thread(session_store().discard, key)
+
+    def path_session_id(request: Request) -> str:
+        """Id de sesión de la ruta; 404 si no tiene el formato de los ids emitidos."""
+        key = request.path_params["session_id"]
+        if not SESSION_ID_PATTERN.fullmatch(key):
+            # Se valida antes de tocar el almacén o el diario, que arma una ruta con él
+            raise HTTPException(404, f"Sesión no encontrada: {key}")
+        return key
+
+    async def existing_session(request: Request, lease: SessionLease) -> None:
+        """Responde 404 si la sesión no tiene una entrevista iniciada."""
+        if not lease.agent.initialized:
+            raise HTTPException(404, f"Sesión no encontrada: {request.path_params['session_id']}")
+
+    async def read_json(request: Request) -> Dict[str, Any]:
+        try:
+            body = await request.json()
+        except ValueError:
+            raise HTTPException(400, "El cuerpo debe ser JSON")
+        if not isinstance(body, dict):
+            raise HTTPException(400, "El cuerpo debe ser un objeto JSON")
+        return body
+
+    async def read_answer(request: Request) -> str:
+        answer = (await read_json(request)).get("answer")
+        if not isinstance(answer, str) or not answer.strip():
+            raise HTTPException(422, "Falta la respuesta ('answer')")
+        return answer
+
+    def turn_payload(lease: SessionLease, reply: str) -> Dict[str, Any]:
+        agent = lease.agent
+        return {
+            "session_id": lease.key,
+            "reply": reply,
+            "current_question": agent.state.current_question,
+            "complete": agent.is_conversation_complete(),
+            "cursor": agent.get_transcript().cursor
+        }
+
+    async def start(request: Request) -> JSONResponse:
+        """Inicia una entrevista; con un token ya usado, retoma la existente."""
+        body = await read_json(request) if await request.body() else {}
+        id_job_offer = body.get("job_offer")
+        token = body.get("token")
+        if token:
+            try:
+                datos_usuario = desencriptar_datos_usuario(token)
+            except Exception:
+                raise HTTPException(400, "Token inválido")
+            key = session_key(datos_usuario)
+            if datos_usuario.get("job-offer") is not None:
+                id_job_offer = str(datos_usuario["job-offer"])
+        elif body.get("session_id"):
+            # Id elegido por el dispatcher de workers para poder enrutar la sesión
+            key = str(body["session_id"])
+            if not SESSION_ID_PATTERN.fullmatch(key):
+                raise HTTPException(400, "session_id inválido")
+        else:
+            key = uuid.uuid4().hex
+
+        async with checkout(key, id_job_offer) as lease:
+            if lease.agent.initialized:
+                reply = lease.agent.get_latest_reply() or ""
+            else:
+                reply = await lease.agent.astart_conversation()
+            return JSONResponse(turn_payload(lease, reply), status_code=201)
+
+    async def answer(request: Request) -> JSONResponse:
+        """Procesa la respuesta del candidato a la pregunta actual."""
+        key = path_session_id(request)
+        user_input = await read_answer(request)
+        async with checkout(key) as lease:
+            await existing_session(request, lease)
+            reply = await lease.agent.aprocess_user_input(user_input)
+            return JSONResponse(turn_payload(lease, reply))
+
+    async def stream(request: Request) -> StreamingResponse:
+        """Procesa la respuesta y transmite el texto del agente a medida que se genera."""
+        key = path_session_id(request)
+        user_input = await read_answer(request)
+        # Verificar la sesión antes de empezar a transmitir
+        async with checkout(key) as lease:
+            await existing_session(request, lease)
+
+        async def chunks() -> AsyncIterator[str]:
+            async with checkout(key) as lease:
+                async for chunk in iterate_in_threadpool(lease.agent.stream_user_input(user_input)):
+                    yield chunk
+
+        return StreamingResponse(chunks(), media_type="text/plain; charset=utf-8")
+
+    async def summary(request: Request) -> JSONResponse:
+        """Resumen de la entrevista: respuestas, progreso y estado."""
+        key = path_session_id(request)
+        async with checkout(key) as lease:
+            await existing_session(request, lease)
+            return JSONResponse(lease.agent.get_conversation_summary())
+
+    async def transcript(request: Request) -> JSONResponse:
+        """Mensajes de la entrevista desde `cursor` (0 para todo el historial)."""
+        key = path_session_id(request)
+        try:
+            cursor = max(int(request.query_params.get("cursor", 0)), 0)
+        except ValueError:
+            raise HTTPException(400, "El cursor debe ser un número entero")
+        async with checkout(key) as lease:
+            await existing_session(request, lease)
+            view = lease.agent.get_transcript()
+            return JSONResponse({
+                "messages": [{"role": role, "content": content} for role, content in view.since(cursor)],
+                "cursor": view.cursor
+            })
+
+    async def health(request: Request) -> JSONResponse:
+        return JSONResponse({"status": "ok"})
+
+    async def ready(request: Request) -> JSONResponse:
+        return JSONResponse({"ready": is_ready()}, status_code=200 if is_ready() else 503)
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette):
+        # Calentamiento en segundo plano: /health responde enseguida y /ready
+        # avisa cuándo se puede enviar tráfico
+        warmup = asyncio.get_running_loop().run_in_executor(None, run_warmup)
+        yield
+        await warmup
+
+    return Starlette(lifespan=lifespan, routes=[
+        Route("/health", health, methods=["GET"]),
+        Route("/ready", ready, methods=["GET"]),
+        Route("/interviews", start, methods=["POST"]),
+        Route("/interviews/{session_id}/answer", answer, methods=["POST"]),
+        Route("/interviews/{session_id}/stream", stream, methods=["POST"]),
+        Route("/interviews/{session_id}/summary", summary, methods=["GET"]),
+        Route("/interviews/{session_id}/transcript", transcript, methods=["GET"])
+    ])
+
+
+# Aplicación por defecto para `uvicorn app.api:app`
+app = create_app()
@@ -3,8 +3,13 @@ import sys
 import os
 # Añadir el directorio actual al path para los imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from views.interviewer_chatbot_st import lanzar_chatbot
-from views.form_candidate_contact import mostrar_formulario as mostrar_formulario_candidatos
+# Las vistas se importan al elegirlas en el menú: cada una arrastra servicios
+# pesados (langchain, Google, Twilio) que el resto de la app no necesita
+from app.warmup import run_warmup
+
+# Precarga de preguntas, clientes y plantillas (una sola vez por proceso;
+# con `python run.py` ya se hizo antes de levantar el servidor)
+run_warmup()
 
 # Configuración de la página
 st.set_page_config(
@@ -60,11 +65,13 @@ if opcion == "Seleccione una opción..." or opcion is None:
 elif opcion == "Formulario de Contacto de Candidato":
     st.header("Formulario de Contacto de Candidato")
     st.markdown("Complete el formulario para invitar a un candidato al proceso de selección.")
+    from views.form_candidate_contact import mostrar_formulario as mostrar_formulario_candidatos
     mostrar_formulario_candidatos()
     
 elif opcion == "Chatbot":
     st.header("Chatbot de Atención")
     st.markdown("Interactúa con nuestro chatbot para resolver dudas.")
+    from views.interviewer_chatbot_st import lanzar_chatbot
     lanzar_chatbot()
 
 # Pie de página
@@ -1,15 +1,14 @@
 import streamlit as st
 from utils.type_utils import validar_email, validar_telefono
 from services.api_client import obtener_vacantes_extra, obtener_medios_extra
-from services.email_sender import enviar_correo
 from services.email_templates import generar_asunto_y_cuerpo_simple
-from services.sms_sender import enviar_sms
 from services.url_shortener import acortar_url, generar_url_token
-#Cryptography
 import json
-from cryptography.fernet import Fernet
 from core.config import settings
 
+# El envío de correos (librerías de Google), de SMS (Twilio) y el cifrado se
+# importan recién al enviar el formulario
+
 # Constantes
 BASE_URL = "https://chatbot-adaptiera.streamlit.app"
 
@@ -66,6 +65,9 @@ def mostrar_formulario():
         else:
             vacante = vacantes_con_indices[vacante_seleccionada]
 
+            #Cryptography
+            from cryptography.fernet import Fernet
+
             # Generar una clave de cifrado
             key = Fernet.generate_key()
             cipher = Fernet(settings.FERNET_KEY)
@@ -97,6 +99,8 @@ def mostrar_formulario():
                 notificacion_enviada = False
 
                 if medio_notif == 'Correo':
+                    from services.email_sender import enviar_correo
+
                     # 1. Enviar correo interno
                     correo_interno_enviado = enviar_correo(
                         destinatario=correo,
@@ -140,6 +144,7 @@ def mostrar_formulario():
 
                 elif medio_notif == 'Teléfono':
                     try:
+                        from services.sms_sender import enviar_sms
                         mensaje_sms = f"Hola {nombre}, en Adaptiera queremos invitarte a postular al puesto de {vacante}. Ingresa aquí: {enlace_entrevista}"
                         mensaje_sms = f"Hola {nombre}, Somos Adaptiera!. Ingresa aquí: {enlace_entrevista}"
                         notificacion_enviada = enviar_sms(telefono, mensaje_sms)
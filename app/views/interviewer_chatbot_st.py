@@ -1,7 +1,7 @@
 import streamlit as st
 import sys
 import os
-import json
+import uuid
 from pathlib import Path
 
 # Agregar el directorio raíz al path para las importaciones
@@ -21,6 +21,8 @@ from core.security import desencriptar_datos_usuario
 
 # Importar agente directamente (simplificado)
 from agents.simple_agent import create_simple_rrhh_agent
+from agents.session_store import get_session_store, session_key
+from agents.session_journal import get_session_journal
 
 def lanzar_chatbot():
     """
@@ -30,11 +32,13 @@ def lanzar_chatbot():
     # Leer token cifrado en la URL
     query_params = st.query_params
     token = query_params.get("token", None)
+    clave_sesion = None
 
     if token:
         try:
             # Desencriptar directamente a diccionario usando la función modularizada
             datos_usuario = desencriptar_datos_usuario(token)
+            clave_sesion = session_key(datos_usuario)
             print(f"Datos usuario desencriptados: {datos_usuario}")
             
             nombre_usuario = datos_usuario.get("nombre", "Candidato")
@@ -73,16 +77,47 @@ def lanzar_chatbot():
             if id_job_offer:
                 st.write(f"**ID Oferta de Trabajo:** {id_job_offer}")
     
-    # Inicializar el agente en session state si no existe
-    if "rrhh_agent" not in st.session_state:
-        st.session_state.rrhh_agent = create_simple_rrhh_agent(id_job_offer)
-        st.session_state.rrhh_conversation_started = False
-        st.session_state.rrhh_messages = []
+    # Identificar la sesión: con token, por los datos del candidato (retoma la
+    # misma entrevista en cualquier pestaña); sin token, por la sesión del navegador
+    if "rrhh_session_key" not in st.session_state:
+        st.session_state.rrhh_session_key = clave_sesion or uuid.uuid4().hex
         # Almacenar información del usuario en session state
         st.session_state.nombre_usuario = nombre_usuario
         st.session_state.telefono_usuario = telefono_usuario
         st.session_state.id_job_offer = id_job_offer
     
+    # El agente se retira del almacén de sesiones durante esta ejecución y se
+    # devuelve al terminar, también cuando st.rerun() interrumpe el script
+    with get_session_store().session(st.session_state.rrhh_session_key, _nuevo_agente) as sesion:
+        _mostrar_entrevista(sesion)
+
+
+def _nuevo_agente():
+    """
+    Crea el agente de la sesión para la oferta del candidato.
+    
+    Si la sesión tiene diario (p. ej. tras un reinicio del servidor), el agente
+    retoma la entrevista desde él en la pregunta pendiente.
+    """
+    return create_simple_rrhh_agent(
+        st.session_state.get("id_job_offer"),
+        journal=get_session_journal(st.session_state.rrhh_session_key)
+    )
+
+
+def _enviar_borrador():
+    """Envía el borrador confirmado a la evaluación especulativa del agente de la sesión"""
+    with get_session_store().session(st.session_state.rrhh_session_key, _nuevo_agente) as sesion:
+        sesion.agent.submit_draft(st.session_state.get("rrhh_draft", ""))
+
+
+def _mostrar_entrevista(sesion):
+    """
+    Muestra los controles, el historial y el campo de respuesta de la entrevista.
+    
+    Args:
+        sesion: Sesión retirada del almacén; asignar `sesion.agent` reemplaza su agente
+    """
     # Botón para iniciar/reiniciar la conversación
     col1, col2, col3 = st.columns([1, 1, 1])
     
@@ -91,18 +126,11 @@ def lanzar_chatbot():
             BUTTONS_CONFIG["start"]["text"], 
             type=BUTTONS_CONFIG["start"]["type"]
         ):
-            # Reiniciar el agente
-            job_offer_id = st.session_state.get("id_job_offer")
-            st.session_state.rrhh_agent = create_simple_rrhh_agent(job_offer_id)
-            st.session_state.rrhh_conversation_started = True
-            st.session_state.rrhh_messages = []
+            # Reiniciar el agente (también borra el diario de la sesión)
+            sesion.agent.reset_conversation()
             
-            # Obtener mensaje inicial
-            initial_message = st.session_state.rrhh_agent.start_conversation()
-            st.session_state.rrhh_messages.append({
-                "role": "assistant", 
-                "content": initial_message
-            })
+            # El mensaje inicial queda en el historial del agente
+            sesion.agent.start_conversation()
             st.rerun()
     
     with col2:
@@ -110,16 +138,13 @@ def lanzar_chatbot():
             BUTTONS_CONFIG["restart"]["text"], 
             type=BUTTONS_CONFIG["restart"]["type"]
         ):
-            job_offer_id = st.session_state.get("id_job_offer")
-            st.session_state.rrhh_agent = create_simple_rrhh_agent(job_offer_id)
-            st.session_state.rrhh_conversation_started = False
-            st.session_state.rrhh_messages = []
+            sesion.agent.reset_conversation()
             st.rerun()
     
     with col3:
-        if st.session_state.get("rrhh_conversation_started", False):
+        if sesion.agent.initialized:
             # Mostrar progreso usando configuración
-            summary = st.session_state.rrhh_agent.get_conversation_summary()
+            summary = sesion.agent.get_conversation_summary()
             progress = summary.get('questions_asked', 0) / max(summary.get('total_questions', 1), 1)
             st.metric(
                 METRICS_CONFIG["progress_label"], 
@@ -128,31 +153,32 @@ def lanzar_chatbot():
             )
     
     # Mostrar el historial de mensajes si la conversación ha comenzado
-    if st.session_state.get("rrhh_conversation_started", False):
+    if sesion.agent.initialized:
         st.markdown("---")
         st.markdown("### 💬 Conversación")
         
-        # Mostrar mensajes usando contenedores nativos de Streamlit
-        for i, message in enumerate(st.session_state.rrhh_messages):
-            if message["role"] == "user":
+        # Mostrar mensajes usando contenedores nativos de Streamlit. El historial
+        # se lee directamente del agente; la sesión no guarda una copia propia
+        for role, content in sesion.agent.get_transcript():
+            if role == "human":
                 # Mensaje del usuario - usando columnas para alineación
                 col1, col2 = st.columns([1, 4])
                 with col2:
-                    st.info(f"**👤 Tú:** {message['content']}")
+                    st.info(f"**👤 Tú:** {content}")
             else:
                 # Mensaje del asistente
                 col1, col2 = st.columns([4, 1])
                 with col1:
-                    st.success(f"**🤖 Agente RRHH:** {message['content']}")
+                    st.success(f"**🤖 Agente RRHH:** {content}")
         
         # Verificar si la conversación está completa
-        if st.session_state.rrhh_agent.is_conversation_complete():
+        if sesion.agent.is_conversation_complete():
             st.balloons()
             st.success(INTERFACE_CONFIG["completion_message"])
             
             # Mostrar resumen final
             with st.expander("📊 Ver resumen de la entrevista"):
-                summary = st.session_state.rrhh_agent.get_conversation_summary()
+                summary = sesion.agent.get_conversation_summary()
                 
                 st.write("**Respuestas proporcionadas:**")
                 for question, answer in summary.get('responses', {}).items():
@@ -165,7 +191,7 @@ def lanzar_chatbot():
             
             # Botón para descargar resumen usando configuración
             if st.button(BUTTONS_CONFIG["download"]["text"]):
-                summary = st.session_state.rrhh_agent.get_conversation_summary()
+                summary = sesion.agent.get_conversation_summary()
                 
                 # Crear contenido del archivo usando configuración
                 content = f"{DOWNLOAD_CONFIG['header']}\n"
@@ -188,33 +214,32 @@ def lanzar_chatbot():
         else:
             # Campo para nueva respuesta usando text_area
             st.markdown("### ✍️ Tu respuesta:")
+            # Con la evaluación especulativa activada, cada borrador confirmado
+            # (al salir del campo o con Ctrl+Enter) se evalúa en segundo plano
             user_input = st.text_area(
                 "Escribe tu respuesta aquí:",
                 height=100,
-                placeholder="Escribe tu respuesta de manera clara y detallada..."
+                placeholder="Escribe tu respuesta de manera clara y detallada...",
+                key="rrhh_draft",
+                on_change=_enviar_borrador
             )
             
+            # Contenedor de ancho completo donde se transmite la respuesta del agente
+            stream_area = st.container()
+            
             col1, col2, col3 = st.columns([1, 1, 2])
             with col1:
                 if st.button("📤 Enviar Respuesta", type="primary"):
                     if user_input.strip():
-                        # Agregar mensaje del usuario al historial
-                        st.session_state.rrhh_messages.append({
-                            "role": "user", 
-                            "content": user_input
-                        })
-                        
-                        # Procesar respuesta con el agente
+                        # Procesar respuesta con el agente, mostrando los fragmentos a medida que llegan
                         try:
-                            with st.spinner("🤔 Procesando tu respuesta..."):
-                                agent_response = st.session_state.rrhh_agent.process_user_input(user_input)
-                            
-                            # Agregar respuesta del agente al historial
-                            st.session_state.rrhh_messages.append({
-                                "role": "assistant", 
-                                "content": agent_response
-                            })
+                            with stream_area:
+                                st.markdown("**🤖 Agente RRHH:**")
+                                st.write_stream(
+                                    sesion.agent.stream_user_input(user_input)
+                                )
                             
+                            # El agente ya registró ambos mensajes en su historial
                             st.rerun()
                             
                         except ValueError as ve:
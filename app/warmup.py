@@ -0,0 +1,181 @@
+"""
+Calentamiento de la aplicación antes de atender al primer candidato.
+
+Sin este paso, el primer candidato después de un deploy paga las
+importaciones en frío (langchain_groq, el cliente de Google, Twilio), la
+búsqueda del `.env`, el parseo de los archivos de preguntas y la creación de
+los clientes LLM. `run_warmup()` hace todo eso una vez por proceso, mide cada
+paso e informa el desglose; `is_ready()` recién devuelve True cuando termina.
+
+Los pasos son independientes: si uno falla (por ejemplo, faltan las
+credenciales de Twilio) se informa y se sigue con el resto, porque la
+entrevista puede funcionar sin ese servicio.
+
+Se ejecuta desde `run.py` (en el mismo proceso que sirve la app), desde
+`app/main.py` y al iniciar la API; las llamadas siguientes no repiten nada.
+Con `python -m app.warmup` se puede ver el desglose sin levantar la app.
+"""
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.rrhh_config import WARMUP_CONFIG
+
+
+class WarmupReport:
+    """Resultado del calentamiento: segundos por paso, detalle y errores."""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self.details: Dict[str, str] = {}
+        self.errors: Dict[str, str] = {}
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.timings.values())
+
+    def summary(self) -> str:
+        """Desglose en una línea por paso, para imprimir al iniciar."""
+        lines = [f"🔥 Calentamiento completo en {self.total_seconds:.2f}s"]
+        for step, seconds in self.timings.items():
+            if step in self.errors:
+                lines.append(f"   ⚠️ {step:<11} {seconds:6.2f}s  {self.errors[step]}")
+            else:
+                detail = self.details.get(step)
+                lines.append(f"   ✅ {step:<11} {seconds:6.2f}s" + (f"  {detail}" if detail else ""))
+        return "\n".join(lines)
+
+
+def _warm_environment() -> Optional[str]:
+    """Busca y carga el `.env` una sola vez."""
+    from utils.env_utils import load_env_variables
+
+    return ".env cargado" if load_env_variables() else "variables del sistema"
+
+
+def _warm_questions() -> Optional[str]:
+    """Abre el índice, arranca el observador y carga las preguntas de todas las ofertas."""
+    from agents.tools.question_bank import DEFAULT_QUESTIONS_FILE, get_question_bank
+    from agents.tools.question_index import QUESTION_FILE_PATTERN
+    from agents.tools.question_watcher import start_question_watcher
+
+    bank = get_question_bank()
+    # El observador descarta lo cargado antes de arrancar: va primero
+    start_question_watcher()
+    directory = os.path.dirname(DEFAULT_QUESTIONS_FILE)
+    offers = 0
+    for name in sorted(os.listdir(directory)):
+        match = QUESTION_FILE_PATTERN.fullmatch(name)
+        if match is not None:
+            bank.get(DEFAULT_QUESTIONS_FILE, match.group(1))
+            offers += 1
+    return f"{offers} archivos de preguntas"
+
+
+def _warm_llm() -> Optional[str]:
+    """Importa langchain y crea el evaluador, el extractor y los clientes de Groq."""
+    from agents.tools.answer_extractor import get_answer_extractor
+    from agents.tools.response_evaluator import get_response_evaluator
+    from core.rrhh_config import MODEL_CASCADE_CONFIG
+    from services.llm_client import obtener_cliente_llm
+    from services.llm_gateway import obtener_gateway_llm
+
+    get_response_evaluator()
+    get_answer_extractor()
+    obtener_gateway_llm()
+    api_key = os.getenv("GROQ_API_KEY")
+    if not api_key:
+        return "sin GROQ_API_KEY: evaluación local"
+    for model in MODEL_CASCADE_CONFIG["models"]:
+        obtener_cliente_llm(api_key, model)
+    return f"{len(MODEL_CASCADE_CONFIG['models'])} clientes LLM"
+
+
+def _warm_email() -> Optional[str]:
+    """Importa el envío de correos y las librerías de Google (OAuth, Gmail API)."""
+    from services.email_sender import cargar_dependencias_google
+
+    cargar_dependencias_google()
+    return None
+
+
+def _warm_sms() -> Optional[str]:
+    """Crea el cliente de Twilio."""
+    from services.sms_sender import obtener_cliente_sms
+
+    obtener_cliente_sms()
+    return None
+
+
+def _warm_views() -> Optional[str]:
+    """Importa lo que usan las vistas, que app/main.py carga al elegirlas en el menú."""
+    import agents.simple_agent  # noqa: F401
+    import cryptography.fernet  # noqa: F401
+    import services.api_client  # noqa: F401
+    import services.url_shortener  # noqa: F401
+
+    return None
+
+
+def _warm_templates() -> Optional[str]:
+    """Genera una vez las plantillas de correo."""
+    from services.email_templates import crear_mensaje_multipart
+
+    crear_mensaje_multipart("candidato@example.com", "Candidato", "Puesto")
+    return None
+
+
+WARMUP_STEPS: List[Tuple[str, Callable[[], Optional[str]]]] = [
+    ("entorno", _warm_environment),
+    ("preguntas", _warm_questions),
+    ("llm", _warm_llm),
+    ("email", _warm_email),
+    ("sms", _warm_sms),
+    ("plantillas", _warm_templates),
+    ("vistas", _warm_views)
+]
+
+_report: Optional[WarmupReport] = None
+_ready = threading.Event()
+_warmup_lock = threading.Lock()
+
+
+def run_warmup(steps: Optional[List[Tuple[str, Callable[[], Optional[str]]]]] = None) -> WarmupReport:
+    """
+    Ejecuta el calentamiento una sola vez por proceso.
+
+    Args:
+        steps: Pasos a ejecutar (por defecto, WARMUP_STEPS)
+
+    Returns:
+        WarmupReport: Desglose del calentamiento (el mismo en las llamadas siguientes)
+    """
+    global _report
+    if _report is None:
+        with _warmup_lock:
+            if _report is None:
+                report = WarmupReport()
+                if WARMUP_CONFIG["enabled"]:
+                    for name, step in steps or WARMUP_STEPS:
+                        started = time.perf_counter()
+                        try:
+                            detail = step()
+                            if detail:
+                                report.details[name] = detail
+                        except Exception as e:
+                            report.errors[name] = f"{type(e).__name__}: {e}"
+                        report.timings[name] = time.perf_counter() - started
+                    print(report.summary())
+                _report = report
+                _ready.set()
+    return _report
+
+
+def is_ready() -> bool:
+    """True cuando el calentamiento terminó y la app puede atender candidatos."""
+    return _ready.is_set()
+
+
+if __name__ == "__main__":
+    run_warmup()
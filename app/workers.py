@@ -0,0 +1,337 @@
+"""
+Modo de workers: varias instancias de la API de entrevistas en procesos
+separados detrás de un dispatcher liviano.
+
+Cada sesión se asigna con hashing consistente a un worker, así todos sus
+turnos pasan por el mismo proceso (y por su lock de sesión y sus cachés en
+memoria). El estado no vive en el worker: todos usan el mismo almacén de
+sesiones SQLite en modo WAL, de modo que si un worker muere el dispatcher lo
+saca del anillo, sus sesiones pasan al siguiente worker del anillo y siguen
+desde el último turno guardado. El supervisor relanza el worker caído y,
+cuando vuelve a responder, recupera sus sesiones.
+
+Uso:
+
+    python run.py --mode workers --workers 4 --port 8000
+"""
+import argparse
+import bisect
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, List, Optional
+
+import httpx
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from core.rrhh_config import LLM_GATEWAY_CONFIG, WORKER_POOL_CONFIG
+from core.security import desencriptar_datos_usuario
+from agents.session_store import session_key
+
+# Encabezados de salto a salto que no se reenvían
+HOP_HEADERS = {"connection", "keep-alive", "transfer-encoding", "content-length", "host"}
+
+
+class HashRing:
+    """
+    Anillo de hashing consistente con nodos virtuales.
+
+    Quitar un nodo solo mueve las claves que le correspondían; el resto de
+    las sesiones sigue en su worker.
+    """
+
+    def __init__(self, nodes: List[str], replicas: int = 64):
+        """
+        Inicializa el anillo.
+
+        Args:
+            nodes (List[str]): Identificadores de los nodos (URLs de los workers)
+            replicas (int): Puntos del anillo por nodo
+        """
+        self.replicas = replicas
+        self._points: List[int] = []
+        self._owners: Dict[int, str] = {}
+        for node in nodes:
+            self.add(node)
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+    def add(self, node: str) -> None:
+        """Agrega un nodo al anillo (no hace nada si ya está)."""
+        for replica in range(self.replicas):
+            point = self._hash(f"{node}#{replica}")
+            if point not in self._owners:
+                bisect.insort(self._points, point)
+                self._owners[point] = node
+
+    def remove(self, node: str) -> None:
+        """Quita un nodo del anillo."""
+        points = [point for point, owner in self._owners.items() if owner == node]
+        for point in points:
+            del self._owners[point]
+        self._points = [point for point in self._points if point in self._owners]
+
+    def nodes(self) -> List[str]:
+        """Nodos presentes en el anillo."""
+        return sorted(set(self._owners.values()))
+
+    def node_for(self, key: str) -> Optional[str]:
+        """
+        Obtiene el nodo responsable de una clave.
+
+        Args:
+            key (str): Clave (id de sesión)
+
+        Returns:
+            Optional[str]: Nodo asignado, o None si el anillo está vacío
+        """
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, self._hash(key)) % len(self._points)
+        return self._owners[self._points[index]]
+
+
+def create_dispatcher(
+    worker_urls: List[str],
+    timeout_seconds: float = 60.0,
+    client: Optional[httpx.AsyncClient] = None,
+    on_shutdown: Optional[Callable[[], None]] = None
+) -> Starlette:
+    """
+    Crea el dispatcher ASGI que reenvía cada pedido al worker de su sesión.
+
+    Args:
+        worker_urls (List[str]): URLs base de los workers
+        timeout_seconds (float): Timeout de cada pedido reenviado
+        client (Optional[httpx.AsyncClient]): Cliente HTTP hacia los workers (None crea uno)
+        on_shutdown (Optional[Callable[[], None]]): Se llama al apagar el dispatcher
+
+    Returns:
+        Starlette: Aplicación del dispatcher
+    """
+    ring = HashRing(worker_urls)
+    down: Dict[str, float] = {}
+    if client is None:
+        client = httpx.AsyncClient(
+            timeout=timeout_seconds,
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100)
+        )
+
+    def revive_workers() -> None:
+        """Devuelve al anillo los workers caídos tras un tiempo, para volver a probarlos."""
+        now = time.monotonic()
+        for url, since in list(down.items()):
+            if now - since >= WORKER_POOL_CONFIG["retry_down_seconds"]:
+                del down[url]
+                ring.add(url)
+
+    async def forward(request: Request, key: str, body: bytes) -> Response:
+        """Reenvía el pedido al worker de la sesión, pasando al siguiente si no responde."""
+        revive_workers()
+        headers = {k: v for k, v in request.headers.items() if k.lower() not in HOP_HEADERS}
+        for _ in range(len(worker_urls)):
+            url = ring.node_for(key)
+            if url is None:
+                break
+            upstream = client.build_request(
+                request.method, url + request.url.path,
+                params=request.query_params, headers=headers, content=body
+            )
+            try:
+                response = await client.send(upstream, stream=True)
+            except httpx.ConnectError:
+                # Worker caído (el pedido no llegó): sus sesiones pasan al siguiente del anillo
+                ring.remove(url)
+                down[url] = time.monotonic()
+                print(f"⚠️ Worker sin respuesta, se quita del anillo: {url}")
+                continue
+            except httpx.TransportError as e:
+                # El pedido pudo haberse procesado: no se reintenta para no duplicar el turno
+                return JSONResponse({"detail": f"Error del worker: {e}"}, status_code=502)
+            return StreamingResponse(
+                response.aiter_raw(),
+                status_code=response.status_code,
+                headers={k: v for k, v in response.headers.items() if k.lower() not in HOP_HEADERS},
+                background=BackgroundTask(response.aclose)
+            )
+        return JSONResponse({"detail": "No hay workers disponibles"}, status_code=503)
+
+    async def start(request: Request) -> Response:
+        """Elige el id de la sesión (o lo deriva del token) para enrutarla desde el inicio."""
+        body = await request.body()
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            payload = None
+        if not isinstance(payload, dict):
+            return JSONResponse({"detail": "El cuerpo debe ser un objeto JSON"}, status_code=400)
+        if payload.get("token"):
+            try:
+                key = session_key(desencriptar_datos_usuario(payload["token"]))
+            except Exception:
+                return JSONResponse({"detail": "Token inválido"}, status_code=400)
+        else:
+            key = payload.setdefault("session_id", uuid.uuid4().hex)
+            body = json.dumps(payload).encode("utf-8")
+        return await forward(request, key, body)
+
+    async def session_route(request: Request) -> Response:
+        return await forward(request, request.path_params["session_id"], await request.body())
+
+    async def health(request: Request) -> JSONResponse:
+        revive_workers()
+        return JSONResponse({"status": "ok", "workers": ring.nodes(), "down": sorted(down)})
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette):
+        yield
+        await client.aclose()
+        if on_shutdown is not None:
+            on_shutdown()
+
+    return Starlette(
+        routes=[
+            Route("/health", health, methods=["GET"]),
+            Route("/interviews", start, methods=["POST"]),
+            Route("/interviews/{session_id}/{action}", session_route, methods=["GET", "POST"])
+        ],
+        lifespan=lifespan
+    )
+
+
+class WorkerPool:
+    """
+    Lanza y supervisa los procesos worker de la API (uvicorn), uno por puerto.
+    """
+
+    def __init__(self, workers: int, host: str = "127.0.0.1", base_port: int = 8001):
+        """
+        Inicializa el pool (los procesos se lanzan con `start()`).
+
+        Args:
+            workers (int): Cantidad de procesos
+            host (str): Host donde escuchan los workers
+            base_port (int): Puerto del primer worker; los siguientes son consecutivos
+        """
+        self.host = host
+        self.ports = [base_port + index for index in range(workers)]
+        self._processes: Dict[int, subprocess.Popen] = {}
+        self._stopping = threading.Event()
+        self._supervisor: Optional[threading.Thread] = None
+
+    @property
+    def urls(self) -> List[str]:
+        """URLs base de los workers."""
+        return [f"http://{self.host}:{port}" for port in self.ports]
+
+    def _environment(self) -> Dict[str, str]:
+        """
+        Entorno de los workers: almacén SQLite compartido en lugar del LRU en
+        memoria y la cuota de Groq repartida entre los procesos.
+        """
+        env = os.environ.copy()
+        env["PYTHONPATH"] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env["SESSION_STORE_BACKEND"] = "sqlite"
+        env.setdefault("SESSION_STORE_PATH", WORKER_POOL_CONFIG["db_path"])
+        # Cada turno ya queda en el almacén compartido; el diario por archivo sería redundante
+        env.setdefault("SESSION_JOURNAL_ENABLED", "false")
+        # Cada worker tiene su propio token bucket: la cuota configurada es la
+        # de toda la API, así que cada proceso recibe su parte
+        workers = len(self.ports)
+        env["GROQ_REQUESTS_PER_MINUTE"] = str(LLM_GATEWAY_CONFIG["requests_per_minute"] / workers)
+        env["GROQ_REQUESTS_BURST"] = str(max(1, LLM_GATEWAY_CONFIG["burst"] // workers))
+        return env
+
+    def _launch(self, port: int) -> None:
+        self._processes[port] = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.api:app",
+             "--host", self.host, "--port", str(port), "--log-level", "warning"],
+            env=self._environment()
+        )
+
+    def start(self, ready_timeout: float = 30.0) -> None:
+        """
+        Lanza los workers, espera a que terminen su calentamiento y arranca el supervisor.
+
+        Args:
+            ready_timeout (float): Segundos máximos de espera por cada worker
+        """
+        for port in self.ports:
+            self._launch(port)
+        for url in self.urls:
+            self._wait_ready(url, ready_timeout)
+        self._supervisor = threading.Thread(target=self._supervise, daemon=True)
+        self._supervisor.start()
+        print(f"🧵 {len(self.ports)} workers listos: {', '.join(self.urls)}")
+
+    @staticmethod
+    def _wait_ready(url: str, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                if httpx.get(url + "/ready", timeout=1.0).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            time.sleep(0.1)
+        raise RuntimeError(f"El worker {url} no respondió en {timeout} segundos")
+
+    def _supervise(self) -> None:
+        """Relanza los workers que terminan inesperadamente."""
+        while not self._stopping.wait(1.0):
+            for port, process in list(self._processes.items()):
+                if process.poll() is not None and not self._stopping.is_set():
+                    print(f"⚠️ Worker en el puerto {port} terminó (código {process.returncode}); relanzando")
+                    self._launch(port)
+
+    def kill(self, index: int) -> None:
+        """Termina un worker de inmediato (para pruebas de tolerancia a fallos)."""
+        self._processes[self.ports[index]].kill()
+
+    def stop(self) -> None:
+        """Detiene el supervisor y todos los workers."""
+        self._stopping.set()
+        for process in self._processes.values():
+            process.terminate()
+        for process in self._processes.values():
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def main() -> None:
+    """Lanza los workers y el dispatcher en el puerto indicado."""
+    parser = argparse.ArgumentParser(description="API de entrevistas con workers en varios procesos")
+    parser.add_argument("--workers", type=int, default=WORKER_POOL_CONFIG["workers"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    pool = WorkerPool(args.workers, host="127.0.0.1", base_port=args.port + 1)
+    pool.start()
+    # Los workers se detienen en el apagado del dispatcher: uvicorn vuelve a
+    # emitir SIGTERM al salir, así que un `finally` no alcanzaría a correr
+    dispatcher = create_dispatcher(pool.urls, on_shutdown=pool.stop)
+    try:
+        uvicorn.run(dispatcher, host=args.host, port=args.port, log_level="warning")
+    finally:
+        pool.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,56 @@
-from typing import List, Dict, Any, Optional
+import struct
+from typing import List, Dict, Any, Optional, Tuple
+import ormsgpack
 from langchain_core.messages import BaseMessage
 from pydantic import BaseModel, Field
 
+from core.models.message_log import MessageLog
+from core.models.question_models import ValidatorSpec
+
+# Formato binario de ConversationState: cabecera fija (firma + versión del
+# esquema) seguida de un arreglo msgpack con los campos en orden fijo
+SNAPSHOT_MAGIC = b"ADCS"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct("<4sH")
+
+# Campos de ValidatorSpec en el orden en que se serializan
+VALIDATOR_FIELDS = ("type", "pattern", "min", "max", "message")
+
+
+def turn_bounds(turn_starts: List[int], message_count: int, turn: int = -1) -> Tuple[int, int]:
+    """
+    Calcula en O(1) el rango de mensajes de un turno a partir del índice de turnos.
+    
+    Args:
+        turn_starts: Índice del primer mensaje de cada turno
+        message_count: Cantidad total de mensajes
+        turn: Número de turno (negativo cuenta desde el final)
+    
+    Returns:
+        Tupla (inicio, fin) del turno en el historial
+    """
+    if turn < 0:
+        turn += len(turn_starts)
+    end = turn_starts[turn + 1] if turn + 1 < len(turn_starts) else message_count
+    return turn_starts[turn], end
+
 
 class ConversationState(BaseModel):
     """Estado del agente conversacional que mantiene el contexto de la conversación"""
     
-    # Historial de mensajes de la conversación
-    messages: List[BaseMessage] = Field(default_factory=list)
+    # Historial de mensajes de la conversación (compacto; los objetos de
+    # LangChain se construyen solo al indexarlo)
+    messages: MessageLog = Field(default_factory=MessageLog)
+    
+    # Índice en `messages` del primer mensaje de cada turno (el turno 0 es el saludo)
+    turn_starts: List[int] = Field(default_factory=list)
     
     # Preguntas pendientes por hacer
     pending_questions: List[str] = Field(default_factory=list)
     
+    # Validadores declarados para cada pregunta (por texto de la pregunta)
+    question_validators: Dict[str, ValidatorSpec] = Field(default_factory=dict)
+    
     # Respuestas del usuario recopiladas
     user_responses: Dict[str, str] = Field(default_factory=dict)
     
@@ -34,4 +73,128 @@ class ConversationState(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
     
     class Config:
-        arbitrary_types_allowed = True 
\ No newline at end of file
+        arbitrary_types_allowed = True 
+    
+    def begin_turn(self) -> int:
+        """
+        Registra el comienzo de un turno en la posición actual del historial.
+        
+        Returns:
+            Número del turno iniciado
+        """
+        self.turn_starts.append(len(self.messages))
+        return len(self.turn_starts) - 1
+    
+    def turn_messages(self, turn: int = -1) -> List[BaseMessage]:
+        """
+        Obtiene los mensajes de un turno sin recorrer el historial completo.
+        
+        Args:
+            turn: Número de turno (por defecto el último)
+        
+        Returns:
+            Mensajes del turno, en orden
+        """
+        if not self.turn_starts:
+            return []
+        start, end = turn_bounds(self.turn_starts, len(self.messages), turn)
+        return self.messages[start:end]
+    
+    def latest_reply(self) -> Optional[str]:
+        """
+        Obtiene la respuesta del agente en el último turno.
+        
+        Returns:
+            Contenido de los mensajes del agente del último turno, o None si no respondió
+        """
+        if not self.turn_starts:
+            return None
+        start, end = turn_bounds(self.turn_starts, len(self.messages), -1)
+        replies = [
+            self.messages.text(index)
+            for index in range(start, end)
+            if self.messages.role(index) == "ai"
+        ]
+        return "\n\n".join(replies) if replies else None
+    
+    def to_bytes(self) -> bytes:
+        """
+        Serializa el estado en el formato binario versionado.
+        
+        El historial se copia tal cual desde las columnas del MessageLog (sin
+        construir mensajes ni decodificar texto) y el resto de los campos va
+        en un arreglo msgpack posicional. `metadata` debe contener solo tipos
+        admitidos por msgpack.
+        
+        Returns:
+            Bytes con la cabecera y el estado
+        """
+        roles, offsets, buffer = self.messages.to_columns()
+        body = [
+            roles,
+            offsets,
+            buffer,
+            self.turn_starts,
+            self.pending_questions,
+            {
+                question: [getattr(validator, field) for field in VALIDATOR_FIELDS]
+                for question, validator in self.question_validators.items()
+            },
+            self.user_responses,
+            self.current_question,
+            self.current_question_index,
+            self.needs_clarification,
+            self.clarification_reason,
+            self.conversation_complete,
+            self.metadata
+        ]
+        return SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION) + ormsgpack.packb(body)
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ConversationState":
+        """
+        Reconstruye un estado serializado con `to_bytes()`.
+        
+        Args:
+            data: Bytes producidos por `to_bytes()`
+        
+        Returns:
+            ConversationState equivalente al original
+        
+        Raises:
+            ValueError: Si los datos no son un estado válido o su versión no es compatible
+        """
+        if len(data) < SNAPSHOT_HEADER.size:
+            raise ValueError("Datos insuficientes para un estado de conversación")
+        magic, version = SNAPSHOT_HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("Los datos no son un estado de conversación serializado")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Versión de estado no soportada: {version}")
+        
+        try:
+            (
+                roles, offsets, buffer, turn_starts, pending_questions, validators,
+                user_responses, current_question, current_question_index,
+                needs_clarification, clarification_reason, conversation_complete, metadata
+            ) = ormsgpack.unpackb(memoryview(data)[SNAPSHOT_HEADER.size:])
+        except (ormsgpack.MsgpackDecodeError, TypeError, ValueError) as e:
+            raise ValueError(f"Estado de conversación corrupto: {e}") from e
+        
+        # model_construct evita revalidar campos que ya tienen el tipo correcto
+        return cls.model_construct(
+            messages=MessageLog.from_columns(roles, offsets, buffer),
+            turn_starts=turn_starts,
+            pending_questions=pending_questions,
+            question_validators={
+                question: ValidatorSpec(**dict(zip(VALIDATOR_FIELDS, values)))
+                for question, values in validators.items()
+            },
+            user_responses=user_responses,
+            current_question=current_question,
+            current_question_index=current_question_index,
+            needs_clarification=needs_clarification,
+            clarification_reason=clarification_reason,
+            conversation_complete=conversation_complete,
+            metadata=metadata
+        )
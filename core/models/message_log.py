@@ -0,0 +1,277 @@
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union, overload
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from pydantic import GetCoreSchemaHandler, GetJsonSchemaHandler
+from pydantic.json_schema import JsonSchemaValue
+from pydantic_core import core_schema
+
+# Roles almacenados como un byte por mensaje
+ROLE_HUMAN = 0
+ROLE_AI = 1
+ROLE_SYSTEM = 2
+
+ROLE_NAMES = ("human", "ai", "system")
+ROLE_CODES = {name: code for code, name in enumerate(ROLE_NAMES)}
+MESSAGE_CLASSES = (HumanMessage, AIMessage, SystemMessage)
+
+
+def _role_of(message: BaseMessage) -> int:
+    """Obtiene el código de rol de un mensaje de LangChain."""
+    if message.type not in ROLE_CODES:
+        raise ValueError(f"Tipo de mensaje no soportado en el historial: {message.type}")
+    return ROLE_CODES[message.type]
+
+
+class MessageLog:
+    """
+    Historial de mensajes compacto: un único buffer UTF-8 con columnas de
+    rol y offset.
+
+    Cada mensaje ocupa sus bytes de texto más cinco bytes de índice, en lugar
+    de un objeto `HumanMessage`/`AIMessage` completo. Los objetos de LangChain
+    se construyen solo al pedirlos (`log[i]`, `to_messages()`), por ejemplo
+    cuando un LLM necesita el historial; la interfaz y los agentes pueden
+    leer rol y texto directamente con `role()`, `text()` e `iter_text()`.
+    """
+
+    __slots__ = ("_buffer", "_roles", "_offsets")
+
+    def __init__(self, messages: Iterable[Any] = ()):
+        """
+        Inicializa el historial.
+
+        Args:
+            messages: Mensajes iniciales (BaseMessage, tuplas (rol, texto) o dicts con role/content)
+        """
+        self._buffer = bytearray()
+        self._roles = array("B")
+        self._offsets = array("I")
+        for message in messages:
+            self.append(message)
+
+    def append(self, message: Union[BaseMessage, Tuple[str, str], Dict[str, str]]) -> None:
+        """
+        Agrega un mensaje al final del historial.
+
+        Args:
+            message: Mensaje de LangChain, tupla (rol, texto) o dict con role y content
+        """
+        if isinstance(message, BaseMessage):
+            role, content = _role_of(message), message.content
+        elif isinstance(message, dict):
+            role, content = ROLE_CODES[message["role"]], message["content"]
+        else:
+            role, content = ROLE_CODES[message[0]], message[1]
+        if not isinstance(content, str):
+            content = str(content)
+        self._roles.append(role)
+        self._offsets.append(len(self._buffer))
+        self._buffer += content.encode("utf-8")
+
+    def extend(self, messages: Iterable[Any]) -> None:
+        """Agrega varios mensajes al final del historial."""
+        for message in messages:
+            self.append(message)
+
+    def __len__(self) -> int:
+        return len(self._roles)
+
+    def _bounds(self, index: int) -> Tuple[int, int]:
+        """Rango en bytes del texto de un mensaje."""
+        if index < 0:
+            index += len(self._roles)
+        if not 0 <= index < len(self._roles):
+            raise IndexError("índice de mensaje fuera de rango")
+        end = self._offsets[index + 1] if index + 1 < len(self._offsets) else len(self._buffer)
+        return self._offsets[index], end
+
+    def role(self, index: int) -> str:
+        """Rol del mensaje (human, ai o system) sin construir el objeto."""
+        return ROLE_NAMES[self._roles[index]]
+
+    def text(self, index: int) -> str:
+        """Texto del mensaje sin construir el objeto."""
+        start, end = self._bounds(index)
+        return self._buffer[start:end].decode("utf-8")
+
+    def iter_text(self, start: int = 0) -> Iterator[Tuple[str, str]]:
+        """
+        Recorre el historial como tuplas (rol, texto), sin objetos de LangChain.
+
+        Args:
+            start: Índice del primer mensaje
+        """
+        for index in range(start, len(self._roles)):
+            yield ROLE_NAMES[self._roles[index]], self.text(index)
+
+    @overload
+    def __getitem__(self, index: int) -> BaseMessage: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[BaseMessage]: ...
+
+    def __getitem__(self, index):
+        """Materializa el mensaje (o los mensajes de un slice) como objetos de LangChain."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._roles)))]
+        return MESSAGE_CLASSES[self._roles[index]](content=self.text(index))
+
+    def __iter__(self) -> Iterator[BaseMessage]:
+        for index in range(len(self._roles)):
+            yield self[index]
+
+    def to_messages(self) -> List[BaseMessage]:
+        """Materializa todo el historial para pasarlo a un LLM."""
+        return list(self)
+
+    def to_records(self) -> List[Dict[str, str]]:
+        """Historial como lista de dicts role/content (formato de serialización)."""
+        return [{"role": role, "content": content} for role, content in self.iter_text()]
+
+    def to_columns(self) -> Tuple[bytes, bytes, bytes]:
+        """
+        Exporta las columnas internas sin decodificar el texto (para serializar).
+
+        Returns:
+            Tupla (roles, offsets en uint32 little-endian, buffer UTF-8)
+        """
+        offsets = self._offsets
+        if sys.byteorder != "little":
+            offsets = array("I", offsets)
+            offsets.byteswap()
+        return self._roles.tobytes(), offsets.tobytes(), bytes(self._buffer)
+
+    @classmethod
+    def from_columns(cls, roles: bytes, offsets: bytes, buffer: bytes) -> "MessageLog":
+        """
+        Reconstruye un historial a partir de las columnas de `to_columns()`.
+
+        Args:
+            roles: Un byte de rol por mensaje
+            offsets: Offsets en uint32 little-endian
+            buffer: Texto UTF-8 de todos los mensajes
+
+        Returns:
+            MessageLog con los mismos mensajes
+        """
+        log = cls()
+        log._roles.frombytes(roles)
+        log._offsets.frombytes(offsets)
+        if sys.byteorder != "little":
+            log._offsets.byteswap()
+        log._buffer = bytearray(buffer)
+        if len(log._roles) != len(log._offsets) or max(log._roles, default=0) >= len(ROLE_NAMES):
+            raise ValueError("columnas del historial inconsistentes")
+        return log
+
+    def nbytes(self) -> int:
+        """Bytes ocupados por el buffer y las columnas."""
+        return (
+            len(self._buffer)
+            + self._roles.itemsize * len(self._roles)
+            + self._offsets.itemsize * len(self._offsets)
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, MessageLog):
+            return (
+                self._roles == other._roles
+                and self._offsets == other._offsets
+                and self._buffer == other._buffer
+            )
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"MessageLog({len(self)} mensajes, {self.nbytes()} bytes)"
+
+    def __copy__(self) -> "MessageLog":
+        copy = MessageLog()
+        copy._buffer = bytearray(self._buffer)
+        copy._roles = array("B", self._roles)
+        copy._offsets = array("I", self._offsets)
+        return copy
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "MessageLog":
+        return self.__copy__()
+
+    @classmethod
+    def _validate(cls, value: Any) -> "MessageLog":
+        """Acepta un MessageLog o cualquier iterable de mensajes."""
+        if isinstance(value, MessageLog):
+            return value
+        if isinstance(value, (list, tuple)):
+            return cls(value)
+        raise TypeError("se esperaba un MessageLog o una lista de mensajes")
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls._validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda log: log.to_records()
+            )
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(cls, schema: core_schema.CoreSchema, handler: GetJsonSchemaHandler) -> JsonSchemaValue:
+        return {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "role": {"type": "string", "enum": list(ROLE_NAMES)},
+                    "content": {"type": "string"}
+                }
+            }
+        }
+
+
+class TranscriptView:
+    """
+    Vista de solo lectura del historial para la interfaz.
+
+    No copia mensajes: lee rol y texto del MessageLog del agente, que es la
+    única fuente del historial. `cursor` marca hasta dónde se leyó y
+    `since(cursor)` devuelve solo los mensajes nuevos, para quien renderiza
+    de forma incremental.
+    """
+
+    __slots__ = ("_log",)
+
+    def __init__(self, log: MessageLog):
+        """
+        Inicializa la vista.
+
+        Args:
+            log: Historial del agente
+        """
+        self._log = log
+
+    def __len__(self) -> int:
+        return len(self._log)
+
+    def __getitem__(self, index: int) -> Tuple[str, str]:
+        """Mensaje como tupla (rol, texto)."""
+        return self._log.role(index), self._log.text(index)
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        return self._log.iter_text()
+
+    @property
+    def cursor(self) -> int:
+        """Posición después del último mensaje disponible."""
+        return len(self._log)
+
+    def since(self, cursor: int) -> Iterator[Tuple[str, str]]:
+        """
+        Recorre los mensajes agregados desde una posición.
+
+        Args:
+            cursor: Valor de `cursor` en la lectura anterior (0 para todo el historial)
+
+        Yields:
+            Tuplas (rol, texto) de los mensajes nuevos
+        """
+        return self._log.iter_text(cursor)
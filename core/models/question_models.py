@@ -0,0 +1,75 @@
+import re
+from typing import Any, Literal, Optional, Union
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+
+ValidatorType = Literal["free_text", "name", "numeric_range", "regex", "yes_no"]
+
+
+class ValidatorSpec(BaseModel):
+    """Validador barato declarado para una pregunta en el banco de preguntas"""
+
+    model_config = ConfigDict(frozen=True)
+
+    # Tipo de validador; "free_text" deja la evaluación al LLM
+    type: ValidatorType = "free_text"
+
+    # Patrón para el validador "regex"
+    pattern: Optional[str] = None
+
+    # Límites para el validador "numeric_range"
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+    # Mensaje de aclaración personalizado cuando la validación falla
+    message: Optional[str] = None
+
+    @model_validator(mode="after")
+    def _check_pattern(self) -> "ValidatorSpec":
+        """Compila el patrón del validador "regex" para rechazar el archivo al cargarlo."""
+        if self.type != "regex":
+            return self
+        if not self.pattern:
+            raise ValueError("El validador 'regex' requiere un patrón")
+        try:
+            re.compile(self.pattern)
+        except re.error as e:
+            raise ValueError(f"Patrón no válido {self.pattern!r}: {e}") from e
+        return self
+
+
+class QuestionSpec(BaseModel):
+    """Pregunta del banco de preguntas junto con su validador"""
+
+    model_config = ConfigDict(frozen=True)
+
+    # Texto de la pregunta que se le muestra al candidato
+    text: str
+
+    # Validador aplicado antes de recurrir al LLM
+    validator: ValidatorSpec = Field(default_factory=ValidatorSpec)
+
+    @field_validator("validator", mode="before")
+    @classmethod
+    def _coerce_validator(cls, value: Union[str, dict, ValidatorSpec, None]) -> Any:
+        """Permite declarar el validador solo con su tipo ("name", "yes_no", ...)."""
+        if value is None:
+            return ValidatorSpec()
+        if isinstance(value, str):
+            return {"type": value}
+        return value
+
+    @classmethod
+    def from_raw(cls, raw: Union[str, dict]) -> "QuestionSpec":
+        """
+        Crea una pregunta a partir de una entrada del archivo JSON.
+
+        Args:
+            raw: Texto plano (formato antiguo) u objeto con "text" y "validator"
+
+        Returns:
+            Pregunta validada
+        """
+        if isinstance(raw, str):
+            return cls(text=raw)
+        return cls.model_validate(raw)
@@ -1,5 +1,13 @@
 # Configuración del Agente de RRHH para Streamlit
 
+import os
+
+from utils.env_utils import load_env_variables
+
+# Los valores de abajo leen variables de entorno al importar el módulo: el .env
+# se carga antes, sea cual sea el punto de entrada (app, API, calentamiento)
+load_env_variables()
+
 # Configuración de la interfaz
 INTERFACE_CONFIG = {
     "title": "🤖 Agente de RRHH - Entrevista Virtual con IA",
@@ -67,4 +75,138 @@ DOWNLOAD_CONFIG = {
     "header": "RESUMEN DE ENTREVISTA - ADAPTIERA",
     "separator": "=" * 50,
     "mime_type": "text/plain"
-} 
\ No newline at end of file
+}
+
+# Configuración de los clientes LLM (Groq) compartidos por el proceso
+LLM_CONFIG = {
+    "model": os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile"),
+    "timeout_seconds": float(os.getenv("GROQ_TIMEOUT_SECONDS", "30")),
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    "keepalive_expiry_seconds": 60.0
+}
+
+# Configuración de la caché de evaluaciones de respuestas
+EVALUATION_CACHE_CONFIG = {
+    "enabled": os.getenv("EVALUATION_CACHE_ENABLED", "true").lower() == "true",
+    "db_path": os.getenv("EVALUATION_CACHE_PATH", "data/evaluation_cache.sqlite3"),
+    "memory_max_entries": 2048,
+    "disk_max_entries": 100000,
+    "ttl_seconds": 7 * 24 * 3600
+}
+
+# Configuración del pre-clasificador local de respuestas
+ANSWER_CLASSIFIER_CONFIG = {
+    "enabled": os.getenv("ANSWER_CLASSIFIER_ENABLED", "true").lower() == "true",
+    "accept_threshold": float(os.getenv("ANSWER_CLASSIFIER_ACCEPT_THRESHOLD", "0.85")),
+    "reject_threshold": float(os.getenv("ANSWER_CLASSIFIER_REJECT_THRESHOLD", "0.1"))
+}
+
+# Configuración de la cascada de modelos para evaluar respuestas:
+# se consulta primero el modelo rápido y solo se escala al siguiente cuando
+# su salida está mal formada, declara poca confianza o (opcionalmente) rechaza
+MODEL_CASCADE_CONFIG = {
+    "models": [
+        model.strip()
+        for model in os.getenv(
+            "GROQ_CASCADE_MODELS", f"llama-3.1-8b-instant,{LLM_CONFIG['model']}"
+        ).split(",")
+        if model.strip()
+    ],
+    "min_confidence": float(os.getenv("GROQ_CASCADE_MIN_CONFIDENCE", "0.8")),
+    "escalate_on_rejection": os.getenv("GROQ_CASCADE_ESCALATE_ON_REJECTION", "true").lower() == "true"
+}
+
+# Configuración del gateway por el que pasan todas las llamadas a Groq.
+# La tasa y la ráfaga se aplican por modelo, igual que la cuota de Groq
+LLM_GATEWAY_CONFIG = {
+    "requests_per_minute": float(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30")),
+    "burst": int(os.getenv("GROQ_REQUESTS_BURST", "10")),
+    "max_concurrency": int(os.getenv("GROQ_MAX_CONCURRENCY", "16")),
+    "max_queue": int(os.getenv("GROQ_MAX_QUEUE", "200")),
+    "max_wait_seconds": float(os.getenv("GROQ_MAX_QUEUE_WAIT_SECONDS", "20"))
+}
+
+# Presupuesto de latencia por turno y circuit breaker de la evaluación con Groq.
+# Un presupuesto de 0 desactiva el límite
+EVALUATION_LATENCY_CONFIG = {
+    "turn_budget_seconds": float(os.getenv("EVALUATION_TURN_BUDGET_SECONDS", "1.5")),
+    "failure_threshold": int(os.getenv("GROQ_BREAKER_FAILURE_THRESHOLD", "5")),
+    "slow_call_seconds": float(os.getenv("GROQ_BREAKER_SLOW_CALL_SECONDS", "1.5")),
+    "open_seconds": float(os.getenv("GROQ_BREAKER_OPEN_SECONDS", "30"))
+}
+
+# Evaluación especulativa de borradores (opcional): los borradores se evalúan
+# en segundo plano y su veredicto se reutiliza si el texto enviado coincide
+SPECULATIVE_EVALUATION_CONFIG = {
+    "enabled": os.getenv("SPECULATIVE_EVALUATION_ENABLED", "false").lower() == "true",
+    "debounce_seconds": float(os.getenv("SPECULATIVE_DEBOUNCE_SECONDS", "0.8")),
+    "similarity_threshold": float(os.getenv("SPECULATIVE_SIMILARITY_THRESHOLD", "0.9")),
+    "max_wait_seconds": float(os.getenv("SPECULATIVE_MAX_WAIT_SECONDS", "1.5"))
+}
+
+# Extracción de respuestas múltiples: un mensaje largo puede responder varias
+# preguntas pendientes, que se registran y se saltan. Usa el modelo rápido de
+# la cascada: tiene que entrar en el presupuesto del turno
+ANSWER_EXTRACTION_CONFIG = {
+    "enabled": os.getenv("ANSWER_EXTRACTION_ENABLED", "true").lower() == "true",
+    "model": os.getenv(
+        "GROQ_EXTRACTION_MODEL", (MODEL_CASCADE_CONFIG["models"] or [LLM_CONFIG["model"]])[0]
+    ),
+    "min_words": int(os.getenv("ANSWER_EXTRACTION_MIN_WORDS", "12")),
+    "max_questions": 10
+}
+
+# Almacén de sesiones de entrevista: los agentes se guardan por candidato en
+# un LRU en memoria y los inactivos se vuelcan a SQLite en lugar de perderse.
+# Con backend "sqlite" cada turno lee y escribe el snapshot directamente en disco
+SESSION_STORE_CONFIG = {
+    "backend": os.getenv("SESSION_STORE_BACKEND", "memory"),
+    "db_path": os.getenv("SESSION_STORE_PATH", "data/sessions.sqlite3"),
+    "max_sessions": int(os.getenv("SESSION_STORE_MAX_SESSIONS", "500")),
+    "idle_ttl_seconds": float(os.getenv("SESSION_STORE_IDLE_TTL_SECONDS", "900")),
+    # Cada cuánto se expulsan en segundo plano las sesiones inactivas (0 lo desactiva)
+    "evict_interval_seconds": float(os.getenv("SESSION_STORE_EVICT_INTERVAL_SECONDS", "60")),
+    # Espera máxima de una pestaña por la sesión que usa otra del mismo candidato
+    "checkout_timeout_seconds": float(os.getenv("SESSION_STORE_CHECKOUT_TIMEOUT_SECONDS", "60")),
+    "disk_ttl_seconds": 30 * 24 * 3600
+}
+
+# Diario por sesión: cada turno se agrega a un archivo en disco para retomar
+# la entrevista tras un reinicio del servidor sin volver a evaluar respuestas
+SESSION_JOURNAL_CONFIG = {
+    "enabled": os.getenv("SESSION_JOURNAL_ENABLED", "true").lower() == "true",
+    "directory": os.getenv("SESSION_JOURNAL_DIR", "data/journals"),
+    "fsync": os.getenv("SESSION_JOURNAL_FSYNC", "true").lower() == "true"
+}
+
+# Modo de workers (`python run.py --mode workers`): procesos de la API detrás
+# de un dispatcher con hashing consistente, con el almacén SQLite compartido
+WORKER_POOL_CONFIG = {
+    "workers": int(os.getenv("API_WORKERS", str(os.cpu_count() or 1))),
+    "db_path": os.getenv("SESSION_STORE_PATH", "data/sessions.sqlite3"),
+    "retry_down_seconds": 5.0
+}
+
+# Banco de preguntas en memoria: ofertas en caché (las menos usadas se descartan)
+QUESTION_BANK_CONFIG = {
+    "max_entries": int(os.getenv("QUESTION_BANK_MAX_ENTRIES", "256"))
+}
+
+# Índice compilado del banco de preguntas (`python -m agents.tools.question_index`)
+QUESTION_INDEX_CONFIG = {
+    "enabled": os.getenv("QUESTION_INDEX_ENABLED", "true").lower() == "true",
+    "path": os.getenv("QUESTION_INDEX_PATH", "data/questions.idx")
+}
+
+# Recarga en caliente de los archivos de preguntas: inotify (watchdog) o sondeo
+QUESTION_WATCH_CONFIG = {
+    "enabled": os.getenv("QUESTION_WATCH_ENABLED", "true").lower() == "true",
+    "use_inotify": os.getenv("QUESTION_WATCH_INOTIFY", "true").lower() == "true",
+    "poll_interval_seconds": float(os.getenv("QUESTION_WATCH_POLL_SECONDS", "0.5"))
+}
+
+# Calentamiento al iniciar (app/warmup.py): preguntas, clientes y plantillas
+WARMUP_CONFIG = {
+    "enabled": os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+}
@@ -1,12 +1,54 @@
+import argparse
 import subprocess
 import os
+import sys
 
 # Obtener el directorio raíz del proyecto
 root_dir = os.path.dirname(os.path.abspath(__file__))
 
+parser = argparse.ArgumentParser(description="Ejecuta Adaptiera")
+parser.add_argument(
+    "--mode",
+    choices=["streamlit", "api", "workers"],
+    default=os.getenv("ADAPTIERA_MODE", "streamlit"),
+    help=(
+        "streamlit: portal web (por defecto); api: API HTTP de entrevistas (ASGI con uvicorn); "
+        "workers: la API en varios procesos detrás de un dispatcher"
+    )
+)
+parser.add_argument("--host", default=os.getenv("API_HOST", "127.0.0.1"), help="Host de la API")
+parser.add_argument("--port", type=int, default=int(os.getenv("API_PORT", "8000")), help="Puerto de la API")
+parser.add_argument(
+    "--workers", type=int, default=int(os.getenv("API_WORKERS", str(os.cpu_count() or 1))),
+    help="Procesos worker en modo workers (por defecto, uno por núcleo)"
+)
+args = parser.parse_args()
+
 # Configurar el entorno para el subproceso
 env = os.environ.copy()
 env["PYTHONPATH"] = root_dir
 
-# Ejecutar streamlit desde el directorio raíz
-subprocess.run(["streamlit", "run", "app/main.py"], env=env, cwd=root_dir)
+if args.mode == "workers":
+    # Dispatcher en --port y workers en los puertos siguientes; cada worker
+    # hace su calentamiento y el dispatcher espera a que estén listos
+    subprocess.run(
+        [sys.executable, "-m", "app.workers", "--workers", str(args.workers),
+         "--host", args.host, "--port", str(args.port)],
+        env=env, cwd=root_dir
+    )
+else:
+    # La app se sirve en este mismo proceso para que el calentamiento
+    # (preguntas, clientes LLM/email/SMS, plantillas) le sirva al primer candidato
+    os.chdir(root_dir)
+    from app.warmup import run_warmup
+    run_warmup()
+
+    if args.mode == "api":
+        # Ejecutar la API de entrevistas desde el directorio raíz
+        import uvicorn
+        uvicorn.run("app.api:app", host=args.host, port=args.port)
+    else:
+        # Ejecutar streamlit desde el directorio raíz
+        from streamlit.web import cli as stcli
+        sys.argv = ["streamlit", "run", os.path.join(root_dir, "app", "main.py")]
+        sys.exit(stcli.main())
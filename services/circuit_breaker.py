@@ -0,0 +1,126 @@
+"""
+Circuit breaker para las llamadas al LLM de Groq.
+
+Tras `failure_threshold` fallos o respuestas lentas consecutivas el circuito
+se abre y las evaluaciones pasan directamente a la lógica local, sin esperar
+el timeout de cada turno. Pasados `open_seconds`, el circuito queda
+semiabierto y deja pasar una única llamada de prueba: si responde a tiempo
+se cierra, y si no vuelve a abrirse.
+"""
+import threading
+import time
+from typing import Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker thread-safe con estado semiabierto de prueba.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        slow_call_seconds: Optional[float] = None,
+        open_seconds: float = 30.0
+    ):
+        """
+        Inicializa el circuito cerrado.
+
+        Args:
+            failure_threshold (int): Fallos consecutivos que abren el circuito
+            slow_call_seconds (Optional[float]): Duración a partir de la cual una llamada cuenta como fallo
+            open_seconds (float): Tiempo abierto antes de probar de nuevo
+        """
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._stats = {"opened": 0, "rejected": 0, "probes": 0, "failures": 0, "slow_calls": 0}
+
+    def allow_request(self) -> bool:
+        """
+        Indica si se puede llamar al LLM.
+
+        En estado semiabierto solo se permite una llamada de prueba a la vez.
+
+        Returns:
+            bool: True si la llamada puede hacerse
+        """
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+                self._state = HALF_OPEN
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                self._stats["probes"] += 1
+                return True
+            self._stats["rejected"] += 1
+            return False
+
+    def record_success(self, duration: float) -> None:
+        """
+        Registra una llamada terminada; si fue lenta cuenta como fallo.
+
+        Args:
+            duration (float): Duración de la llamada en segundos
+        """
+        if self.slow_call_seconds is not None and duration > self.slow_call_seconds:
+            with self._lock:
+                self._stats["slow_calls"] += 1
+            self.record_failure()
+            return
+        with self._lock:
+            self._state = CLOSED
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Registra un error o un timeout y abre el circuito si corresponde."""
+        with self._lock:
+            self._stats["failures"] += 1
+            self._consecutive_failures += 1
+            if self._state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self._stats["opened"] += 1
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """
+        Libera la llamada de prueba sin registrar un resultado: la llamada no
+        llegó a Groq (por ejemplo, se agotó su espera en la cola del gateway).
+        """
+        with self._lock:
+            self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Estado actual del circuito (closed, open o half_open)."""
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+                return HALF_OPEN
+            return self._state
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Obtiene el estado y los contadores del circuito.
+
+        Returns:
+            Dict[str, object]: Estado, fallos consecutivos, aperturas, rechazos y pruebas
+        """
+        state = self.state
+        with self._lock:
+            stats: Dict[str, object] = dict(self._stats)
+            stats["consecutive_failures"] = self._consecutive_failures
+        stats["state"] = state
+        return stats
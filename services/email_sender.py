@@ -1,15 +1,14 @@
 """
 Módulo para enviar correos electrónicos.
+
+Las librerías de Google (google-auth, oauthlib, googleapiclient) se importan
+dentro de las funciones que las usan, no al importar el módulo.
 """
-from core.config import settings
 import base64
 import os
 import pickle
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.credentials import Credentials
 import smtplib
 import socket
 from pathlib import Path
@@ -20,19 +19,19 @@ ROOT_DIR = Path(__file__).resolve().parents[1]
 CREDENTIALS_PATH = ROOT_DIR / "data" / "credentials.json"
 TOKEN_PATH = ROOT_DIR / "data" / "token.pickle"
 
-# Imprimir información de depuración
-print(f"Directorio raíz: {ROOT_DIR}")
-print(f"Ruta de credenciales: {CREDENTIALS_PATH}")
-print(f"¿El archivo de credenciales existe? {CREDENTIALS_PATH.exists()}")
-
 # Reemplazá con tu cuenta
 SMTP_USER = settings.SMTP_USER
 
-# Scopes requeridos para enviar correo - obtenidos desde settings
-SCOPES = settings.get_gmail_scopes()
-print(f"Usando scopes: {SCOPES}")
+
+def cargar_dependencias_google():
+    """Importa las librerías de Google que usa el envío por OAuth y Gmail API."""
+    from google.auth.transport.requests import Request
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    import googleapiclient.discovery  # noqa: F401
+    return Request, InstalledAppFlow
 
 def obtener_token_oauth():
+    Request, InstalledAppFlow = cargar_dependencias_google()
     creds = None
     if TOKEN_PATH.exists():
         try:
@@ -68,7 +67,7 @@ def obtener_token_oauth():
                         print("No se encontró el archivo de credenciales")
                         return None
                 
-                flow = InstalledAppFlow.from_client_secrets_file(str(CREDENTIALS_PATH), SCOPES)
+                flow = InstalledAppFlow.from_client_secrets_file(str(CREDENTIALS_PATH), settings.get_gmail_scopes())
                 creds = flow.run_local_server(port=0)
                 print("Nuevas credenciales obtenidas")
                 
@@ -142,8 +141,7 @@ def enviar_correo_v2_gmail_api(destinatario, asunto, cuerpo):
     """Alternativa usando Gmail API directamente (recomendado)"""
     try:
         from googleapiclient.discovery import build
-        from email.mime.text import MIMEText
-        import base64
+        Request, InstalledAppFlow = cargar_dependencias_google()
         
         # Obtener credenciales
         creds = None
@@ -166,7 +164,7 @@ def enviar_correo_v2_gmail_api(destinatario, asunto, cuerpo):
                         print(f"Error: El archivo de credenciales no existe en: {CREDENTIALS_PATH}")
                         return False
                     
-                    flow = InstalledAppFlow.from_client_secrets_file(str(CREDENTIALS_PATH), SCOPES)
+                    flow = InstalledAppFlow.from_client_secrets_file(str(CREDENTIALS_PATH), settings.get_gmail_scopes())
                     creds = flow.run_local_server(port=0)
                     
                     TOKEN_PATH.parent.mkdir(exist_ok=True)
@@ -0,0 +1,101 @@
+"""
+Registro de clientes LLM (Groq) compartidos por todo el proceso.
+
+Cada combinación de modelo, API key y URL base se construye una sola vez y
+mantiene sus conexiones HTTP vivas (keep-alive), de modo que los turnos de
+la entrevista no pagan la creación del cliente ni un nuevo handshake TLS.
+"""
+import threading
+from typing import Dict, Optional, Tuple
+
+import httpx
+from langchain_groq import ChatGroq
+
+from core.rrhh_config import LLM_CONFIG
+
+ClaveCliente = Tuple[str, str, Optional[str]]
+
+_clientes: Dict[ClaveCliente, ChatGroq] = {}
+_http_clients: Dict[ClaveCliente, Tuple[httpx.Client, httpx.AsyncClient]] = {}
+_lock = threading.Lock()
+
+
+def _crear_limites() -> httpx.Limits:
+    """
+    Construye los límites del pool de conexiones a partir de LLM_CONFIG.
+
+    Returns:
+        httpx.Limits: Límites de conexiones y keep-alive
+    """
+    return httpx.Limits(
+        max_connections=LLM_CONFIG["max_connections"],
+        max_keepalive_connections=LLM_CONFIG["max_keepalive_connections"],
+        keepalive_expiry=LLM_CONFIG["keepalive_expiry_seconds"]
+    )
+
+
+def obtener_cliente_llm(
+    api_key: str,
+    model: Optional[str] = None,
+    base_url: Optional[str] = None
+) -> ChatGroq:
+    """
+    Obtiene el cliente ChatGroq compartido para el modelo y la API key dados.
+
+    El cliente se crea la primera vez que se solicita y se reutiliza en las
+    llamadas siguientes desde cualquier hilo.
+
+    Args:
+        api_key (str): API key de Groq
+        model (Optional[str]): Modelo a utilizar (por defecto LLM_CONFIG)
+        base_url (Optional[str]): URL base alternativa de la API de Groq
+
+    Returns:
+        ChatGroq: Cliente compartido con conexiones persistentes
+    """
+    model = model or LLM_CONFIG["model"]
+    clave = (model, api_key, base_url)
+
+    cliente = _clientes.get(clave)
+    if cliente is not None:
+        return cliente
+
+    with _lock:
+        cliente = _clientes.get(clave)
+        if cliente is not None:
+            return cliente
+
+        timeout = httpx.Timeout(LLM_CONFIG["timeout_seconds"])
+        http_client = httpx.Client(limits=_crear_limites(), timeout=timeout)
+        http_async_client = httpx.AsyncClient(
+            limits=_crear_limites(), timeout=timeout
+        )
+        cliente = ChatGroq(
+            api_key=api_key,
+            model=model,
+            base_url=base_url,
+            timeout=LLM_CONFIG["timeout_seconds"],
+            http_client=http_client,
+            http_async_client=http_async_client
+        )
+        _http_clients[clave] = (http_client, http_async_client)
+        _clientes[clave] = cliente
+        print(f"🔌 Cliente LLM creado para el modelo: {model}")
+        return cliente
+
+
+def cerrar_clientes_llm() -> None:
+    """
+    Cierra las conexiones HTTP sincrónicas y vacía el registro de clientes.
+
+    Los clientes asíncronos se descartan sin cerrar porque pueden estar
+    ligados a un event loop que ya no existe.
+    """
+    with _lock:
+        for http_client, _ in _http_clients.values():
+            try:
+                http_client.close()
+            except Exception as e:
+                print(f"Error al cerrar cliente HTTP: {e}")
+        _http_clients.clear()
+        _clientes.clear()
@@ -0,0 +1,595 @@
+"""
+Gateway por el que pasan todas las llamadas al LLM de Groq.
+
+Combina tres mecanismos para repartir la cuota de Groq entre los candidatos:
+
+- Un limitador token bucket por modelo, dimensionado según la cuota de la
+  cuenta, para no provocar errores 429.
+- Coalescencia single-flight: los prompts idénticos que ya están en vuelo
+  comparten una única llamada, que espera con la mejor prioridad de todos.
+- Una cola de prioridad acotada: las entrevistas en curso se atienden antes
+  que los trabajos por lotes o de re-evaluación y, si la cola se llena, se
+  descartan primero las solicitudes menos prioritarias.
+
+Las llamadas se ejecutan en el hilo (o event loop) de quien las hace; el
+gateway solo decide cuándo pueden empezar.
+"""
+import asyncio
+import itertools
+import threading
+import time
+from concurrent.futures import CancelledError, Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from core.rrhh_config import LLM_CONFIG, LLM_GATEWAY_CONFIG
+
+# Prioridades de las solicitudes (menor número = se atiende antes)
+PRIORIDAD_ENTREVISTA = 0
+PRIORIDAD_ESPECULATIVA = 5
+PRIORIDAD_LOTE = 10
+
+
+class TokenBucket:
+    """
+    Limitador de tasa token bucket.
+
+    Se recargan `tasa_por_segundo` tokens por segundo hasta un máximo de
+    `capacidad`, que define la ráfaga permitida.
+    """
+
+    def __init__(self, tasa_por_segundo: float, capacidad: float):
+        """
+        Inicializa el bucket lleno.
+
+        Args:
+            tasa_por_segundo (float): Tokens que se recargan por segundo
+            capacidad (float): Máximo de tokens acumulables
+        """
+        self.tasa_por_segundo = tasa_por_segundo
+        self.capacidad = capacidad
+        self._tokens = capacidad
+        self._ultima_recarga = time.monotonic()
+
+    def intentar_consumir(self, tokens: float = 1.0) -> float:
+        """
+        Consume tokens si hay suficientes. No es thread-safe por sí mismo;
+        el gateway lo llama con su lock tomado.
+
+        Args:
+            tokens (float): Tokens a consumir
+
+        Returns:
+            float: 0 si se consumieron, o los segundos a esperar hasta que haya
+        """
+        ahora = time.monotonic()
+        self._tokens = min(
+            self.capacidad,
+            self._tokens + (ahora - self._ultima_recarga) * self.tasa_por_segundo
+        )
+        self._ultima_recarga = ahora
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return 0.0
+        return (tokens - self._tokens) / self.tasa_por_segundo
+
+
+class _Solicitud:
+    """Solicitud esperando turno en la cola del gateway."""
+
+    __slots__ = ("prioridad", "orden", "modelo", "permiso", "encolada_en")
+
+    def __init__(self, prioridad: int, orden: int, modelo: str):
+        self.prioridad = prioridad
+        self.orden = orden
+        self.modelo = modelo
+        self.permiso: Future = Future()
+        self.encolada_en = time.monotonic()
+
+    def clave_orden(self) -> Tuple[int, int]:
+        """Orden de atención: prioridad y, a igual prioridad, orden de llegada."""
+        return self.prioridad, self.orden
+
+
+class Admision:
+    """
+    Momento en que el gateway concedió turno a una llamada.
+
+    Permite medir cuánto tardó el LLM sin contar la espera en la cola y
+    saber si un timeout ocurrió mientras la llamada todavía esperaba turno.
+    Si la llamada se coalesció con otra, vale el turno de la llamada líder.
+    """
+
+    __slots__ = ("admitida_en",)
+
+    def __init__(self):
+        self.admitida_en: Optional[float] = None
+
+    def marcar(self, momento: Optional[float] = None) -> None:
+        """Registra el turno concedido (solo el primero cuenta)."""
+        if self.admitida_en is None:
+            self.admitida_en = time.monotonic() if momento is None else momento
+
+    @property
+    def admitida(self) -> bool:
+        """True si el gateway ya le concedió turno."""
+        return self.admitida_en is not None
+
+    def duracion(self) -> float:
+        """Segundos desde que se concedió el turno (0 si todavía no se concedió)."""
+        if self.admitida_en is None:
+            return 0.0
+        return time.monotonic() - self.admitida_en
+
+
+class _Vuelo:
+    """Llamada en vuelo que comparten los prompts idénticos (coalescencia)."""
+
+    __slots__ = ("futuro", "prioridad", "solicitud", "admitida_en", "admisiones")
+
+    def __init__(self, prioridad: int):
+        self.futuro: Future = Future()
+        # Mejor prioridad entre el líder y quienes se unieron
+        self.prioridad = prioridad
+        # Solicitud del líder en la cola, cuando ya la hizo
+        self.solicitud: Optional[_Solicitud] = None
+        # Turno del líder y admisiones de quienes esperan que se conceda
+        self.admitida_en: Optional[float] = None
+        self.admisiones: List[Admision] = []
+
+
+class LLMGateway:
+    """
+    Controla la admisión de llamadas al LLM: tasa por modelo, concurrencia
+    máxima, cola de prioridad acotada y coalescencia de prompts idénticos.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        burst: int,
+        max_concurrency: int,
+        max_queue: int,
+        max_wait_seconds: float,
+        max_call_seconds: float = 30.0
+    ):
+        """
+        Inicializa el gateway.
+
+        Args:
+            requests_per_minute (float): Solicitudes por minuto permitidas por modelo
+            burst (int): Solicitudes que pueden salir en ráfaga por modelo
+            max_concurrency (int): Llamadas simultáneas máximas
+            max_queue (int): Solicitudes máximas esperando turno
+            max_wait_seconds (float): Espera máxima en cola antes de abandonar
+            max_call_seconds (float): Duración máxima de una llamada; con la espera en
+                cola, acota cuánto aguarda quien se une a una llamada en vuelo
+        """
+        self.requests_per_minute = requests_per_minute
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+        self.max_call_seconds = max_call_seconds
+
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._cola: List[_Solicitud] = []
+        self._activas = 0
+        self._orden = itertools.count()
+        self._temporizador: Optional[threading.Timer] = None
+        self._en_vuelo: Dict[Hashable, _Vuelo] = {}
+        self._stats = {
+            "requests": 0,
+            "coalesced": 0,
+            "queued": 0,
+            "rejected": 0,
+            "timeouts": 0,
+            "promoted": 0,
+            "wait_seconds": 0.0,
+            "max_queue_depth": 0
+        }
+
+    # ------------------------------------------------------------------
+    # Cola de prioridad y limitador
+    # ------------------------------------------------------------------
+
+    def _bucket(self, modelo: str) -> TokenBucket:
+        """Obtiene (o crea) el token bucket de un modelo."""
+        bucket = self._buckets.get(modelo)
+        if bucket is None:
+            bucket = TokenBucket(self.requests_per_minute / 60.0, self.burst)
+            self._buckets[modelo] = bucket
+        return bucket
+
+    def _encolar(self, prioridad: int, modelo: str, vuelo: Optional[_Vuelo] = None) -> _Solicitud:
+        """
+        Agrega una solicitud a la cola y despacha las que puedan empezar.
+
+        Args:
+            prioridad (int): Prioridad de quien llama
+            modelo (str): Modelo de la llamada
+            vuelo (Optional[_Vuelo]): Llamada en vuelo que lidera quien llama
+
+        Raises:
+            RuntimeError: Si la cola está llena de solicitudes igual o más prioritarias
+        """
+        solicitud = _Solicitud(prioridad, next(self._orden), modelo)
+        with self._lock:
+            if vuelo is not None:
+                # Alguien más prioritario pudo unirse antes de que el líder se encolara
+                solicitud.prioridad = min(prioridad, vuelo.prioridad)
+                vuelo.solicitud = solicitud
+            self._stats["requests"] += 1
+            pendientes = [s for s in self._cola if not s.permiso.done()]
+            if len(pendientes) >= self.max_queue:
+                peor = max(pendientes, key=_Solicitud.clave_orden)
+                if peor.clave_orden() < solicitud.clave_orden():
+                    self._stats["rejected"] += 1
+                    raise RuntimeError("Cola del gateway LLM llena")
+                # Desplazar la solicitud menos prioritaria
+                self._stats["rejected"] += 1
+                if peor.permiso.set_running_or_notify_cancel():
+                    peor.permiso.set_exception(RuntimeError("Desplazada de la cola del gateway LLM"))
+                pendientes.remove(peor)
+            pendientes.append(solicitud)
+            self._cola = pendientes
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], len(self._cola))
+            self._despachar_locked()
+            if not solicitud.permiso.done():
+                self._stats["queued"] += 1
+        return solicitud
+
+    def _despachar(self) -> None:
+        """Despacha las solicitudes que puedan empezar (toma el lock)."""
+        with self._lock:
+            self._temporizador = None
+            self._despachar_locked()
+
+    def _despachar_locked(self) -> None:
+        """
+        Concede turno, por orden de prioridad, a las solicitudes cuyo modelo
+        tiene tokens disponibles mientras haya cupo de concurrencia.
+        """
+        espera_minima: Optional[float] = None
+        restantes = []
+        for solicitud in sorted(self._cola, key=_Solicitud.clave_orden):
+            if solicitud.permiso.done():
+                continue
+            if self._activas >= self.max_concurrency:
+                restantes.append(solicitud)
+                continue
+            espera = self._bucket(solicitud.modelo).intentar_consumir()
+            if espera > 0:
+                espera_minima = espera if espera_minima is None else min(espera_minima, espera)
+                restantes.append(solicitud)
+                continue
+            # Reclamar la solicitud; falla si quien esperaba ya la abandonó
+            if solicitud.permiso.set_running_or_notify_cancel():
+                self._activas += 1
+                self._stats["wait_seconds"] += time.monotonic() - solicitud.encolada_en
+                solicitud.permiso.set_result(None)
+        self._cola = restantes
+
+        if espera_minima is not None and self._temporizador is None:
+            self._temporizador = threading.Timer(espera_minima, self._despachar)
+            self._temporizador.daemon = True
+            self._temporizador.start()
+
+    def _liberar(self) -> None:
+        """Libera un cupo de concurrencia y despacha la cola."""
+        with self._lock:
+            self._activas -= 1
+            self._despachar_locked()
+
+    def _abandonar(self, solicitud: _Solicitud) -> bool:
+        """
+        Intenta retirar de la cola una solicitud que agotó su espera.
+
+        Returns:
+            bool: True si se retiró; False si ya se le había concedido turno
+        """
+        if solicitud.permiso.cancel():
+            with self._lock:
+                self._stats["timeouts"] += 1
+            return True
+        return False
+
+    @staticmethod
+    def _turno_concedido(solicitud: _Solicitud) -> bool:
+        """Indica si a la solicitud se le concedió turno (y ocupa un cupo)."""
+        permiso = solicitud.permiso
+        return permiso.done() and not permiso.cancelled() and permiso.exception() is None
+
+    def _esperar_turno(self, prioridad: int, modelo: str, vuelo: Optional[_Vuelo] = None) -> None:
+        """
+        Espera turno de forma bloqueante.
+
+        Raises:
+            TimeoutError: Si se agota la espera máxima
+            RuntimeError: Si otra solicitud más prioritaria la desplazó de la cola
+        """
+        solicitud = self._encolar(prioridad, modelo, vuelo)
+        try:
+            solicitud.permiso.result(timeout=self.max_wait_seconds)
+        except (FutureTimeoutError, CancelledError):
+            if self._abandonar(solicitud):
+                raise TimeoutError("Tiempo de espera agotado en la cola del gateway LLM")
+            # El permiso se resolvió al vencer la espera: turno concedido o desplazada
+            solicitud.permiso.result()
+
+    async def _aesperar_turno(self, prioridad: int, modelo: str, vuelo: Optional[_Vuelo] = None) -> None:
+        """
+        Espera turno sin bloquear el event loop.
+
+        Raises:
+            TimeoutError: Si se agota la espera máxima
+            RuntimeError: Si otra solicitud más prioritaria la desplazó de la cola
+        """
+        solicitud = self._encolar(prioridad, modelo, vuelo)
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(solicitud.permiso)),
+                timeout=self.max_wait_seconds
+            )
+        except asyncio.TimeoutError:
+            if self._abandonar(solicitud):
+                raise TimeoutError("Tiempo de espera agotado en la cola del gateway LLM")
+            # El permiso se resolvió al vencer la espera: turno concedido o desplazada
+            await asyncio.wrap_future(solicitud.permiso)
+        except asyncio.CancelledError:
+            # Devolver el cupo si el turno llegó justo cuando se canceló la tarea
+            if not self._abandonar(solicitud) and self._turno_concedido(solicitud):
+                self._liberar()
+            raise
+
+    # ------------------------------------------------------------------
+    # Coalescencia single-flight
+    # ------------------------------------------------------------------
+
+    def _unirse_o_liderar(
+        self,
+        clave: Hashable,
+        prioridad: int,
+        admision: Optional[Admision] = None
+    ) -> Tuple[_Vuelo, bool]:
+        """
+        Obtiene la llamada en vuelo para un prompt o registra una nueva.
+
+        Si quien se une es más prioritario que el líder y este todavía espera
+        turno, el líder pasa a la prioridad de quien se unió: una entrevista
+        no espera detrás de los lotes por compartir el prompt con uno.
+
+        Returns:
+            Tupla (llamada en vuelo, True si quien llama debe ejecutarla)
+        """
+        with self._lock:
+            vuelo = self._en_vuelo.get(clave)
+            if vuelo is None:
+                vuelo = _Vuelo(prioridad)
+                self._en_vuelo[clave] = vuelo
+                return vuelo, True
+            self._stats["coalesced"] += 1
+            if admision is not None:
+                if vuelo.admitida_en is not None:
+                    admision.marcar(vuelo.admitida_en)
+                else:
+                    vuelo.admisiones.append(admision)
+            if prioridad < vuelo.prioridad:
+                vuelo.prioridad = prioridad
+                solicitud = vuelo.solicitud
+                if solicitud is not None and not solicitud.permiso.done():
+                    solicitud.prioridad = prioridad
+                    self._stats["promoted"] += 1
+                    self._despachar_locked()
+            return vuelo, False
+
+    def _marcar_admision(self, vuelo: Optional[_Vuelo], admision: Optional[Admision]) -> None:
+        """Registra el turno concedido en quien llama y en quienes esperan su llamada."""
+        ahora = time.monotonic()
+        if admision is not None:
+            admision.marcar(ahora)
+        if vuelo is not None:
+            with self._lock:
+                vuelo.admitida_en = ahora
+                admisiones, vuelo.admisiones = vuelo.admisiones, []
+            for otra in admisiones:
+                otra.marcar(ahora)
+
+    def _espera_seguidor(self) -> float:
+        """Tiempo máximo que aguarda quien se une a una llamada en vuelo."""
+        return self.max_wait_seconds + self.max_call_seconds
+
+    def _terminar(self, clave: Hashable, vuelo: _Vuelo, resultado: Any, error: Optional[BaseException]) -> None:
+        """Publica el resultado de la llamada líder y la retira de las en vuelo."""
+        with self._lock:
+            self._en_vuelo.pop(clave, None)
+        if vuelo.futuro.cancelled():
+            return
+        if error is not None:
+            vuelo.futuro.set_exception(error)
+        else:
+            vuelo.futuro.set_result(resultado)
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+
+    def invoke(
+        self,
+        llm: Any,
+        prompt: str,
+        modelo: str,
+        prioridad: int = PRIORIDAD_ENTREVISTA,
+        admision: Optional[Admision] = None
+    ) -> Any:
+        """
+        Ejecuta `llm.invoke(prompt)` respetando la cuota, la prioridad y la
+        coalescencia de prompts idénticos.
+
+        Args:
+            llm: Cliente LLM (ChatGroq compartido)
+            prompt (str): Prompt a enviar
+            modelo (str): Modelo del cliente; define el bucket de cuota
+            prioridad (int): PRIORIDAD_ENTREVISTA o PRIORIDAD_LOTE
+            admision (Optional[Admision]): Registro del turno concedido, para medir la llamada
+
+        Returns:
+            Respuesta del LLM
+
+        Raises:
+            RuntimeError: Si la cola está llena
+            TimeoutError: Si se agota la espera en cola
+        """
+        clave = (modelo, id(llm), prompt)
+        vuelo, lider = self._unirse_o_liderar(clave, prioridad, admision)
+        if not lider:
+            try:
+                return vuelo.futuro.result(timeout=self._espera_seguidor())
+            except FutureTimeoutError:
+                raise TimeoutError("Tiempo de espera agotado en una llamada compartida del gateway LLM")
+
+        resultado, error = None, None
+        try:
+            self._esperar_turno(prioridad, modelo, vuelo)
+            self._marcar_admision(vuelo, admision)
+            try:
+                resultado = llm.invoke(prompt)
+            finally:
+                self._liberar()
+        except BaseException as e:
+            error = e
+        self._terminar(clave, vuelo, resultado, error)
+        if error is not None:
+            raise error
+        return resultado
+
+    async def ainvoke(
+        self,
+        llm: Any,
+        prompt: str,
+        modelo: str,
+        prioridad: int = PRIORIDAD_ENTREVISTA,
+        admision: Optional[Admision] = None
+    ) -> Any:
+        """
+        Variante asíncrona de `invoke` que ejecuta `llm.ainvoke(prompt)`.
+
+        Args:
+            llm: Cliente LLM (ChatGroq compartido)
+            prompt (str): Prompt a enviar
+            modelo (str): Modelo del cliente; define el bucket de cuota
+            prioridad (int): PRIORIDAD_ENTREVISTA o PRIORIDAD_LOTE
+            admision (Optional[Admision]): Registro del turno concedido, para medir la llamada
+
+        Returns:
+            Respuesta del LLM
+
+        Raises:
+            RuntimeError: Si la cola está llena
+            TimeoutError: Si se agota la espera en cola
+        """
+        clave = (modelo, id(llm), prompt)
+        vuelo, lider = self._unirse_o_liderar(clave, prioridad, admision)
+        if not lider:
+            try:
+                return await asyncio.wait_for(
+                    asyncio.shield(asyncio.wrap_future(vuelo.futuro)), timeout=self._espera_seguidor()
+                )
+            except asyncio.TimeoutError:
+                raise TimeoutError("Tiempo de espera agotado en una llamada compartida del gateway LLM")
+
+        resultado, error = None, None
+        try:
+            await self._aesperar_turno(prioridad, modelo, vuelo)
+            self._marcar_admision(vuelo, admision)
+            try:
+                resultado = await llm.ainvoke(prompt)
+            finally:
+                self._liberar()
+        except BaseException as e:
+            error = e
+        self._terminar(clave, vuelo, resultado, error)
+        if error is not None:
+            raise error
+        return resultado
+
+    def stream(
+        self,
+        llm: Any,
+        prompt: str,
+        modelo: str,
+        prioridad: int = PRIORIDAD_ENTREVISTA,
+        admision: Optional[Admision] = None
+    ) -> Iterator[str]:
+        """
+        Ejecuta `llm.stream(prompt)` respetando la cuota y la prioridad.
+
+        Las llamadas en streaming no se coalescen: cada consumidor necesita
+        sus propios fragmentos a medida que llegan.
+
+        Args:
+            llm: Cliente LLM (ChatGroq compartido)
+            prompt (str): Prompt a enviar
+            modelo (str): Modelo del cliente; define el bucket de cuota
+            prioridad (int): PRIORIDAD_ENTREVISTA o PRIORIDAD_LOTE
+            admision (Optional[Admision]): Registro del turno concedido, para medir la llamada
+
+        Yields:
+            str: Fragmentos de texto de la respuesta
+
+        Raises:
+            RuntimeError: Si la cola está llena
+            TimeoutError: Si se agota la espera en cola
+        """
+        self._esperar_turno(prioridad, modelo)
+        self._marcar_admision(None, admision)
+        try:
+            for chunk in llm.stream(prompt):
+                text = chunk.content if hasattr(chunk, "content") else str(chunk)
+                if text:
+                    yield text
+        finally:
+            self._liberar()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Obtiene las métricas del gateway.
+
+        Returns:
+            Dict[str, float]: Solicitudes, coalescidas, encoladas, rechazadas,
+            esperas agotadas, espera media y ocupación actual
+        """
+        with self._lock:
+            stats: Dict[str, float] = dict(self._stats)
+            stats["queue_depth"] = sum(1 for s in self._cola if not s.permiso.done())
+            stats["active"] = self._activas
+        admitted = stats["requests"] - stats["rejected"] - stats["timeouts"]
+        stats["avg_wait_seconds"] = stats["wait_seconds"] / admitted if admitted > 0 else 0.0
+        return stats
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def obtener_gateway_llm() -> LLMGateway:
+    """
+    Obtiene el gateway LLM compartido por todo el proceso.
+
+    Returns:
+        LLMGateway: Instancia única configurada según LLM_GATEWAY_CONFIG
+    """
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = LLMGateway(
+                    requests_per_minute=LLM_GATEWAY_CONFIG["requests_per_minute"],
+                    burst=LLM_GATEWAY_CONFIG["burst"],
+                    max_concurrency=LLM_GATEWAY_CONFIG["max_concurrency"],
+                    max_queue=LLM_GATEWAY_CONFIG["max_queue"],
+                    max_wait_seconds=LLM_GATEWAY_CONFIG["max_wait_seconds"],
+                    max_call_seconds=LLM_CONFIG["timeout_seconds"]
+                )
+    return _gateway
@@ -1,22 +1,36 @@
 """
 Módulo para enviar mensajes SMS.
 """
+import threading
+
 from core.config import settings
-from twilio.rest import Client
 
-# Cargar variables de entorno o directamente del archivo credentials.json
-TWILIO_ACCOUNT_SID = settings.TWILIO_ACCOUNT_SID
-TWILIO_AUTH_TOKEN = settings.TWILIO_AUTH_TOKEN
-TWILIO_PHONE_NUMBER = settings.TWILIO_PHONE_NUMBER
+_client = None
+_client_lock = threading.Lock()
+
+
+def obtener_cliente_sms():
+    """
+    Obtiene el cliente de Twilio compartido, creándolo la primera vez.
+
+    Twilio se importa recién acá: importar este módulo no cuesta nada hasta
+    que se envía el primer SMS (o el calentamiento crea el cliente).
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from twilio.rest import Client
 
-client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+                _client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
+    return _client
 
 def enviar_sms(destinatario: str, mensaje: str) -> bool:
     mensaje = mensaje[:50]
     try:
-        message = client.messages.create(
+        message = obtener_cliente_sms().messages.create(
             body=mensaje,
-            from_=TWILIO_PHONE_NUMBER,
+            from_=settings.TWILIO_PHONE_NUMBER,
             to=destinatario
         )
         print(f"SMS Enviado a : {destinatario}")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Perfil del tiempo de importación en frío de la app.
+
+Importa el módulo indicado (por defecto `app.main`) en procesos nuevos con
+`python -X importtime`, informa la mediana del tiempo total y los paquetes
+que más tardan en importarse (tiempo propio acumulado por paquete de primer
+nivel). El calentamiento se desactiva: se mide solo el grafo de imports. Uso:
+
+    python tests/bench_imports.py [--module app.main] [--runs 5] [--top 15]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Tuple
+
+root_dir = Path(__file__).parent.parent
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def cold_import(module: str) -> Tuple[float, str]:
+    """
+    Importa el módulo en un proceso nuevo.
+
+    Returns:
+        Tuple[float, str]: Segundos de la importación y salida de -X importtime
+    """
+    code = (
+        "import time; started = time.perf_counter(); "
+        f"import {module}; print(time.perf_counter() - started)"
+    )
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(root_dir)
+    env["WARMUP_ENABLED"] = "false"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=root_dir, env=env, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def self_time_by_package(importtime: str) -> Dict[str, int]:
+    """Suma el tiempo propio (µs) de cada módulo bajo su paquete de primer nivel."""
+    totals: Dict[str, int] = defaultdict(int)
+    for match in IMPORTTIME_LINE.finditer(importtime):
+        self_us, _, _, name = match.groups()
+        totals[name.split(".")[0]] += int(self_us)
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Perfil de importación en frío")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    samples = []
+    importtime = ""
+    for _ in range(args.runs):
+        seconds, importtime = cold_import(args.module)
+        samples.append(seconds)
+
+    print(f"import {args.module}: mediana {statistics.median(samples) * 1000:.0f} ms "
+          f"(mín {min(samples) * 1000:.0f} ms, {args.runs} procesos)")
+    totals = self_time_by_package(importtime)
+    print("Paquetes más lentos (tiempo propio, última corrida):")
+    for package, micros in sorted(totals.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {package:<28} {micros / 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
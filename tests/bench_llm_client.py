@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark de latencia por turno: ChatGroq nuevo en cada turno frente al
+cliente compartido de services/llm_client.py.
+
+Levanta un endpoint local compatible con la API de Groq, de modo que no se
+necesita red ni GROQ_API_KEY. Uso:
+
+    python tests/bench_llm_client.py [turnos]
+"""
+
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, List
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from langchain_groq import ChatGroq
+
+from core.rrhh_config import LLM_CONFIG
+from services.llm_client import cerrar_clientes_llm, obtener_cliente_llm
+
+API_KEY_FALSA = "gsk_benchmark_local"
+PROMPT = "Pregunta: ¿Cuál es tu nombre completo?\nRespuesta: Juan Pérez"
+
+
+class FakeGroqHandler(BaseHTTPRequestHandler):
+    """Handler que responde como el endpoint de chat completions de Groq."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    conexiones = 0
+    lock = threading.Lock()
+
+    def setup(self) -> None:
+        """Cuenta cada conexión TCP nueva que abre el cliente."""
+        super().setup()
+        with FakeGroqHandler.lock:
+            FakeGroqHandler.conexiones += 1
+
+    def do_POST(self) -> None:
+        """Devuelve siempre una evaluación SATISFACTORIA."""
+        longitud = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(longitud)
+        cuerpo = json.dumps({
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": LLM_CONFIG["model"],
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "SATISFACTORIA"},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": 10,
+                "completion_tokens": 1,
+                "total_tokens": 11
+            }
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, format: str, *args) -> None:
+        """Silencia el log de acceso del servidor."""
+
+
+def medir_turnos(turno: Callable[[], None], turnos: int) -> List[float]:
+    """
+    Ejecuta un turno varias veces y devuelve sus latencias en milisegundos.
+
+    Args:
+        turno (Callable[[], None]): Función que ejecuta un turno completo
+        turnos (int): Número de turnos a medir
+
+    Returns:
+        List[float]: Latencia de cada turno en milisegundos
+    """
+    latencias = []
+    for _ in range(turnos):
+        inicio = time.perf_counter()
+        turno()
+        latencias.append((time.perf_counter() - inicio) * 1000)
+    return latencias
+
+
+def imprimir_resultado(nombre: str, latencias: List[float], conexiones: int) -> None:
+    """
+    Imprime las estadísticas de latencia de un escenario.
+
+    Args:
+        nombre (str): Nombre del escenario
+        latencias (List[float]): Latencias en milisegundos
+        conexiones (int): Conexiones TCP abiertas durante el escenario
+    """
+    ordenadas = sorted(latencias)
+    p95 = ordenadas[int(len(ordenadas) * 0.95) - 1]
+    print(
+        f"{nombre:<28} media={statistics.mean(latencias):7.2f} ms  "
+        f"p50={statistics.median(latencias):7.2f} ms  "
+        f"p95={p95:7.2f} ms  conexiones={conexiones}"
+    )
+
+
+def main() -> None:
+    """Ejecuta el benchmark antes/después contra el endpoint local."""
+    turnos = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), FakeGroqHandler)
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    base_url = f"http://127.0.0.1:{servidor.server_address[1]}"
+
+    def turno_sin_pool() -> None:
+        llm = ChatGroq(
+            api_key=API_KEY_FALSA,
+            model=LLM_CONFIG["model"],
+            base_url=base_url
+        )
+        llm.invoke(PROMPT)
+
+    def turno_con_pool() -> None:
+        llm = obtener_cliente_llm(API_KEY_FALSA, base_url=base_url)
+        llm.invoke(PROMPT)
+
+    print(f"📊 Latencia por turno ({turnos} turnos, endpoint local)")
+    print("-" * 90)
+    try:
+        for nombre, turno in [
+            ("Antes: ChatGroq por turno", turno_sin_pool),
+            ("Después: cliente compartido", turno_con_pool)
+        ]:
+            turno()
+            FakeGroqHandler.conexiones = 0
+            latencias = medir_turnos(turno, turnos)
+            imprimir_resultado(nombre, latencias, FakeGroqHandler.conexiones)
+    finally:
+        cerrar_clientes_llm()
+        servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memoria del historial de una entrevista: lista de mensajes de
+LangChain frente al MessageLog compacto de ConversationState.
+
+Reproduce con SimpleRRHHAgent una entrevista con muchas repreguntas (sin
+GROQ_API_KEY, con la evaluación local) hasta completar los turnos pedidos y
+mide con tracemalloc lo que ocupa cada representación del mismo historial.
+Uso:
+
+    python tests/bench_message_log.py [turnos]
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from agents.simple_agent import SimpleRRHHAgent
+from core.models.message_log import MessageLog
+
+MESSAGE_CLASSES = {"human": HumanMessage, "ai": AIMessage, "system": SystemMessage}
+ANSWERS = [
+    "Juan Pérez",
+    "Trabajé tres años como desarrollador backend en una fintech",
+    "Python, Django, PostgreSQL y Docker",
+    "Quiero crecer en un equipo con más desafíos técnicos",
+    "1.500.000 brutos"
+]
+
+
+def record_interview(turns: int) -> List[Tuple[str, str]]:
+    """
+    Reproduce una entrevista de `turns` turnos con repreguntas y devuelve su historial.
+
+    Args:
+        turns: Cantidad de mensajes del candidato
+
+    Returns:
+        List[Tuple[str, str]]: Historial como tuplas (rol, texto)
+    """
+    agent = SimpleRRHHAgent(speculative=False)
+    agent.extractor = None
+    agent.start_conversation()
+    vague_turns = max(turns - len(ANSWERS), 0)
+    script = []
+    for answer in ANSWERS:
+        # Las respuestas vagas ("no") provocan una repregunta en cada turno
+        script += ["no"] * (vague_turns // len(ANSWERS))
+        script.append(answer)
+    script += ["no"] * (turns - len(script))
+    for answer in script[:turns]:
+        if agent.is_conversation_complete():
+            break
+        agent.process_user_input(answer)
+    return list(agent.state.messages.iter_text())
+
+
+def measure(build: Callable[[], object]) -> Tuple[int, object]:
+    """
+    Mide los bytes que quedan asignados al construir una estructura.
+
+    Args:
+        build: Función que construye la estructura
+
+    Returns:
+        Tuple[int, object]: Bytes asignados y la estructura (para mantenerla viva)
+    """
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return allocated, result
+
+
+def main() -> None:
+    """Compara la memoria por sesión de ambas representaciones."""
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    os.environ.pop("GROQ_API_KEY", None)
+
+    # Las respuestas se guardan en data/, así que se trabaja sobre una copia
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        shutil.copytree(root_dir / "data", Path(workdir) / "data", ignore=shutil.ignore_patterns("*.sqlite3"))
+        os.chdir(workdir)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                history = record_interview(turns)
+        finally:
+            os.chdir(original_cwd)
+
+    # Cada representación copia el texto, como lo haría una sesión nueva
+    list_bytes, _ = measure(lambda: [
+        MESSAGE_CLASSES[role](content=text.encode("utf-8").decode("utf-8")) for role, text in history
+    ])
+    log_bytes, log = measure(lambda: MessageLog(
+        (role, text.encode("utf-8").decode("utf-8")) for role, text in history
+    ))
+    text_bytes = sum(len(text.encode("utf-8")) for _, text in history)
+
+    print(f"📊 Memoria del historial ({turns} turnos, {len(history)} mensajes, {text_bytes} bytes de texto)")
+    print("-" * 70)
+    print(f"{'Antes: lista de mensajes LangChain':<38} {list_bytes / 1024:8.1f} KiB")
+    print(f"{'Después: MessageLog compacto':<38} {log_bytes / 1024:8.1f} KiB")
+    print(f"Reducción: {(1 - log_bytes / list_bytes) * 100:.1f}% ({list_bytes / log_bytes:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
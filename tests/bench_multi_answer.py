@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Benchmark de turnos por entrevista con y sin extracción de respuestas múltiples.
+
+Reproduce las entrevistas de tests/data/replay_interviews.json: en cada turno
+el candidato responde la pregunta actual con su siguiente mensaje que la
+cubre (o repite el fragmento correspondiente si ya lo había dicho en otro
+mensaje). Groq se reemplaza por un LLM local que acepta todas las respuestas
+y, para la extracción, devuelve los fragmentos anotados en el corpus, de modo
+que se mide el techo de la mejora sin red ni GROQ_API_KEY. Uso:
+
+    python tests/bench_multi_answer.py
+"""
+
+import contextlib
+import io
+import json
+import os
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from unittest import mock
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from agents.simple_agent import SimpleRRHHAgent
+from agents.tools.answer_extractor import AnswerExtractor
+from agents.tools.model_cascade import ModelCascade
+from agents.tools.response_evaluator import ResponseEvaluator
+from agents.tools.file_search_tool import search_question_specs_direct
+from core.rrhh_config import ANSWER_EXTRACTION_CONFIG, LLM_CONFIG
+from services.llm_gateway import LLMGateway
+
+CORPUS = Path(__file__).parent / "data" / "replay_interviews.json"
+NUMBERED_QUESTION = re.compile(r"^\s*(\d+)\.\s+(.+?)\s*$", re.MULTILINE)
+
+
+class ReplayLLM:
+    """LLM local que acepta las respuestas y extrae según las anotaciones del corpus."""
+
+    def __init__(self):
+        self.answers: Dict[str, str] = {}
+        self.calls = 0
+
+    def invoke(self, prompt: str) -> str:
+        """Responde una evaluación o una extracción."""
+        self.calls += 1
+        if "Preguntas que todavía no se le hicieron" not in prompt:
+            return "SATISFACTORIA"
+        covered = {
+            number: self.answers[question]
+            for number, question in NUMBERED_QUESTION.findall(prompt)
+            if question in self.answers
+        }
+        return json.dumps(covered, ensure_ascii=False)
+
+
+def make_gateway() -> LLMGateway:
+    """Gateway sin límites de tasa apreciables."""
+    return LLMGateway(
+        requests_per_minute=600000, burst=1000, max_concurrency=8, max_queue=100, max_wait_seconds=5
+    )
+
+
+def replay_interview(
+    interview: Dict[str, Any],
+    llm: ReplayLLM,
+    extractor: Optional[AnswerExtractor]
+) -> int:
+    """
+    Reproduce una entrevista y devuelve cuántos turnos necesitó el candidato.
+
+    Args:
+        interview: Entrevista del corpus
+        llm: LLM local compartido
+        extractor: Extractor de respuestas (None reproduce el comportamiento anterior)
+
+    Returns:
+        int: Mensajes enviados por el candidato hasta terminar la entrevista
+    """
+    id_job_offer = interview["id_job_offer"]
+    questions = [spec.text for spec in search_question_specs_direct("data/questions.json", id_job_offer)]
+    messages = interview["messages"]
+    fragments = {
+        int(index): fragment
+        for message in messages
+        for index, fragment in message["answers"].items()
+    }
+
+    evaluator = ResponseEvaluator(cascade=ModelCascade([LLM_CONFIG["model"]], gateway=make_gateway()))
+    with mock.patch("agents.simple_agent.get_response_evaluator", return_value=evaluator), \
+            mock.patch("agents.simple_agent.get_answer_extractor", return_value=extractor):
+        agent = SimpleRRHHAgent(id_job_offer, speculative=False)
+    agent.start_conversation()
+
+    used = set()
+    turns = 0
+    while not agent.is_conversation_complete():
+        index = agent.state.current_question_index
+        position = next(
+            (i for i, message in enumerate(messages) if i not in used and str(index) in message["answers"]),
+            None
+        )
+        if position is None:
+            # El candidato ya lo había contado en otro mensaje: lo repite
+            text, answers = fragments[index], {str(index): fragments[index]}
+        else:
+            used.add(position)
+            text, answers = messages[position]["text"], messages[position]["answers"]
+        llm.answers = {questions[int(i)]: fragment for i, fragment in answers.items()}
+        agent.process_user_input(text)
+        turns += 1
+    return turns
+
+
+def run_corpus(interviews: List[Dict[str, Any]], with_extraction: bool) -> Dict[str, float]:
+    """
+    Reproduce todo el corpus en un modo.
+
+    Args:
+        interviews: Entrevistas del corpus
+        with_extraction: Si se usa el extractor de respuestas múltiples
+
+    Returns:
+        Dict[str, float]: Turnos medios y llamadas al LLM por entrevista
+    """
+    llm = ReplayLLM()
+    extractor = None
+    if with_extraction:
+        extractor = AnswerExtractor(
+            ANSWER_EXTRACTION_CONFIG["model"], min_words=ANSWER_EXTRACTION_CONFIG["min_words"],
+            gateway=make_gateway()
+        )
+    turns = []
+    with mock.patch("agents.tools.model_cascade.obtener_cliente_llm", return_value=llm), \
+            mock.patch("agents.tools.answer_extractor.obtener_cliente_llm", return_value=llm), \
+            contextlib.redirect_stdout(io.StringIO()):
+        for interview in interviews:
+            turns.append(replay_interview(interview, llm, extractor))
+    return {
+        "turns": statistics.mean(turns),
+        "llm_calls": llm.calls / len(interviews)
+    }
+
+
+def main() -> None:
+    """Ejecuta el corpus antes/después en un directorio de trabajo temporal."""
+    interviews = json.loads(CORPUS.read_text(encoding="utf-8"))["interviews"]
+    os.environ["GROQ_API_KEY"] = os.environ.get("GROQ_API_KEY") or "gsk_benchmark_local"
+
+    # Las respuestas se guardan en data/, así que se trabaja sobre una copia
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        shutil.copytree(root_dir / "data", Path(workdir) / "data", ignore=shutil.ignore_patterns("*.sqlite3"))
+        os.chdir(workdir)
+        try:
+            before = run_corpus(interviews, with_extraction=False)
+            after = run_corpus(interviews, with_extraction=True)
+        finally:
+            os.chdir(original_cwd)
+
+    print(f"📊 Turnos por entrevista ({len(interviews)} entrevistas de {CORPUS.name})")
+    print("-" * 70)
+    for name, result in [("Antes: pregunta a pregunta", before), ("Después: extracción múltiple", after)]:
+        print(f"{name:<30} turnos={result['turns']:5.2f}  llamadas LLM={result['llm_calls']:5.2f}")
+    print(f"Reducción de turnos: {(1 - after['turns'] / before['turns']) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark de búsqueda de preguntas por oferta con 10.000 ofertas sintéticas.
+
+Genera `questions_{id}.json` en un directorio temporal, compila el índice y
+compara el costo por búsqueda de:
+
+- JSON: abrir y parsear el archivo de la oferta (lo que se hacía en cada inicio)
+- índice: `QuestionIndex.get` sobre el artefacto compilado
+- banco: `QuestionBank.get` con el índice detrás (stat + caché en memoria)
+
+Uso:
+
+    python tests/bench_question_index.py [--offers 10000] [--lookups 20000]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from agents.tools.question_bank import QuestionBank, load_question_file
+from agents.tools.question_index import QuestionIndex, build_question_index
+
+VALIDATORS = ["free_text", "name", "yes_no", {"type": "numeric_range", "min": 100, "max": 100000000}]
+
+
+def generate_offers(data_dir: Path, offers: int) -> None:
+    """Escribe el archivo por defecto y uno por oferta, con 5 a 12 preguntas cada uno."""
+    rng = random.Random(42)
+    (data_dir / "questions.json").write_text(
+        json.dumps({"questions": ["¿Cuál es tu nombre completo?"]}), encoding="utf-8"
+    )
+    for offer in range(offers):
+        questions = [
+            {"text": f"¿Pregunta {number} de la oferta {offer}?", "validator": rng.choice(VALIDATORS)}
+            for number in range(rng.randint(5, 12))
+        ]
+        (data_dir / f"questions_{offer}.json").write_text(
+            json.dumps({"questions": questions}, ensure_ascii=False), encoding="utf-8"
+        )
+
+
+def per_lookup_us(function, keys) -> float:
+    started = time.perf_counter()
+    for key in keys:
+        function(key)
+    return (time.perf_counter() - started) / len(keys) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark del índice de preguntas")
+    parser.add_argument("--offers", type=int, default=10000)
+    parser.add_argument("--lookups", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        generate_offers(data_dir, args.offers)
+
+        started = time.perf_counter()
+        result = build_question_index(str(data_dir))
+        build_seconds = time.perf_counter() - started
+        index_path = data_dir / "questions.idx"
+
+        started = time.perf_counter()
+        index = QuestionIndex(str(index_path))
+        open_ms = (time.perf_counter() - started) * 1000
+
+        rng = random.Random(7)
+        keys = [str(rng.randrange(args.offers)) for _ in range(args.lookups)]
+        default_file = str(data_dir / "questions.json")
+        bank = QuestionBank(index)
+
+        json_us = per_lookup_us(lambda key: load_question_file(os.path.join(tmp, f"questions_{key}.json")), keys)
+        index_us = per_lookup_us(index.get, keys)
+        # El banco imprime al cargar cada oferta por primera vez
+        with contextlib.redirect_stdout(io.StringIO()):
+            bank_cold_us = per_lookup_us(lambda key: bank.get(default_file, key), keys)
+        bank_warm_us = per_lookup_us(lambda key: bank.get(default_file, key), keys)
+
+        print(f"Ofertas: {result['offers']} | preguntas: {result['questions']} | búsquedas: {args.lookups}")
+        print(f"  Compilación:          {build_seconds:8.2f} s ({index_path.stat().st_size / 1024:.0f} KiB)")
+        print(f"  Apertura del índice:  {open_ms:8.2f} ms")
+        print(f"  JSON por búsqueda:    {json_us:8.1f} µs")
+        print(f"  Índice por búsqueda:  {index_us:8.1f} µs  (x{json_us / index_us:.1f})")
+        print(f"  Banco, primera vez:   {bank_cold_us:8.1f} µs")
+        print(f"  Banco, en caché:      {bank_warm_us:8.1f} µs  (x{json_us / bank_warm_us:.1f})")
+        print(f"  {bank.stats()}")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de serialización de ConversationState: `model_dump_json` /
+`model_validate_json` de pydantic frente al formato binario
+`to_bytes` / `from_bytes`.
+
+Arma entrevistas sintéticas de 10 y 100 turnos (una respuesta del candidato
+y una repregunta o pregunta siguiente por turno) y mide tamaño y tiempo de
+ida y vuelta. Uso:
+
+    python tests/bench_state_serialization.py [repeticiones]
+"""
+
+import sys
+import timeit
+from pathlib import Path
+from typing import Callable
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from core.models.conversation_models import ConversationState
+from core.models.question_models import ValidatorSpec
+
+QUESTIONS = [
+    "¿Cuál es tu nombre completo?",
+    "¿Cuál es tu experiencia laboral previa?",
+    "¿Qué habilidades técnicas posees?",
+    "¿Por qué te interesa este puesto?",
+    "¿Cuál es tu pretensión salarial?"
+]
+ANSWER = "Trabajé tres años como desarrollador backend en una fintech, con Python, Django y PostgreSQL."
+CLARIFICATION = "Gracias por tu respuesta. ¿Podrías darnos un poco más de detalle sobre tus tareas y el equipo?"
+
+
+def build_state(turns: int) -> ConversationState:
+    """
+    Construye el estado de una entrevista con `turns` turnos del candidato.
+
+    Args:
+        turns: Cantidad de mensajes del candidato
+
+    Returns:
+        ConversationState con historial, índice de turnos y respuestas
+    """
+    state = ConversationState(
+        pending_questions=QUESTIONS,
+        question_validators={QUESTIONS[-1]: ValidatorSpec(type="numeric_range", min=0)},
+        metadata={"id_job_offer": "1024", "extracted_questions": []}
+    )
+    state.begin_turn()
+    state.messages.append(("ai", "¡Hola! Soy el asistente de RRHH de Adaptiera."))
+    state.messages.append(("ai", QUESTIONS[0]))
+    for turn in range(turns):
+        state.begin_turn()
+        state.messages.append(("human", f"{ANSWER} (turno {turn})"))
+        state.messages.append(("ai", CLARIFICATION))
+    state.user_responses = {question: ANSWER for question in QUESTIONS[:-1]}
+    state.current_question = QUESTIONS[-1]
+    state.current_question_index = len(QUESTIONS) - 1
+    return state
+
+
+def per_call_us(function: Callable[[], object], number: int) -> float:
+    """Tiempo medio por llamada en microsegundos (mejor de 5 series)."""
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    """Compara tamaño y tiempo de ambos formatos para 10 y 100 turnos."""
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print("📊 Serialización de ConversationState (ida y vuelta)")
+    print("-" * 78)
+    print(f"{'Turnos':>6}  {'Formato':<22} {'Bytes':>8} {'Serializar':>12} {'Deserializar':>14}")
+    for turns in (10, 100):
+        state = build_state(turns)
+        as_json = state.model_dump_json()
+        as_bytes = state.to_bytes()
+        assert ConversationState.from_bytes(as_bytes).model_dump() == state.model_dump()
+
+        rows = [
+            ("model_dump_json", len(as_json.encode("utf-8")),
+             per_call_us(state.model_dump_json, number),
+             per_call_us(lambda: ConversationState.model_validate_json(as_json), number)),
+            ("to_bytes (binario)", len(as_bytes),
+             per_call_us(state.to_bytes, number),
+             per_call_us(lambda: ConversationState.from_bytes(as_bytes), number))
+        ]
+        for name, size, dump_us, load_us in rows:
+            print(f"{turns:>6}  {name:<22} {size:>8} {dump_us:>10.1f}µs {load_us:>12.1f}µs")
+
+        (_, json_size, json_dump, json_load), (_, bin_size, bin_dump, bin_load) = rows
+        print(
+            f"{'':>6}  {'mejora':<22} {json_size / bin_size:>7.1f}x "
+            f"{json_dump / bin_dump:>11.1f}x {json_load / bin_load:>13.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Prueba de carga del modo de workers: entrevistas completas a través del
+dispatcher con 1, 2, 4... procesos worker (hasta la cantidad de núcleos).
+
+Para cada cantidad de workers se lanza `python -m app.workers` en un
+directorio temporal (almacén SQLite propio) y varios procesos cliente
+recorren entrevistas completas (inicio + una respuesta por pregunta) en
+paralelo. Se informa turnos por segundo y la eficiencia de escalado
+respecto de un worker. Sin GROQ_API_KEY la evaluación es local, así que se
+mide el costo del propio servicio (agente, almacén y HTTP). Uso:
+
+    python tests/bench_workers.py [--interviews 200] [--concurrency 16]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+import httpx
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+ANSWERS = [
+    "Juan Pérez",
+    "Trabajé cinco años como desarrollador backend en una empresa de logística",
+    "Python, SQL, Docker y diseño de APIs REST",
+    "Me interesa el producto y el equipo, y quiero crecer en una empresa con impacto",
+    "1500000"
+]
+
+
+async def run_interviews(base_url: str, interviews: int, concurrency: int) -> int:
+    """Recorre `interviews` entrevistas con `concurrency` en vuelo; devuelve los turnos hechos."""
+    semaphore = asyncio.Semaphore(concurrency)
+    turns = 0
+
+    async def interview(client: httpx.AsyncClient) -> None:
+        nonlocal turns
+        async with semaphore:
+            started = await client.post("/interviews", json={})
+            started.raise_for_status()
+            session_id = started.json()["session_id"]
+            turns += 1
+            for answer in ANSWERS:
+                response = await client.post(f"/interviews/{session_id}/answer", json={"answer": answer})
+                response.raise_for_status()
+                turns += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        await asyncio.gather(*(interview(client) for _ in range(interviews)))
+    return turns
+
+
+def client_process(args) -> int:
+    base_url, interviews, concurrency = args
+    return asyncio.run(run_interviews(base_url, interviews, concurrency))
+
+
+def wait_ready(url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url + "/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"El dispatcher {url} no respondió")
+
+
+def measure(workers: int, interviews: int, concurrency: int, port: int) -> float:
+    """Lanza el pool con `workers` procesos y devuelve turnos por segundo."""
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / "data").mkdir()
+        shutil.copy(root_dir / "data" / "questions.json", Path(tmp) / "data")
+        env = os.environ.copy()
+        env["PYTHONPATH"] = str(root_dir)
+        env.pop("GROQ_API_KEY", None)
+        dispatcher = subprocess.Popen(
+            [sys.executable, "-m", "app.workers", "--workers", str(workers), "--port", str(port)],
+            cwd=tmp, env=env, stdout=subprocess.DEVNULL
+        )
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            wait_ready(base_url)
+            # Un proceso cliente por worker, para que el generador de carga no sea el cuello de botella
+            clients = max(workers, 1)
+            jobs = [(base_url, interviews // clients, max(concurrency // clients, 1))] * clients
+            with multiprocessing.Pool(clients) as pool:
+                # Calentamiento: importaciones y conexiones de cada worker
+                pool.map(client_process, [(base_url, 2, 2)] * clients)
+                started = time.perf_counter()
+                turns = sum(pool.map(client_process, jobs))
+                elapsed = time.perf_counter() - started
+        finally:
+            dispatcher.terminate()
+            dispatcher.wait(timeout=30)
+    return turns / elapsed
+
+
+def worker_counts(limit: int) -> List[int]:
+    counts, n = [], 1
+    while n <= limit:
+        counts.append(n)
+        n *= 2
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prueba de carga del modo de workers")
+    parser.add_argument("--interviews", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+
+    print(f"Núcleos: {os.cpu_count()} | {args.interviews} entrevistas x {len(ANSWERS) + 1} turnos")
+    baseline = None
+    for workers in worker_counts(args.max_workers):
+        rate = measure(workers, args.interviews, args.concurrency * workers, args.port)
+        baseline = baseline or rate
+        efficiency = rate / (baseline * workers)
+        print(f"  {workers} workers: {rate:8.1f} turnos/s  (x{rate / baseline:.2f}, eficiencia {efficiency:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,22 @@
 Test básico del agente de RRHH simplificado.
 """
 
+import asyncio
+import shutil
 import sys
 import os
+import time
 from pathlib import Path
 
+import pytest
+
 # Agregar el directorio raíz al path para importaciones
 root_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(root_dir))
 
 from agents.simple_agent import create_simple_rrhh_agent
+from agents.tools.evaluation_cache import EvaluationCache
+from agents.tools.response_evaluator import ResponseEvaluator
 
 def test_agent_basic():
     """Prueba básica del agente"""
@@ -66,6 +73,165 @@ def test_agent_with_vacancy():
     
     return True
 
+
+class FakeAsyncLLM:
+    """LLM falso que simula la latencia de red de Groq en ainvoke."""
+
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(self.latency)
+        return "SATISFACTORIA"
+
+
+@pytest.fixture
+def interview_dir(tmp_path, monkeypatch):
+    """Directorio de trabajo aislado con el banco de preguntas por defecto."""
+    (tmp_path / "data").mkdir()
+    shutil.copy(root_dir / "data" / "questions.json", tmp_path / "data")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("GROQ_API_KEY", raising=False)
+    monkeypatch.setattr(
+        "agents.simple_agent.get_response_evaluator",
+        lambda: ResponseEvaluator(EvaluationCache())
+    )
+    return tmp_path
+
+
+def test_async_api_matches_sync(interview_dir):
+    """Las variantes asíncronas producen la misma conversación que las sincrónicas."""
+    answers = ["Juan Pérez", "no", "Tengo 3 años de experiencia"]
+
+    sync_agent = create_simple_rrhh_agent()
+    sync_replies = [sync_agent.start_conversation()]
+    sync_replies += [sync_agent.process_user_input(a) for a in answers]
+
+    async def run_async():
+        agent = create_simple_rrhh_agent()
+        replies = [await agent.astart_conversation()]
+        for answer in answers:
+            replies.append(await agent.aprocess_user_input(answer))
+        return agent, replies
+
+    async_agent, async_replies = asyncio.run(run_async())
+
+    assert async_replies == sync_replies
+    assert async_agent.state.user_responses == sync_agent.state.user_responses
+
+
+def test_async_interviews_run_concurrently(interview_dir, monkeypatch):
+    """Muchas entrevistas en curso comparten un único event loop."""
+    monkeypatch.setenv("GROQ_API_KEY", "gsk_test")
+    monkeypatch.setattr(
+        "agents.tools.response_evaluator.load_env_variables", lambda *args: True
+    )
+    monkeypatch.setattr(
+        "agents.tools.model_cascade.obtener_cliente_llm",
+        lambda *args, **kwargs: FakeAsyncLLM(latency=0.05)
+    )
+
+    async def run_interview():
+        agent = create_simple_rrhh_agent()
+        await agent.astart_conversation()
+        await agent.aprocess_user_input("Juan Pérez")
+        return agent
+
+    async def run_all():
+        return await asyncio.gather(*(run_interview() for _ in range(100)))
+
+    start = time.perf_counter()
+    agents = asyncio.run(run_all())
+    elapsed = time.perf_counter() - start
+
+    assert all(a.state.current_question_index == 1 for a in agents)
+    assert elapsed < 100 * 0.05 / 4
+
+
+def test_latest_reply_uses_turn_index(interview_dir):
+    """La última respuesta sale del índice de turnos, aun con respuestas repetidas."""
+    agent = create_simple_rrhh_agent()
+    greeting = agent.start_conversation()
+    assert agent.get_latest_reply() == greeting
+
+    agent.process_user_input("Juan Pérez")
+    first = agent.process_user_input("no")
+    second = agent.process_user_input("no")
+
+    assert first == second == agent.get_latest_reply()
+    assert len(agent.state.turn_starts) == 4
+    assert [m.content for m in agent.state.turn_messages(2)] == ["no", first]
+    assert agent.state.turn_messages(0)[0].content.startswith("¡Hola!")
+
+
+def test_transcript_reads_new_messages_from_cursor(interview_dir):
+    """La vista del historial entrega los mensajes nuevos desde un cursor."""
+    agent = create_simple_rrhh_agent()
+    agent.start_conversation()
+    transcript = agent.get_transcript()
+    assert [role for role, _ in transcript] == ["ai", "ai"]
+    assert transcript[0][1].startswith("¡Hola!")
+    cursor = transcript.cursor
+
+    reply = agent.process_user_input("Juan Pérez")
+
+    # La vista lee el historial del agente, no una copia
+    new_messages = list(transcript.since(cursor))
+    assert new_messages[0] == ("human", "Juan Pérez")
+    assert "\n\n".join(text for _, text in new_messages[1:]) == reply
+    assert len(transcript) == transcript.cursor == cursor + len(new_messages)
+
+
+def test_snapshot_restores_interview_in_new_agent(interview_dir):
+    """Una entrevista en curso se retoma en otro agente a partir de su snapshot."""
+    agent = create_simple_rrhh_agent("42")
+    agent.start_conversation()
+    agent.process_user_input("Juan Pérez")
+
+    restored = create_simple_rrhh_agent().restore(agent.snapshot())
+
+    assert restored.initialized and restored.id_job_offer == "42"
+    assert list(restored.get_transcript()) == list(agent.get_transcript())
+    reply = restored.process_user_input("Trabajé tres años como desarrollador backend")
+    assert restored.state.current_question_index == 2
+    assert restored.state.pending_questions[2] in reply
+
+
+class FakeStreamingLLM:
+    """LLM falso que transmite una aclaración en varios fragmentos."""
+
+    chunks = ["NECESITA_", "CLARIFICACION: ", "Cuéntanos ", "dónde ", "trabajaste."]
+
+    def stream(self, prompt):
+        for chunk in self.chunks:
+            yield chunk
+
+
+def test_stream_user_input_streams_clarification(interview_dir, monkeypatch):
+    """La aclaración generada por Groq se transmite en fragmentos al agente y la UI."""
+    monkeypatch.setenv("GROQ_API_KEY", "gsk_test")
+    monkeypatch.setattr(
+        "agents.tools.response_evaluator.load_env_variables", lambda *args: True
+    )
+    monkeypatch.setattr(
+        "agents.tools.model_cascade.obtener_cliente_llm",
+        lambda *args, **kwargs: FakeStreamingLLM()
+    )
+
+    agent = create_simple_rrhh_agent()
+    agent.start_conversation()
+    accepted = list(agent.stream_user_input("Juan Pérez"))
+    assert len(accepted) == 1
+    assert agent.state.current_question_index == 1
+
+    chunks = list(agent.stream_user_input("no"))
+    assert chunks[1:4] == ["Cuéntanos", " dónde", " trabajaste."]
+    assert "".join(chunks) == agent.state.messages[-1].content
+    assert agent.state.needs_clarification
+    assert agent.state.clarification_reason == "Cuéntanos dónde trabajaste."
+    assert agent.state.current_question_index == 1
+
+
 def main():
     """Función principal"""
     print("=" * 50)
@@ -99,4 +265,4 @@ def main():
         print(f"{name}: {status}")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main() 
@@ -0,0 +1,92 @@
+"""
+Pruebas del pre-clasificador local de respuestas.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from agents.tools.answer_classifier import (
+    AnswerClassifier,
+    NECESITA_CLARIFICACION,
+    SATISFACTORIA
+)
+from agents.tools.response_evaluator import ResponseEvaluator
+
+QUESTION = "¿Cuál es tu experiencia laboral previa?"
+
+
+@pytest.fixture
+def classifier():
+    """Clasificador con los umbrales por defecto."""
+    return AnswerClassifier()
+
+
+def test_accepts_detailed_relevant_answer(classifier):
+    """Una respuesta larga y relacionada se acepta sin LLM."""
+    result = classifier.classify(
+        QUESTION,
+        "Tengo 3 años de experiencia laboral como desarrollador backend en Python y Django"
+    )
+    assert result.verdict == SATISFACTORIA
+    assert result.confidence >= classifier.accept_threshold
+
+
+@pytest.mark.parametrize("answer", ["", "   ", "???", "asdfghjkl", "aaaaaaaa", "qwrtp zxcvb"])
+def test_rejects_empty_or_unreadable_answers(classifier, answer):
+    """Las respuestas vacías o ilegibles se rechazan localmente."""
+    result = classifier.classify(QUESTION, answer)
+    assert result.verdict == NECESITA_CLARIFICACION
+    assert result.reason
+
+
+@pytest.mark.parametrize("answer", ["Juan Pérez", "no", "sí", "Python, JavaScript, React"])
+def test_escalates_ambiguous_answers(classifier, answer):
+    """Las respuestas cortas pero plausibles se derivan al LLM."""
+    assert classifier.classify(QUESTION, answer).verdict is None
+
+
+def test_thresholds_are_configurable():
+    """Un umbral de aceptación más bajo resuelve más respuestas localmente."""
+    strict = AnswerClassifier(accept_threshold=0.99)
+    lenient = AnswerClassifier(accept_threshold=0.4)
+    answer = "Trabajé cinco años en Accenture como consultor de datos"
+    assert strict.classify(QUESTION, answer).verdict is None
+    assert lenient.classify(QUESTION, answer).verdict == SATISFACTORIA
+
+
+def test_evaluator_reports_saved_llm_calls(classifier, monkeypatch):
+    """El evaluador no llama al LLM para veredictos locales y lo reporta."""
+    calls = []
+
+    class FakeLLM:
+        def invoke(self, prompt):
+            calls.append(prompt)
+            return "SATISFACTORIA"
+
+    monkeypatch.setenv("GROQ_API_KEY", "gsk_test")
+    monkeypatch.setattr(
+        "agents.tools.response_evaluator.load_env_variables", lambda *args: True
+    )
+    monkeypatch.setattr(
+        "agents.tools.model_cascade.obtener_cliente_llm",
+        lambda *args, **kwargs: FakeLLM()
+    )
+    evaluator = ResponseEvaluator(classifier=classifier)
+
+    assert evaluator.evaluate(QUESTION, "asdfghjkl")[0] is False
+    assert evaluator.evaluate(
+        QUESTION,
+        "Tengo 3 años de experiencia laboral como desarrollador backend en Python y Django"
+    ) == (True, "")
+    assert evaluator.evaluate(QUESTION, "Juan Pérez") == (True, "")
+
+    assert len(calls) == 1
+    stats = evaluator.get_metrics()["classifier"]
+    assert stats["llm_calls_saved"] == 2
+    assert stats["escalated"] == 1
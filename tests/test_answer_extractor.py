@@ -0,0 +1,276 @@
+"""
+Pruebas de la extracción de respuestas múltiples en un solo mensaje.
+"""
+
+import asyncio
+import json
+import shutil
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from agents.simple_agent import SimpleRRHHAgent
+from agents.tools.answer_extractor import AnswerExtractor, parse_extraction
+from agents.tools.evaluation_cache import EvaluationCache
+from agents.tools.model_cascade import ModelCascade
+from agents.tools.response_evaluator import ResponseEvaluator
+from core.models.question_models import ValidatorSpec
+from services.circuit_breaker import CircuitBreaker
+from services.llm_gateway import LLMGateway
+
+MODEL = "llama-3.3-70b-versatile"
+NAME = "¿Cuál es tu nombre completo?"
+EXPERIENCE = "¿Cuál es tu experiencia laboral previa?"
+SKILLS = "¿Qué habilidades técnicas posees?"
+MOTIVATION = "¿Por qué estás interesado en esta posición?"
+SALARY = "¿Cuáles son tus expectativas salariales?"
+
+LONG_ANSWER = (
+    "Me llamo Ana López, trabajé cinco años como analista de datos en una empresa "
+    "de logística y manejo Python, SQL y Power BI a diario"
+)
+
+
+class ExtractingLLM:
+    """LLM falso: acepta las evaluaciones y extrae según el mapa configurado."""
+
+    def __init__(self, extraction=None, evaluation="SATISFACTORIA"):
+        self.extraction = extraction or {}
+        self.evaluation = evaluation
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def _answer(self, prompt):
+        with self._lock:
+            self.prompts.append(prompt)
+        if "Preguntas que todavía no se le hicieron" in prompt:
+            return json.dumps(self.extraction, ensure_ascii=False)
+        return self.evaluation
+
+    def invoke(self, prompt):
+        return self._answer(prompt)
+
+    async def ainvoke(self, prompt):
+        return self._answer(prompt)
+
+    def extraction_calls(self):
+        return [p for p in self.prompts if "Preguntas que todavía no se le hicieron" in p]
+
+
+def make_gateway():
+    """Gateway con límites holgados para las pruebas."""
+    return LLMGateway(
+        requests_per_minute=60000, burst=100, max_concurrency=8, max_queue=50, max_wait_seconds=5
+    )
+
+
+@pytest.fixture
+def groq(monkeypatch):
+    """Conecta el evaluador y el extractor a un LLM falso."""
+    llm = ExtractingLLM()
+    monkeypatch.setenv("GROQ_API_KEY", "gsk_test")
+    monkeypatch.setattr(
+        "agents.tools.response_evaluator.load_env_variables", lambda *args: True
+    )
+    monkeypatch.setattr(
+        "agents.tools.model_cascade.obtener_cliente_llm", lambda *args, **kwargs: llm
+    )
+    monkeypatch.setattr(
+        "agents.tools.answer_extractor.obtener_cliente_llm", lambda *args, **kwargs: llm
+    )
+    return llm
+
+
+@pytest.fixture
+def agent(groq, tmp_path, monkeypatch):
+    """Agente sobre el banco de preguntas por defecto, con evaluador y extractor aislados."""
+    (tmp_path / "data").mkdir()
+    shutil.copy(root_dir / "data" / "questions.json", tmp_path / "data")
+    monkeypatch.chdir(tmp_path)
+    evaluator = ResponseEvaluator(
+        cache=EvaluationCache(), cascade=ModelCascade([MODEL], gateway=make_gateway())
+    )
+    extractor = AnswerExtractor(MODEL, min_words=12, gateway=make_gateway())
+    monkeypatch.setattr("agents.simple_agent.get_response_evaluator", lambda: evaluator)
+    monkeypatch.setattr("agents.simple_agent.get_answer_extractor", lambda: extractor)
+    agent = SimpleRRHHAgent()
+    agent.start_conversation()
+    return agent
+
+
+def test_parse_extraction_maps_numbers_to_questions():
+    """Las claves numéricas se asocian a las preguntas y se ignora lo que no encaja."""
+    pending = [EXPERIENCE, SKILLS]
+    text = '```json\n{"1": "cinco años en logística", "2.": " Python ", "7": "x", "a": "y"}\n```'
+    assert parse_extraction(text, pending) == {EXPERIENCE: "cinco años en logística", SKILLS: "Python"}
+    assert parse_extraction("{}", pending) == {}
+    assert parse_extraction("ninguna", pending) is None
+    assert parse_extraction('{"1": ', pending) is None
+
+
+def test_extracted_answers_must_pass_their_validator(groq):
+    """Una respuesta extraída que el validador rechaza se pregunta normalmente."""
+    groq.extraction = {"1": "quiero cobrar 5", "2": "me interesa el rubro"}
+    extractor = AnswerExtractor(MODEL, min_words=3, gateway=make_gateway())
+    validators = {SALARY: ValidatorSpec(type="numeric_range", min=100)}
+
+    answers = extractor.extract(NAME, LONG_ANSWER, [SALARY, MOTIVATION], validators)
+
+    assert answers == {MOTIVATION: "me interesa el rubro"}
+    stats = extractor.stats()
+    assert stats["calls"] == 1
+    assert stats["filled"] == 1
+    assert stats["rejected_by_validator"] == 1
+
+
+def test_short_answers_skip_extraction(agent, groq):
+    """Los mensajes cortos no disparan la llamada de extracción."""
+    agent.process_user_input("Ana López")
+
+    assert groq.extraction_calls() == []
+    assert agent.state.current_question == EXPERIENCE
+    assert agent.extractor.stats()["skipped"] == 1
+
+
+def test_one_message_answers_several_questions(agent, groq):
+    """Las preguntas cubiertas por el mensaje se registran y se saltan."""
+    groq.extraction = {
+        "1": "trabajé cinco años como analista de datos en una empresa de logística",
+        "2": "manejo Python, SQL y Power BI a diario"
+    }
+
+    response = agent.process_user_input(LONG_ANSWER)
+
+    assert agent.state.current_question == MOTIVATION
+    assert MOTIVATION in response
+    assert list(agent.state.user_responses) == [NAME, EXPERIENCE, SKILLS]
+    assert agent.state.user_responses[SKILLS] == "manejo Python, SQL y Power BI a diario"
+    assert len(groq.extraction_calls()) == 1
+    # Las preguntas ya respondidas no aparecen en la siguiente extracción
+    groq.extraction = {}
+    agent.process_user_input("Me interesa porque quiero crecer en análisis de datos dentro de una empresa con impacto")
+    assert EXPERIENCE not in groq.extraction_calls()[-1]
+    assert SALARY in groq.extraction_calls()[-1]
+
+    agent.process_user_input("Pretendo 1.500.000 pesos brutos")
+    assert agent.is_conversation_complete()
+    assert agent.get_conversation_summary()["extracted_count"] == 2
+
+
+def test_rejected_answer_discards_extraction(agent, groq):
+    """Si la respuesta actual necesita aclaración, no se registra nada extraído."""
+    agent.process_user_input("Ana López")
+    groq.evaluation = "NECESITA_CLARIFICACION: no describe experiencia"
+    groq.extraction = {"1": "manejo Python"}
+
+    agent.process_user_input("La verdad prefiero contarte eso más adelante si te parece, hoy manejo Python")
+
+    assert agent.state.current_question == EXPERIENCE
+    assert SKILLS not in agent.state.user_responses
+    assert agent.extractor.stats()["discarded"] == 1
+
+
+def test_async_extraction_runs_with_evaluation(agent, groq):
+    """La variante asíncrona también salta las preguntas cubiertas."""
+    groq.extraction = {"3": "me interesa el puesto porque quiero crecer en datos"}
+
+    asyncio.run(agent.aprocess_user_input(LONG_ANSWER))
+
+    assert agent.state.current_question == EXPERIENCE
+    asyncio.run(agent.aprocess_user_input("Trabajé cinco años como analista de datos"))
+    assert agent.state.current_question == SKILLS
+    asyncio.run(agent.aprocess_user_input("Python y SQL"))
+    assert agent.state.current_question == SALARY
+
+
+class SlowExtractionLLM(ExtractingLLM):
+    """LLM falso que evalúa al instante pero demora la extracción hasta que se la libera."""
+
+    def __init__(self, extraction=None):
+        super().__init__(extraction)
+        self.release = threading.Event()
+
+    def invoke(self, prompt):
+        if "Preguntas que todavía no se le hicieron" in prompt:
+            self.release.wait(5)
+        return self._answer(prompt)
+
+    async def ainvoke(self, prompt):
+        if "Preguntas que todavía no se le hicieron" in prompt:
+            await asyncio.sleep(5)
+        return self._answer(prompt)
+
+
+@pytest.fixture
+def budgeted_agent(agent, groq, monkeypatch):
+    """Agente con presupuesto de turno y una extracción más lenta que el presupuesto."""
+    slow = SlowExtractionLLM({"1": "trabajé cinco años como analista de datos"})
+    monkeypatch.setattr(
+        "agents.tools.answer_extractor.obtener_cliente_llm", lambda *args, **kwargs: slow
+    )
+    agent.evaluator.turn_budget_seconds = 0.3
+    yield agent, slow
+    slow.release.set()
+
+
+def test_extraction_wait_is_bounded_by_turn_budget(budgeted_agent):
+    """El turno no espera la extracción más allá de su presupuesto de latencia."""
+    agent, slow = budgeted_agent
+
+    started = time.monotonic()
+    agent.process_user_input(LONG_ANSWER)
+    assert time.monotonic() - started < 2
+
+    assert agent.state.current_question == EXPERIENCE
+    assert EXPERIENCE not in agent.state.user_responses
+    assert agent.extractor.stats()["timed_out"] == 1
+
+
+def test_async_extraction_wait_is_bounded_by_turn_budget(budgeted_agent):
+    """La variante asíncrona también abandona la extracción que no llega a tiempo."""
+    agent, slow = budgeted_agent
+
+    started = time.monotonic()
+    asyncio.run(agent.aprocess_user_input(LONG_ANSWER))
+    assert time.monotonic() - started < 2
+
+    assert agent.state.current_question == EXPERIENCE
+    assert agent.extractor.stats()["timed_out"] == 1
+
+
+def test_open_circuit_skips_extraction(groq):
+    """Con el circuito de Groq abierto no se intenta la extracción."""
+    groq.extraction = {"1": "me interesa el rubro"}
+    extractor = AnswerExtractor(MODEL, min_words=3, gateway=make_gateway())
+    breaker = CircuitBreaker(failure_threshold=1)
+    breaker.record_failure()
+
+    assert extractor.extract(NAME, LONG_ANSWER, [MOTIVATION], {}, breaker) == {}
+    assert groq.extraction_calls() == []
+    assert extractor.stats()["circuit_open"] == 1
+
+
+def test_extraction_reports_to_the_breaker(groq, monkeypatch):
+    """Los errores de la extracción cuentan como fallos de Groq en el breaker."""
+    class FailingLLM:
+        def invoke(self, prompt):
+            raise ConnectionError("sin conexión")
+
+    extractor = AnswerExtractor(MODEL, min_words=3, gateway=make_gateway())
+    breaker = CircuitBreaker(failure_threshold=1)
+    assert extractor.extract(NAME, LONG_ANSWER, [MOTIVATION], {}, breaker) == {}
+    assert breaker.state == "closed"
+
+    monkeypatch.setattr(
+        "agents.tools.answer_extractor.obtener_cliente_llm", lambda *args, **kwargs: FailingLLM()
+    )
+    assert extractor.extract(NAME, LONG_ANSWER, [MOTIVATION], {}, breaker) == {}
+    assert breaker.state == "open"
+    assert extractor.stats()["errors"] == 1
@@ -0,0 +1,113 @@
+"""
+Prueba de humo de la API HTTP de entrevistas con un cliente en proceso.
+"""
+
+import asyncio
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+from cryptography.fernet import Fernet
+
+starlette = pytest.importorskip("starlette")
+httpx = pytest.importorskip("httpx")
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from agents.session_store import MemorySessionStore
+from agents.tools.evaluation_cache import EvaluationCache
+from agents.tools.response_evaluator import ResponseEvaluator
+from app.api import create_app
+from core.security import encriptar_datos_usuario
+
+
+@pytest.fixture
+def client_factory(tmp_path, monkeypatch):
+    """Cliente HTTP en proceso sobre una app con almacén de sesiones aislado."""
+    (tmp_path / "data").mkdir()
+    shutil.copy(root_dir / "data" / "questions.json", tmp_path / "data")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("GROQ_API_KEY", raising=False)
+    monkeypatch.setattr(
+        "agents.simple_agent.get_response_evaluator",
+        lambda: ResponseEvaluator(EvaluationCache())
+    )
+    app = create_app(MemorySessionStore(spill=None))
+
+    def make_client():
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+    return make_client
+
+
+def test_interview_over_http(client_factory):
+    """Inicia, responde (con y sin streaming), lee el historial y el resumen."""
+
+    async def run():
+        async with client_factory() as client:
+            assert (await client.get("/health")).json() == {"status": "ok"}
+
+            started = await client.post("/interviews", json={})
+            assert started.status_code == 201
+            session_id = started.json()["session_id"]
+            assert started.json()["current_question"] == "¿Cuál es tu nombre completo?"
+
+            answered = await client.post(f"/interviews/{session_id}/answer", json={"answer": "Juan Pérez"})
+            assert answered.json()["current_question"] == "¿Cuál es tu experiencia laboral previa?"
+
+            streamed = await client.post(f"/interviews/{session_id}/stream", json={"answer": "no"})
+            assert "Por favor, proporciona más detalles" in streamed.text
+
+            transcript = await client.get(f"/interviews/{session_id}/transcript", params={"cursor": 2})
+            assert transcript.json()["messages"][0] == {"role": "human", "content": "Juan Pérez"}
+            assert transcript.json()["cursor"] == 6
+
+            summary = await client.get(f"/interviews/{session_id}/summary")
+            assert summary.json()["questions_asked"] == 1
+
+            missing = await client.get("/interviews/desconocida/summary")
+            assert missing.status_code == 404
+            invalid = await client.post(f"/interviews/{session_id}/answer", json={})
+            assert invalid.status_code == 422
+
+    asyncio.run(run())
+
+
+def test_same_token_resumes_the_interview(client_factory, monkeypatch):
+    """El mismo token retoma la entrevista en lugar de empezar otra."""
+    monkeypatch.setenv("FERNET_KEY", Fernet.generate_key().decode())
+    token = encriptar_datos_usuario({"nombre": "Ana López", "job-offer": 7})
+
+    async def run():
+        async with client_factory() as client:
+            first = (await client.post("/interviews", json={"token": token})).json()
+            await client.post(f"/interviews/{first['session_id']}/answer", json={"answer": "Ana López"})
+            again = (await client.post("/interviews", json={"token": token})).json()
+            assert again["session_id"] == first["session_id"]
+            assert again["current_question"] == "¿Cuál es tu experiencia laboral previa?"
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("method, path", [
+    ("POST", "/interviews/{}/answer"),
+    ("POST", "/interviews/{}/stream"),
+    ("GET", "/interviews/{}/summary"),
+    ("GET", "/interviews/{}/transcript")
+])
+@pytest.mark.parametrize("session_id", ["..%2F..%2Fetc", "ABCDEF", "0" * 40])
+def test_malformed_session_ids_never_reach_the_store(client_factory, monkeypatch, method, path, session_id):
+    """Un id de sesión con otro formato se rechaza antes de abrir la sesión o su diario."""
+    journals = []
+    monkeypatch.setattr("app.api.get_session_journal", lambda key: journals.append(key))
+
+    async def run():
+        async with client_factory() as client:
+            response = await client.request(method, path.format(session_id), json={"answer": "Ana López"})
+            assert response.status_code == 404
+
+    asyncio.run(run())
+    assert journals == []
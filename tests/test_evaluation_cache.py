@@ -0,0 +1,118 @@
+"""
+Pruebas de la caché de evaluaciones y su uso desde el evaluador de respuestas.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from agents.tools import evaluation_cache
+from agents.tools.evaluation_cache import EvaluationCache, cache_key
+from agents.tools.response_evaluator import ResponseEvaluator
+
+QUESTION = "¿Cuál es tu nombre completo?"
+
+
+class CountingLLM:
+    """LLM falso que cuenta cuántas veces se le invoca."""
+
+    def __init__(self, answer: str = "SATISFACTORIA"):
+        self.answer = answer
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        return self.answer
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Ruta de una base SQLite temporal para la caché."""
+    return str(tmp_path / "evaluation_cache.sqlite3")
+
+
+def test_key_ignores_case_accents_and_punctuation():
+    """Respuestas casi idénticas comparten la misma clave."""
+    assert cache_key(QUESTION, "Juan Pérez.") == cache_key(QUESTION, "  juan   perez ")
+    assert cache_key(QUESTION, "Juan Pérez") != cache_key("¿Edad?", "Juan Pérez")
+
+
+def test_memory_and_disk_hits(db_path):
+    """Una entrada guardada se recupera de memoria y, tras reabrir, de disco."""
+    cache = EvaluationCache(db_path=db_path)
+    assert cache.get(QUESTION, "Juan Pérez") is None
+    cache.set(QUESTION, "Juan Pérez", (True, ""))
+    assert cache.get(QUESTION, "juan perez") == (True, "")
+    cache.close()
+
+    reopened = EvaluationCache(db_path=db_path)
+    assert reopened.get(QUESTION, "JUAN PÉREZ") == (True, "")
+    stats = reopened.stats()
+    assert stats["disk_hits"] == 1
+    assert stats["misses"] == 0
+    assert reopened.get(QUESTION, "juan perez") == (True, "")
+    assert reopened.stats()["memory_hits"] == 1
+    reopened.close()
+
+
+def test_entries_expire_after_ttl(db_path, monkeypatch):
+    """Las entradas vencidas no se devuelven en ninguno de los niveles."""
+    now = [1000.0]
+    monkeypatch.setattr(evaluation_cache.time, "time", lambda: now[0])
+    cache = EvaluationCache(db_path=db_path, ttl_seconds=60)
+    cache.set(QUESTION, "Juan", (False, "Falta el apellido"))
+    assert cache.get(QUESTION, "Juan") == (False, "Falta el apellido")
+
+    now[0] += 61
+    assert cache.get(QUESTION, "Juan") is None
+    assert cache.stats()["misses"] == 1
+    cache.close()
+
+
+def test_memory_tier_is_lru_bounded():
+    """El nivel en memoria expulsa la entrada menos usada al llenarse."""
+    cache = EvaluationCache(memory_max_entries=2)
+    cache.set(QUESTION, "uno", (True, ""))
+    cache.set(QUESTION, "dos", (True, ""))
+    cache.get(QUESTION, "uno")
+    cache.set(QUESTION, "tres", (True, ""))
+
+    assert cache.get(QUESTION, "dos") is None
+    assert cache.get(QUESTION, "uno") == (True, "")
+    assert cache.stats()["memory_evictions"] == 1
+
+
+def test_disk_tier_is_size_bounded(db_path):
+    """El nivel en disco se recorta al tamaño máximo configurado."""
+    cache = EvaluationCache(db_path=db_path, memory_max_entries=1, disk_max_entries=50)
+    for i in range(200):
+        cache.set(QUESTION, f"respuesta {i}", (True, ""))
+
+    (total,) = cache._conn.execute("SELECT COUNT(*) FROM evaluations").fetchone()
+    assert total == 50
+    assert cache.stats()["disk_evictions"] > 0
+    cache.close()
+
+
+def test_evaluator_skips_llm_on_cache_hit(monkeypatch):
+    """Solo la primera respuesta equivalente llega al LLM."""
+    llm = CountingLLM()
+    monkeypatch.setenv("GROQ_API_KEY", "gsk_test")
+    monkeypatch.setattr(
+        "agents.tools.response_evaluator.load_env_variables", lambda *args: True
+    )
+    monkeypatch.setattr(
+        "agents.tools.model_cascade.obtener_cliente_llm",
+        lambda *args, **kwargs: llm
+    )
+    evaluator = ResponseEvaluator(EvaluationCache())
+
+    assert evaluator.evaluate(QUESTION, "Juan Pérez") == (True, "")
+    assert evaluator.evaluate(QUESTION, "juan perez!") == (True, "")
+    assert llm.calls == 1
+    assert evaluator.get_metrics()["cache"]["hit_rate"] == 0.5
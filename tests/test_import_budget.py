@@ -0,0 +1,61 @@
+"""
+Presupuesto de importación en frío de la app: `import app.main` no debe
+arrastrar los servicios pesados y debe mantenerse bajo un tiempo máximo.
+
+El perfil detallado se obtiene con `python tests/bench_imports.py`.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+# Segundos máximos para `import app.main` en un proceso nuevo (sin calentamiento)
+IMPORT_BUDGET_SECONDS = float(os.getenv("IMPORT_BUDGET_SECONDS", "0.9"))
+
+# Paquetes que solo se cargan al usar su funcionalidad
+LAZY_PACKAGES = {
+    "twilio",
+    "googleapiclient",
+    "google_auth_oauthlib",
+    "langchain_core",
+    "langchain_groq",
+    "cryptography"
+}
+
+
+def cold_import(module: str) -> dict:
+    code = (
+        "import json, sys, time; started = time.perf_counter(); "
+        f"import {module}; elapsed = time.perf_counter() - started; "
+        "print(json.dumps({'seconds': elapsed, 'packages': sorted({m.split('.')[0] for m in sys.modules})}))"
+    )
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(root_dir)
+    env["WARMUP_ENABLED"] = "false"
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=root_dir, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_app_main_cold_import_is_lazy_and_within_budget():
+    """Importar app.main no carga Google, Twilio ni langchain, y entra en el presupuesto."""
+    # El mejor de tres procesos, para no fallar por ruido de la máquina
+    runs = [cold_import("app.main") for _ in range(3)]
+
+    assert LAZY_PACKAGES.isdisjoint(runs[0]["packages"]), LAZY_PACKAGES & set(runs[0]["packages"])
+    best = min(run["seconds"] for run in runs)
+    assert best < IMPORT_BUDGET_SECONDS, f"import app.main tardó {best:.2f}s (presupuesto {IMPORT_BUDGET_SECONDS}s)"
+
+
+def test_services_do_not_create_clients_at_import():
+    """Los módulos de email y SMS se importan sin credenciales ni librerías de Google/Twilio."""
+    result = cold_import("services.email_sender, services.sms_sender")
+    assert "twilio" not in result["packages"]
+    assert "googleapiclient" not in result["packages"]
@@ -0,0 +1,229 @@
+"""
+Pruebas del agente de RRHH sobre el grafo de LangGraph compilado.
+"""
+
+import asyncio
+import gc
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+from langgraph.checkpoint.memory import InMemorySaver
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from agents.langgraph_agent import (
+    CHECKPOINT_SERDE,
+    CONVERSATION_GRAPH,
+    DEFAULT_CHECKPOINTER,
+    AdaptieraRRHHAgent,
+    create_rrhh_agent
+)
+
+
+class ScriptedEvaluator:
+    """Evaluador falso: pide aclaración para las respuestas marcadas como vagas."""
+
+    def __init__(self, vague=("no sé",)):
+        self.vague = set(vague)
+        self.calls = []
+
+    def _verdict(self, user_response):
+        if user_response in self.vague:
+            return False, "La respuesta es muy vaga."
+        return True, ""
+
+    def evaluate(self, question, user_response, validator=None):
+        self.calls.append(user_response)
+        return self._verdict(user_response)
+
+    async def aevaluate(self, question, user_response, validator=None):
+        self.calls.append(user_response)
+        return self._verdict(user_response)
+
+
+@pytest.fixture
+def evaluator(tmp_path, monkeypatch):
+    """Directorio de trabajo aislado con el banco de preguntas y evaluador falso."""
+    (tmp_path / "data").mkdir()
+    shutil.copy(root_dir / "data" / "questions.json", tmp_path / "data")
+    monkeypatch.chdir(tmp_path)
+    fake = ScriptedEvaluator()
+    monkeypatch.setattr("agents.nodes.conversation_nodes.get_response_evaluator", lambda: fake)
+    monkeypatch.setattr("agents.nodes.conversation_nodes.simulate_email_send_direct", lambda responses: True)
+    return fake
+
+
+ANSWERS = [
+    "Juan Pérez",
+    "Tres años como desarrollador",
+    "Python y SQL",
+    "Quiero crecer profesionalmente",
+    "1.500.000"
+]
+
+
+def test_agents_share_the_compiled_graph():
+    """El grafo se compila una vez; un checkpointer propio no lo recompila."""
+    assert create_rrhh_agent().graph is CONVERSATION_GRAPH
+    custom = AdaptieraRRHHAgent(InMemorySaver(serde=CHECKPOINT_SERDE))
+    assert custom.graph is not CONVERSATION_GRAPH
+    assert custom.graph.builder is CONVERSATION_GRAPH.builder
+
+
+def test_each_answer_is_evaluated_once_per_turn(evaluator):
+    """Cada turno evalúa la respuesta una sola vez y avanza de pregunta."""
+    agent = create_rrhh_agent()
+    assert "¿Cuál es tu nombre completo?" in agent.start_conversation()
+
+    for index, answer in enumerate(ANSWERS[:-1]):
+        reply = agent.process_user_input(answer)
+        assert agent.state.pending_questions[index + 1] in reply
+
+    reply = agent.process_user_input(ANSWERS[-1])
+    assert "Muchas gracias por tu tiempo" in reply
+    assert evaluator.calls == ANSWERS
+    assert agent.is_conversation_complete()
+    summary = agent.get_conversation_summary()
+    assert summary["questions_asked"] == 5
+    assert summary["responses"]["¿Cuál es tu nombre completo?"] == "Juan Pérez"
+
+    # Una vez terminada, la entrevista no vuelve a ejecutar el grafo
+    assert agent.process_user_input("hola") == reply
+    assert evaluator.calls == ANSWERS
+
+
+def test_clarified_answer_is_evaluated_again(evaluator):
+    """Tras pedir aclaración, la respuesta siguiente se evalúa en lugar de repreguntar."""
+    agent = create_rrhh_agent()
+    agent.start_conversation()
+    agent.process_user_input("Juan Pérez")
+
+    reply = agent.process_user_input("no sé")
+    assert "La respuesta es muy vaga." in reply
+    assert agent.state.needs_clarification
+
+    reply = agent.process_user_input("Tres años como desarrollador")
+    assert "¿Qué habilidades técnicas posees?" in reply
+    assert evaluator.calls == ["Juan Pérez", "no sé", "Tres años como desarrollador"]
+
+
+def test_conversation_resumes_from_checkpointer(evaluator):
+    """Otro agente con el mismo checkpointer y thread_id retoma la conversación."""
+    checkpointer = InMemorySaver(serde=CHECKPOINT_SERDE)
+    first = AdaptieraRRHHAgent(checkpointer)
+    first.start_conversation()
+    first.process_user_input("Juan Pérez")
+
+    resumed = AdaptieraRRHHAgent(checkpointer, thread_id=first.thread_id)
+    assert resumed.initialized
+    reply = resumed.process_user_input("Tres años como desarrollador")
+
+    assert "¿Qué habilidades técnicas posees?" in reply
+    assert list(resumed.get_conversation_summary()["responses"]) == [
+        "¿Cuál es tu nombre completo?", "¿Cuál es tu experiencia laboral previa?"
+    ]
+
+
+def test_astream_yields_messages_as_nodes_run(evaluator):
+    """`astream_user_input` transmite los mensajes del agente de cada turno."""
+    agent = create_rrhh_agent()
+
+    async def run():
+        await agent.aprocess_user_input("Juan Pérez")
+        return [message async for message in agent.astream_user_input("no sé")]
+
+    messages = asyncio.run(run())
+    assert len(messages) == 1
+    assert "La respuesta es muy vaga." in messages[0]
+    assert agent.state.current_question == "¿Cuál es tu experiencia laboral previa?"
+
+
+def test_reset_releases_the_thread(evaluator):
+    """Reiniciar la conversación borra el thread del checkpointer."""
+    checkpointer = InMemorySaver(serde=CHECKPOINT_SERDE)
+    agent = AdaptieraRRHHAgent(checkpointer)
+    agent.start_conversation()
+    old_thread = agent.thread_id
+
+    agent.reset_conversation()
+
+    assert agent.thread_id != old_thread
+    assert checkpointer.get_tuple({"configurable": {"thread_id": old_thread}}) is None
+    assert not agent.initialized
+
+
+def thread_exists(thread_id):
+    """Indica si el checkpointer en memoria del proceso guarda el thread."""
+    return DEFAULT_CHECKPOINTER.get_tuple({"configurable": {"thread_id": thread_id}}) is not None
+
+
+def test_finished_and_abandoned_interviews_free_the_default_checkpointer(evaluator):
+    """El checkpointer del proceso no acumula entrevistas terminadas ni abandonadas."""
+    finished = create_rrhh_agent()
+    finished.start_conversation()
+    for answer in ANSWERS:
+        finished.process_user_input(answer)
+    assert finished.is_conversation_complete()
+    assert not thread_exists(finished.thread_id)
+    assert finished.get_conversation_summary()["questions_asked"] == 5
+
+    abandoned = create_rrhh_agent()
+    abandoned.start_conversation()
+    thread_id = abandoned.thread_id
+    assert thread_exists(thread_id)
+    del abandoned
+    gc.collect()
+    assert not thread_exists(thread_id)
+
+
+def test_repeated_answers_return_their_own_turn(evaluator):
+    """Las respuestas repetidas ("no sé") devuelven la respuesta de su propio turno."""
+    agent = create_rrhh_agent()
+    agent.start_conversation()
+    agent.process_user_input("Juan Pérez")
+
+    first = agent.process_user_input("no sé")
+    second = agent.process_user_input("no sé")
+    third = agent.process_user_input("Tres años como desarrollador")
+
+    assert first == second
+    assert "La respuesta es muy vaga." in first
+    assert "¿Qué habilidades técnicas posees?" in third
+    assert agent.get_latest_reply() == third
+    assert agent.values["turn_starts"] == [0, 1, 3, 5, 7]
+
+
+def test_snapshot_restores_into_a_new_thread(evaluator):
+    """Un snapshot se retoma en otro agente y la entrevista sigue desde la misma pregunta."""
+    agent = create_rrhh_agent()
+    agent.start_conversation()
+    agent.process_user_input("Juan Pérez")
+    agent.process_user_input("no sé")
+
+    restored = AdaptieraRRHHAgent(InMemorySaver(serde=CHECKPOINT_SERDE)).restore(agent.snapshot())
+
+    assert restored.thread_id != agent.thread_id
+    assert restored.state.model_dump() == agent.state.model_dump()
+    reply = restored.process_user_input("Tres años como desarrollador")
+    assert "¿Qué habilidades técnicas posees?" in reply
+    assert evaluator.calls[-1] == "Tres años como desarrollador"
+
+
+def test_restore_keeps_the_previous_thread_of_a_custom_checkpointer(evaluator):
+    """Restaurar en un checkpointer propio no borra la conversación que tenía el agente."""
+    checkpointer = InMemorySaver(serde=CHECKPOINT_SERDE)
+    agent = AdaptieraRRHHAgent(checkpointer)
+    agent.start_conversation()
+    agent.process_user_input("Juan Pérez")
+    previous = agent.thread_id
+
+    agent.restore(agent.snapshot())
+
+    assert agent.thread_id != previous
+    assert checkpointer.get_tuple({"configurable": {"thread_id": previous}}) is not None
+    resumed = AdaptieraRRHHAgent(checkpointer, thread_id=previous)
+    assert resumed.state.user_responses == {"¿Cuál es tu nombre completo?": "Juan Pérez"}
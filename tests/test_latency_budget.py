@@ -0,0 +1,199 @@
+"""
+Pruebas del presupuesto de latencia por turno y del circuit breaker de Groq.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from agents.tools.evaluation_cache import EvaluationCache
+from agents.tools.model_cascade import ModelCascade
+from agents.tools.response_evaluator import ResponseEvaluator
+from services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from services.llm_gateway import LLMGateway
+
+QUESTION = "¿Por qué estás interesado en esta posición?"
+MODEL = "llama-3.3-70b-versatile"
+
+
+class FakeLLM:
+    """LLM falso con latencia y fallos configurables."""
+
+    def __init__(self):
+        self.latency = 0.0
+        self.error = None
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        time.sleep(self.latency)
+        if self.error is not None:
+            raise self.error
+        return "NECESITA_CLARIFICACION: respuesta muy vaga"
+
+    async def ainvoke(self, prompt):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self.error is not None:
+            raise self.error
+        return "NECESITA_CLARIFICACION: respuesta muy vaga"
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Conecta el evaluador a un LLM falso con un gateway sin límites ajustados."""
+    llm = FakeLLM()
+    monkeypatch.setenv("GROQ_API_KEY", "gsk_test")
+    monkeypatch.setattr(
+        "agents.tools.response_evaluator.load_env_variables", lambda *args: True
+    )
+    monkeypatch.setattr(
+        "agents.tools.model_cascade.obtener_cliente_llm", lambda *args, **kwargs: llm
+    )
+    return llm
+
+
+def make_evaluator(budget=None, gateway=None, **breaker_options):
+    """Evaluador con caché en memoria, cascada de un modelo y el breaker indicado."""
+    gateway = gateway or LLMGateway(
+        requests_per_minute=60000, burst=100, max_concurrency=8, max_queue=50, max_wait_seconds=5
+    )
+    return ResponseEvaluator(
+        cache=EvaluationCache(),
+        cascade=ModelCascade([MODEL], gateway=gateway),
+        breaker=CircuitBreaker(**breaker_options),
+        turn_budget_seconds=budget
+    )
+
+
+def test_breaker_opens_and_probes_in_half_open_state():
+    """El circuito se abre tras N fallos y deja pasar una sola prueba al semiabrirse."""
+    breaker = CircuitBreaker(failure_threshold=2, open_seconds=0.05)
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.allow_request() is False
+
+    time.sleep(0.06)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    time.sleep(0.06)
+    assert breaker.allow_request() is True
+    breaker.record_success(0.01)
+    assert breaker.state == CLOSED
+    stats = breaker.stats()
+    assert stats["opened"] == 2
+    assert stats["probes"] == 2
+
+
+def test_slow_calls_count_as_failures():
+    """Las respuestas más lentas que el umbral abren el circuito."""
+    breaker = CircuitBreaker(failure_threshold=2, slow_call_seconds=0.5)
+    breaker.record_success(0.1)
+    breaker.record_success(0.9)
+    breaker.record_success(1.2)
+    assert breaker.state == OPEN
+    assert breaker.stats()["slow_calls"] == 2
+
+
+def test_turn_budget_degrades_to_local_evaluation(fake_llm):
+    """Si Groq no responde a tiempo, el turno usa la lógica local y la caché se llena después."""
+    fake_llm.latency = 0.3
+    evaluator = make_evaluator(budget=0.05)
+
+    start = time.perf_counter()
+    assert evaluator.evaluate(QUESTION, "Me interesa crecer") == (True, "")
+    assert time.perf_counter() - start < 0.25
+
+    # La respuesta tardía de Groq queda en la caché para el siguiente intento
+    time.sleep(0.4)
+    assert evaluator.evaluate(QUESTION, "Me interesa crecer") == (False, "respuesta muy vaga")
+    assert fake_llm.calls == 1
+
+    metrics = evaluator.get_metrics()
+    assert metrics["fallbacks"]["budget_exceeded"] == 1
+    assert metrics["circuit_breaker"]["failures"] == 1
+
+
+def test_async_turn_budget(fake_llm):
+    """La variante asíncrona respeta el mismo presupuesto."""
+    fake_llm.latency = 0.3
+    evaluator = make_evaluator(budget=0.05)
+
+    async def run():
+        start = time.perf_counter()
+        result = await evaluator.aevaluate(QUESTION, "Me interesa crecer")
+        elapsed = time.perf_counter() - start
+        await asyncio.sleep(0.4)
+        return result, elapsed
+
+    result, elapsed = asyncio.run(run())
+    assert result == (True, "")
+    assert elapsed < 0.25
+    assert evaluator.cache.get(QUESTION, "Me interesa crecer") == (False, "respuesta muy vaga")
+    assert evaluator.fallback_stats()["budget_exceeded"] == 1
+
+
+def throttled_gateway(llm):
+    """Gateway sin tokens disponibles: la próxima llamada espera 0.1s en la cola."""
+    gateway = LLMGateway(
+        requests_per_minute=600, burst=1, max_concurrency=8, max_queue=50, max_wait_seconds=5
+    )
+    gateway.invoke(llm, "consume la ráfaga", MODEL)
+    return gateway
+
+
+def test_queue_wait_does_not_count_against_the_breaker(fake_llm):
+    """La espera en la cola del gateway no cuenta como llamada lenta de Groq."""
+    evaluator = make_evaluator(gateway=throttled_gateway(fake_llm), slow_call_seconds=0.05)
+
+    assert evaluator.evaluate(QUESTION, "Me interesa crecer") == (False, "respuesta muy vaga")
+
+    stats = evaluator.breaker.stats()
+    assert stats["slow_calls"] == 0
+    assert stats["failures"] == 0
+
+
+def test_budget_timeout_while_queued_is_not_a_groq_failure(fake_llm):
+    """Un turno que agota el presupuesto en la cola no abre el circuito; el resultado llega después."""
+    evaluator = make_evaluator(
+        budget=0.03, gateway=throttled_gateway(fake_llm), failure_threshold=1, slow_call_seconds=0.05
+    )
+
+    assert evaluator.evaluate(QUESTION, "Me interesa crecer") == (True, "")
+    assert evaluator.breaker.state == CLOSED
+    assert evaluator.breaker.stats()["failures"] == 0
+
+    time.sleep(0.3)
+    assert evaluator.cache.get(QUESTION, "Me interesa crecer") == (False, "respuesta muy vaga")
+    assert evaluator.breaker.stats()["failures"] == 0
+    assert evaluator.fallback_stats()["budget_exceeded"] == 1
+
+
+def test_open_circuit_skips_groq(fake_llm):
+    """Con el circuito abierto, los turnos no esperan a Groq."""
+    fake_llm.error = RuntimeError("503")
+    evaluator = make_evaluator(failure_threshold=2, open_seconds=60)
+
+    for answer in ("Me interesa crecer", "Quiero aprender", "Me gusta el equipo"):
+        assert evaluator.evaluate(QUESTION, answer) == (True, "")
+
+    assert fake_llm.calls == 2
+    metrics = evaluator.get_metrics()
+    assert metrics["circuit_breaker"]["state"] == OPEN
+    assert metrics["fallbacks"] == {
+        "no_api_key": 0, "circuit_open": 1, "budget_exceeded": 0, "error": 2
+    }
@@ -0,0 +1,53 @@
+"""
+Pruebas del registro de clientes LLM compartidos.
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from services.llm_client import cerrar_clientes_llm, obtener_cliente_llm
+
+
+@pytest.fixture(autouse=True)
+def registro_limpio():
+    """Vacía el registro de clientes antes y después de cada prueba."""
+    cerrar_clientes_llm()
+    yield
+    cerrar_clientes_llm()
+
+
+def test_reutiliza_cliente_para_misma_clave():
+    """El mismo modelo y API key devuelven la misma instancia."""
+    primero = obtener_cliente_llm("gsk_test")
+    segundo = obtener_cliente_llm("gsk_test")
+    assert primero is segundo
+
+
+def test_claves_distintas_crean_clientes_distintos():
+    """Modelos o API keys distintos no comparten cliente."""
+    base = obtener_cliente_llm("gsk_test")
+    assert obtener_cliente_llm("gsk_test", model="llama-3.1-8b-instant") is not base
+    assert obtener_cliente_llm("gsk_otra") is not base
+
+
+def test_creacion_concurrente_devuelve_una_sola_instancia():
+    """Varios hilos pidiendo el mismo cliente obtienen una única instancia."""
+    resultados = []
+
+    def pedir_cliente():
+        resultados.append(obtener_cliente_llm("gsk_concurrente"))
+
+    hilos = [threading.Thread(target=pedir_cliente) for _ in range(16)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert len({id(cliente) for cliente in resultados}) == 1
@@ -0,0 +1,290 @@
+"""
+Pruebas del gateway LLM: limitador de tasa, coalescencia y cola de prioridad.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from services.llm_gateway import (
+    LLMGateway,
+    PRIORIDAD_ENTREVISTA,
+    PRIORIDAD_LOTE,
+    TokenBucket
+)
+
+MODEL = "llama-3.3-70b-versatile"
+
+
+class SlowLLM:
+    """LLM falso que registra los prompts y tarda en responder."""
+
+    def __init__(self, latency: float = 0.0, gate: threading.Event = None):
+        self.latency = latency
+        self.gate = gate
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt):
+        with self._lock:
+            self.prompts.append(prompt)
+        if self.gate is not None:
+            self.gate.wait(5)
+        time.sleep(self.latency)
+        return f"respuesta a {prompt}"
+
+    async def ainvoke(self, prompt):
+        with self._lock:
+            self.prompts.append(prompt)
+        await asyncio.sleep(self.latency)
+        return f"respuesta a {prompt}"
+
+
+def make_gateway(**overrides):
+    """Gateway con límites holgados salvo los indicados."""
+    config = dict(
+        requests_per_minute=60000, burst=100, max_concurrency=8, max_queue=50, max_wait_seconds=5
+    )
+    config.update(overrides)
+    return LLMGateway(**config)
+
+
+def wait_until(condition, timeout=2.0):
+    """Espera activa hasta que se cumpla una condición."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condición no alcanzada"
+        time.sleep(0.005)
+
+
+def test_token_bucket_allows_burst_then_throttles():
+    """El bucket permite la ráfaga configurada y luego informa la espera."""
+    bucket = TokenBucket(tasa_por_segundo=10, capacidad=3)
+    assert [bucket.intentar_consumir() for _ in range(3)] == [0.0, 0.0, 0.0]
+    wait = bucket.intentar_consumir()
+    assert 0 < wait <= 0.1
+
+
+def test_rate_limit_spaces_requests():
+    """Pasada la ráfaga, las solicitudes salen al ritmo de la cuota."""
+    gateway = make_gateway(requests_per_minute=1200, burst=1)  # 20 por segundo
+    llm = SlowLLM()
+
+    start = time.perf_counter()
+    for i in range(4):
+        gateway.invoke(llm, f"prompt {i}", MODEL)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed >= 3 / 20 * 0.9
+    assert gateway.stats()["queued"] == 3
+
+
+def test_identical_prompts_in_flight_are_coalesced():
+    """Los prompts idénticos en vuelo comparten una sola llamada."""
+    gateway = make_gateway()
+    llm = SlowLLM(latency=0.1)
+    results = []
+
+    def call():
+        results.append(gateway.invoke(llm, "mismo prompt", MODEL))
+
+    threads = [threading.Thread(target=call) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert llm.prompts == ["mismo prompt"]
+    assert results == ["respuesta a mismo prompt"] * 10
+    assert gateway.stats()["coalesced"] == 9
+
+
+def test_live_interviews_are_served_before_batch_work():
+    """Con la concurrencia ocupada, las entrevistas pasan delante de los lotes."""
+    gateway = make_gateway(max_concurrency=1)
+    gate = threading.Event()
+    llm = SlowLLM(gate=gate)
+
+    def call(prompt, priority):
+        gateway.invoke(llm, prompt, MODEL, priority)
+
+    blocker = threading.Thread(target=call, args=("en curso", PRIORIDAD_LOTE))
+    blocker.start()
+    wait_until(lambda: llm.prompts == ["en curso"])
+
+    waiting = [
+        threading.Thread(target=call, args=("lote 1", PRIORIDAD_LOTE)),
+        threading.Thread(target=call, args=("lote 2", PRIORIDAD_LOTE)),
+        threading.Thread(target=call, args=("entrevista", PRIORIDAD_ENTREVISTA))
+    ]
+    for thread in waiting:
+        thread.start()
+        wait_until(lambda: gateway.stats()["queue_depth"] == waiting.index(thread) + 1)
+
+    gate.set()
+    for thread in [blocker] + waiting:
+        thread.join()
+
+    assert llm.prompts == ["en curso", "entrevista", "lote 1", "lote 2"]
+
+
+def test_live_follower_promotes_queued_batch_leader():
+    """Una entrevista que se une a un lote en cola lo adelanta a su prioridad."""
+    gateway = make_gateway(max_concurrency=1)
+    gate = threading.Event()
+    llm = SlowLLM(gate=gate)
+    results = {}
+
+    def call(name, prompt, priority):
+        results[name] = gateway.invoke(llm, prompt, MODEL, priority)
+
+    blocker = threading.Thread(target=call, args=("en curso", "en curso", PRIORIDAD_LOTE))
+    blocker.start()
+    wait_until(lambda: llm.prompts == ["en curso"])
+
+    waiting = [
+        threading.Thread(target=call, args=("lote", "lote", PRIORIDAD_LOTE)),
+        threading.Thread(target=call, args=("especulativo", "compartido", PRIORIDAD_LOTE))
+    ]
+    for thread in waiting:
+        thread.start()
+        wait_until(lambda: gateway.stats()["queue_depth"] == waiting.index(thread) + 1)
+    live = threading.Thread(target=call, args=("entrevista", "compartido", PRIORIDAD_ENTREVISTA))
+    live.start()
+    wait_until(lambda: gateway.stats()["promoted"] == 1)
+
+    gate.set()
+    for thread in [blocker, live] + waiting:
+        thread.join()
+
+    assert llm.prompts == ["en curso", "compartido", "lote"]
+    assert results["entrevista"] == results["especulativo"] == "respuesta a compartido"
+
+
+def test_follower_wait_is_bounded():
+    """Quien se une a una llamada en vuelo no espera más que la cola y la llamada."""
+    gateway = make_gateway(max_wait_seconds=0.05, max_call_seconds=0.05)
+    gate = threading.Event()
+    llm = SlowLLM(gate=gate)
+    leader = threading.Thread(target=gateway.invoke, args=(llm, "lento", MODEL))
+    leader.start()
+    wait_until(lambda: llm.prompts == ["lento"])
+
+    with pytest.raises(TimeoutError):
+        gateway.invoke(llm, "lento", MODEL)
+    gate.set()
+    leader.join()
+
+
+def test_full_queue_displaces_batch_work():
+    """Si la cola se llena, una entrevista desplaza al trabajo por lotes."""
+    gateway = make_gateway(max_concurrency=1, max_queue=1)
+    gate = threading.Event()
+    llm = SlowLLM(gate=gate)
+    errors = {}
+
+    def call(prompt, priority):
+        try:
+            gateway.invoke(llm, prompt, MODEL, priority)
+        except RuntimeError as e:
+            errors[prompt] = e
+
+    blocker = threading.Thread(target=call, args=("en curso", PRIORIDAD_ENTREVISTA))
+    blocker.start()
+    wait_until(lambda: llm.prompts == ["en curso"])
+
+    batch = threading.Thread(target=call, args=("lote", PRIORIDAD_LOTE))
+    batch.start()
+    wait_until(lambda: gateway.stats()["queue_depth"] == 1)
+    live = threading.Thread(target=call, args=("entrevista", PRIORIDAD_ENTREVISTA))
+    live.start()
+    batch.join()
+
+    # Una segunda solicitud de lote no cabe detrás de la entrevista
+    call("otro lote", PRIORIDAD_LOTE)
+
+    gate.set()
+    for thread in (blocker, live):
+        thread.join()
+
+    assert set(errors) == {"lote", "otro lote"}
+    assert llm.prompts == ["en curso", "entrevista"]
+    assert gateway.stats()["rejected"] == 2
+
+
+class DisplacingGateway(LLMGateway):
+    """Gateway en el que una entrevista desplaza a la solicitud justo cuando vence su espera."""
+
+    displacer = None
+
+    def _abandonar(self, solicitud):
+        self.displacer = self._encolar(PRIORIDAD_ENTREVISTA, MODEL)
+        return super()._abandonar(solicitud)
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_timeout_racing_a_displacement_does_not_take_a_slot(use_async):
+    """Si al vencer la espera la solicitud ya fue desplazada, falla sin ocupar un cupo."""
+    gateway = DisplacingGateway(
+        requests_per_minute=60000, burst=100, max_concurrency=1, max_queue=1, max_wait_seconds=0.05
+    )
+    gate = threading.Event()
+    llm = SlowLLM(gate=gate)
+    blocker = threading.Thread(target=gateway.invoke, args=(llm, "en curso", MODEL))
+    blocker.start()
+    wait_until(lambda: llm.prompts == ["en curso"])
+
+    with pytest.raises(RuntimeError, match="Desplazada"):
+        if use_async:
+            asyncio.run(gateway.ainvoke(llm, "lote", MODEL, PRIORIDAD_LOTE))
+        else:
+            gateway.invoke(llm, "lote", MODEL, PRIORIDAD_LOTE)
+
+    gate.set()
+    blocker.join()
+    # La entrevista que desplazó al lote recibe el cupo y lo devuelve
+    gateway.displacer.permiso.result(timeout=2)
+    gateway._liberar()
+    assert llm.prompts == ["en curso"]
+    assert gateway.stats()["active"] == 0
+
+
+def test_queue_wait_times_out():
+    """Una solicitud que no consigue turno a tiempo se abandona con TimeoutError."""
+    gateway = make_gateway(requests_per_minute=60, burst=1, max_wait_seconds=0.05)
+    llm = SlowLLM()
+    gateway.invoke(llm, "primero", MODEL)
+
+    with pytest.raises(TimeoutError):
+        gateway.invoke(llm, "segundo", MODEL)
+    assert gateway.stats()["timeouts"] == 1
+    assert llm.prompts == ["primero"]
+
+
+def test_async_calls_share_limits_and_coalesce():
+    """La variante asíncrona aplica la concurrencia máxima y la coalescencia."""
+    gateway = make_gateway(max_concurrency=2)
+    llm = SlowLLM(latency=0.05)
+
+    async def run_all():
+        prompts = [f"prompt {i}" for i in range(6)] + ["prompt 0"] * 3
+        return await asyncio.gather(*(gateway.ainvoke(llm, p, MODEL) for p in prompts))
+
+    start = time.perf_counter()
+    results = asyncio.run(run_all())
+    elapsed = time.perf_counter() - start
+
+    assert results[-1] == "respuesta a prompt 0"
+    assert len(llm.prompts) == 6
+    assert elapsed >= 3 * 0.05 * 0.9
+    stats = gateway.stats()
+    assert stats["coalesced"] == 3
+    assert stats["active"] == 0
@@ -0,0 +1,113 @@
+"""
+Pruebas del historial compacto de mensajes.
+"""
+
+import copy
+import pickle
+import sys
+from pathlib import Path
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from core.models.conversation_models import SNAPSHOT_HEADER, SNAPSHOT_MAGIC, ConversationState
+from core.models.message_log import MessageLog
+from core.models.question_models import ValidatorSpec
+
+
+def make_log():
+    """Historial con mensajes de los tres roles y texto no ASCII."""
+    log = MessageLog()
+    log.append(SystemMessage(content="Eres un asistente de RRHH"))
+    log.append(AIMessage(content="¿Cuál es tu nombre completo?"))
+    log.append(HumanMessage(content="José Núñez 🙂"))
+    log.append(("ai", ""))
+    log.append({"role": "human", "content": "sí"})
+    return log
+
+
+def test_messages_are_materialized_on_demand():
+    """Los mensajes se reconstruyen con su clase y su texto al indexarlos."""
+    log = make_log()
+
+    assert len(log) == 5
+    assert isinstance(log[2], HumanMessage)
+    assert log[2].content == "José Núñez 🙂"
+    assert isinstance(log[-2], AIMessage) and log[-2].content == ""
+    assert [m.type for m in log[1:3]] == ["ai", "human"]
+    assert [type(m) for m in log.to_messages()] == [SystemMessage, AIMessage, HumanMessage, AIMessage, HumanMessage]
+    with pytest.raises(IndexError):
+        log.text(5)
+
+
+def test_text_access_does_not_build_objects():
+    """Rol y texto se leen directamente de las columnas."""
+    log = make_log()
+
+    assert log.role(0) == "system"
+    assert log.text(-1) == "sí"
+    assert list(log.iter_text(3)) == [("ai", ""), ("human", "sí")]
+    assert log.nbytes() < 200
+
+
+def test_copy_and_pickle_preserve_contents():
+    """Las copias son independientes y el historial se puede serializar con pickle."""
+    log = make_log()
+    clone = copy.deepcopy(log)
+    clone.append(("ai", "Gracias"))
+
+    assert len(log) == 5 and len(clone) == 6
+    assert pickle.loads(pickle.dumps(log)) == log
+
+
+def test_conversation_state_validates_and_dumps_the_log():
+    """ConversationState acepta listas de mensajes y serializa el historial como registros."""
+    state = ConversationState(messages=[AIMessage(content="Hola"), HumanMessage(content="Ana López")])
+
+    assert isinstance(state.messages, MessageLog)
+    assert state.model_dump()["messages"] == [
+        {"role": "ai", "content": "Hola"},
+        {"role": "human", "content": "Ana López"}
+    ]
+    restored = ConversationState.model_validate_json(state.model_dump_json())
+    assert restored.messages == state.messages
+    assert ConversationState().messages is not ConversationState().messages
+
+
+def test_conversation_state_binary_round_trip():
+    """to_bytes/from_bytes conserva el estado completo y es más compacto que JSON."""
+    state = ConversationState(
+        messages=make_log(),
+        turn_starts=[0, 2, 4],
+        pending_questions=["¿Cuál es tu nombre completo?", "¿Cuál es tu pretensión salarial?"],
+        question_validators={"¿Cuál es tu pretensión salarial?": ValidatorSpec(type="numeric_range", min=0, max=10)},
+        user_responses={"¿Cuál es tu nombre completo?": "José Núñez 🙂"},
+        current_question="¿Cuál es tu pretensión salarial?",
+        current_question_index=1,
+        needs_clarification=True,
+        clarification_reason="Indica un monto",
+        metadata={"id_job_offer": "42", "extracted_questions": []}
+    )
+
+    data = state.to_bytes()
+    restored = ConversationState.from_bytes(data)
+
+    assert restored.model_dump() == state.model_dump()
+    assert restored.messages == state.messages
+    assert len(data) < len(state.model_dump_json())
+
+
+def test_from_bytes_rejects_foreign_or_newer_data():
+    """Los datos ajenos, truncados o de otra versión del esquema se rechazan."""
+    data = ConversationState(messages=make_log()).to_bytes()
+
+    with pytest.raises(ValueError, match="no son un estado"):
+        ConversationState.from_bytes(b"XXXX" + data[4:])
+    with pytest.raises(ValueError, match="Versión"):
+        ConversationState.from_bytes(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, 99) + data[SNAPSHOT_HEADER.size:])
+    with pytest.raises(ValueError):
+        ConversationState.from_bytes(data[:len(data) // 2])
@@ -0,0 +1,162 @@
+"""
+Pruebas de la cascada de modelos usada para evaluar respuestas.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from agents.tools.model_cascade import ModelCascade, parse_tier_output
+from agents.tools.response_evaluator import ResponseEvaluator
+from services.llm_gateway import LLMGateway
+
+SMALL = "llama-3.1-8b-instant"
+LARGE = "llama-3.3-70b-versatile"
+
+
+class FakeLLM:
+    """Modelo falso que responde según el nombre del modelo."""
+
+    def __init__(self, model, answers, calls):
+        self.model = model
+        self.answers = answers
+        self.calls = calls
+
+    def invoke(self, prompt):
+        self.calls.append((self.model, prompt))
+        answer = self.answers[self.model]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    async def ainvoke(self, prompt):
+        return self.invoke(prompt)
+
+    def stream(self, prompt):
+        answer = self.invoke(prompt)
+        middle = len(answer) // 2
+        yield answer[:middle]
+        yield answer[middle:]
+
+
+@pytest.fixture
+def fake_models(monkeypatch):
+    """Registra las respuestas de cada modelo y las llamadas recibidas."""
+    answers = {LARGE: "SATISFACTORIA"}
+    calls = []
+    monkeypatch.setattr(
+        "agents.tools.model_cascade.obtener_cliente_llm",
+        lambda api_key, model=None, **kwargs: FakeLLM(model, answers, calls)
+    )
+    gateway = LLMGateway(
+        requests_per_minute=6000, burst=100, max_concurrency=8, max_queue=10, max_wait_seconds=1
+    )
+    monkeypatch.setattr("agents.tools.model_cascade.obtener_gateway_llm", lambda: gateway)
+    return answers, calls
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("SATISFACTORIA\nCONFIANZA: 0.95", ((True, ""), 0.95)),
+    ("NECESITA_CLARIFICACION: vacía\nCONFIANZA: 90", ((False, "vacía"), 0.9)),
+    ("SATISFACTORIA", ((True, ""), None)),
+    ("Creo que sí", None),
+    ("", None)
+])
+def test_parse_tier_output(text, expected):
+    """La salida de los modelos intermedios se interpreta con su confianza."""
+    assert parse_tier_output(text) == expected
+
+
+def test_confident_small_model_answers_alone(fake_models):
+    """Si el modelo rápido está seguro, no se consulta al grande."""
+    answers, calls = fake_models
+    answers[SMALL] = "SATISFACTORIA\nCONFIANZA: 0.9"
+    cascade = ModelCascade([SMALL, LARGE])
+
+    assert cascade.invoke("prompt", "gsk_test") == (True, "")
+    assert [model for model, _ in calls] == [SMALL]
+    assert "CONFIANZA" in calls[0][1]
+    assert cascade.stats()[SMALL]["answered"] == 1
+    assert cascade.stats()[LARGE]["calls"] == 0
+
+
+@pytest.mark.parametrize("small_answer, reason", [
+    ("No estoy seguro", "malformed"),
+    ("SATISFACTORIA\nCONFIANZA: 0.4", "low_confidence"),
+    ("SATISFACTORIA", "low_confidence"),
+    ("NECESITA_CLARIFICACION: irrelevante\nCONFIANZA: 0.99", "rejection"),
+    (RuntimeError("429"), "error")
+])
+def test_escalates_to_large_model(fake_models, small_answer, reason):
+    """Las salidas dudosas del modelo rápido se vuelven a preguntar al grande."""
+    answers, calls = fake_models
+    answers[SMALL] = small_answer
+    cascade = ModelCascade([SMALL, LARGE])
+
+    assert cascade.invoke("prompt", "gsk_test") == (True, "")
+    assert [model for model, _ in calls] == [SMALL, LARGE]
+    assert calls[1][1] == "prompt"
+    stats = cascade.stats()
+    assert stats[SMALL][reason] == 1
+    assert stats[SMALL]["escalated"] == 1
+    assert stats[LARGE]["answered"] == 1
+
+
+def test_rejection_escalation_is_configurable(fake_models):
+    """Sin escalar rechazos, el modelo rápido puede pedir aclaración por sí mismo."""
+    answers, calls = fake_models
+    answers[SMALL] = "NECESITA_CLARIFICACION: irrelevante\nCONFIANZA: 0.99"
+    cascade = ModelCascade([SMALL, LARGE], escalate_on_rejection=False)
+
+    assert cascade.invoke("prompt", "gsk_test") == (False, "irrelevante")
+    assert len(calls) == 1
+
+
+def test_last_model_errors_propagate(fake_models):
+    """Si el último modelo falla, el error llega al evaluador para su fallback."""
+    answers, _ = fake_models
+    answers[SMALL] = RuntimeError("caído")
+    answers[LARGE] = RuntimeError("caído")
+
+    with pytest.raises(RuntimeError):
+        ModelCascade([SMALL, LARGE]).invoke("prompt", "gsk_test")
+
+
+def test_evaluator_uses_cascade_sync_and_async(fake_models, monkeypatch):
+    """El evaluador recorre la cascada y expone sus contadores en las métricas."""
+    answers, calls = fake_models
+    answers[SMALL] = "SATISFACTORIA\nCONFIANZA: 0.2"
+    monkeypatch.setenv("GROQ_API_KEY", "gsk_test")
+    monkeypatch.setattr(
+        "agents.tools.response_evaluator.load_env_variables", lambda *args: True
+    )
+    evaluator = ResponseEvaluator(cascade=ModelCascade([SMALL, LARGE]))
+
+    assert evaluator.evaluate("¿Por qué?", "Porque me gusta") == (True, "")
+    assert asyncio.run(evaluator.aevaluate("¿Por qué?", "Porque sí")) == (True, "")
+
+    stats = evaluator.get_metrics()["cascade"]
+    assert stats[SMALL]["low_confidence"] == 2
+    assert stats[LARGE]["answered"] == 2
+
+
+def test_stream_only_streams_the_last_model(fake_models):
+    """Los modelos intermedios responden completos; el último se transmite en fragmentos."""
+    answers, calls = fake_models
+    answers[SMALL] = "SATISFACTORIA\nCONFIANZA: 0.95"
+    answers[LARGE] = "NECESITA_CLARIFICACION: falta detalle"
+    cascade = ModelCascade([SMALL, LARGE])
+
+    assert list(cascade.stream("prompt", "gsk_test")) == ["SATISFACTORIA"]
+
+    answers[SMALL] = "SATISFACTORIA\nCONFIANZA: 0.1"
+    chunks = list(cascade.stream("prompt", "gsk_test"))
+    assert len(chunks) == 2
+    assert "".join(chunks) == "NECESITA_CLARIFICACION: falta detalle"
+    assert cascade.stats()[LARGE]["answered"] == 1
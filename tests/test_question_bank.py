@@ -0,0 +1,82 @@
+"""
+Pruebas del banco de preguntas en memoria con invalidación por mtime y tamaño.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from agents.tools.question_bank import QuestionBank
+
+
+def write_questions(path: Path, questions, mtime_ns=None):
+    path.write_text(json.dumps({"questions": questions}), encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_sessions_share_the_cached_tuple(tmp_path):
+    """Las consultas repetidas devuelven la misma tupla sin volver a leer el archivo."""
+    default_file = tmp_path / "questions.json"
+    write_questions(default_file, ["¿Por defecto?"])
+    write_questions(tmp_path / "questions_7.json", [{"text": "¿Nombre?", "validator": "name"}])
+    bank = QuestionBank()
+
+    first = bank.get(str(default_file), "7")
+    assert isinstance(first, tuple)
+    assert [question.text for question in first] == ["¿Nombre?"]
+    assert bank.get(str(default_file), 7) is first
+
+    # Oferta sin archivo propio: se usa el archivo por defecto
+    assert [question.text for question in bank.get(str(default_file), "8")] == ["¿Por defecto?"]
+    assert bank.stats() == {
+        "entries": 2, "hits": 1, "loads": 2, "index_loads": 0, "reloads": 0, "evictions": 0
+    }
+
+    with pytest.raises(FileNotFoundError):
+        bank.get(str(tmp_path / "missing.json"), "9")
+
+
+def test_changes_on_disk_invalidate_the_entry(tmp_path):
+    """Un cambio de mtime o tamaño, o un archivo de oferta nuevo, recarga las preguntas."""
+    default_file = tmp_path / "questions.json"
+    write_questions(default_file, ["¿Una?"], mtime_ns=1_000_000_000)
+    bank = QuestionBank()
+    before = bank.get(str(default_file), "3")
+
+    # Mismo tamaño, otra fecha de modificación
+    write_questions(default_file, ["¿Dos?"], mtime_ns=2_000_000_000)
+    after = bank.get(str(default_file), "3")
+    assert after is not before
+    assert after[0].text == "¿Dos?"
+
+    write_questions(tmp_path / "questions_3.json", ["¿Propia?"])
+    assert bank.get(str(default_file), "3")[0].text == "¿Propia?"
+    assert bank.stats()["loads"] == 3
+
+
+def test_cache_keeps_only_the_most_recent_offers(tmp_path):
+    """Los ids de oferta vienen del cliente: la caché no crece más allá del máximo."""
+    default_file = tmp_path / "questions.json"
+    write_questions(default_file, ["¿Por defecto?"])
+    write_questions(tmp_path / "questions_1.json", ["¿Propia?"])
+    bank = QuestionBank(max_entries=3)
+
+    first = bank.get(str(default_file), "1")
+    for offer in range(100, 110):
+        bank.get(str(default_file), str(offer))
+        # La oferta usada seguido se mantiene en la caché
+        assert bank.get(str(default_file), "1") is first
+
+    stats = bank.stats()
+    assert stats["entries"] == 3
+    assert stats["evictions"] == 8
+    assert stats["loads"] == 11
+    assert stats["hits"] == 10
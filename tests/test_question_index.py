@@ -0,0 +1,89 @@
+"""
+Pruebas del índice compilado del banco de preguntas.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from agents.tools.evaluation_cache import question_id
+from agents.tools.question_bank import QuestionBank
+from agents.tools.question_index import QuestionIndex, build_question_index
+from core.models.question_models import QuestionSpec, ValidatorSpec
+
+
+def write_questions(path: Path, questions):
+    path.write_text(json.dumps({"questions": questions}), encoding="utf-8")
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    write_questions(tmp_path / "questions.json", ["¿Por defecto?"])
+    write_questions(tmp_path / "questions_7.json", [
+        {"text": "¿Nombre?", "validator": "name"},
+        {"text": "¿Salario?", "validator": {"type": "numeric_range", "min": 100}}
+    ])
+    write_questions(tmp_path / "questions_8.json", [{"text": "¿Nombre?", "validator": "free_text"}])
+    (tmp_path / "questions_roto.json").write_text('{"otro": []}', encoding="utf-8")
+    (tmp_path / "notas.json").write_text("{}", encoding="utf-8")
+    return tmp_path
+
+
+def test_build_and_lookup(data_dir):
+    """El índice guarda cada oferta con ids estables y hashes de contenido."""
+    result = build_question_index(str(data_dir))
+    assert result == {"offers": 3, "questions": 4, "skipped": 1}
+
+    index = QuestionIndex(str(data_dir / "questions.idx"))
+    assert sorted(index.offers()) == ["", "7", "8"]
+    assert "9" not in index and index.get("9") is None
+
+    entry = index.get("7")
+    assert entry.source == "questions_7.json"
+    assert entry.specs == (
+        QuestionSpec(text="¿Nombre?", validator=ValidatorSpec(type="name")),
+        QuestionSpec(text="¿Salario?", validator=ValidatorSpec(type="numeric_range", min=100))
+    )
+    assert [question.question_id for question in entry.questions] == [
+        question_id("¿Nombre?"), question_id("¿Salario?")
+    ]
+
+    # Mismo texto con otro validador: mismo id, distinto hash de contenido
+    other = index.get("8").questions[0]
+    assert other.question_id == entry.questions[0].question_id
+    assert other.content_hash != entry.questions[0].content_hash
+    assert index.get("8").set_hash != entry.set_hash
+
+    # Recompilar sin cambios da los mismos hashes
+    build_question_index(str(data_dir))
+    assert QuestionIndex(str(data_dir / "questions.idx")).get("7").set_hash == entry.set_hash
+    index.close()
+
+
+def test_bank_reads_from_index_until_file_changes(data_dir):
+    """El banco usa el índice mientras el archivo coincide con lo compilado."""
+    build_question_index(str(data_dir))
+    bank = QuestionBank(QuestionIndex(str(data_dir / "questions.idx")))
+    default_file = str(data_dir / "questions.json")
+
+    assert bank.get(default_file, "7")[0].validator == ValidatorSpec(type="name")
+    assert bank.get(default_file, "9")[0].text == "¿Por defecto?"
+    assert bank.stats()["index_loads"] == 2
+
+    write_questions(data_dir / "questions_7.json", ["¿Pregunta editada después de compilar?"])
+    assert bank.get(default_file, "7")[0].text == "¿Pregunta editada después de compilar?"
+    assert bank.stats()["loads"] == 1
+
+
+def test_rejects_files_that_are_not_an_index(tmp_path):
+    """Un archivo ajeno o truncado no se abre como índice."""
+    path = tmp_path / "questions.idx"
+    path.write_bytes(b"no es un indice de preguntas")
+    with pytest.raises(ValueError):
+        QuestionIndex(str(path))
@@ -0,0 +1,159 @@
+"""
+Pruebas de los validadores por pregunta y del formato extendido del banco de preguntas.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from agents.tools.file_search_tool import search_question_specs_direct, search_questions_file_direct
+from agents.tools.question_bank import parse_question_specs
+from agents.tools.question_validators import _parse_numbers, validate_answer
+from agents.tools.response_evaluator import ResponseEvaluator
+from core.models.question_models import QuestionSpec, ValidatorSpec
+
+NAME = ValidatorSpec(type="name")
+SALARY = ValidatorSpec(type="numeric_range", min=100, max=100000000)
+
+
+@pytest.mark.parametrize("answer", ["Juan Pérez", "Me llamo María José García", "Ana O'Neill"])
+def test_name_validator_accepts_full_names(answer):
+    """Los nombres completos se aceptan sin LLM."""
+    assert validate_answer(NAME, answer) == (True, "")
+
+
+@pytest.mark.parametrize("answer", ["Juan", "Juan P@rez"])
+def test_name_validator_rejects_incomplete_names(answer):
+    """Un solo nombre o palabras que no son de un nombre piden aclaración."""
+    is_valid, reason = validate_answer(NAME, answer)
+    assert is_valid is False
+    assert reason
+
+
+@pytest.mark.parametrize("answer", ["1.500.000", "50k", "Espero unos 2 millones", "800000 ARS"])
+def test_numeric_range_accepts_amounts(answer):
+    """Las expectativas salariales con un monto razonable se aceptan."""
+    assert validate_answer(SALARY, answer) == (True, "")
+
+
+@pytest.mark.parametrize("answer, expected", [
+    ("$1,500.50 mensuales", 1500.5),
+    ("1.500,50", 1500.5),
+    ("USD 2,000", 2000),
+    ("1.500.000", 1500000),
+    ("1 millón", 1000000),
+    ("1,5 millones", 1500000)
+])
+def test_parse_numbers_detects_decimal_and_thousand_separators(answer, expected):
+    """El último separador seguido de uno o dos dígitos es el decimal; el resto son miles."""
+    assert _parse_numbers(answer) == [expected]
+    assert validate_answer(SALARY, answer) == (True, "")
+
+
+@pytest.mark.parametrize("answer", [
+    "Soy Juan Pérez y tengo 5 años de experiencia en Python",
+    "Juan Pérez, 5 años",
+    "12345",
+    "María José de la O"
+])
+def test_name_validator_escalates_what_it_cannot_decide(answer):
+    """Frases largas, respuestas con números y partículas de una letra van al LLM."""
+    assert validate_answer(NAME, answer) is None
+
+
+def test_numeric_range_rejects_out_of_range_and_escalates_text():
+    """Un monto fuera de rango se rechaza y una respuesta sin números va al LLM."""
+    assert validate_answer(SALARY, "5")[0] is False
+    assert validate_answer(SALARY, "Lo que corresponda al mercado") is None
+
+
+def test_regex_and_yes_no_validators():
+    """Los validadores regex y sí/no usan el mensaje personalizado al fallar."""
+    email = ValidatorSpec(type="regex", pattern=r"^\S+@\S+\.\S+$", message="Email no válido")
+    assert validate_answer(email, "ana@example.com") == (True, "")
+    assert validate_answer(email, "ana arroba example") == (False, "Email no válido")
+
+    yes_no = ValidatorSpec(type="yes_no")
+    assert validate_answer(yes_no, "Sí, claro")[0] is True
+    assert validate_answer(yes_no, "quizás")[0] is False
+
+
+def test_free_text_always_escalates():
+    """Las preguntas de texto libre se dejan siempre al LLM."""
+    assert validate_answer(None, "cualquier cosa") is None
+    assert validate_answer(ValidatorSpec(), "cualquier cosa") is None
+
+
+def test_parse_question_specs_accepts_old_and_new_formats():
+    """Las listas de texto plano y los objetos con validador conviven."""
+    specs = parse_question_specs({
+        "questions": [
+            "¿Cuál es tu experiencia laboral previa?",
+            {"text": "¿Cuál es tu nombre completo?", "validator": "name"},
+            {"text": "¿Expectativas salariales?", "validator": {"type": "numeric_range", "min": 1}}
+        ]
+    })
+    assert [spec.validator.type for spec in specs] == ["free_text", "name", "numeric_range"]
+    assert specs[2].validator.min == 1
+
+    assert parse_question_specs(["¿Pregunta?"]) == [QuestionSpec(text="¿Pregunta?")]
+
+    with pytest.raises(ValueError):
+        parse_question_specs({"questions": [{"text": "¿Pregunta?", "validator": "desconocido"}]})
+
+
+@pytest.mark.parametrize("validator", [{"type": "regex", "pattern": "[a-z"}, "regex"])
+def test_invalid_regex_is_rejected_at_load(validator):
+    """Un patrón que no compila (o que falta) invalida el archivo en lugar del turno."""
+    with pytest.raises(ValueError):
+        parse_question_specs({"questions": [{"text": "¿Email?", "validator": validator}]})
+
+
+def test_question_files_load_texts_and_specs(tmp_path):
+    """Los archivos con validadores siguen devolviendo textos en la API antigua."""
+    questions_file = tmp_path / "questions.json"
+    questions_file.write_text(json.dumps({
+        "questions": [{"text": "¿Cuál es tu nombre completo?", "validator": "name"}, "¿Por qué?"]
+    }), encoding="utf-8")
+
+    assert search_questions_file_direct(str(questions_file)) == [
+        "¿Cuál es tu nombre completo?", "¿Por qué?"
+    ]
+    specs = search_question_specs_direct(str(questions_file))
+    assert specs[0].validator == NAME
+
+
+def test_evaluator_skips_llm_for_validated_questions(monkeypatch):
+    """El evaluador solo llama a Groq para las respuestas que el validador no decide."""
+    calls = []
+
+    class FakeLLM:
+        def invoke(self, prompt):
+            calls.append(prompt)
+            return "SATISFACTORIA"
+
+    monkeypatch.setenv("GROQ_API_KEY", "gsk_test")
+    monkeypatch.setattr(
+        "agents.tools.response_evaluator.load_env_variables", lambda *args: True
+    )
+    monkeypatch.setattr(
+        "agents.tools.model_cascade.obtener_cliente_llm",
+        lambda *args, **kwargs: FakeLLM()
+    )
+    evaluator = ResponseEvaluator()
+
+    assert evaluator.evaluate("¿Cuál es tu nombre completo?", "Juan Pérez", NAME) == (True, "")
+    assert evaluator.evaluate("¿Cuál es tu nombre completo?", "Juan", NAME)[0] is False
+    assert evaluator.evaluate("¿Expectativas salariales?", "1.500.000", SALARY) == (True, "")
+    assert evaluator.evaluate("¿Expectativas salariales?", "A convenir", SALARY) == (True, "")
+
+    assert len(calls) == 1
+    stats = evaluator.get_metrics()["validators"]
+    assert stats["name"] == {"accepted": 1, "rejected": 1, "escalated": 0}
+    assert stats["numeric_range"] == {"accepted": 1, "rejected": 0, "escalated": 1}
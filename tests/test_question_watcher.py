@@ -0,0 +1,63 @@
+"""
+Pruebas de la recarga en caliente de los archivos de preguntas.
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from agents.tools.question_bank import QuestionBank
+from agents.tools.question_watcher import Observer, QuestionFileWatcher
+
+
+def write_questions(path: Path, questions):
+    path.write_text(json.dumps({"questions": questions}), encoding="utf-8")
+
+
+def wait_for(condition, timeout=1.0):
+    """Espera hasta `timeout` segundos a que se cumpla la condición."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+
+@pytest.mark.parametrize("use_inotify", [
+    pytest.param(True, marks=pytest.mark.skipif(Observer is None, reason="watchdog no está instalado")),
+    False
+])
+def test_changes_reach_new_sessions_within_a_second(tmp_path, use_inotify):
+    """Los cambios válidos se ven enseguida, los inválidos se ignoran y las sesiones conservan lo suyo."""
+    default_file = str(tmp_path / "questions.json")
+    write_questions(tmp_path / "questions.json", ["¿Por defecto?"])
+    write_questions(tmp_path / "questions_5.json", ["¿Primera versión?"])
+    bank = QuestionBank()
+    watcher = QuestionFileWatcher(bank, str(tmp_path), poll_interval=0.1, use_inotify=use_inotify)
+    watcher.start()
+    try:
+        in_progress = bank.get(default_file, "5")
+
+        write_questions(tmp_path / "questions_5.json", ["¿Segunda versión?", "¿Otra pregunta?"])
+        assert wait_for(lambda: bank.get(default_file, "5")[0].text == "¿Segunda versión?")
+        assert in_progress[0].text == "¿Primera versión?"
+
+        # Archivo roto: se mantiene la última versión válida
+        (tmp_path / "questions_5.json").write_text("{no es json", encoding="utf-8")
+        time.sleep(0.3)
+        assert bank.get(default_file, "5")[0].text == "¿Segunda versión?"
+
+        # Archivo borrado: la oferta vuelve a las preguntas por defecto
+        (tmp_path / "questions_5.json").unlink()
+        assert wait_for(lambda: bank.get(default_file, "5")[0].text == "¿Por defecto?")
+        assert bank.stats()["reloads"] >= 2
+    finally:
+        watcher.stop()
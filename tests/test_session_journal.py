@@ -0,0 +1,154 @@
+"""
+Pruebas del diario de sesión: retomar entrevistas interrumpidas sin llamar al LLM.
+"""
+
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from agents.session_journal import SessionJournal
+from agents.simple_agent import create_simple_rrhh_agent
+from agents.tools.evaluation_cache import EvaluationCache
+from agents.tools.response_evaluator import ResponseEvaluator
+
+
+class CountingEvaluator(ResponseEvaluator):
+    """Evaluador local que cuenta las evaluaciones."""
+
+    def __init__(self):
+        super().__init__(EvaluationCache())
+        self.calls = 0
+
+    def evaluate(self, question, user_response, validator=None):
+        self.calls += 1
+        return super().evaluate(question, user_response, validator)
+
+
+@pytest.fixture
+def evaluator(tmp_path, monkeypatch):
+    """Directorio de trabajo aislado con el banco de preguntas y evaluación local."""
+    (tmp_path / "data").mkdir()
+    shutil.copy(root_dir / "data" / "questions.json", tmp_path / "data")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("GROQ_API_KEY", raising=False)
+    fake = CountingEvaluator()
+    monkeypatch.setattr("agents.simple_agent.get_response_evaluator", lambda: fake)
+    return fake
+
+
+def interrupted_interview(journal):
+    """Entrevista con una respuesta aceptada y una aclaración pendiente."""
+    agent = create_simple_rrhh_agent("42", journal=journal)
+    agent.start_conversation()
+    agent.process_user_input("Juan Pérez")
+    agent.process_user_input("no")
+    return agent
+
+
+def test_new_agent_resumes_from_journal_without_evaluating(evaluator, tmp_path):
+    """Un agente nuevo con el mismo diario retoma el estado sin volver a evaluar."""
+    journal_path = str(tmp_path / "journals" / "sesion.journal")
+    agent = interrupted_interview(SessionJournal(journal_path, fsync=False))
+    calls = evaluator.calls
+
+    resumed = create_simple_rrhh_agent(journal=SessionJournal(journal_path, fsync=False))
+
+    assert evaluator.calls == calls
+    assert resumed.initialized and resumed.id_job_offer == "42"
+    assert resumed.state.model_dump() == agent.state.model_dump()
+    assert resumed.state.needs_clarification
+
+    reply = resumed.process_user_input("Trabajé tres años como desarrollador backend")
+    assert resumed.state.pending_questions[2] in reply
+    assert len(list(SessionJournal(journal_path).records())) == 4
+
+
+def test_torn_record_is_ignored_and_overwritten(evaluator, tmp_path):
+    """Un registro a medio escribir no cuenta y el próximo turno lo reemplaza."""
+    journal_path = tmp_path / "sesion.journal"
+    agent = interrupted_interview(SessionJournal(str(journal_path), fsync=False))
+    intact = journal_path.read_bytes()
+    # Simular un corte durante la escritura del turno siguiente
+    journal_path.write_bytes(intact + b"\x40\x00\x00\x00\x01\x02\x03")
+
+    resumed = create_simple_rrhh_agent(journal=SessionJournal(str(journal_path), fsync=False))
+    assert resumed.state.model_dump() == agent.state.model_dump()
+
+    resumed.process_user_input("Trabajé tres años como desarrollador backend")
+    again = create_simple_rrhh_agent(journal=SessionJournal(str(journal_path), fsync=False))
+    assert again.state.model_dump() == resumed.state.model_dump()
+
+
+def test_reset_clears_the_journal(evaluator, tmp_path):
+    """Reiniciar la entrevista borra el diario y la siguiente empieza de cero."""
+    journal_path = str(tmp_path / "sesion.journal")
+    agent = interrupted_interview(SessionJournal(journal_path, fsync=False))
+
+    agent.reset_conversation()
+    agent.start_conversation()
+
+    resumed = create_simple_rrhh_agent(journal=SessionJournal(journal_path, fsync=False))
+    assert len(resumed.state.turn_starts) == 1
+    assert resumed.state.current_question_index == 0
+    assert resumed.id_job_offer == "42"
+
+
+def test_older_snapshot_does_not_override_journal(evaluator, tmp_path):
+    """Un snapshot más viejo que el diario no pisa los turnos ya registrados."""
+    journal_path = str(tmp_path / "sesion.journal")
+    agent = create_simple_rrhh_agent(journal=SessionJournal(journal_path, fsync=False))
+    agent.start_conversation()
+    old_snapshot = agent.snapshot()
+    agent.process_user_input("Juan Pérez")
+
+    resumed = create_simple_rrhh_agent(journal=SessionJournal(journal_path, fsync=False))
+    resumed.restore(old_snapshot)
+
+    assert resumed.state.user_responses == {"¿Cuál es tu nombre completo?": "Juan Pérez"}
+
+
+def test_rewrite_is_atomic(evaluator, tmp_path, monkeypatch):
+    """Reescribir el diario reemplaza el archivo de una vez; si falla, queda el anterior."""
+    journal_path = tmp_path / "sesion.journal"
+    journal = SessionJournal(str(journal_path), fsync=False)
+    agent = interrupted_interview(journal)
+    previous = journal_path.read_bytes()
+
+    def failing_replace(src, dst):
+        raise OSError("disco lleno")
+
+    with monkeypatch.context() as patch:
+        patch.setattr("agents.session_journal.os.replace", failing_replace)
+        journal.rewrite(agent.state)
+    assert journal_path.read_bytes() == previous
+
+    journal.rewrite(agent.state)
+    assert not (tmp_path / "sesion.journal.tmp").exists()
+    assert len(list(SessionJournal(str(journal_path), fsync=False).records())) == 1
+    resumed = create_simple_rrhh_agent(journal=SessionJournal(str(journal_path), fsync=False))
+    assert resumed.state.model_dump() == agent.state.model_dump()
+
+
+def test_completed_interview_deletes_its_journal(evaluator, tmp_path):
+    """Al terminar la entrevista el diario se borra: no queda nada que retomar."""
+    journal_path = tmp_path / "sesion.journal"
+    agent = create_simple_rrhh_agent(journal=SessionJournal(str(journal_path), fsync=False))
+    agent.start_conversation()
+    for answer in [
+        "Juan Pérez",
+        "Trabajé tres años como desarrollador backend",
+        "Python, SQL y Docker",
+        "Me interesa crecer en un equipo de producto",
+        "Pretendo 1.500.000 pesos brutos"
+    ]:
+        assert journal_path.exists()
+        agent.process_user_input(answer)
+
+    assert agent.is_conversation_complete()
+    assert not journal_path.exists()
@@ -0,0 +1,256 @@
+"""
+Pruebas del almacén de sesiones de entrevista (LRU en memoria y SQLite).
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from agents.session_journal import delete_session_journal
+from agents.session_store import MemorySessionStore, SQLiteSessionStore, session_key
+from core.rrhh_config import SESSION_JOURNAL_CONFIG
+
+
+class FakeAgent:
+    """Agente mínimo con snapshot/restore."""
+
+    def __init__(self):
+        self.answers = []
+
+    def snapshot(self):
+        return "\n".join(self.answers).encode("utf-8")
+
+    def restore(self, data):
+        self.answers = data.decode("utf-8").split("\n") if data else []
+        return self
+
+
+class FakeClock:
+    """Reloj manual para simular inactividad."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_session_key_is_stable_and_hides_user_data(monkeypatch):
+    """La clave depende solo del contenido del token, no del orden ni expone datos."""
+    monkeypatch.delenv("SESSION_KEY_SECRET", raising=False)
+    monkeypatch.setenv("FERNET_KEY", "clave-del-servidor")
+    first = session_key({"nombre": "Ana López", "phone": "123", "job-offer": 7})
+    second = session_key({"job-offer": 7, "phone": "123", "nombre": "Ana López"})
+
+    assert first == second
+    assert "Ana" not in first and len(first) == 32
+    assert session_key({"nombre": "Ana López", "phone": "124", "job-offer": 7}) != first
+
+
+def test_session_key_requires_the_server_secret(monkeypatch):
+    """Sin el secreto del servidor la clave no se puede calcular a partir de los datos."""
+    datos = {"nombre": "Ana López", "phone": "123", "job-offer": 7}
+    monkeypatch.setenv("FERNET_KEY", "clave-del-servidor")
+    monkeypatch.delenv("SESSION_KEY_SECRET", raising=False)
+    with_fernet = session_key(datos)
+    monkeypatch.setenv("SESSION_KEY_SECRET", "otro-secreto")
+    assert session_key(datos) != with_fernet
+
+    monkeypatch.delenv("SESSION_KEY_SECRET")
+    monkeypatch.delenv("FERNET_KEY")
+    with pytest.raises(ValueError):
+        session_key(datos)
+
+
+def test_idle_sessions_spill_to_disk_and_come_back(tmp_path):
+    """Una sesión inactiva se vuelca a SQLite al expulsarse y se restaura al volver."""
+    clock = FakeClock()
+    disk = SQLiteSessionStore(str(tmp_path / "sessions.sqlite3"))
+    store = MemorySessionStore(max_sessions=10, idle_ttl_seconds=60, spill=disk, clock=clock)
+
+    with store.session("ana", FakeAgent) as lease:
+        lease.agent.answers.append("Ana López")
+    clock.now = 61
+    assert store.evict_idle() == 1
+    assert len(store) == 0
+
+    agent = store.checkout("ana", FakeAgent)
+    assert agent.answers == ["Ana López"]
+    assert store.stats()["restored"] == 1 and store.stats()["spilled"] == 1
+
+
+def test_lru_evicts_oldest_idle_session_but_not_checked_out_ones(tmp_path):
+    """Al superar el máximo se expulsa la menos usada; las retiradas no cuentan."""
+    disk = SQLiteSessionStore(str(tmp_path / "sessions.sqlite3"))
+    store = MemorySessionStore(max_sessions=2, idle_ttl_seconds=3600, spill=disk, clock=FakeClock())
+
+    active = store.checkout("activa", FakeAgent)
+    for key in ("a", "b", "c"):
+        store.checkin(key, store.checkout(key, FakeAgent))
+
+    assert disk.load("a") is not None
+    assert disk.load("b") is None and disk.load("activa") is None
+    assert store.stats()["idle_sessions"] == 2 and store.stats()["active_sessions"] == 1
+    store.checkin("activa", active)
+    assert store.checkout("activa", FakeAgent) is active
+
+
+def test_tabs_of_the_same_candidate_take_turns(tmp_path):
+    """Una segunda pestaña del mismo candidato espera a que la primera devuelva el agente."""
+    store = MemorySessionStore(spill=None, clock=FakeClock())
+    first = store.checkout("ana", FakeAgent)
+    second = []
+    tab = threading.Thread(target=lambda: second.append(store.checkout("ana", FakeAgent)))
+    tab.start()
+    time.sleep(0.05)
+
+    assert second == [] and store.stats()["waits"] == 1
+    first.answers.append("Ana López")
+    store.checkin("ana", first)
+    tab.join(1)
+
+    assert second == [first] and second[0].answers == ["Ana López"]
+    assert store.stats()["active_sessions"] == 1
+
+
+def test_checkout_of_a_busy_session_times_out(tmp_path):
+    """Si la sesión no se devuelve a tiempo, la otra ejecución recibe TimeoutError."""
+    store = MemorySessionStore(spill=None, clock=FakeClock(), checkout_timeout_seconds=0.05)
+    store.checkout("ana", FakeAgent)
+    with pytest.raises(TimeoutError):
+        store.checkout("ana", FakeAgent)
+
+
+def test_idle_sessions_are_evicted_in_the_background(tmp_path):
+    """Con un intervalo configurado, las sesiones vencidas se expulsan sin más tráfico."""
+    clock = FakeClock()
+    store = MemorySessionStore(
+        idle_ttl_seconds=60, spill=None, clock=clock, evict_interval_seconds=0.01
+    )
+    store.checkin("ana", store.checkout("ana", FakeAgent))
+    clock.now = 61
+    deadline = time.monotonic() + 2
+    while len(store) and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert len(store) == 0
+    store.close()
+
+
+def test_spill_is_written_outside_the_store_lock(tmp_path):
+    """El snapshot de una sesión expulsada se escribe sin bloquear al resto del almacén."""
+    locked_while_saving = []
+
+    class WatchedDisk(SQLiteSessionStore):
+        def save(self, key, snapshot):
+            locked_while_saving.append(store._lock.locked())
+            super().save(key, snapshot)
+
+    store = MemorySessionStore(
+        max_sessions=1, spill=WatchedDisk(str(tmp_path / "sessions.sqlite3")), clock=FakeClock()
+    )
+    for key in ("a", "b"):
+        store.checkin(key, store.checkout(key, FakeAgent))
+
+    assert locked_while_saving == [False]
+    assert store.spill.load("a") is not None
+
+
+def test_replacing_the_agent_in_a_lease(tmp_path):
+    """Asignar `lease.agent` reemplaza el agente de la sesión (p. ej. al reiniciar)."""
+    store = MemorySessionStore(spill=None, clock=FakeClock())
+    with store.session("ana", FakeAgent) as lease:
+        old = lease.agent
+        lease.agent = FakeAgent()
+
+    assert store.checkout("ana", FakeAgent) is not old
+
+
+def test_sqlite_store_persists_across_instances(tmp_path):
+    """El almacén SQLite conserva la sesión entre procesos y borra las descartadas."""
+    db_path = str(tmp_path / "sessions.sqlite3")
+    store = SQLiteSessionStore(db_path)
+    with store.session("ana", FakeAgent) as lease:
+        lease.agent.answers += ["Ana López", "Python"]
+    store.close()
+
+    reopened = SQLiteSessionStore(db_path)
+    assert reopened.checkout("ana", FakeAgent).answers == ["Ana López", "Python"]
+    reopened.discard("ana")
+    assert reopened.load("ana") is None
+    assert len(reopened) == 0
+
+
+def test_memory_store_close_spills_every_session(tmp_path):
+    """Al cerrar, las sesiones en memoria se guardan en disco."""
+    db_path = str(tmp_path / "sessions.sqlite3")
+    store = MemorySessionStore(spill=SQLiteSessionStore(db_path), clock=FakeClock())
+    store.checkin("a", store.checkout("a", FakeAgent))
+    agent = store.checkout("b", FakeAgent)
+    agent.answers.append("en curso")
+    store.close()
+
+    disk = SQLiteSessionStore(db_path)
+    assert disk.load("a") is not None
+    assert disk.load("b") == b"en curso"
+
+
+@pytest.fixture
+def journals(tmp_path, monkeypatch):
+    """Directorio de diarios aislado; crea un diario vacío por clave."""
+    directory = tmp_path / "journals"
+    directory.mkdir()
+    monkeypatch.setitem(SESSION_JOURNAL_CONFIG, "enabled", True)
+    monkeypatch.setitem(SESSION_JOURNAL_CONFIG, "directory", str(directory))
+
+    def create(*keys):
+        for key in keys:
+            (directory / f"{key}.journal").write_bytes(b"diario")
+        return directory
+
+    return create
+
+
+@pytest.mark.parametrize("with_spill", [True, False])
+def test_journals_of_sessions_leaving_memory_are_deleted(tmp_path, journals, with_spill):
+    """Los diarios de las sesiones expulsadas o descartadas no quedan en disco."""
+    clock = FakeClock()
+    disk = SQLiteSessionStore(str(tmp_path / "sessions.sqlite3")) if with_spill else None
+    store = MemorySessionStore(
+        idle_ttl_seconds=60, spill=disk, clock=clock, on_remove=delete_session_journal
+    )
+    directory = journals("vieja", "descartada", "activa")
+
+    store.checkin("vieja", store.checkout("vieja", FakeAgent))
+    clock.now = 61
+    # Devolver otra sesión expulsa la vencida
+    store.checkin("activa", store.checkout("activa", FakeAgent))
+    store.checkout("descartada", FakeAgent)
+    store.discard("descartada")
+    assert store.stats()["evicted"] == 1
+
+    assert sorted(path.name for path in directory.iterdir()) == ["activa.journal"]
+    if with_spill:
+        assert disk.load("vieja") is not None
+
+
+def test_sqlite_store_deletes_journals_of_discarded_and_expired_sessions(tmp_path, journals):
+    """En el backend SQLite el diario se borra al descartar la sesión o al vencer."""
+    db_path = str(tmp_path / "sessions.sqlite3")
+    store = SQLiteSessionStore(db_path, on_remove=delete_session_journal)
+    directory = journals("descartada", "vencida")
+    for key in ("descartada", "vencida"):
+        store.checkin(key, store.checkout(key, FakeAgent))
+    store.discard("descartada")
+    assert [path.name for path in directory.iterdir()] == ["vencida.journal"]
+    store.close()
+
+    SQLiteSessionStore(db_path, ttl_seconds=0, on_remove=delete_session_journal).close()
+    assert list(directory.iterdir()) == []
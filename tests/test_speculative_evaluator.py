@@ -0,0 +1,179 @@
+"""
+Pruebas de la evaluación especulativa de borradores.
+"""
+
+import shutil
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from agents.simple_agent import SimpleRRHHAgent
+from agents.tools.evaluation_cache import EvaluationCache
+from agents.tools.model_cascade import ModelCascade
+from agents.tools.response_evaluator import ResponseEvaluator
+from agents.tools.speculative_evaluator import SpeculativeEvaluator
+from core.models.question_models import ValidatorSpec
+from services.llm_gateway import LLMGateway
+
+QUESTION = "¿Por qué estás interesado en esta posición?"
+DEBOUNCE = 0.05
+
+
+class CountingLLM:
+    """LLM falso que cuenta las llamadas y tarda en responder."""
+
+    def __init__(self, latency: float = 0.1):
+        self.latency = latency
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt):
+        with self._lock:
+            self.prompts.append(prompt)
+        time.sleep(self.latency)
+        return "SATISFACTORIA"
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Conecta los evaluadores a un LLM falso."""
+    fake = CountingLLM()
+    monkeypatch.setenv("GROQ_API_KEY", "gsk_test")
+    monkeypatch.setattr(
+        "agents.tools.response_evaluator.load_env_variables", lambda *args: True
+    )
+    monkeypatch.setattr(
+        "agents.tools.model_cascade.obtener_cliente_llm", lambda *args, **kwargs: fake
+    )
+    return fake
+
+
+@pytest.fixture
+def evaluator(llm):
+    """Evaluador sin pre-clasificador, con caché en memoria y gateway holgado."""
+    gateway = LLMGateway(
+        requests_per_minute=60000, burst=100, max_concurrency=8, max_queue=50, max_wait_seconds=5
+    )
+    return ResponseEvaluator(
+        cache=EvaluationCache(),
+        cascade=ModelCascade(["llama-3.3-70b-versatile"], gateway=gateway)
+    )
+
+
+@pytest.fixture
+def speculator(evaluator):
+    """Evaluador especulativo con debounce corto."""
+    return SpeculativeEvaluator(evaluator, debounce_seconds=DEBOUNCE)
+
+
+def settle(speculator, seconds=0.3):
+    """Espera a que terminen el debounce y la evaluación en segundo plano."""
+    time.sleep(seconds)
+
+
+def test_only_the_last_draft_is_evaluated(speculator, llm):
+    """Los borradores que llegan antes del debounce se descartan."""
+    for draft in ("Me inte", "Me interesa el", "Me interesa el puesto por el equipo"):
+        speculator.submit_draft(QUESTION, draft)
+    settle(speculator)
+
+    assert len(llm.prompts) == 1
+    assert "Me interesa el puesto por el equipo" in llm.prompts[0]
+    stats = speculator.stats()
+    assert stats["debounced"] == 2
+    assert stats["speculative_calls"] == 1
+
+
+def test_exact_and_near_matches_reuse_the_verdict(speculator, llm):
+    """El veredicto se reutiliza si el texto enviado coincide o casi coincide."""
+    speculator.submit_draft(QUESTION, "Me interesa el puesto por el equipo")
+    settle(speculator)
+
+    start = time.perf_counter()
+    assert speculator.resolve(QUESTION, "me interesa el puesto, por el equipo") == (True, "")
+    assert time.perf_counter() - start < 0.05
+
+    speculator.submit_draft(QUESTION, "Me interesa el puesto por el equpo y la empresa")
+    settle(speculator)
+    assert speculator.resolve(QUESTION, "Me interesa el puesto por el equipo y la empresa.") == (True, "")
+
+    assert len(llm.prompts) == 2
+    stats = speculator.stats()
+    assert stats["exact_hits"] == 1
+    assert stats["near_hits"] == 1
+    assert stats["wasted_calls"] == 0
+
+
+def test_different_final_text_counts_wasted_call(speculator, llm):
+    """Si el candidato reescribe la respuesta, la especulación se cuenta como desperdiciada."""
+    speculator.submit_draft(QUESTION, "Busco un cambio de rubro")
+    settle(speculator)
+
+    assert speculator.resolve(QUESTION, "Me interesa porque conozco el producto hace años") is None
+    stats = speculator.stats()
+    assert stats["misses"] == 1
+    assert stats["wasted_calls"] == 1
+
+
+def test_submit_waits_for_speculation_in_flight(speculator, llm):
+    """Si el borrador equivalente se está evaluando, se espera en lugar de repetir la llamada."""
+    speculator.submit_draft(QUESTION, "Me interesa el puesto por el equipo")
+    time.sleep(DEBOUNCE + 0.02)
+
+    assert speculator.resolve(QUESTION, "Me interesa el puesto por el equipo") == (True, "")
+    assert len(llm.prompts) == 1
+
+
+def test_validator_decided_drafts_are_not_speculated(speculator, llm):
+    """Los borradores que resuelve el validador no consumen llamadas."""
+    speculator.submit_draft("¿Cuál es tu nombre completo?", "Juan Pérez", ValidatorSpec(type="name"))
+    settle(speculator, DEBOUNCE + 0.05)
+
+    assert llm.prompts == []
+    assert speculator.stats()["skipped"] == 1
+
+
+def test_agent_reuses_speculation_on_submit(evaluator, llm, tmp_path, monkeypatch):
+    """El agente en modo especulativo no repite la llamada a Groq al enviar."""
+    (tmp_path / "data").mkdir()
+    shutil.copy(root_dir / "data" / "questions.json", tmp_path / "data")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("agents.simple_agent.get_response_evaluator", lambda: evaluator)
+
+    agent = SimpleRRHHAgent(speculative=True)
+    agent.speculator.debounce_seconds = DEBOUNCE
+    agent.start_conversation()
+    agent.process_user_input("Juan Pérez")
+
+    agent.submit_draft("Trabajé cinco años en logística")
+    settle(agent.speculator)
+    agent.process_user_input("Trabajé cinco años en logística")
+
+    assert len(llm.prompts) == 1
+    assert agent.state.current_question_index == 2
+    assert agent.get_speculation_stats()["exact_hits"] == 1
+
+
+def test_async_turn_skips_speculation_when_disabled(evaluator, llm, tmp_path, monkeypatch):
+    """Sin modo especulativo, el turno asíncrono no pasa por un hilo para buscar borradores."""
+    import asyncio
+
+    (tmp_path / "data").mkdir()
+    shutil.copy(root_dir / "data" / "questions.json", tmp_path / "data")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("agents.simple_agent.get_response_evaluator", lambda: evaluator)
+
+    agent = SimpleRRHHAgent()
+    assert agent.speculator is None
+    monkeypatch.setattr(agent, "_resolve_speculation", lambda *args: pytest.fail("hilo innecesario"))
+    agent.start_conversation()
+
+    asyncio.run(agent.aprocess_user_input("Juan Pérez"))
+    assert agent.state.current_question_index == 1
@@ -0,0 +1,90 @@
+"""
+Pruebas del calentamiento al iniciar la aplicación.
+"""
+
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+import app.warmup as warmup
+
+
+@pytest.fixture(autouse=True)
+def fresh_warmup(monkeypatch):
+    """Cada prueba parte de un proceso sin calentar."""
+    monkeypatch.setattr(warmup, "_report", None)
+    monkeypatch.setattr(warmup, "_ready", threading.Event())
+
+
+def test_warmup_reports_each_step_and_flips_readiness():
+    """Cada paso se mide, los errores no cortan el resto y la app queda lista al final."""
+    calls = []
+
+    def questions():
+        assert not warmup.is_ready()
+        calls.append("preguntas")
+        return "5 archivos de preguntas"
+
+    def sms():
+        calls.append("sms")
+        raise RuntimeError("faltan credenciales de Twilio")
+
+    def templates():
+        calls.append("plantillas")
+
+    steps = [("preguntas", questions), ("sms", sms), ("plantillas", templates)]
+    report = warmup.run_warmup(steps)
+
+    assert calls == ["preguntas", "sms", "plantillas"]
+    assert warmup.is_ready()
+    assert list(report.timings) == ["preguntas", "sms", "plantillas"]
+    assert report.details == {"preguntas": "5 archivos de preguntas"}
+    assert report.errors == {"sms": "RuntimeError: faltan credenciales de Twilio"}
+    assert "faltan credenciales de Twilio" in report.summary()
+
+    # Una sola vez por proceso
+    assert warmup.run_warmup(steps) is report
+    assert len(calls) == 3
+
+
+def test_api_is_not_ready_until_warmup_finishes():
+    """/health responde siempre; /ready solo cuando terminó el calentamiento."""
+    httpx = pytest.importorskip("httpx")
+    pytest.importorskip("starlette")
+    import asyncio
+
+    from agents.session_store import MemorySessionStore
+    from app.api import create_app
+
+    async def run():
+        transport = httpx.ASGITransport(app=create_app(MemorySessionStore(spill=None)))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            assert (await client.get("/health")).status_code == 200
+            assert (await client.get("/ready")).status_code == 503
+            warmup.run_warmup([])
+            assert (await client.get("/ready")).json() == {"ready": True}
+
+    asyncio.run(run())
+
+
+def test_config_reads_dotenv_from_any_entry_point(tmp_path):
+    """Los *_CONFIG toman los valores del .env aunque el punto de entrada sea app.warmup."""
+    (tmp_path / ".env").write_text("GROQ_MODEL=modelo-del-env\nWARMUP_ENABLED=false\n")
+    env = {key: value for key, value in os.environ.items() if key not in ("GROQ_MODEL", "WARMUP_ENABLED")}
+    env["PYTHONPATH"] = str(root_dir)
+    code = (
+        "import app.warmup; from core.rrhh_config import LLM_CONFIG, WARMUP_CONFIG; "
+        "print(LLM_CONFIG['model'], WARMUP_CONFIG['enabled'])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=tmp_path, env=env, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip().splitlines()[-1] == "modelo-del-env False"
@@ -0,0 +1,127 @@
+"""
+Pruebas del modo de workers: anillo de hashing consistente y dispatcher con
+un worker que se cae a mitad de la entrevista.
+"""
+
+import asyncio
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+starlette = pytest.importorskip("starlette")
+httpx = pytest.importorskip("httpx")
+
+# Agregar el directorio raíz al path para importaciones
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from agents.session_store import SQLiteSessionStore
+from agents.tools.evaluation_cache import EvaluationCache
+from agents.tools.response_evaluator import ResponseEvaluator
+from app.api import create_app
+from app.workers import HashRing, WorkerPool, create_dispatcher
+from core.rrhh_config import LLM_GATEWAY_CONFIG, SESSION_JOURNAL_CONFIG
+
+
+class FlakyTransport(httpx.AsyncBaseTransport):
+    """Transporte hacia un worker en proceso que se puede "apagar"."""
+
+    def __init__(self, app):
+        self.inner = httpx.ASGITransport(app=app)
+        self.alive = True
+        self.requests = 0
+
+    async def handle_async_request(self, request):
+        if not self.alive:
+            raise httpx.ConnectError("worker caído", request=request)
+        self.requests += 1
+        return await self.inner.handle_async_request(request)
+
+
+def test_hash_ring_only_moves_keys_of_removed_node():
+    """Quitar un nodo solo reasigna las claves que tenía ese nodo."""
+    nodes = ["http://w1", "http://w2", "http://w3"]
+    ring = HashRing(nodes)
+    keys = [f"sesion-{i}" for i in range(2000)]
+    before = {key: ring.node_for(key) for key in keys}
+
+    assert set(before.values()) == set(nodes)
+    # Reparto razonable entre los tres nodos
+    assert min(list(before.values()).count(node) for node in nodes) > 400
+
+    ring.remove("http://w2")
+    after = {key: ring.node_for(key) for key in keys}
+    for key in keys:
+        if before[key] != "http://w2":
+            assert after[key] == before[key]
+        else:
+            assert after[key] in ("http://w1", "http://w3")
+
+    ring.add("http://w2")
+    assert {key: ring.node_for(key) for key in keys} == before
+    assert HashRing([]).node_for("x") is None
+
+
+def test_groq_quota_is_split_between_workers(monkeypatch):
+    """Cada worker recibe su parte de la cuota de Groq, no la cuota entera."""
+    monkeypatch.setitem(LLM_GATEWAY_CONFIG, "requests_per_minute", 30.0)
+    monkeypatch.setitem(LLM_GATEWAY_CONFIG, "burst", 10)
+
+    env = WorkerPool(4)._environment()
+    assert float(env["GROQ_REQUESTS_PER_MINUTE"]) == 7.5
+    assert int(env["GROQ_REQUESTS_BURST"]) == 2
+
+    # La ráfaga nunca queda en cero, aunque haya más workers que cupos
+    env = WorkerPool(16)._environment()
+    assert float(env["GROQ_REQUESTS_PER_MINUTE"]) * 16 == 30.0
+    assert int(env["GROQ_REQUESTS_BURST"]) == 1
+
+
+def test_sessions_resume_on_another_worker(tmp_path, monkeypatch):
+    """Si el worker de la sesión se cae, el siguiente la retoma desde el almacén compartido."""
+    (tmp_path / "data").mkdir()
+    shutil.copy(root_dir / "data" / "questions.json", tmp_path / "data")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("GROQ_API_KEY", raising=False)
+    # Como en WorkerPool: el estado compartido es el de SQLite, sin diario por archivo
+    monkeypatch.setitem(SESSION_JOURNAL_CONFIG, "enabled", False)
+    monkeypatch.setattr(
+        "agents.simple_agent.get_response_evaluator",
+        lambda: ResponseEvaluator(EvaluationCache())
+    )
+    db_path = str(tmp_path / "sessions.sqlite3")
+    workers = {
+        f"http://w{i}": FlakyTransport(create_app(SQLiteSessionStore(db_path)))
+        for i in range(2)
+    }
+    upstream = httpx.AsyncClient(mounts=workers)
+    dispatcher = create_dispatcher(list(workers), client=upstream)
+
+    async def run():
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=dispatcher), base_url="http://dispatcher"
+        ) as client:
+            started = await client.post("/interviews", json={})
+            assert started.status_code == 201
+            session_id = started.json()["session_id"]
+            owner = HashRing(list(workers)).node_for(session_id)
+            assert workers[owner].requests == 1
+
+            answered = await client.post(f"/interviews/{session_id}/answer", json={"answer": "Juan Pérez"})
+            assert answered.json()["current_question"] == "¿Cuál es tu experiencia laboral previa?"
+            assert workers[owner].requests == 2
+
+            workers[owner].alive = False
+            summary = (await client.get(f"/interviews/{session_id}/summary")).json()
+            assert summary["questions_asked"] == 1
+            assert "Juan Pérez" in summary["responses"].values()
+            assert (await client.get("/health")).json()["down"] == [owner]
+
+            for transport in workers.values():
+                transport.alive = False
+            unavailable = await client.get(f"/interviews/{session_id}/summary")
+            assert unavailable.status_code == 503
+
+    asyncio.run(run())
@@ -1,4 +1,5 @@
 import re
+import unicodedata
 from typing import List, Optional
 
 def clean_text(text: str) -> str:
@@ -23,4 +24,11 @@ def extract_emails(text: str) -> List[str]:
 def extract_phone_numbers(text: str) -> List[str]:
     """Extrae números de teléfono de un texto."""
     phone_pattern = r'\+?1?\d{9,15}'
-    return re.findall(phone_pattern, text) 
\ No newline at end of file
+    return re.findall(phone_pattern, text)
+
+def normalize_text(text: str) -> str:
+    """Normaliza un texto para compararlo: minúsculas, sin tildes ni signos."""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = re.sub(r'[^\w\s]', ' ', text)
+    return re.sub(r'\s+', ' ', text).strip()